@@ -0,0 +1,252 @@
+"""
+Microbenchmarks for the agent's hot paths.
+
+Usage:
+    python -m benchmarks.agent [--repeat 7] [--min-time 0.2] [--output results.json]
+
+Compare two saved runs with benchmarks.compare.
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agent import BookingAgent
+from src.mocks import MockResponses
+from src.slots import generate_slots
+
+# One customer booking end to end: start, service, day, slot, name, phone, email
+BOOKING_FLOW = [
+    "I want to book an appointment",
+    "Manicure",
+    "tomorrow",
+    "2",
+    "Ada Lovelace",
+    "555-0100",
+    "ada@example.com",
+]
+
+INTENT_MESSAGES = [
+    "hello there",
+    "Can I schedule a pedicure for Friday?",
+    "check appointment appt-1234",
+    "I need to cancel booking appt-9876",
+    "What services do you provide?",
+    "Do you take walk-ins on weekends?",
+]
+
+EMAILS = [
+    ("Appointment request", "Hi, could I book a gel manicure and nail art on 5/14 or 5/15? Thanks!"),
+    ("Reschedule", "I need to reschedule, can you move my appointment to next week?"),
+    ("Question", "What are your hours and where is your location? Also what is the price of acrylic?"),
+    ("Re: your visit", "Thank you so much, my nails look amazing. See you next month!"),
+]
+
+TEMPLATE_DATA = {
+    "service_name": "Gel Manicure",
+    "date": "Saturday, May 18",
+    "time": "2:30 PM",
+    "staff_name": "Delane",
+    "name": "Ada Lovelace",
+    "login_url": "https://delanenails.example/account",
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 7, min_time: float = 0.2) -> Dict[str, float]:
+    """
+    Time a callable with timeit.
+
+    The loop count is calibrated so each run takes at least ``min_time``;
+    per-call times from ``repeat`` runs are summarized.
+
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of timed runs
+        min_time: Minimum seconds per run
+
+    Returns:
+        Dict with median, min and stdev per call (microseconds) and the loop count
+    """
+    timer = timeit.Timer(func)
+    loops, elapsed = timer.autorange()
+    if elapsed < min_time:
+        loops = max(loops, int(loops * min_time / max(elapsed, 1e-9)))
+    per_call = [total / loops * 1e6 for total in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "median_us": statistics.median(per_call),
+        "min_us": min(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "loops": loops,
+        "runs": repeat,
+    }
+
+
+def _booking_flow() -> Callable[[], str]:
+    agent = BookingAgent(use_mock_api=True)
+
+    def flow() -> str:
+        reply = ""
+        for message in BOOKING_FLOW:
+            reply = agent.process_message(message)
+        return reply
+
+    assert "is confirmed" in flow(), "booking flow did not complete"
+    return flow
+
+
+def _list_services() -> Callable[[], str]:
+    agent = BookingAgent(use_mock_api=True)
+    return lambda: agent.process_message("What services do you offer?")
+
+
+def _determine_intent() -> Callable[[], List[str]]:
+    agent = BookingAgent(use_mock_api=True)
+    return lambda: [agent._determine_intent(message, agent.conversation) for message in INTENT_MESSAGES]
+
+
+def _analyze_email_intent() -> Callable[[], list]:
+    # src.ai.agent pulls in every integration (Twilio, Google Cloud); skip if one is missing
+    from src.ai.agent import AIAgent
+
+    agent = AIAgent.__new__(AIAgent)
+    return lambda: [agent._analyze_email_intent(body, subject) for subject, body in EMAILS]
+
+
+def _available_slots() -> Callable[[], Any]:
+    start = datetime.now() + timedelta(days=1)
+    return lambda: MockResponses.available_slots("service-001", start)
+
+
+def _generate_slots_month() -> Callable[[], Any]:
+    now = datetime(2030, 5, 1, 8)
+    return lambda: generate_slots("service-001", now, days=30, now=now)
+
+
+def _mime_message(size: int) -> Dict[str, Any]:
+    """A Gmail API message: multipart/mixed with an alternative part and an attachment."""
+    def encode(text: str) -> str:
+        return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+    plain = ("Hi, I'd like to book a gel manicure on Saturday. " * (size // 50))[:size]
+    html = f"<html><body><p>{plain}</p></body></html>"
+    return {
+        "id": "msg-1",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "headers": [{"name": "Subject", "value": "Booking"}],
+            "parts": [
+                {
+                    "mimeType": "multipart/alternative",
+                    "parts": [
+                        {"mimeType": "text/plain", "body": {"data": encode(plain)}},
+                        {"mimeType": "text/html", "body": {"data": encode(html)}},
+                    ],
+                },
+                {"mimeType": "image/jpeg", "filename": "nails.jpg",
+                 "body": {"attachmentId": "att-1", "size": size}},
+            ],
+        },
+    }
+
+
+def _email_content_large() -> Callable[[], Tuple[str, str]]:
+    from src.google_services.gmail import GmailService
+
+    gmail = GmailService()
+    message = _mime_message(1024 * 1024)
+    return lambda: gmail.get_email_content(message)
+
+
+def _render_templates() -> Callable[[], List[str]]:
+    from src.services.email_service import EmailService
+
+    service = EmailService()
+    renderers = [service._render_appointment_confirmation, service._render_reminder, service._render_welcome]
+    return lambda: [render(TEMPLATE_DATA) for render in renderers]
+
+
+# Benchmark name -> factory returning the callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {
+    "agent.process_message.booking_flow": _booking_flow,
+    "agent.process_message.list_services": _list_services,
+    "agent.determine_intent": _determine_intent,
+    "ai_agent.analyze_email_intent": _analyze_email_intent,
+    "mocks.available_slots": _available_slots,
+    "slots.generate_slots_30_days": _generate_slots_month,
+    "gmail.get_email_content_1mb": _email_content_large,
+    "email.render_templates": _render_templates,
+}
+
+
+def run(repeat: int = 7, min_time: float = 0.2, only: Optional[List[str]] = None) -> dict:
+    """
+    Run the hot-path benchmarks.
+
+    Benchmarks whose modules can't be imported here are reported as skipped.
+
+    Args:
+        repeat: Timed runs per benchmark
+        min_time: Minimum seconds per run
+        only: Names (or name prefixes) of benchmarks to run; all by default
+
+    Returns:
+        Dict with run metadata and per-benchmark results
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, factory in BENCHMARKS.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            func = factory()
+        except ImportError as e:
+            results[name] = {"skipped": str(e)}
+            continue
+        results[name] = measure(func, repeat, min_time)
+
+    return {
+        "benchmark": "agent",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main():
+    """Run the benchmarks, print a report and optionally save it as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--only", action="append", help="Run benchmarks starting with this name (repeatable)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = run(args.repeat, args.min_time, args.only)
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            print(f"{name:<40} skipped ({result['skipped']})")
+        else:
+            print(f"{name:<40} {result['median_us']:>12.2f} us  "
+                  f"(min {result['min_us']:.2f}, stdev {result['stdev_us']:.2f}, {result['loops']} loops)")
+    print(f"Finished in {time.perf_counter() - started:.1f} s")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark month-to-date reports from AppointmentAnalytics.
+
+Usage:
+    python -m benchmarks.analytics [--appointments 100000] [--reports 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.analytics import AppointmentAnalytics
+from src.mocks import MockResponses
+from src.storage.appointment_store import AppointmentStore
+
+
+def _generate(count: int, start: datetime, services: list):
+    """Yield appointments spread over consecutive days, 16 per day."""
+    rng = random.Random(42)
+    for n in range(count):
+        slot = start + timedelta(days=n // 16, minutes=30 * (n % 16))
+        service = rng.choice(services)
+        yield {
+            "appointment_id": f"appt-{n}",
+            "service_id": service["id"],
+            "status": "canceled" if rng.random() < 0.1 else "confirmed",
+            "start_time": slot,
+            "end_time": slot + timedelta(minutes=service["duration"]),
+        }
+
+
+def run(appointments: int = 100000, reports: int = 200) -> dict:
+    """
+    Populate a store and time month-to-date reports.
+
+    Args:
+        appointments: Number of appointments to insert
+        reports: Number of timed warm reports
+
+    Returns:
+        Dict with timing results
+    """
+    services = MockResponses.services()
+    start = datetime(2030, 1, 1, 9)
+    # Report on the last full month that has data
+    last_day = start + timedelta(days=max(appointments // 16 - 1, 0))
+    today = max(last_day.replace(day=1) - timedelta(days=1), start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AppointmentStore(os.path.join(tmp, "bench.db"))
+        store.add_many(_generate(appointments, start, services))
+        analytics = AppointmentAnalytics.for_store(store, services, clock=lambda: today)
+
+        started = time.perf_counter()
+        report = analytics.month_to_date()
+        cold_ms = (time.perf_counter() - started) * 1e3
+
+        started = time.perf_counter()
+        for _ in range(reports):
+            analytics.month_to_date()
+        warm_ms = (time.perf_counter() - started) / reports * 1e3
+        store.close()
+
+    return {
+        "appointments": appointments,
+        "report_days": report["days"],
+        "report_appointments": report["appointments"],
+        "cold_ms": cold_ms,
+        "warm_ms": warm_ms,
+    }
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=100000)
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args()
+
+    result = run(args.appointments, args.reports)
+    print(f"Appointments:      {result['appointments']}")
+    print(f"Report covers:     {result['report_days']} days, {result['report_appointments']} appointments")
+    print(f"Cold report:       {result['cold_ms']:.2f} ms")
+    print(f"Warm report:       {result['warm_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
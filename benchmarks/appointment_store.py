@@ -0,0 +1,99 @@
+"""
+Benchmark AppointmentStore lookups and daily range scans.
+
+Usage:
+    python -m benchmarks.appointment_store [--appointments 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.storage.appointment_store import AppointmentStore
+
+
+def _generate(count: int, start: datetime):
+    """Yield appointments spread over consecutive days, 16 per day."""
+    for n in range(count):
+        slot = start + timedelta(days=n // 16, minutes=30 * (n % 16))
+        yield {
+            "appointment_id": f"appt-{n}",
+            "slot_id": f"slot_{slot.strftime('%Y%m%d%H%M')}",
+            "service_id": "service-001",
+            "service_name": "Manicure",
+            "start_time": slot,
+            "end_time": slot + timedelta(hours=1),
+            "customer_name": f"Customer {n}",
+            "customer_email": f"customer{n}@example.com",
+            "customer_phone": f"555{n:07d}",
+        }
+
+
+def _time_per_call(func, args_list) -> float:
+    """Average microseconds per call."""
+    started = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - started) / len(args_list) * 1e6
+
+
+def run(appointments: int = 100000, lookups: int = 2000) -> dict:
+    """
+    Populate a store and time its queries.
+
+    Args:
+        appointments: Number of appointments to insert
+        lookups: Number of timed queries of each kind
+
+    Returns:
+        Dict with timing results
+    """
+    start = datetime(2030, 1, 1, 9)
+    days = appointments // 16
+    rng = random.Random(42)
+    sample = [rng.randrange(appointments) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AppointmentStore(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        store.add_many(_generate(appointments, start))
+        insert_seconds = time.perf_counter() - started
+
+        result = {
+            "appointments": store.count(),
+            "insert_per_second": appointments / insert_seconds,
+            "get_us": _time_per_call(store.get, [(f"appt-{n}",) for n in sample]),
+            "by_phone_us": _time_per_call(store.find_by_phone, [(f"555{n:07d}",) for n in sample]),
+            "by_email_us": _time_per_call(store.find_by_email, [(f"customer{n}@example.com",) for n in sample]),
+            "day_scan_us": _time_per_call(
+                store.on_day, [(start + timedelta(days=rng.randrange(max(days, 1))),) for _ in sample]
+            ),
+        }
+        store.close()
+    return result
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--appointments", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = run(args.appointments, args.lookups)
+    print(f"Appointments:      {result['appointments']}")
+    print(f"Batch insert:      {result['insert_per_second']:.0f} rows/s")
+    print(f"get by ID:         {result['get_us']:.1f} us")
+    print(f"find by phone:     {result['by_phone_us']:.1f} us")
+    print(f"find by email:     {result['by_email_us']:.1f} us")
+    print(f"day range scan:    {result['day_scan_us']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare two saved benchmark runs and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.10]
+
+Exits with status 1 if any benchmark's median got slower by more than the
+threshold, so it can gate a CI job.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare per-benchmark median times.
+
+    A change only counts when it exceeds ``threshold`` and is larger than
+    the combined run-to-run spread (stdev) of both runs, so noisy
+    benchmarks don't flap.
+
+    Args:
+        baseline: Results saved by a benchmark's --output
+        current: Results to check against the baseline
+        threshold: Relative slowdown (0.10 = 10%) that counts as a regression
+
+    Returns:
+        One row per benchmark with name, baseline_us, current_us, change and status
+        ("regression", "improvement", "unchanged", "new", "missing" or "skipped")
+    """
+    before, after = baseline.get("results", {}), current.get("results", {})
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        old, new = before.get(name), after.get(name)
+        row = {"name": name, "baseline_us": None, "current_us": None, "change": None}
+        if new is None:
+            row["status"] = "missing"
+        elif old is None:
+            row["status"] = "new"
+        elif "skipped" in old or "skipped" in new:
+            row["status"] = "skipped"
+        else:
+            row["baseline_us"], row["current_us"] = old["median_us"], new["median_us"]
+            delta = new["median_us"] - old["median_us"]
+            row["change"] = delta / old["median_us"] if old["median_us"] else 0.0
+            noise = old.get("stdev_us", 0.0) + new.get("stdev_us", 0.0)
+            if abs(row["change"]) <= threshold or abs(delta) <= noise:
+                row["status"] = "unchanged"
+            else:
+                row["status"] = "regression" if delta > 0 else "improvement"
+        if row["current_us"] is None and new is not None and "median_us" in new:
+            row["current_us"] = new["median_us"]
+        rows.append(row)
+    return rows
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def main():
+    """Print a comparison table; exit 1 on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+    for row in rows:
+        baseline = f"{row['baseline_us']:.2f}" if row["baseline_us"] is not None else "-"
+        current = f"{row['current_us']:.2f}" if row["current_us"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else ""
+        print(f"{row['name']:<40} {baseline:>12} {current:>12} us {change:>8}  {row['status']}")
+
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
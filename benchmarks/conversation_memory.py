@@ -0,0 +1,84 @@
+"""
+Benchmark per-process memory used by ConversationMemory.
+
+Usage:
+    python -m benchmarks.conversation_memory [--sessions 10000] [--turns 40]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.chat.memory import ConversationMemory
+
+USER_MESSAGE = "Hi, I'd like to book a gel manicure for Saturday afternoon if you have anything open."
+ASSISTANT_MESSAGE = ("Of course! On Saturday we have openings at 1:00 PM, 2:30 PM and 4:00 PM "
+                     "for a Gel Manicure. Which time works best for you?")
+
+
+def run(sessions: int = 10000, turns: int = 40) -> dict:
+    """
+    Fill ConversationMemory with simulated chat sessions and measure it.
+
+    Args:
+        sessions: Number of concurrent sessions
+        turns: User/assistant turn pairs per session
+
+    Returns:
+        Dict with memory and timing results
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    memory = ConversationMemory()
+    started = time.perf_counter()
+    for turn in range(turns):
+        for session in range(sessions):
+            session_id = f"session-{session}"
+            # Distinct strings per turn, as real messages would be
+            memory.add_turn(session_id, "user", f"{USER_MESSAGE} ({turn})")
+            memory.add_turn(session_id, "assistant", f"{ASSISTANT_MESSAGE} ({turn})")
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = memory.stats()
+    used = current - baseline
+    return {
+        "sessions": stats["sessions"],
+        "turns_retained": stats["turns"],
+        "turns_added": sessions * turns * 2,
+        "memory_bytes": used,
+        "peak_bytes": peak - baseline,
+        "bytes_per_session": used / max(stats["sessions"], 1),
+        "add_turn_us": elapsed / (sessions * turns * 2) * 1e6,
+    }
+
+
+def main():
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+
+    result = run(args.sessions, args.turns)
+    print(f"Sessions:          {result['sessions']}")
+    print(f"Turns added:       {result['turns_added']}")
+    print(f"Turns retained:    {result['turns_retained']}")
+    print(f"Memory in use:     {result['memory_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"Peak memory:       {result['peak_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"Per session:       {result['bytes_per_session'] / 1024:.1f} KiB")
+    print(f"add_turn latency:  {result['add_turn_us']:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
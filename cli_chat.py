@@ -5,8 +5,8 @@ import asyncio
 import logging
 import os
 import sys
-from datetime import datetime
-from typing import Dict, Any, Optional
+import uuid
+from typing import Dict, Any, List, Optional
 
 # Set up logging configuration
 logging.basicConfig(
@@ -19,6 +19,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 # Import agent after path setup
 from src.agent import Agent
+from src.chat.memory import ConversationMemory
 
 class ChatSession:
     """Interactive CLI chat session with NailAide."""
@@ -26,7 +27,8 @@ class ChatSession:
     def __init__(self):
         """Initialize the chat session."""
         self.agent = Agent()
-        self.conversation_history = []
+        self.session_id = str(uuid.uuid4())
+        self.memory = ConversationMemory()
         self.customer_info = {
             "name": "",
             "email": "",
@@ -83,24 +85,21 @@ class ChatSession:
         }
         
         # Add message to history
-        self.conversation_history.append({
-            "role": "user",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.memory.add_turn(self.session_id, "user", message)
         
         # Process the request
         response = await self.agent.process_request(request_data, channel="cli")
         
         # Add response to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response.get("message", ""),
-            "timestamp": datetime.now().isoformat()
-        })
+        self.memory.add_turn(self.session_id, "assistant", response.get("message", ""))
         
         return response
     
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Recent turns of this session (older turns are summarized)."""
+        return self.memory.history(self.session_id)
+    
     def display_response(self, response: Dict[str, Any]):
         """Display the agent's response."""
         print(f"\nNailAide: {response.get('message', 'No response')}")
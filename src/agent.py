@@ -2,54 +2,152 @@
 Nail salon booking agent that handles conversation flow with customers.
 """
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Generator, Optional, Tuple
 import re
 import json
 
 from src.api_client import NailSalonAPI
+from src.slots import Slot
+from src.storage.appointment_store import AppointmentStore
+from src.storage.reservations import (
+    SlotUnavailableError, assign_claim, claim_slot, filter_available, rollback_claim
+)
+from src.utils.tracing import span
+
+# An upstream call requested by the conversation flow: (NailSalonAPI method name, args)
+ApiCall = Tuple[str, Tuple[Any, ...]]
+
+
+class Conversation:
+    """One customer's progress through the conversation flow."""
+
+    __slots__ = ("state", "context")
+
+    def __init__(self):
+        # Flow stage per intent, e.g. {"book": {"stage": "slot_selection", ...}}
+        self.state: Dict[str, Any] = {}
+        # Options last shown to the customer (services, slots)
+        self.context: Dict[str, Any] = {}
+
 
 class BookingAgent:
     """Agent for handling nail salon booking conversations."""
     
-    def __init__(self, use_mock_api: bool = True):
+    def __init__(self, use_mock_api: bool = True, store: Optional[AppointmentStore] = None,
+                 reservations: Optional[Any] = None):
         """
         Initialize the booking agent.
         
         Args:
             use_mock_api: Whether to use mock API responses
+            store: Local appointment store to book against instead of the API
+            reservations: Slot reservations shared with the other booking
+                paths; when set, chosen slots are held and claimed there
         """
-        self.api = NailSalonAPI(use_mock=use_mock_api)
-        self.conversation_state = {}
-        self.current_context = {}
+        self.reservations = reservations
+        self.api = NailSalonAPI(use_mock=use_mock_api, store=store, reservations=reservations)
+        # Used when a caller serves a single customer and passes no conversation
+        self.conversation = Conversation()
+    
+    @property
+    def conversation_state(self) -> Dict[str, Any]:
+        """Flow state of the default conversation."""
+        return self.conversation.state
+    
+    @property
+    def current_context(self) -> Dict[str, Any]:
+        """Options last shown in the default conversation."""
+        return self.conversation.context
     
-    def process_message(self, message: str) -> str:
+    def process_message(self, message: str, conversation: Optional[Conversation] = None) -> str:
         """
         Process an incoming message and return a response.
         
         Args:
             message: The message from the user
+            conversation: The customer's conversation (defaults to the agent's own,
+                for callers that serve a single customer)
             
         Returns:
             Response to the user
         """
+        flow = self._respond(message, conversation or self.conversation)
+        try:
+            call = next(flow)
+            while True:
+                name, args = call
+                try:
+                    result = getattr(self.api, name)(*args)
+                except Exception as e:
+                    call = flow.throw(e)
+                else:
+                    call = flow.send(result)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            # Exit the flow's spans here rather than wherever it gets collected
+            flow.close()
+    
+    async def process_message_async(self, message: str,
+                                    conversation: Optional[Conversation] = None) -> str:
+        """
+        Process an incoming message without blocking the event loop.
+        
+        Runs the same conversation flow as process_message, awaiting the
+        API client's async methods for every upstream call. Pass each
+        customer's own conversation: flows for different customers interleave
+        at every await.
+        
+        Args:
+            message: The message from the user
+            conversation: The customer's conversation (defaults to the agent's own)
+            
+        Returns:
+            Response to the user
+        """
+        flow = self._respond(message, conversation or self.conversation)
+        try:
+            call = next(flow)
+            while True:
+                name, args = call
+                try:
+                    result = await getattr(self.api, f"{name}_async")(*args)
+                except Exception as e:
+                    call = flow.throw(e)
+                else:
+                    call = flow.send(result)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            # Exit the flow's spans here rather than wherever it gets collected
+            flow.close()
+    
+    def _respond(self, message: str, conversation: Conversation) -> Generator[ApiCall, Any, str]:
+        """
+        Conversation flow for one message.
+        
+        Yields (api_method_name, args) for each upstream call and receives
+        the result; the drivers above perform the I/O. Returns the reply.
+        """
         # Check for intent
-        intent = self._determine_intent(message)
+        intent = self._determine_intent(message, conversation)
         
-        # Handle based on intent
-        if intent == "greeting":
-            return self._handle_greeting()
-        elif intent == "book_appointment":
-            return self._handle_booking_flow(message)
-        elif intent == "check_appointment":
-            return self._handle_appointment_check(message)
-        elif intent == "cancel_appointment":
-            return self._handle_appointment_cancellation(message)
-        elif intent == "list_services":
-            return self._handle_list_services()
-        else:
-            return "I'm here to help you book nail services. Would you like to schedule an appointment, check an existing appointment, or learn about our services?"
+        # Handle based on intent; upstream calls nest under this span
+        with span("agent.intent", intent=intent):
+            if intent == "greeting":
+                return self._handle_greeting()
+            elif intent == "book_appointment":
+                return (yield from self._handle_booking_flow(message, conversation))
+            elif intent == "check_appointment":
+                return (yield from self._handle_appointment_check(message, conversation))
+            elif intent == "cancel_appointment":
+                return (yield from self._handle_appointment_cancellation(message, conversation))
+            elif intent == "list_services":
+                return (yield from self._handle_list_services())
+            else:
+                return "I'm here to help you book nail services. Would you like to schedule an appointment, check an existing appointment, or learn about our services?"
     
-    def _determine_intent(self, message: str) -> str:
+    def _determine_intent(self, message: str, conversation: Conversation) -> str:
         """Determine the intent of the message."""
         message = message.lower()
         
@@ -64,11 +162,11 @@ class BookingAgent:
         # Expanded service-related keywords
         elif any(word in message for word in ["service", "services", "offer", "provide", "available", "what can you do"]):
             return "list_services"
-        elif "book" in self.conversation_state:
+        elif "book" in conversation.state:
             return "book_appointment"
-        elif "check" in self.conversation_state:
+        elif "check" in conversation.state:
             return "check_appointment"
-        elif "cancel" in self.conversation_state:
+        elif "cancel" in conversation.state:
             return "cancel_appointment"
         else:
             return "unknown"
@@ -79,22 +177,22 @@ class BookingAgent:
                 "check your existing appointment, or provide information about our services. "
                 "What would you like to do today?")
     
-    def _handle_booking_flow(self, message: str) -> str:
+    def _handle_booking_flow(self, message: str, conversation: Conversation) -> Generator[ApiCall, Any, str]:
         """Handle the booking flow based on current state."""
         # Initialize booking state if needed
-        if "book" not in self.conversation_state:
-            self.conversation_state["book"] = {"stage": "service_selection"}
-            services = self.api.get_services()
+        if "book" not in conversation.state:
+            conversation.state["book"] = {"stage": "service_selection"}
+            services = yield ("get_services", ())
             service_list = "\n".join([f"{i+1}. {s['name']} - ${s['price']} ({s['duration']} minutes)" 
                                      for i, s in enumerate(services)])
-            self.current_context["services"] = services
+            conversation.context["services"] = services
             return f"Great! I'd be happy to help you book an appointment. Here are our services:\n\n{service_list}\n\nWhich service would you like to book?"
         
-        booking_state = self.conversation_state["book"]
+        booking_state = conversation.state["book"]
         
         # Handle service selection
         if booking_state["stage"] == "service_selection":
-            selected_service = self._extract_service_selection(message)
+            selected_service = self._extract_service_selection(message, conversation)
             if selected_service:
                 booking_state["service"] = selected_service
                 booking_state["stage"] = "date_selection"
@@ -110,12 +208,14 @@ class BookingAgent:
                 booking_state["stage"] = "slot_selection"
                 
                 # Get available slots
-                slots = self.api.get_available_slots(booking_state["service"]["id"], date)
+                slots = yield ("get_available_slots", (booking_state["service"]["id"], date))
+                if self.reservations is not None:
+                    slots = filter_available(self.reservations, slots)
                 if not slots:
                     return f"I'm sorry, there are no available slots for {booking_state['service']['name']} on {date.strftime('%A, %B %d')}. Would you like to try a different day?"
                 
-                self.current_context["slots"] = slots
-                slot_list = "\n".join([f"{i+1}. {self._format_time(s['start_time'])}" for i, s in enumerate(slots[:8])])
+                conversation.context["slots"] = slots
+                slot_list = "\n".join([f"{i+1}. {self._format_time(s.starts_at)}" for i, s in enumerate(slots[:8])])
                 
                 return f"Here are available times for {booking_state['service']['name']} on {date.strftime('%A, %B %d')}:\n\n{slot_list}\n\nWhich time works for you?"
             else:
@@ -123,8 +223,13 @@ class BookingAgent:
         
         # Handle slot selection
         elif booking_state["stage"] == "slot_selection":
-            slot = self._extract_slot_selection(message)
+            slot = self._extract_slot_selection(message, conversation)
             if slot:
+                if self.reservations is not None:
+                    hold = self.reservations.hold(slot.id, token=booking_state.get("hold_token"))
+                    if hold is None:
+                        return "Sorry, that time was just taken. Please choose another time."
+                    booking_state["hold_token"] = hold.token
                 booking_state["slot"] = slot
                 booking_state["stage"] = "customer_details"
                 return "Great! I just need a few details to complete your booking. What's your name?"
@@ -148,66 +253,84 @@ class BookingAgent:
                     "email": booking_state["customer_email"]
                 }
                 
+                slot = booking_state["slot"]
+                token = None
+                if self.reservations is not None:
+                    try:
+                        token = claim_slot(self.reservations, slot.id, booking_state.get("hold_token"))
+                    except SlotUnavailableError:
+                        # Keep the service and date; the customer picks another time
+                        for key in ("slot", "hold_token", "customer_name", "customer_phone", "customer_email"):
+                            booking_state.pop(key, None)
+                        booking_state["stage"] = "slot_selection"
+                        return (f"I'm sorry, {self._format_time(slot.starts_at)} was just taken. "
+                                "Please choose another time.")
+                
                 try:
-                    appointment = self.api.book_appointment(
+                    appointment = yield ("book_appointment", (
                         booking_state["service"]["id"],
-                        booking_state["slot"]["id"],
+                        slot.id,
                         customer_details
-                    )
+                    ))
+                    if token is not None:
+                        assign_claim(self.reservations, slot.id, token, appointment["appointment_id"])
                     
                     # Reset conversation state
-                    self.conversation_state = {}
+                    conversation.state = {}
                     
                     return (f"Great! Your appointment for {booking_state['service']['name']} on "
                             f"{datetime.fromisoformat(appointment['start_time'].replace('Z', '+00:00')).strftime('%A, %B %d at %I:%M %p')} "
                             f"is confirmed. Your appointment ID is {appointment['appointment_id']}. "
                             f"We'll see you then!")
                 except Exception as e:
+                    if token is not None:
+                        rollback_claim(self.reservations, slot.id, token)
                     return f"I'm sorry, there was an error booking your appointment: {str(e)}. Please try again."
     
-    def _handle_appointment_check(self, message: str) -> str:
+    def _handle_appointment_check(self, message: str, conversation: Conversation) -> Generator[ApiCall, Any, str]:
         """Handle checking appointment status."""
         appointment_id = self._extract_appointment_id(message)
         
         if appointment_id:
             try:
-                appointment = self.api.get_appointment(appointment_id)
+                appointment = yield ("get_appointment", (appointment_id,))
                 return (f"Your appointment for {appointment['service_name']} on "
                         f"{datetime.fromisoformat(appointment['start_time'].replace('Z', '+00:00')).strftime('%A, %B %d at %I:%M %p')} "
                         f"is {appointment['status']}.")
             except Exception:
                 return f"I couldn't find an appointment with ID {appointment_id}. Please check the ID and try again."
         else:
-            self.conversation_state["check"] = {"stage": "waiting_for_id"}
+            conversation.state["check"] = {"stage": "waiting_for_id"}
             return "I'd be happy to check your appointment. Could you please provide your appointment ID?"
     
-    def _handle_appointment_cancellation(self, message: str) -> str:
+    def _handle_appointment_cancellation(self, message: str,
+                                         conversation: Conversation) -> Generator[ApiCall, Any, str]:
         """Handle cancelling an appointment."""
         appointment_id = self._extract_appointment_id(message)
         
         if appointment_id:
             try:
-                result = self.api.cancel_appointment(appointment_id)
+                result = yield ("cancel_appointment", (appointment_id,))
                 return f"Your appointment {appointment_id} has been {result['status']}. {result.get('message', '')}"
             except Exception:
                 return f"I couldn't cancel appointment {appointment_id}. Please check the ID and try again."
         else:
-            self.conversation_state["cancel"] = {"stage": "waiting_for_id"}
+            conversation.state["cancel"] = {"stage": "waiting_for_id"}
             return "I'd be happy to cancel your appointment. Could you please provide your appointment ID?"
     
-    def _handle_list_services(self) -> str:
+    def _handle_list_services(self) -> Generator[ApiCall, Any, str]:
         """Handle listing available services."""
-        services = self.api.get_services()
+        services = yield ("get_services", ())
         service_list = "\n".join([f"{s['name']} - ${s['price']} ({s['duration']} minutes): {s['description']}" 
                                  for s in services])
         return f"Here are the services we offer:\n\n{service_list}\n\nWould you like to book an appointment?"
     
-    def _extract_service_selection(self, message: str) -> Optional[Dict[str, Any]]:
+    def _extract_service_selection(self, message: str, conversation: Conversation) -> Optional[Dict[str, Any]]:
         """Extract service selection from message."""
-        if "services" not in self.current_context:
+        if "services" not in conversation.context:
             return None
             
-        services = self.current_context["services"]
+        services = conversation.context["services"]
         
         # Check for number selection
         number_match = re.search(r'\b(\d+)\b', message)
@@ -250,12 +373,12 @@ class BookingAgent:
                 
         return None
     
-    def _extract_slot_selection(self, message: str) -> Optional[Dict[str, Any]]:
+    def _extract_slot_selection(self, message: str, conversation: Conversation) -> Optional[Slot]:
         """Extract time slot selection from message."""
-        if "slots" not in self.current_context:
+        if "slots" not in conversation.context:
             return None
             
-        slots = self.current_context["slots"]
+        slots = conversation.context["slots"]
         
         # Check for number selection
         number_match = re.search(r'\b(\d+)\b', message)
@@ -275,20 +398,18 @@ class BookingAgent:
                 hour += 12
             
             for slot in slots:
-                slot_time = datetime.fromisoformat(slot["start_time"].replace('Z', '+00:00'))
-                if slot_time.hour == hour and slot_time.minute == minute:
+                if slot.starts_at.hour == hour and slot.starts_at.minute == minute:
                     return slot
                     
         return None
     
     def _extract_appointment_id(self, message: str) -> Optional[str]:
         """Extract appointment ID from message."""
-        id_match = re.search(r'(appt-[a-z0-9-]+)', message, re.IGNORECASE)
+        id_match = re.search(r'(appt-[\w-]+)', message, re.IGNORECASE)
         if id_match:
             return id_match.group(1)
         return None
     
-    def _format_time(self, time_str: str) -> str:
-        """Format a time string for display."""
-        dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+    def _format_time(self, dt: datetime) -> str:
+        """Format a time for display."""
         return dt.strftime("%I:%M %p")
\ No newline at end of file
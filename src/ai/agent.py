@@ -7,9 +7,11 @@ import json
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
+from src.analytics import AppointmentAnalytics, format_report, rows_from_dicts
 from src.config import Config
 from src.google_services.calendar import GoogleCalendar
 from src.google_services.gmail import GmailService
+from src.google_services.pool import get_pool
 from src.integrations.booksy import BooksyAPI
 from src.services.notification import NotificationService
 from src.services.voice_service import VoiceService
@@ -38,6 +40,9 @@ class AIAgent:
         # Track active conversations
         self.active_conversations = {}
         
+        # Built on first report (needs the service catalog)
+        self.analytics: Optional[AppointmentAnalytics] = None
+        
         logger.info("AI Agent initialized successfully")
         
     def process_email(self, email_id: str) -> bool:
@@ -53,7 +58,7 @@ class AIAgent:
         try:
             # Get email details
             service = self.gmail._get_service()
-            email = service.users().messages().get(userId='me', id=email_id, format='full').execute()
+            email = get_pool().execute(service.users().messages().get(userId='me', id=email_id, format='full'))
             
             # Extract headers
             headers = {}
@@ -64,7 +69,7 @@ class AIAgent:
             sender = headers.get('from', '')
             subject = headers.get('subject', '')
             
-            logger.info(f"Processing email from {sender} with subject: {subject}")
+            logger.info("Processing email from %s with subject: %s", sender, subject)
             
             # Get email content
             plain_text, html_text = self.gmail.get_email_content(email)
@@ -88,7 +93,7 @@ class AIAgent:
             return True
             
         except Exception as e:
-            logger.error(f"Error processing email: {str(e)}")
+            logger.error("Error processing email: %s", e)
             return False
             
     def _analyze_email_intent(self, content: str, subject: str) -> Tuple[str, Dict[str, Any]]:
@@ -150,7 +155,7 @@ class AIAgent:
             elif "price" in combined_text or "cost" in combined_text:
                 extracted_data["info_type"] = "pricing"
                 
-        logger.info(f"Analyzed intent: {intent} with data: {extracted_data}")
+        logger.info("Analyzed intent: %s with data: %s", intent, extracted_data)
         return intent, extracted_data
         
     def _handle_email_by_intent(self, intent: str, data: Dict[str, Any], 
@@ -230,11 +235,11 @@ class AIAgent:
                 reply_body=response_body
             )
             
-            logger.info(f"Sent email response for intent: {intent}")
+            logger.info("Sent email response for intent: %s", intent)
             return True
             
         except Exception as e:
-            logger.error(f"Error sending email response: {str(e)}")
+            logger.error("Error sending email response: %s", e)
             return False
             
     def _generate_booking_response(self, data: Dict[str, Any]) -> str:
@@ -266,9 +271,9 @@ class AIAgent:
                                 slot_time = datetime.fromisoformat(slot['start_time'].replace('Z', '+00:00'))
                                 available_slots.append(slot_time.strftime('%I:%M %p'))
                 except Exception as e:
-                    logger.error(f"Error parsing date: {str(e)}")
+                    logger.error("Error parsing date: %s", e)
         except Exception as e:
-            logger.error(f"Error getting Booksy data: {str(e)}")
+            logger.error("Error getting Booksy data: %s", e)
         
         # If we couldn't get real data, provide some generic options
         if not services_list:
@@ -391,7 +396,7 @@ class AIAgent:
         twiml = self.voice.handle_incoming_call_twiml()
         
         # Log and notify about the call
-        logger.info(f"Handling incoming call from {caller_number}")
+        logger.info("Handling incoming call from %s", caller_number)
         self.notification.send_system_alert(
             alert_type="Incoming Call",
             details=f"From: {caller_number}\nTime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
@@ -476,7 +481,7 @@ class AIAgent:
             response.append(gather)
             
         # Log the selection
-        logger.info(f"Call menu selection {digit_pressed} from {caller_number}")
+        logger.info("Call menu selection %s from %s", digit_pressed, caller_number)
         
         return str(response)
         
@@ -497,11 +502,11 @@ class AIAgent:
                 if success:
                     processed_count += 1
                     
-            logger.info(f"Processed {processed_count} unread emails")
+            logger.info("Processed %d unread emails", processed_count)
             return processed_count
             
         except Exception as e:
-            logger.error(f"Error checking unread emails: {str(e)}")
+            logger.error("Error checking unread emails: %s", e)
             return 0
             
     def generate_daily_report(self) -> None:
@@ -509,6 +514,29 @@ class AIAgent:
         try:
             # Get today's date
             today = datetime.now().strftime("%Y-%m-%d")
+            today_dt = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            
+            # Rollups for earlier days are kept between reports, so month-to-date
+            # only loads appointments for days not yet summarized
+            if self.analytics is None:
+                self.analytics = AppointmentAnalytics(
+                    loader=lambda start, end: rows_from_dicts(
+                        self.booksy.get_appointments(start, end - timedelta(days=1), raise_errors=True)
+                    ),
+                    services=self.booksy.get_services(raise_errors=True)
+                )
+            
+            daily = self.analytics.report(today_dt, today_dt + timedelta(days=1))
+            month = self.analytics.month_to_date(today_dt)
+            
+            body = "\n\n".join([
+                format_report(daily, title=f"Daily report for {today}"),
+                format_report(month, title="Month to date")
+            ])
+            self.gmail.send_email(self.admin_email, f"Daily Report - {today}", body)
+            
+            logger.info("Sent daily report for %s: %d appointments, $%.2f revenue",
+                        today, daily['appointments'], daily['revenue'])
             
-            # Get appointments for today from Booksy
-            today_dt = datetime.
\ No newline at end of file
+        except Exception as e:
+            logger.error("Error generating daily report: %s", e)
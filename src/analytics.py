@@ -0,0 +1,342 @@
+"""
+Columnar appointment analytics with incremental daily rollups.
+
+Appointments are loaded into NumPy arrays and reduced with ``np.bincount``
+into one fixed-layout vector per day: booked minutes per hour of day,
+revenue and bookings per service, cancellations and booking lead time.
+Finished days are cached, so a month-to-date report sums about thirty
+small vectors instead of rescanning appointments.
+"""
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.slots import EPOCH, parse_time
+
+logger = logging.getLogger(__name__)
+
+# Loader rows: (start_minute, end_minute, service_id, status, created_minute or None)
+Row = Tuple[int, int, Optional[str], Optional[str], Optional[int]]
+RowLoader = Callable[[datetime, datetime], Iterable[Row]]
+
+CANCELED_STATUSES = ("canceled", "cancelled")
+UNKNOWN_SERVICE = "Other"
+UNCATEGORIZED = "Uncategorized"
+
+# Booking lead time histogram: upper bucket edges in hours
+LEAD_EDGES_HOURS = (24, 72, 168, 336)
+LEAD_LABELS = ("<1d", "1-3d", "3-7d", "7-14d", "14d+")
+
+DayValue = Union[date, datetime]
+
+
+def _day_number(day: DayValue) -> int:
+    """Days since 1970-01-01 for a date or datetime."""
+    if isinstance(day, datetime):
+        day = day.date()
+    return (day - EPOCH.date()).days
+
+
+def _day_date(number: int) -> date:
+    """Calendar date for a day number."""
+    return EPOCH.date() + timedelta(days=number)
+
+
+def rows_from_dicts(appointments: Iterable[Dict[str, Any]]) -> List[Row]:
+    """
+    Convert appointment dictionaries from an API into loader rows.
+
+    Args:
+        appointments: Dicts with start_time and optionally end_time,
+            service_id, status and an ISO created_at
+
+    Returns:
+        Loader rows
+    """
+    rows = []
+    for appointment in appointments:
+        start = parse_time(appointment["start_time"])
+        end = parse_time(appointment["end_time"]) if appointment.get("end_time") else start + 60
+        created = appointment.get("created_at")
+        rows.append((
+            start,
+            end,
+            appointment.get("service_id"),
+            appointment.get("status"),
+            parse_time(created) if isinstance(created, str) else None,
+        ))
+    return rows
+
+
+class AppointmentAnalytics:
+    """
+    Utilization, revenue, cancellation and lead-time reports over any date range.
+
+    Appointments come from a loader returning compact rows for [start, end);
+    use ``for_store`` to read them from an AppointmentStore. Rollups for days
+    before today are computed once and cached; today and later days are
+    recomputed on each report because bookings can still change.
+    """
+
+    def __init__(self, loader: RowLoader, services: Optional[Sequence[Dict[str, Any]]] = None,
+                 open_hour: int = 9, close_hour: int = 17, stations: int = 1,
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Initialize the analytics engine.
+
+        Args:
+            loader: Callable(start, end) returning rows (see ``Row``); it must
+                raise when its source is unavailable, since returned rows are cached
+            services: Service catalog dicts with id, name, price and optional category
+            open_hour: First bookable hour of the day
+            close_hour: Hour the salon closes
+            stations: Appointments the salon can serve at once
+            clock: Returns the current time (used to decide which days are final)
+        """
+        self.loader = loader
+        self.open_hour = open_hour
+        self.close_hour = close_hour
+        self.stations = stations
+        self.clock = clock
+
+        services = list(services or [])
+        self.service_ids = [s["id"] for s in services]
+        self.service_names = [s.get("name", s["id"]) for s in services] + [UNKNOWN_SERVICE]
+        self._service_index = {service_id: i for i, service_id in enumerate(self.service_ids)}
+        self.prices = np.array([float(s.get("price") or 0) for s in services] + [0.0])
+
+        categories = [s.get("category") or UNCATEGORIZED for s in services] + [UNCATEGORIZED]
+        self.categories = list(dict.fromkeys(categories))
+        # One-hot service -> category matrix so category totals are a single matmul
+        self._category_matrix = np.zeros((len(categories), len(self.categories)))
+        self._category_matrix[np.arange(len(categories)), [self.categories.index(c) for c in categories]] = 1
+
+        # Layout of each day's rollup vector
+        n_services = len(self.service_names)
+        n_buckets = len(LEAD_LABELS)
+        self._slices = {}
+        offset = 0
+        for name, width in (("minutes", 24), ("revenue", n_services), ("bookings", n_services),
+                            ("cancellations", 1), ("lead_sum", 1), ("lead_count", 1), ("lead_hist", n_buckets)):
+            self._slices[name] = slice(offset, offset + width)
+            offset += width
+        self.width = offset
+
+        self._rollups: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_store(cls, store: Any, services: Optional[Sequence[Dict[str, Any]]] = None,
+                  **kwargs) -> "AppointmentAnalytics":
+        """Create an engine reading appointments from an AppointmentStore."""
+        return cls(store.analytics_rows, services, **kwargs)
+
+    def _columns(self, rows: Iterable[Row]) -> Dict[str, np.ndarray]:
+        """Load loader rows into typed column arrays."""
+        rows = list(rows)
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return {"start": empty, "end": empty, "service": empty,
+                    "canceled": np.zeros(0, dtype=bool), "created": empty}
+
+        starts, ends, service_ids, statuses, created = zip(*rows)
+        unknown = len(self.service_ids)
+        lookup = self._service_index
+        return {
+            "start": np.fromiter(starts, dtype=np.int64, count=len(rows)),
+            "end": np.fromiter(ends, dtype=np.int64, count=len(rows)),
+            "service": np.fromiter((lookup.get(s, unknown) for s in service_ids), dtype=np.int64, count=len(rows)),
+            "canceled": np.fromiter(((s or "").lower() in CANCELED_STATUSES for s in statuses),
+                                    dtype=bool, count=len(rows)),
+            "created": np.fromiter((-1 if c is None else c for c in created), dtype=np.int64, count=len(rows)),
+        }
+
+    def _compute(self, first_day: int, days: int, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Reduce appointment columns into one rollup vector per day.
+
+        Returns:
+            Array of shape (days, width)
+        """
+        n_services = len(self.service_names)
+        n_buckets = len(LEAD_LABELS)
+        start, end, service = columns["start"], columns["end"], columns["service"]
+        day = start // 1440 - first_day
+        keep = (day >= 0) & (day < days)
+        start, end, service, day = start[keep], end[keep], service[keep], day[keep]
+        canceled = columns["canceled"][keep]
+        created = columns["created"][keep]
+        active = ~canceled
+
+        out = np.zeros((days, self.width))
+
+        # Booked minutes per hour of day; an appointment spills into later hours of the same day
+        first_hour = start // 60
+        span = int(np.max((end - first_hour * 60 + 59) // 60, initial=0))
+        minutes = np.zeros(days * 24)
+        for k in range(span):
+            hour = first_hour + k
+            overlap = np.minimum(end, (hour + 1) * 60) - np.maximum(start, hour * 60)
+            valid = active & (overlap > 0) & (hour // 24 - first_day == day)
+            minutes += np.bincount(day[valid] * 24 + hour[valid] % 24, weights=overlap[valid],
+                                   minlength=days * 24)
+        out[:, self._slices["minutes"]] = minutes.reshape(days, 24)
+
+        cell = day * n_services + service
+        out[:, self._slices["revenue"]] = np.bincount(
+            cell, weights=self.prices[service] * active, minlength=days * n_services
+        ).reshape(days, n_services)
+        out[:, self._slices["bookings"]] = np.bincount(
+            cell, weights=active, minlength=days * n_services
+        ).reshape(days, n_services)
+        out[:, self._slices["cancellations"]] = np.bincount(day, weights=canceled, minlength=days)[:, None]
+
+        # Rows without a creation time (or created after the fact) have no lead time
+        has_lead = active & (created >= 0) & (created <= start)
+        lead_hours = (start - created) / 60.0
+        out[:, self._slices["lead_sum"]] = np.bincount(
+            day, weights=np.where(has_lead, lead_hours, 0.0), minlength=days
+        )[:, None]
+        out[:, self._slices["lead_count"]] = np.bincount(day, weights=has_lead, minlength=days)[:, None]
+        bucket = np.searchsorted(LEAD_EDGES_HOURS, lead_hours, side="right")
+        out[:, self._slices["lead_hist"]] = np.bincount(
+            day * n_buckets + bucket, weights=has_lead, minlength=days * n_buckets
+        ).reshape(days, n_buckets)
+        return out
+
+    def rollups(self, start: DayValue, end: DayValue) -> np.ndarray:
+        """
+        Get the rollup vectors for the days in [start, end).
+
+        Missing days are loaded with a single loader call covering them.
+        If the loader raises, the error propagates and nothing is cached.
+
+        Returns:
+            Array of shape (days, width)
+        """
+        first, last = _day_number(start), _day_number(end)
+        if last <= first:
+            return np.zeros((0, self.width))
+        today = _day_number(self.clock())
+
+        with self._lock:
+            missing = [d for d in range(first, last) if d not in self._rollups]
+        if missing:
+            lo, hi = missing[0], missing[-1] + 1
+            range_start = datetime.combine(_day_date(lo), datetime.min.time())
+            range_end = datetime.combine(_day_date(hi), datetime.min.time())
+            computed = self._compute(lo, hi - lo, self._columns(self.loader(range_start, range_end)))
+            fresh = {lo + i: computed[i] for i in range(hi - lo)}
+            with self._lock:
+                # Days that can still change are never cached
+                self._rollups.update((d, row) for d, row in fresh.items() if d < today)
+        else:
+            fresh = {}
+
+        with self._lock:
+            return np.stack([fresh[d] if d in fresh else self._rollups[d] for d in range(first, last)])
+
+    def invalidate(self, day: Optional[DayValue] = None) -> None:
+        """Drop one cached day (e.g. after a late edit), or all of them."""
+        with self._lock:
+            if day is None:
+                self._rollups.clear()
+            else:
+                self._rollups.pop(_day_number(day), None)
+
+    def report(self, start: DayValue, end: DayValue) -> Dict[str, Any]:
+        """
+        Build a report for the days in [start, end).
+
+        Args:
+            start: First day of the report
+            end: Day after the last day of the report
+
+        Returns:
+            Dict of totals, breakdowns by service, category and hour, and lead time
+        """
+        days = self.rollups(start, end)
+        totals = days.sum(axis=0)
+
+        def part(name: str) -> np.ndarray:
+            return totals[self._slices[name]]
+
+        revenue = part("revenue")
+        bookings = part("bookings")
+        cancellations = int(part("cancellations")[0])
+        appointments = int(bookings.sum())
+        lead_count = int(part("lead_count")[0])
+
+        capacity = len(days) * self.stations * 60
+        hours = range(self.open_hour, self.close_hour)
+        utilization = part("minutes")[list(hours)] / capacity if capacity else np.zeros(len(hours))
+
+        return {
+            "start": (start.date() if isinstance(start, datetime) else start).isoformat(),
+            "end": (end.date() if isinstance(end, datetime) else end).isoformat(),
+            "days": len(days),
+            "appointments": appointments,
+            "cancellations": cancellations,
+            "cancellation_rate": cancellations / (appointments + cancellations) if appointments + cancellations else 0.0,
+            "revenue": round(float(revenue.sum()), 2),
+            "revenue_by_service": {
+                name: round(float(value), 2) for name, value in zip(self.service_names, revenue) if value
+            },
+            "bookings_by_service": {
+                name: int(value) for name, value in zip(self.service_names, bookings) if value
+            },
+            "revenue_by_category": {
+                name: round(float(value), 2)
+                for name, value in zip(self.categories, revenue @ self._category_matrix) if value
+            },
+            "utilization_by_hour": {hour: round(float(value), 4) for hour, value in zip(hours, utilization)},
+            "lead_time_hours": {
+                "mean": round(float(part("lead_sum")[0]) / lead_count, 1) if lead_count else None,
+                "buckets": dict(zip(LEAD_LABELS, (int(v) for v in part("lead_hist")))),
+            },
+        }
+
+    def month_to_date(self, today: Optional[DayValue] = None) -> Dict[str, Any]:
+        """Build a report from the first of the month through today."""
+        today = today or self.clock()
+        if isinstance(today, datetime):
+            today = today.date()
+        return self.report(today.replace(day=1), today + timedelta(days=1))
+
+
+def format_report(report: Dict[str, Any], title: str = "Activity report") -> str:
+    """
+    Format a report as plain text for email.
+
+    Args:
+        report: Report from AppointmentAnalytics.report
+        title: Heading line
+
+    Returns:
+        The report text
+    """
+    lines = [
+        title,
+        f"{report['start']} to {report['end']} ({report['days']} days)",
+        "",
+        f"Appointments: {report['appointments']}",
+        f"Cancellations: {report['cancellations']} ({report['cancellation_rate']:.0%})",
+        f"Revenue: ${report['revenue']:.2f}",
+    ]
+    if report["revenue_by_service"]:
+        lines += ["", "Revenue by service:"]
+        lines += [f"  {name}: ${value:.2f} ({report['bookings_by_service'].get(name, 0)} bookings)"
+                  for name, value in report["revenue_by_service"].items()]
+    if report["revenue_by_category"]:
+        lines += ["", "Revenue by category:"]
+        lines += [f"  {name}: ${value:.2f}" for name, value in report["revenue_by_category"].items()]
+    lines += ["", "Utilization by hour:"]
+    lines += [f"  {hour:02d}:00  {value:.0%}" for hour, value in report["utilization_by_hour"].items()]
+    lead = report["lead_time_hours"]
+    if lead["mean"] is not None:
+        lines += ["", f"Average booking lead time: {lead['mean']:.1f} hours"]
+        lines += [f"  {label}: {count}" for label, count in lead["buckets"].items()]
+    return "\n".join(lines)
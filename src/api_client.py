@@ -1,30 +1,116 @@
 """
 API client for the nail salon booking system.
-Can work with both mock data and real API endpoints.
+Can work with mock data, a local appointment store, or real API endpoints.
 """
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 import os
 import requests
 
 from src.mocks import MockResponses
+from src.slots import Appointment, SlotSet, parse_time
+from src.storage.appointment_store import AppointmentStore
+from src.utils.blocking import BlockingPool, default_pool
+from src.utils.metrics import timed
+from src.utils.tracing import span
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 class NailSalonAPI:
     """Client for nail salon booking API."""
     
-    def __init__(self, use_mock: bool = False, api_base_url: Optional[str] = None):
+    def __init__(self, use_mock: bool = False, api_base_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None,
+                 blocking_pool: Optional[BlockingPool] = None,
+                 store: Optional[AppointmentStore] = None,
+                 reservations: Optional[Any] = None):
         """
         Initialize the API client.
         
         Args:
             use_mock: If True, use mock responses instead of real API calls
             api_base_url: Base URL for the API (only used when use_mock is False)
+            session: HTTP session to reuse (keeps connections to the API alive)
+            blocking_pool: Pool for the async methods when httpx is not installed
+            store: Local appointment store; when set, appointments are booked,
+                looked up and canceled locally instead of through the API
+            reservations: Slot reservations; a canceled appointment's slot is
+                freed there so it can be booked again
         """
         self.use_mock = use_mock
         self.api_base_url = api_base_url or os.getenv("NAIL_SALON_API_URL", "https://api.nailsalon.example")
+        self.session = session or requests.Session()
+        self.blocking_pool = blocking_pool
+        self.store = store
+        self.reservations = reservations
+        self.slot_filters: List[Callable[[SlotSet], SlotSet]] = []
+        self._async_client = None
+    
+    def add_slot_filter(self, slot_filter: Callable[[SlotSet], SlotSet]) -> None:
+        """
+        Narrow available slots with an extra source, e.g. staff calendars.
+        
+        Args:
+            slot_filter: Callable taking and returning a SlotSet (such as
+                GoogleCalendar.slot_filter or CalendarMirror.filter_slots)
+        """
+        self.slot_filters.append(slot_filter)
+    
+    def _filter_slots(self, slots: SlotSet) -> SlotSet:
+        """Apply the registered slot filters in order."""
+        for slot_filter in self.slot_filters:
+            slots = slot_filter(slots)
+        return slots
+    
+    @property
+    def in_process(self) -> bool:
+        """True when requests are answered locally (mock data or the store)."""
+        return self.use_mock or self.store is not None
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections, including the async client's."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    async def _request_async(self, method: str, path: str, **kwargs) -> Any:
+        """
+        Make an API request without blocking the event loop.
         
+        Uses a shared httpx.AsyncClient; without httpx the blocking session
+        call runs in the bounded thread pool instead.
+        """
+        if httpx is None:
+            pool = self.blocking_pool or default_pool()
+            return await pool.run("salon_api", self._request, method, path, **kwargs)
+        
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.api_base_url)
+        with span(f"HTTP {method}", path=path) as http_span:
+            response = await self._async_client.request(method, path, **kwargs)
+            http_span.set("status", response.status_code)
+        response.raise_for_status()
+        return response.json()
+    
+    def _request(self, method: str, path: str, **kwargs) -> Any:
+        """Make a blocking API request with the pooled session."""
+        with span(f"HTTP {method}", path=path) as http_span:
+            response = self.session.request(method, f"{self.api_base_url}{path}", **kwargs)
+            http_span.set("status", response.status_code)
+        response.raise_for_status()
+        return response.json()
+        
+    @timed("salon_api")
     def get_available_slots(self, service_id: Optional[str] = None, 
-                          start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                          start_date: Optional[datetime] = None) -> SlotSet:
         """
         Get available appointment slots.
         
@@ -33,8 +119,14 @@ class NailSalonAPI:
             start_date: Optional start date to search from
             
         Returns:
-            List of available appointment slots
+            Available appointment slots
         """
+        return self._filter_slots(self._fetch_slots(service_id, start_date))
+    
+    def _fetch_slots(self, service_id: Optional[str], start_date: Optional[datetime]) -> SlotSet:
+        """Get slots from the store, mocks or API, before slot filters."""
+        if self.store is not None:
+            return self._available_local(service_id, start_date)
         if self.use_mock:
             return MockResponses.available_slots(service_id, start_date)
             
@@ -44,10 +136,9 @@ class NailSalonAPI:
         if start_date:
             params["start_date"] = start_date.strftime("%Y-%m-%d")
             
-        response = requests.get(f"{self.api_base_url}/slots", params=params)
-        response.raise_for_status()
-        return response.json()
+        return SlotSet.from_dicts(self._request("GET", "/slots", params=params), service_id)
     
+    @timed("salon_api")
     def get_services(self) -> List[Dict[str, Any]]:
         """
         Get available services.
@@ -55,13 +146,12 @@ class NailSalonAPI:
         Returns:
             List of service details
         """
-        if self.use_mock:
+        if self.in_process:
             return MockResponses.services()
             
-        response = requests.get(f"{self.api_base_url}/services")
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", "/services")
     
+    @timed("salon_api")
     def book_appointment(self, service_id: str, slot_id: str, 
                        customer_details: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -75,18 +165,17 @@ class NailSalonAPI:
         Returns:
             Details of the booked appointment
         """
-        if self.use_mock:
-            return MockResponses.book_appointment(service_id, slot_id, customer_details)
+        if self.in_process:
+            return self._book_in_process(service_id, slot_id, customer_details)
             
         payload = {
             "service_id": service_id,
             "slot_id": slot_id,
             "customer_details": customer_details
         }
-        response = requests.post(f"{self.api_base_url}/appointments", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", "/appointments", json=payload)
     
+    @timed("salon_api")
     def get_appointment(self, appointment_id: str) -> Dict[str, Any]:
         """
         Get details of an appointment.
@@ -97,13 +186,12 @@ class NailSalonAPI:
         Returns:
             Appointment details
         """
-        if self.use_mock:
-            return MockResponses.get_appointment(appointment_id)
+        if self.in_process:
+            return self._get_in_process(appointment_id)
             
-        response = requests.get(f"{self.api_base_url}/appointments/{appointment_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", f"/appointments/{appointment_id}")
     
+    @timed("salon_api")
     def cancel_appointment(self, appointment_id: str) -> Dict[str, Any]:
         """
         Cancel an appointment.
@@ -114,9 +202,139 @@ class NailSalonAPI:
         Returns:
             Confirmation of cancellation
         """
-        if self.use_mock:
-            return MockResponses.cancel_appointment(appointment_id)
-            
-        response = requests.delete(f"{self.api_base_url}/appointments/{appointment_id}")
-        response.raise_for_status()
-        return response.json()
+        if self.in_process:
+            return self._cancel_in_process(appointment_id)
+        result = self._request("DELETE", f"/appointments/{appointment_id}")
+        if result.get("status") == "canceled":
+            self._free_slot(appointment_id)
+        return result
+    
+    # Shared by the sync and async methods, so each call is timed only once
+    
+    def _book_in_process(self, service_id: str, slot_id: str,
+                         customer_details: Dict[str, str]) -> Dict[str, Any]:
+        """Book an appointment in the store or the mocks."""
+        if self.store is not None:
+            return self._book_local(service_id, slot_id, customer_details)
+        return MockResponses.book_appointment(service_id, slot_id, customer_details)
+    
+    def _get_in_process(self, appointment_id: str) -> Dict[str, Any]:
+        """Look an appointment up in the store or the mocks."""
+        if self.store is None:
+            return MockResponses.get_appointment(appointment_id)
+        appointment = self.store.get(appointment_id)
+        if appointment is None:
+            raise KeyError(f"Appointment {appointment_id} not found")
+        return appointment
+    
+    def _cancel_in_process(self, appointment_id: str) -> Dict[str, Any]:
+        """Cancel an appointment in the store or the mocks."""
+        if self.store is not None:
+            return self._cancel_local(appointment_id)
+        result = MockResponses.cancel_appointment(appointment_id)
+        if result.get("status") == "canceled":
+            self._free_slot(appointment_id)
+        return result
+    
+    def _cancel_local(self, appointment_id: str) -> Dict[str, Any]:
+        """Cancel an appointment in the local store, freeing its slot only on the first cancel."""
+        if self.store.set_status(appointment_id, "canceled", expected="confirmed") is None:
+            appointment = self.store.get(appointment_id)
+            if appointment is None:
+                raise KeyError(f"Appointment {appointment_id} not found")
+            return {
+                "appointment_id": appointment_id,
+                "status": appointment["status"],
+                "message": f"Appointment is already {appointment['status']}"
+            }
+        self._free_slot(appointment_id)
+        return {
+            "appointment_id": appointment_id,
+            "status": "canceled",
+            "message": "Appointment successfully canceled"
+        }
+    
+    def _free_slot(self, appointment_id: str) -> None:
+        """Drop a canceled appointment's reservation so its slot is offered again."""
+        # Reservations are owned by appointment ID, so a repeated cancel can't free a rebooked slot
+        if self.reservations is not None:
+            self.reservations.cancel(appointment_id)
+    
+    def _available_local(self, service_id: Optional[str],
+                         start_date: Optional[datetime]) -> SlotSet:
+        """Generate the week's slots and drop those already booked in the store."""
+        slots = MockResponses.available_slots(service_id, start_date)
+        if not slots:
+            return slots
+        
+        # One indexed range scan covers every generated slot
+        first, last = slots[0], slots[-1]
+        booked = self.store.between(first.starts_at, last.ends_at, status="confirmed")
+        return slots.without(parse_time(appointment["start_time"]) for appointment in booked)
+    
+    def _book_local(self, service_id: str, slot_id: str,
+                    customer_details: Dict[str, str]) -> Dict[str, Any]:
+        """Book an appointment in the local store."""
+        service_name = next(
+            (s["name"] for s in MockResponses.services() if s["id"] == service_id), "Unknown Service"
+        )
+        appointment = Appointment.for_slot(service_id, slot_id, customer_details, service_name)
+        return self.store.add(appointment.to_dict())
+    
+    @timed("salon_api")
+    async def get_available_slots_async(self, service_id: Optional[str] = None,
+                                        start_date: Optional[datetime] = None) -> SlotSet:
+        """Async version of get_available_slots."""
+        if self.in_process:
+            slots = self._fetch_slots(service_id, start_date)
+        else:
+            params = {}
+            if service_id:
+                params["service_id"] = service_id
+            if start_date:
+                params["start_date"] = start_date.strftime("%Y-%m-%d")
+            slots = SlotSet.from_dicts(await self._request_async("GET", "/slots", params=params), service_id)
+        
+        if self.slot_filters:
+            # Filters may call other services (e.g. FreeBusy); keep them off the event loop
+            pool = self.blocking_pool or default_pool()
+            slots = await pool.run("slot_filters", self._filter_slots, slots)
+        return slots
+    
+    @timed("salon_api")
+    async def get_services_async(self) -> List[Dict[str, Any]]:
+        """Async version of get_services."""
+        if self.in_process:
+            return MockResponses.services()
+        return await self._request_async("GET", "/services")
+    
+    @timed("salon_api")
+    async def book_appointment_async(self, service_id: str, slot_id: str,
+                                     customer_details: Dict[str, str]) -> Dict[str, Any]:
+        """Async version of book_appointment."""
+        if self.in_process:
+            return self._book_in_process(service_id, slot_id, customer_details)
+        
+        payload = {
+            "service_id": service_id,
+            "slot_id": slot_id,
+            "customer_details": customer_details
+        }
+        return await self._request_async("POST", "/appointments", json=payload)
+    
+    @timed("salon_api")
+    async def get_appointment_async(self, appointment_id: str) -> Dict[str, Any]:
+        """Async version of get_appointment."""
+        if self.in_process:
+            return self._get_in_process(appointment_id)
+        return await self._request_async("GET", f"/appointments/{appointment_id}")
+    
+    @timed("salon_api")
+    async def cancel_appointment_async(self, appointment_id: str) -> Dict[str, Any]:
+        """Async version of cancel_appointment."""
+        if self.in_process:
+            return self._cancel_in_process(appointment_id)
+        result = await self._request_async("DELETE", f"/appointments/{appointment_id}")
+        if result.get("status") == "canceled":
+            self._free_slot(appointment_id)
+        return result
@@ -0,0 +1,333 @@
+"""
+Session-keyed pub/sub bus for delivering chat messages across workers.
+
+With several uvicorn workers a session's WebSocket may live in a different
+process than the request that produced a message for it. Every worker
+subscribes the sessions it holds sockets for; publishing delivers to local
+subscribers directly and forwards to other workers through the backend.
+
+Usage:
+    python -m src.chat.bus --path /tmp/delanenails-bus.sock   # standalone broker
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Environment variable selecting the Unix-socket backend
+BUS_SOCKET_ENV = "CHAT_BUS_SOCKET"
+
+
+class InProcessBackend:
+    """Backend for a single process; there are no other workers to forward to."""
+
+    async def start(self, deliver: Callable[[str, Dict[str, Any]], Awaitable[None]]) -> None:
+        pass
+
+    def subscribe(self, session_id: str) -> None:
+        pass
+
+    def unsubscribe(self, session_id: str) -> None:
+        pass
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class BusBroker:
+    """
+    Routes published messages between workers over a Unix domain socket.
+
+    Frames are newline-delimited JSON. Clients send ``sub``/``unsub``/``pub``
+    operations; the broker forwards each ``pub`` to every other client
+    subscribed to that session.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Bind the broker socket, replacing a stale socket file."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        logger.info("Chat bus broker listening on %s", self.path)
+
+    async def serve_forever(self) -> None:
+        """Run the broker until cancelled."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting clients and remove the socket file."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Process frames from one worker until it disconnects."""
+        sessions: Set[str] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    logger.warning("Chat bus broker received an invalid frame")
+                    continue
+
+                op = frame.get("op")
+                session_id = frame.get("session")
+                if op == "sub":
+                    self.subscribers.setdefault(session_id, set()).add(writer)
+                    sessions.add(session_id)
+                elif op == "unsub":
+                    self._remove(session_id, writer)
+                    sessions.discard(session_id)
+                elif op == "pub":
+                    out = json.dumps({"session": session_id, "message": frame.get("message")}).encode() + b"\n"
+                    for subscriber in list(self.subscribers.get(session_id, ())):
+                        if subscriber is not writer:
+                            subscriber.write(out)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for session_id in sessions:
+                self._remove(session_id, writer)
+            writer.close()
+
+    def _remove(self, session_id: str, writer: asyncio.StreamWriter) -> None:
+        """Drop one worker's subscription to a session."""
+        subscribers = self.subscribers.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self.subscribers[session_id]
+
+
+class UnixSocketBackend:
+    """
+    Forward messages to other workers through a BusBroker.
+
+    If no broker is listening, the first worker to take the lock file starts
+    one in-process; the others connect to it. Connections are re-established
+    (and subscriptions replayed) if the broker goes away.
+    """
+
+    def __init__(self, path: str, reconnect_delay: float = 0.5):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Filesystem path of the broker's Unix socket
+            reconnect_delay: Seconds between reconnection attempts
+        """
+        self.path = path
+        self.reconnect_delay = reconnect_delay
+        self.sessions: Set[str] = set()
+
+        self._deliver: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._broker: Optional[BusBroker] = None
+        self._lock_fd: Optional[int] = None
+        self._closing = False
+
+    async def start(self, deliver: Callable[[str, Dict[str, Any]], Awaitable[None]]) -> None:
+        """Connect to (or become) the broker and start reading forwarded messages."""
+        self._deliver = deliver
+        reader = await self._connect()
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def _connect(self) -> asyncio.StreamReader:
+        """Open a connection to the broker, starting one if nobody else holds the lock."""
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self._broker is None and self._try_lock():
+                    self._broker = BusBroker(self.path)
+                    await self._broker.start()
+                    continue
+                await asyncio.sleep(self.reconnect_delay)
+
+        self._writer = writer
+        for session_id in self.sessions:
+            self._send({"op": "sub", "session": session_id})
+        return reader
+
+    def _try_lock(self) -> bool:
+        """Take the broker lock file without blocking."""
+        import fcntl
+
+        fd = os.open(f"{self.path}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Deliver forwarded messages; reconnect if the broker disappears."""
+        while not self._closing:
+            try:
+                line = await reader.readline()
+            except ConnectionError:
+                line = b""
+            if not line:
+                if self._closing:
+                    break
+                logger.warning("Chat bus broker connection lost, reconnecting")
+                self._writer = None
+                reader = await self._connect()
+                continue
+            try:
+                frame = json.loads(line)
+                await self._deliver(frame["session"], frame["message"])
+            except Exception as e:
+                logger.error("Error delivering bus message: %s", e)
+
+    def _send(self, frame: Dict[str, Any]) -> None:
+        """Buffer a frame for the broker (dropped while reconnecting)."""
+        if self._writer is not None:
+            self._writer.write(json.dumps(frame).encode() + b"\n")
+
+    def subscribe(self, session_id: str) -> None:
+        """Ask the broker to forward messages for a session."""
+        self.sessions.add(session_id)
+        self._send({"op": "sub", "session": session_id})
+
+    def unsubscribe(self, session_id: str) -> None:
+        """Stop forwarding messages for a session."""
+        self.sessions.discard(session_id)
+        self._send({"op": "unsub", "session": session_id})
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> None:
+        """Forward a message to other workers subscribed to the session."""
+        self._send({"op": "pub", "session": session_id, "message": message})
+        if self._writer is not None:
+            await self._writer.drain()
+
+    async def close(self) -> None:
+        """Disconnect, and shut down the broker if this worker owns it."""
+        self._closing = True
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        if self._broker is not None:
+            await self._broker.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+class MessageBus:
+    """Publish messages to a session wherever its sockets live."""
+
+    def __init__(self, backend: Optional[Any] = None):
+        """
+        Initialize the bus.
+
+        Args:
+            backend: InProcessBackend (default) or UnixSocketBackend
+        """
+        self.backend = backend or InProcessBackend()
+        self.handlers: Dict[str, Handler] = {}
+        self._started = False
+
+    async def start(self) -> None:
+        """Start the backend (idempotent)."""
+        if not self._started:
+            await self.backend.start(self._dispatch)
+            self._started = True
+
+    async def close(self) -> None:
+        """Stop the backend."""
+        if self._started:
+            await self.backend.close()
+            self._started = False
+
+    def subscribe(self, session_id: str, handler: Handler) -> None:
+        """
+        Receive messages for a session in this process.
+
+        Args:
+            session_id: Session to subscribe to
+            handler: Coroutine function called with each message
+        """
+        self.handlers[session_id] = handler
+        self.backend.subscribe(session_id)
+
+    def unsubscribe(self, session_id: str) -> None:
+        """Stop receiving messages for a session in this process."""
+        if self.handlers.pop(session_id, None) is not None:
+            self.backend.unsubscribe(session_id)
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> None:
+        """
+        Deliver a message to every subscriber of a session in any worker.
+
+        Args:
+            session_id: Target session
+            message: JSON-serializable message
+        """
+        await self._dispatch(session_id, message)
+        await self.backend.publish(session_id, message)
+
+    async def _dispatch(self, session_id: str, message: Dict[str, Any]) -> None:
+        """Hand a message to this process's subscriber, if any."""
+        handler = self.handlers.get(session_id)
+        if handler is not None:
+            await handler(message)
+
+
+def create_bus(socket_path: Optional[str] = None) -> MessageBus:
+    """
+    Create a bus using the Unix-socket backend if a socket path is configured.
+
+    Args:
+        socket_path: Broker socket path (defaults to the CHAT_BUS_SOCKET environment variable)
+
+    Returns:
+        A MessageBus (in-process only when no path is set)
+    """
+    socket_path = socket_path or os.getenv(BUS_SOCKET_ENV)
+    if socket_path:
+        return MessageBus(UnixSocketBackend(socket_path))
+    return MessageBus(InProcessBackend())
+
+
+def main():
+    """Run a standalone broker."""
+    parser = argparse.ArgumentParser(description="Chat message bus broker")
+    parser.add_argument("--path", default=os.getenv(BUS_SOCKET_ENV, "/tmp/delanenails-bus.sock"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(BusBroker(args.path).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
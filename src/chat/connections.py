@@ -0,0 +1,248 @@
+"""
+WebSocket connection registry for the chat widgets.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from src.chat.bus import MessageBus
+from src.chat.memory import ConversationMemory, SessionMemory
+
+logger = logging.getLogger(__name__)
+
+
+class Connection:
+    """A single WebSocket with its outbound queue and sender task."""
+
+    __slots__ = ("websocket", "session_id", "queue", "sender", "last_seen", "closed")
+
+    def __init__(self, websocket: Any, session_id: str, queue_size: int):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.last_seen = time.monotonic()
+        self.closed = False
+
+
+class ConnectionManager:
+    """
+    Track WebSocket connections indexed by socket and by session.
+
+    Connect, disconnect and per-session lookups are O(1). A session may have
+    several sockets (e.g. multiple tabs). Outbound messages go through a
+    bounded queue per connection drained by its own task, so a slow client
+    only ever fills its own queue; when that queue is full the client is
+    disconnected instead of stalling everyone else. Connections that stop
+    answering heartbeats are reaped.
+
+    When a message bus is given, sessions with open sockets in this process
+    are subscribed on it so publish() reaches them from any worker.
+    """
+
+    def __init__(self, memory: Optional[ConversationMemory] = None, queue_size: int = 32,
+                 heartbeat_interval: float = 30.0, idle_timeout: float = 90.0,
+                 bus: Optional[MessageBus] = None):
+        """
+        Initialize the connection manager.
+
+        Args:
+            memory: Conversation memory shared by all sessions
+            queue_size: Maximum queued outbound messages per connection
+            heartbeat_interval: Seconds between heartbeat sweeps
+            idle_timeout: Seconds without client traffic before a connection is reaped
+            bus: Message bus for cross-worker delivery
+        """
+        self.memory = memory or ConversationMemory()
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.bus = bus
+
+        self.connections: Dict[Any, Connection] = {}
+        self.sessions: Dict[str, Set[Connection]] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @property
+    def active_connections(self) -> List[Connection]:
+        """All open connections."""
+        return list(self.connections.values())
+
+    async def connect(self, websocket: Any, session_id: str) -> Connection:
+        """
+        Accept a WebSocket and register it for a session.
+
+        Args:
+            websocket: The WebSocket to accept
+            session_id: Chat session the socket belongs to
+
+        Returns:
+            The registered connection
+        """
+        await websocket.accept()
+        connection = Connection(websocket, session_id, self.queue_size)
+        connection.sender = asyncio.create_task(self._drain(connection))
+
+        self.connections[websocket] = connection
+        if session_id not in self.sessions:
+            self.sessions[session_id] = set()
+            if self.bus is not None:
+                self.bus.subscribe(session_id, self._session_handler(session_id))
+        self.sessions[session_id].add(connection)
+
+        # Initialize session if needed
+        self.memory.get_session(session_id)
+
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+        return connection
+
+    def disconnect(self, websocket: Any) -> None:
+        """Unregister a WebSocket and stop its sender task."""
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+
+        connection.closed = True
+        if connection.sender is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+
+        session_connections = self.sessions.get(connection.session_id)
+        if session_connections is not None:
+            session_connections.discard(connection)
+            if not session_connections:
+                del self.sessions[connection.session_id]
+                if self.bus is not None:
+                    self.bus.unsubscribe(connection.session_id)
+
+    def touch(self, websocket: Any) -> None:
+        """Record client activity on a socket."""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    async def send_response(self, connection: Connection, message: Dict[str, Any]) -> bool:
+        """
+        Queue a message for one connection without waiting on the network.
+
+        Args:
+            connection: Target connection
+            message: JSON-serializable message
+
+        Returns:
+            True if queued, False if the connection is closed or too slow
+        """
+        if connection.closed:
+            return False
+        try:
+            connection.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Dropping slow WebSocket client for session %s", connection.session_id)
+            await self._close(connection, code=1013)
+            return False
+
+    async def send_to_session(self, session_id: str, message: Dict[str, Any]) -> int:
+        """
+        Queue a message for every socket of a session.
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        delivered = 0
+        for connection in list(self.sessions.get(session_id, ())):
+            if await self.send_response(connection, message):
+                delivered += 1
+        return delivered
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> None:
+        """
+        Deliver a message to a session's sockets, whichever worker holds them.
+
+        Args:
+            session_id: Target session
+            message: JSON-serializable message
+        """
+        if self.bus is not None:
+            await self.bus.publish(session_id, message)
+        else:
+            await self.send_to_session(session_id, message)
+
+    def _session_handler(self, session_id: str):
+        """Build the bus handler that delivers to this process's sockets."""
+        async def handler(message: Dict[str, Any]) -> None:
+            await self.send_to_session(session_id, message)
+        return handler
+
+    async def broadcast(self, message: Dict[str, Any]) -> int:
+        """
+        Queue a message for every open connection.
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        delivered = 0
+        for connection in list(self.connections.values()):
+            if await self.send_response(connection, message):
+                delivered += 1
+        return delivered
+
+    def get_session(self, session_id: str) -> SessionMemory:
+        """Get the conversation memory for a session."""
+        return self.memory.get_session(session_id)
+
+    async def reap(self, now: Optional[float] = None) -> int:
+        """
+        Close dead connections and ping quiet ones.
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            Number of connections reaped
+        """
+        now = time.monotonic() if now is None else now
+        reaped = 0
+        for connection in list(self.connections.values()):
+            idle = now - connection.last_seen
+            if idle > self.idle_timeout:
+                await self._close(connection, code=1001)
+                reaped += 1
+            elif idle > self.heartbeat_interval:
+                await self.send_response(connection, {"type": "ping"})
+
+        if reaped:
+            logger.info("Reaped %d idle WebSocket connections", reaped)
+        self.memory.evict_idle()
+        return reaped
+
+    async def _run_heartbeat(self) -> None:
+        """Periodically reap idle connections while any are open."""
+        while self.connections:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error("Error in WebSocket heartbeat: %s", e)
+
+    async def _drain(self, connection: Connection) -> None:
+        """Send queued messages for one connection until it closes."""
+        try:
+            while True:
+                message = await connection.queue.get()
+                await connection.websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("WebSocket send failed for session %s: %s", connection.session_id, e)
+            self.disconnect(connection.websocket)
+
+    async def _close(self, connection: Connection, code: int) -> None:
+        """Close a connection's socket and unregister it."""
+        self.disconnect(connection.websocket)
+        try:
+            await connection.websocket.close(code=code)
+        except Exception:
+            pass
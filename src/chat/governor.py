@@ -0,0 +1,122 @@
+"""
+Client-side request and token rate governor for the OpenAI API.
+"""
+import email.utils
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Mapping, Optional
+
+from src.utils.rate_limit import PriorityLimiter, TokenBucket, Permit
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Read a retry delay from response headers.
+
+    Supports ``retry-after-ms``, ``retry-after`` in seconds, and
+    ``retry-after`` as an HTTP date.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        Delay in seconds, or None if no usable header is present
+    """
+    if not headers:
+        return None
+
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return max(0.0, float(retry_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    """
+    Keep OpenAI traffic under the account's RPM/TPM limits.
+
+    Each request reserves one request token and an estimate of its total
+    tokens before it is sent; the estimate is reconciled with the usage the
+    API reports. Excess requests queue in priority order rather than failing.
+    """
+
+    def __init__(self, requests_per_minute: int = 500, tokens_per_minute: int = 30000,
+                 max_concurrent: int = 8):
+        """
+        Initialize the governor.
+
+        Args:
+            requests_per_minute: Provider request limit
+            tokens_per_minute: Provider token limit (prompt + completion)
+            max_concurrent: Maximum in-flight requests
+        """
+        self.limiter = PriorityLimiter(
+            buckets={
+                "requests": TokenBucket(requests_per_minute, requests_per_minute / 60.0),
+                "tokens": TokenBucket(tokens_per_minute, tokens_per_minute / 60.0),
+            },
+            max_concurrent=max_concurrent
+        )
+        logger.info(
+            "Rate governor initialized: %s RPM, %s TPM, %s concurrent",
+            requests_per_minute, tokens_per_minute, max_concurrent
+        )
+
+    @contextmanager
+    def reserve(self, estimated_tokens: int, priority: int = PRIORITY_INTERACTIVE,
+                timeout: Optional[float] = None):
+        """
+        Wait for capacity for one request.
+
+        Args:
+            estimated_tokens: Estimated prompt plus completion tokens
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout: Maximum seconds to queue
+
+        Yields:
+            Permit for the request
+        """
+        with self.limiter.limit({"requests": 1, "tokens": estimated_tokens},
+                                priority=priority, timeout=timeout) as permit:
+            if permit.waited > 0.5:
+                logger.debug("Request queued %.2fs by rate governor", permit.waited)
+            yield permit
+
+    def reconcile(self, permit: Permit, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if actual_tokens is None:
+            return
+        delta = actual_tokens - permit.costs.get("tokens", 0)
+        if delta:
+            self.limiter.adjust("tokens", delta)
+
+    def honor_retry_after(self, seconds: float) -> None:
+        """Hold all queued requests until the provider's retry window passes."""
+        logger.warning("Rate limited by provider, pausing requests for %.2fs", seconds)
+        self.limiter.pause(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get governor counters."""
+        return self.limiter.stats()
@@ -0,0 +1,267 @@
+"""
+Bounded per-session conversation memory with token-budget compaction.
+"""
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Any
+
+from src.chat.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+class Turn:
+    """A single message in a conversation."""
+
+    __slots__ = ("role", "content", "timestamp", "tokens")
+
+    def __init__(self, role: str, content: str, timestamp: float):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.tokens = estimate_tokens(content)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the message dictionary format used by the agents."""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+
+class SessionMemory:
+    """Ring buffer of recent turns plus a running summary of older ones."""
+
+    __slots__ = ("turns", "tokens", "summary", "customer_info", "last_active", "conversation")
+
+    def __init__(self, max_turns: int, now: float):
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.tokens = 0
+        self.summary = ""
+        self.customer_info: Dict[str, Any] = {}
+        self.last_active = now
+        # The agent's flow state for this session; evicted with the turns
+        self.conversation: Any = None
+
+
+def truncate_summary(summary: str, dropped: List[Turn], token_budget: int) -> str:
+    """
+    Fold dropped turns into the summary by keeping their first sentence.
+
+    The oldest material is trimmed first once the summary exceeds its
+    budget. This is the default summarizer; an LLM-backed callable with the
+    same signature can be supplied to ConversationMemory instead.
+
+    Args:
+        summary: Existing summary text
+        dropped: Turns being evicted from the ring buffer
+        token_budget: Maximum tokens for the resulting summary
+
+    Returns:
+        Updated summary text
+    """
+    lines = [summary] if summary else []
+    for turn in dropped:
+        first_sentence = _SENTENCE_END.split(turn.content.strip(), 1)[0]
+        lines.append(f"{turn.role}: {first_sentence}")
+    text = "\n".join(lines)
+
+    max_chars = token_budget * 4
+    if len(text) > max_chars:
+        text = text[-max_chars:]
+        newline = text.find("\n")
+        if 0 <= newline < len(text) - 1:
+            text = text[newline + 1:]
+    return text
+
+
+class ConversationMemory:
+    """
+    Store conversation turns per session within fixed memory bounds.
+
+    Each session keeps at most ``max_turns`` turns and ``token_budget``
+    estimated tokens; older turns are folded into a short summary. Sessions
+    idle for longer than ``idle_ttl`` seconds are evicted.
+    """
+
+    def __init__(self, max_turns: int = 20, token_budget: int = 1500,
+                 summary_token_budget: int = 200, idle_ttl: float = 30 * 60,
+                 summarizer: Optional[Callable[[str, List[Turn], int], str]] = None):
+        """
+        Initialize conversation memory.
+
+        Args:
+            max_turns: Maximum turns kept verbatim per session
+            token_budget: Maximum estimated tokens kept verbatim per session
+            summary_token_budget: Maximum estimated tokens for the running summary
+            idle_ttl: Seconds of inactivity before a session is evicted
+            summarizer: Callable(summary, dropped_turns, token_budget) -> summary
+        """
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self.idle_ttl = idle_ttl
+        self.summarizer = summarizer or truncate_summary
+
+        # Ordered by last activity so idle sessions are always at the front
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get_session(self, session_id: str) -> SessionMemory:
+        """
+        Get a session, creating it if needed, and mark it active.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session's memory
+        """
+        now = time.time()
+        self.evict_idle(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = SessionMemory(self.max_turns, now)
+            self._sessions[session_id] = session
+        else:
+            session.last_active = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def add_turn(self, session_id: str, role: str, content: str) -> None:
+        """
+        Append a turn and compact the session if it is over budget.
+
+        Args:
+            session_id: Session identifier
+            role: Message role (user, assistant, system)
+            content: Message text
+        """
+        session = self.get_session(session_id)
+        dropped = []
+
+        # deque(maxlen) would silently discard the oldest turn; keep it for the summary
+        if len(session.turns) == self.max_turns:
+            oldest = session.turns.popleft()
+            session.tokens -= oldest.tokens
+            dropped.append(oldest)
+
+        turn = Turn(role, content or "", session.last_active)
+        session.turns.append(turn)
+        session.tokens += turn.tokens
+
+        while session.tokens > self.token_budget and len(session.turns) > 1:
+            oldest = session.turns.popleft()
+            session.tokens -= oldest.tokens
+            dropped.append(oldest)
+
+        if dropped:
+            session.summary = self.summarizer(session.summary, dropped, self.summary_token_budget)
+
+    def conversation(self, session_id: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get the agent's flow state for a session, creating it on first use.
+
+        Args:
+            session_id: Session identifier
+            factory: Creates the state for a new session
+
+        Returns:
+            The session's flow state
+        """
+        session = self.get_session(session_id)
+        if session.conversation is None:
+            session.conversation = factory()
+        return session.conversation
+
+    def set_customer_info(self, session_id: str, customer_info: Dict[str, Any]) -> None:
+        """Store the customer's contact details for a session."""
+        self.get_session(session_id).customer_info = dict(customer_info or {})
+
+    def history(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the retained turns for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            List of message dictionaries (role, content, timestamp)
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
+        return [turn.to_dict() for turn in session.turns]
+
+    def messages(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        Build a bounded prompt context for a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Chat messages, starting with a system summary if older turns were compacted
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
+        messages = []
+        if session.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of earlier conversation:\n{session.summary}"
+            })
+        messages.extend({"role": turn.role, "content": turn.content} for turn in session.turns)
+        return messages
+
+    def remove(self, session_id: str) -> None:
+        """Forget a session immediately."""
+        self._sessions.pop(session_id, None)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Evict sessions idle longer than the TTL.
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of sessions evicted
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.idle_ttl
+        evicted = 0
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_active > cutoff:
+                break
+            self._sessions.popitem(last=False)
+            evicted += 1
+
+        if evicted:
+            self._evicted += evicted
+            logger.debug("Evicted %d idle conversation sessions", evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Get memory usage counters."""
+        return {
+            "sessions": len(self._sessions),
+            "turns": sum(len(s.turns) for s in self._sessions.values()),
+            "tokens": sum(s.tokens for s in self._sessions.values()),
+            "evicted": self._evicted
+        }
@@ -2,53 +2,133 @@
 Client for interacting with OpenAI's API.
 """
 import logging
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
+from openai.types.chat import ChatCompletion
 from typing import Dict, List, Optional, Any
 
+from src.chat.governor import RateGovernor, PRIORITY_INTERACTIVE, parse_retry_after
+from src.chat.response_cache import ResponseCache, make_cache_key
+from src.chat.tokens import estimate_message_tokens
+from src.utils.metrics import timed
+
 logger = logging.getLogger(__name__)
 
 class OpenAIClient:
     """Client to interact with OpenAI's API."""
     
-    def __init__(self, api_key: str):
-        """Initialize the OpenAI client with an API key."""
-        self.client = OpenAI(api_key=api_key)
+    # Completion size assumed for rate budgeting when max_tokens is not given
+    DEFAULT_COMPLETION_TOKENS = 500
+    
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None,
+                 governor: Optional[RateGovernor] = None, max_retries: int = 3):
+        """
+        Initialize the OpenAI client with an API key.
+        
+        Args:
+            api_key: OpenAI API key
+            cache: Optional response cache for low-temperature requests
+            governor: Optional rate governor to queue requests under provider limits
+            max_retries: Retries on rate-limit errors when a governor is used
+        """
+        self.cache = cache
+        self.governor = governor
+        self.max_retries = max_retries
+        if governor is not None:
+            # The governor owns retries so queued requests back off together
+            self.client = OpenAI(api_key=api_key, max_retries=0)
+        else:
+            self.client = OpenAI(api_key=api_key)
         logger.info("OpenAI client initialized")
         
+    @timed("openai")
     def chat_completion(self, 
                         messages: List[Dict[str, str]], 
                         model: str = "gpt-4", 
                         temperature: float = 0.7,
-                        max_tokens: Optional[int] = None) -> Any:
+                        max_tokens: Optional[int] = None,
+                        bypass_cache: bool = False,
+                        priority: int = PRIORITY_INTERACTIVE) -> Any:
         """
         Send a chat completion request to OpenAI.
         
+        Requests at or below the cache's deterministic temperature are served
+        from the response cache when an equivalent prompt was seen before.
+        
         Args:
             messages: List of message dictionaries (role, content)
             model: OpenAI model to use
             temperature: Sampling temperature
             max_tokens: Maximum tokens in the response
+            bypass_cache: Skip the response cache for this call
+            priority: Queue priority when a rate governor is configured
+                (PRIORITY_INTERACTIVE for chat, PRIORITY_BACKGROUND for batch work)
             
         Returns:
             OpenAI API response
         """
+        cache_key = None
+        if self.cache is not None:
+            if bypass_cache or not self.cache.is_cacheable(temperature):
+                self.cache.record_bypass()
+            else:
+                cache_key = make_cache_key(model, temperature, messages, max_tokens)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.debug("Serving chat completion for model %s from cache", model)
+                    return ChatCompletion.model_validate(cached)
+        
         try:
-            logger.debug(f"Sending chat completion request with model {model}")
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            return response
+            logger.debug("Sending chat completion request with model %s", model)
+            if self.governor is not None:
+                response = self._governed_completion(messages, model, temperature, max_tokens, priority)
+            else:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
         except Exception as e:
-            logger.error(f"Error in chat completion request: {str(e)}")
+            logger.error("Error in chat completion request: %s", e)
             raise
+        
+        if cache_key is not None:
+            try:
+                self.cache.put(cache_key, response.model_dump(mode="json"))
+            except Exception as e:
+                logger.warning("Could not cache chat completion: %s", e)
+        
+        return response
+            
+    def _governed_completion(self, messages: List[Dict[str, str]], model: str,
+                             temperature: float, max_tokens: Optional[int], priority: int) -> Any:
+        """Send a completion through the rate governor, honoring Retry-After on 429s."""
+        estimated_tokens = estimate_message_tokens(messages) + (max_tokens or self.DEFAULT_COMPLETION_TOKENS)
+        
+        for attempt in range(self.max_retries + 1):
+            with self.governor.reserve(estimated_tokens, priority=priority) as permit:
+                try:
+                    response = self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                except RateLimitError as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = parse_retry_after(getattr(e.response, "headers", None))
+                    self.governor.honor_retry_after(delay if delay is not None else 2 ** attempt)
+                    continue
+                
+                usage = getattr(response, "usage", None)
+                self.governor.reconcile(permit, getattr(usage, "total_tokens", None))
+                return response
             
     def get_response_text(self, response: Any) -> str:
         """Extract the response text from an OpenAI chat completion."""
         try:
             return response.choices[0].message.content
         except (AttributeError, IndexError) as e:
-            logger.error(f"Error extracting response text: {str(e)}")
+            logger.error("Error extracting response text: %s", e)
             return ""
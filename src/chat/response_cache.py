@@ -0,0 +1,199 @@
+"""
+SQLite-backed response cache for OpenAI chat completions.
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Default location for the cache database
+DEFAULT_CACHE_PATH = str(Path(__file__).parent.parent.parent / "data" / "openai_cache.db")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_messages(messages: List[Dict[str, str]]) -> List[List[str]]:
+    """
+    Normalize a messages list so trivially different prompts share a key.
+
+    Roles and content are case-folded and runs of whitespace are collapsed,
+    so "What are your hours?" and "what are  your hours? " hit the same entry.
+
+    Args:
+        messages: List of message dictionaries (role, content)
+
+    Returns:
+        List of [role, content] pairs
+    """
+    normalized = []
+    for message in messages:
+        role = str(message.get("role", "")).strip().lower()
+        content = _WHITESPACE.sub(" ", str(message.get("content") or "")).strip().casefold()
+        normalized.append([role, content])
+    return normalized
+
+
+def make_cache_key(model: str, temperature: float, messages: List[Dict[str, str]],
+                   max_tokens: Optional[int] = None) -> str:
+    """
+    Build a stable cache key for a completion request.
+
+    Args:
+        model: OpenAI model name
+        temperature: Sampling temperature
+        messages: List of message dictionaries (role, content)
+        max_tokens: Maximum tokens in the response
+
+    Returns:
+        Hex SHA-256 digest of the normalized request
+    """
+    payload = json.dumps(
+        [model, round(float(temperature), 2), max_tokens, normalize_messages(messages)],
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with TTL, persisted in SQLite.
+
+    Entries are evicted least-recently-used first once ``max_entries`` is
+    exceeded, and are treated as misses once older than ``ttl_seconds``.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 1000,
+                 ttl_seconds: float = 24 * 3600, max_temperature: float = 0.3):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_path: Path to the SQLite database (":memory:" for a private in-memory cache)
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Time-to-live for each cached response
+            max_temperature: Highest temperature considered deterministic enough to cache
+        """
+        self.db_path = db_path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "expired": 0}
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        logger.info("Response cache initialized at %s", self.db_path)
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """Check whether a request at this temperature may be served from cache."""
+        return temperature <= self.max_temperature
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            The cached response payload, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+
+        return json.loads(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a response, evicting least-recently-used entries if over capacity.
+
+        Args:
+            key: Cache key from make_cache_key
+            value: JSON-serializable response payload
+        """
+        now = time.time()
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self._stats["evictions"] += overflow
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache."""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with hit/miss counters, current size and hit rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,25 @@
+"""
+Cheap token estimates for budgeting prompts without a tokenizer.
+"""
+from typing import Dict, List
+
+# Rough average for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+# Per-message overhead for role and separators in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a string."""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt tokens for a list of chat messages."""
+    return sum(
+        estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
@@ -1,124 +1,399 @@
 """
 Configuration settings for the DelaneNails application.
+
+Settings are assembled once from defaults, the JSON config file and
+environment variables (in that order), validated, and published as a
+frozen ``Settings`` snapshot. ``settings()`` returns the current snapshot;
+``SettingsWatcher`` swaps in a new one when the config file changes.
+``Config`` and ``config`` keep dictionary-style ``get`` access working on
+top of the snapshot.
 """
-import os
-from typing import Dict, Any
+import collections.abc
 import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union, get_args, get_origin
 
-class Config:
-    """Configuration manager for DelaneNails application."""
-    
-    def __init__(self, config_file: str = None):
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / "config" / "config.json"
+CREDENTIALS_DIR = PROJECT_ROOT / "credentials"
+
+_TRUE = ("true", "1", "yes", "on")
+_FALSE = ("false", "0", "no", "off", "")
+
+
+def setting(default: Any, *env: str) -> Any:
+    """Declare a settings field with the environment variables that override it."""
+    if isinstance(default, MappingProxyType):
+        # Read-only, so one instance can be shared, but dataclasses reject unhashable defaults
+        return field(default_factory=lambda: default, metadata={"env": env})
+    return field(default=default, metadata={"env": env})
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Validated, immutable application settings."""
+
+    # API settings
+    api_host: str = setting("0.0.0.0", "API_HOST")
+    api_port: int = setting(8000, "API_PORT")
+    api_debug: bool = setting(True, "API_DEBUG")
+    blocking_max_workers: int = setting(16, "BLOCKING_MAX_WORKERS")
+
+    # External API settings
+    use_mock_api: bool = setting(True, "USE_MOCK_API")
+    external_api_url: str = setting("https://api.nailsalon.example", "EXTERNAL_API_URL", "NAIL_SALON_API_URL")
+    api_key: str = setting("", "API_KEY")
+    booksy_api_key: str = setting("", "BOOKSY_API_KEY")
+    booksy_business_id: str = setting("", "BOOKSY_BUSINESS_ID")
+
+    # Database settings
+    db_type: str = setting("sqlite", "DB_TYPE")
+    db_path: str = setting("delane_nails.db", "DB_PATH")
+    use_local_store: bool = setting(False, "USE_LOCAL_STORE")
+
+    # Email settings
+    # Empty host and sender mean each mail service's own default (see get())
+    smtp_host: str = setting("", "SMTP_HOST", "SMTP_SERVER")
+    smtp_port: int = setting(587, "SMTP_PORT")
+    smtp_username: str = setting("", "SMTP_USERNAME")
+    smtp_password: str = setting("", "SMTP_PASSWORD")
+    from_email: str = setting("", "FROM_EMAIL", "SENDER_EMAIL")
+    sender_name: str = setting("Delane Nails", "SENDER_NAME")
+
+    # SMS and notification settings
+    sms_provider: str = setting("twilio", "SMS_PROVIDER")
+    twilio_account_sid: str = setting("", "TWILIO_ACCOUNT_SID")
+    twilio_auth_token: str = setting("", "TWILIO_AUTH_TOKEN")
+    twilio_phone_number: str = setting("", "TWILIO_PHONE_NUMBER")
+    notification_email: str = setting("maecity@aol.com", "NOTIFICATION_EMAIL")
+    staff_emails: Tuple[str, ...] = setting(("maecity@aol.com",), "STAFF_EMAILS")
+    owner_phone: Optional[str] = setting(None, "OWNER_PHONE")
+
+    # Google settings
+    google_credentials_path: str = setting(str(CREDENTIALS_DIR / "credentials.json"), "GOOGLE_CREDENTIALS_PATH")
+    google_token_path: str = setting(str(CREDENTIALS_DIR / "token.json"), "GOOGLE_TOKEN_PATH")
+    google_api_key: str = setting("", "GOOGLE_API_KEY")
+    google_credentials_json: Optional[Mapping[str, Any]] = setting(None, "GOOGLE_CREDENTIALS_JSON")
+
+    # Business settings
+    business_name: str = setting("Delane Nails", "BUSINESS_NAME")
+    business_phone: str = setting("", "BUSINESS_PHONE")
+    business_email: str = setting("info@delanenails.com", "BUSINESS_EMAIL")
+    business_address: str = setting("123 Main St, Anytown, USA", "BUSINESS_ADDRESS")
+    business_hours: Mapping[str, str] = setting(MappingProxyType({
+        "monday": "9:00-17:00",
+        "tuesday": "9:00-17:00",
+        "wednesday": "9:00-17:00",
+        "thursday": "9:00-17:00",
+        "friday": "9:00-17:00",
+        "saturday": "9:00-17:00",
+        "sunday": "closed"
+    }))
+
+    # Web interface settings
+    web_host: str = setting("0.0.0.0", "WEB_HOST")
+    web_port: int = setting(5000, "WEB_PORT")
+    web_debug: bool = setting(True, "WEB_DEBUG")
+
+    # Tracing settings (sample rate 0 disables tracing)
+    trace_sample_rate: float = setting(0.0, "TRACE_SAMPLE_RATE")
+    trace_file: str = setting(str(PROJECT_ROOT / "logs" / "traces.jsonl"), "TRACE_FILE")
+    trace_min_duration_ms: float = setting(0.0, "TRACE_MIN_DURATION_MS")
+
+    # Config file sections without a typed field (e.g. "openai"), read with get("openai.model")
+    extra: Mapping[str, Any] = setting(MappingProxyType({}))
+
+    @classmethod
+    def load(cls, config_file: Optional[Union[str, Path]] = None,
+             environ: Optional[Mapping[str, str]] = None) -> "Settings":
         """
-        Initialize configuration from environment variables and config file.
-        
+        Build settings from defaults, a JSON config file and the environment.
+
         Args:
-            config_file: Path to JSON configuration file (optional)
+            config_file: JSON config file (defaults to $CONFIG_PATH or config/config.json);
+                a missing file is skipped
+            environ: Environment variables (defaults to os.environ)
+
+        Returns:
+            The validated settings
+
+        Raises:
+            ValueError: If a value can't be converted to its setting's type
         """
-        # Default configuration
-        self.settings = {
-            # API settings
-            "api_host": "0.0.0.0",
-            "api_port": 8000,
-            "api_debug": True,
-            
-            # External API settings
-            "use_mock_api": True,
-            "external_api_url": "https://api.nailsalon.example",
-            "api_key": "",
-            
-            # Database settings
-            "db_type": "sqlite",
-            "db_path": "delane_nails.db",
-            
-            # Email settings
-            "smtp_host": "smtp.example.com",
-            "smtp_port": 587,
-            "smtp_username": "",
-            "smtp_password": "",
-            "from_email": "appointments@delanenails.com",
-            
-            # SMS settings
-            "sms_provider": "twilio",
-            "twilio_account_sid": "",
-            "twilio_auth_token": "",
-            "twilio_phone_number": "",
-            
-            # Business settings
-            "business_name": "Delane Nails",
-            "business_phone": "",
-            "business_email": "info@delanenails.com",
-            "business_address": "123 Main St, Anytown, USA",
-            "business_hours": {
-                "monday": "9:00-17:00",
-                "tuesday": "9:00-17:00",
-                "wednesday": "9:00-17:00",
-                "thursday": "9:00-17:00",
-                "friday": "9:00-17:00",
-                "saturday": "9:00-17:00",
-                "sunday": "closed"
-            },
-            
-            # Web interface settings
-            "web_host": "0.0.0.0",
-            "web_port": 5000,
-            "web_debug": True
-        }
-        
-        # Load from config file if provided
-        if config_file:
-            self._load_from_file(config_file)
-            
-        # Override with environment variables
-        self._load_from_env()
-    
-    def _load_from_file(self, config_file: str) -> None:
-        """Load configuration from JSON file."""
-        config_path = Path(config_file)
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                file_config = json.load(f)
-                self.settings.update(file_config)
-    
-    def _load_from_env(self) -> None:
-        """Load configuration from environment variables."""
-        # API settings
-        if os.getenv("API_HOST"):
-            self.settings["api_host"] = os.getenv("API_HOST")
-        if os.getenv("API_PORT"):
-            self.settings["api_port"] = int(os.getenv("API_PORT"))
-        if os.getenv("API_DEBUG"):
-            self.settings["api_debug"] = os.getenv("API_DEBUG").lower() == "true"
-            
-        # External API settings
-        if os.getenv("USE_MOCK_API"):
-            self.settings["use_mock_api"] = os.getenv("USE_MOCK_API").lower() == "true"
-        if os.getenv("EXTERNAL_API_URL"):
-            self.settings["external_api_url"] = os.getenv("EXTERNAL_API_URL")
-        if os.getenv("API_KEY"):
-            self.settings["api_key"] = os.getenv("API_KEY")
-            
-        # Database settings
-        if os.getenv("DB_TYPE"):
-            self.settings["db_type"] = os.getenv("DB_TYPE")
-        if os.getenv("DB_PATH"):
-            self.settings["db_path"] = os.getenv("DB_PATH")
-            
-        # Other settings follow the same pattern...
-    
+        environ = os.environ if environ is None else environ
+        path = Path(config_file or environ.get("CONFIG_PATH") or DEFAULT_CONFIG_PATH)
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+
+        if path.exists():
+            with open(path, 'r') as f:
+                for key, value in json.load(f).items():
+                    if key in _FIELDS and key != "extra":
+                        values[key] = value
+                    else:
+                        extra[key] = value
+
+        # Variables that are set but blank (e.g. "SMTP_PORT=") count as unset
+        for name, spec in _FIELDS.items():
+            for variable in spec.metadata["env"]:
+                if environ.get(variable):
+                    values[name] = environ[variable]
+                    break
+
+        converted = {name: _coerce(name, _FIELDS[name].type, value) for name, value in values.items()}
+        return cls(**converted, extra=_freeze(extra))
+
     def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a setting by name.
+
+        Accepts field names in any case ("db_path", "NOTIFICATION_EMAIL") and
+        dotted paths into config file sections ("openai.model"). Fields left
+        unset (empty or None) return the caller's default when one is given.
+        """
+        name = key.lower()
+        if name in _FIELDS:
+            value = getattr(self, name)
+            if value in ("", None) and default is not None and default is not _MISSING:
+                return default
+            return value
+        value: Any = self.extra
+        for part in key.split("."):
+            if not isinstance(value, Mapping) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        """Allow dictionary-style access to settings."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export settings as plain, JSON-serializable data."""
+        data = {name: _thaw(getattr(self, name)) for name in _FIELDS if name != "extra"}
+        data.update(_thaw(self.extra))
+        return data
+
+
+_FIELDS = {spec.name: spec for spec in fields(Settings)}
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Make nested config data read-only."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Convert frozen config data back to dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _coerce(name: str, annotation: Any, value: Any) -> Any:
+    """Convert a file or environment value to a setting's declared type."""
+    optional = get_origin(annotation) is Union and type(None) in get_args(annotation)
+    if optional:
+        if value is None or value == "":
+            return None
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    origin = get_origin(annotation) or annotation
+
+    if annotation is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+            return value.strip().lower() in _TRUE
+    elif annotation is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                pass
+    elif annotation is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    elif annotation is str:
+        if isinstance(value, str):
+            return value
+    elif origin is tuple:
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(",") if item.strip()]
+        if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+            return tuple(value)
+    elif origin in (collections.abc.Mapping, dict):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if isinstance(value, Mapping):
+            return _freeze(dict(value))
+    raise ValueError(f"Invalid value for setting '{name}': {value!r}")
+
+
+class SettingsWatcher:
+    """
+    Reload settings when the config file changes.
+
+    The file's mtime is polled every ``interval`` seconds. A changed file is
+    loaded into a new snapshot and published with a single reference swap,
+    so readers see either the old settings or the new ones, never a mix.
+    A file that fails to parse or validate is logged and the current
+    snapshot stays in place.
+    """
+
+    def __init__(self, config_file: Optional[Union[str, Path]] = None, interval: float = 2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            config_file: File to watch (defaults to $CONFIG_PATH or config/config.json)
+            interval: Seconds between checks
+        """
+        self.path = Path(config_file or os.environ.get("CONFIG_PATH") or DEFAULT_CONFIG_PATH)
+        self.interval = interval
+        self._mtime = self._current_mtime()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """
+        Reload now if the file changed since the last check.
+
+        Returns:
+            True if a new snapshot was published
+        """
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            load_settings(self.path)
+        except (OSError, ValueError) as e:
+            logger.error("Keeping current settings, %s is invalid: %s", self.path, e)
+            return False
+        logger.info("Settings reloaded from %s", self.path)
+        return True
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="settings-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def settings() -> Settings:
+    """Get the current settings snapshot, loading it on first use."""
+    current = _settings
+    if current is None:
+        with _settings_lock:
+            if _settings is None:
+                load_settings()
+            current = _settings
+    return current
+
+
+def load_settings(config_file: Optional[Union[str, Path]] = None,
+                  environ: Optional[Mapping[str, str]] = None) -> Settings:
+    """
+    Build settings and publish them as the current snapshot.
+
+    Args:
+        config_file: JSON config file (see Settings.load)
+        environ: Environment variables (defaults to os.environ)
+
+    Returns:
+        The new snapshot
+    """
+    global _settings
+    snapshot = Settings.load(config_file, environ)
+    _settings = snapshot
+    return snapshot
+
+
+class Config:
+    """
+    Dictionary-style access to the current settings snapshot.
+
+    All methods read ``settings()`` at call time, so they can be used on the
+    class (``Config.get("NOTIFICATION_EMAIL")``) or on ``config`` and always
+    see the latest reload.
+    """
+
+    @classmethod
+    def get(cls, key: str, default: Any = None) -> Any:
         """Get a configuration value."""
-        return self.settings.get(key, default)
-    
+        return settings().get(key, default)
+
     def __getitem__(self, key: str) -> Any:
         """Allow dictionary-style access to configuration."""
-        return self.settings[key]
-    
-    def to_dict(self) -> Dict[str, Any]:
+        return settings()[key]
+
+    @classmethod
+    def to_dict(cls) -> Dict[str, Any]:
         """Export configuration as a dictionary."""
-        return self.settings.copy()
+        return settings().to_dict()
+
+    @classmethod
+    def get_google_credentials(cls) -> Dict[str, str]:
+        """Get the OAuth client secrets and token file paths."""
+        current = settings()
+        return {
+            "credentials_path": current.google_credentials_path,
+            "token_path": current.google_token_path,
+        }
+
+    @classmethod
+    def get_google_api_key(cls) -> str:
+        """Get the Google API key (empty if not configured)."""
+        return settings().google_api_key
 
 
-# Create a singleton instance
+# Shared instance for dictionary-style access
 config = Config()
@@ -5,10 +5,10 @@ For APIs that don't need OAuth2 user consent/credentials.
 import logging
 from typing import Any, Optional, Dict
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from src.config import Config
+from src.google_services.registry import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -68,20 +68,20 @@ class GoogleApiClient:
             The service object for the API
         """
         try:
-            self.service = build(
-                self.api_name, 
-                self.api_version, 
-                developerKey=self.api_key
+            self.service = get_registry().service(
+                self.api_name,
+                self.api_version,
+                developer_key=self.api_key
             )
-            logger.info(f"Successfully built service for {self.api_name} {self.api_version}")
+            logger.info("Successfully built service for %s %s", self.api_name, self.api_version)
             return self.service
         
         except HttpError as e:
-            logger.error(f"HTTP error building service: {e}")
+            logger.error("HTTP error building service: %s", e)
             raise
         
         except Exception as e:
-            logger.error(f"Error building service: {e}")
+            logger.error("Error building service: %s", e)
             raise
     
     def get_service(self) -> Any:
@@ -4,14 +4,9 @@ Google Calendar API integration.
 import logging
 import os
 import datetime
-import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 # Import the Config class
@@ -24,8 +19,19 @@ except ImportError:
     sys.path.append(str(Path(__file__).parent.parent.parent))
     from src.config import Config
 
+from src.google_services.pool import AsyncResource, get_pool
+from src.google_services.quota import PRIORITY_BACKGROUND
+from src.google_services.registry import get_registry
+from src.google_services.calendar_sync import CalendarMirror, filter_busy_slots, parse_rfc3339
+from src.slots import SlotSet, from_minutes, to_minutes
+from src.utils.metrics import mark_failed, timed
+
 logger = logging.getLogger(__name__)
 
+# Google's per-request limits
+BATCH_LIMIT = 50
+FREEBUSY_LIMIT = 50
+
 class GoogleCalendar:
     """
     Client for interacting with Google Calendar API.
@@ -56,8 +62,8 @@ class GoogleCalendar:
         self.credentials_path = credentials_path or google_creds["credentials_path"]
         self.token_path = token_path or google_creds["token_path"]
         
-        logger.info(f"Using credentials at: {self.credentials_path}")
-        logger.info(f"Using token at: {self.token_path}")
+        logger.info("Using credentials at: %s", self.credentials_path)
+        logger.info("Using token at: %s", self.token_path)
         
         # Also try to get API key if available (for public data operations)
         self.api_key = Config.get_google_api_key()
@@ -68,7 +74,7 @@ class GoogleCalendar:
     def check_credentials_exist(self) -> bool:
         """Check if the credentials file exists."""
         if not os.path.exists(self.credentials_path):
-            logger.error(f"Credentials file not found at: {self.credentials_path}")
+            logger.error("Credentials file not found at: %s", self.credentials_path)
             logger.info("Please download your OAuth credentials from Google Cloud Console and save as credentials.json")
             return False
         return True
@@ -82,48 +88,19 @@ class GoogleCalendar:
             )
             
         try:
-            # Check if token.json exists with valid credentials
-            if os.path.exists(self.token_path):
-                try:
-                    with open(self.token_path, 'r') as token_file:
-                        token_data = json.load(token_file)
-                    self.credentials = Credentials.from_authorized_user_info(
-                        info=token_data,
-                        scopes=self.SCOPES
-                    )
-                except (json.JSONDecodeError, ValueError) as e:
-                    logger.warning(f"Token file is invalid, will re-authenticate: {e}")
-                    self.credentials = None
-            
-            # If credentials don't exist or are invalid, authenticate
-            if not self.credentials or not self.credentials.valid:
-                if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    self.credentials.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_path, self.SCOPES
-                    )
-                    self.credentials = flow.run_local_server(port=0)
-                
-                # Save the credentials for future use
-                token_dir = os.path.dirname(self.token_path)
-                if not os.path.exists(token_dir):
-                    os.makedirs(token_dir, exist_ok=True)
-                    
-                with open(self.token_path, 'w') as token:
-                    token.write(json.dumps(json.loads(self.credentials.to_json())))
-            
-            # Build the service
-            self.service = build('calendar', 'v3', credentials=self.credentials)
+            registry = get_registry()
+            self.credentials = registry.credentials(self.token_path, self.SCOPES, self.credentials_path)
+            self.service = registry.service('calendar', 'v3', credentials=self.credentials)
             logger.info("Successfully authenticated with Google Calendar")
             
         except HttpError as e:
-            logger.error(f"Google API HTTP error: {e}")
+            logger.error("Google API HTTP error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
+            logger.error("Authentication error: %s", e)
             raise
             
+    @timed("calendar")
     def list_upcoming_events(self, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         List upcoming calendar events.
@@ -139,22 +116,79 @@ class GoogleCalendar:
             
         try:
             now = datetime.datetime.utcnow().isoformat() + 'Z'
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            events = []
+            page_token = None
+            # The API caps each page (250 events); follow nextPageToken for the rest
+            while len(events) < max_results:
+                events_result = get_pool().execute(self.service.events().list(
+                    calendarId='primary',
+                    timeMin=now,
+                    maxResults=min(max_results - len(events), 250),
+                    singleEvents=True,
+                    orderBy='startTime',
+                    pageToken=page_token
+                ))
+                
+                events.extend(events_result.get('items', []))
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
             
-            events = events_result.get('items', [])
-            logger.info(f"Retrieved {len(events)} upcoming events")
-            return events
+            logger.info("Retrieved %d upcoming events", len(events))
+            return events[:max_results]
             
         except Exception as e:
-            logger.error(f"Error listing events: {str(e)}")
+            logger.error("Error listing events: %s", e)
+            mark_failed()
             return []
             
+    def async_service(self) -> AsyncResource:
+        """Get an async facade over the Calendar service (``await ....list(...)``)."""
+        if not self.service:
+            self.authenticate()
+        return get_pool().wrap(self.service)
+            
+    def mirror(self, calendar_id: str = 'primary', max_age: float = 60.0) -> CalendarMirror:
+        """
+        Create a local mirror of a calendar kept current with incremental sync.
+        
+        Args:
+            calendar_id: Calendar to mirror
+            max_age: Seconds before a query triggers an incremental sync
+            
+        Returns:
+            The mirror (synced on first query)
+        """
+        return CalendarMirror(self, calendar_id=calendar_id, max_age=max_age)
+            
+    @staticmethod
+    def _event_body(summary: str,
+                    start_time: datetime.datetime,
+                    end_time: datetime.datetime,
+                    description: str = None,
+                    location: str = None) -> Dict[str, Any]:
+        """Build an events.insert request body."""
+        event = {
+            'summary': summary,
+            'start': {
+                'dateTime': start_time.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'end': {
+                'dateTime': end_time.isoformat(),
+                'timeZone': 'UTC',
+            }
+        }
+        
+        if description:
+            event['description'] = description
+            
+        if location:
+            event['location'] = location
+            
+        return event
+            
+    @timed("calendar")
     def create_event(self, 
                      summary: str,
                      start_time: datetime.datetime,
@@ -178,32 +212,132 @@ class GoogleCalendar:
             self.authenticate()
             
         try:
-            event = {
-                'summary': summary,
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'UTC',
-                }
-            }
+            event = self._event_body(summary, start_time, end_time, description, location)
             
-            if description:
-                event['description'] = description
-                
-            if location:
-                event['location'] = location
-                
-            created_event = self.service.events().insert(
+            created_event = get_pool().execute(self.service.events().insert(
                 calendarId='primary',
                 body=event
-            ).execute()
+            ))
             
-            logger.info(f"Event created: {created_event.get('htmlLink')}")
+            logger.info("Event created: %s", created_event.get('htmlLink'))
             return created_event
             
         except Exception as e:
-            logger.error(f"Error creating event: {str(e)}")
+            logger.error("Error creating event: %s", e)
             raise
+            
+    @timed("calendar")
+    def create_events_batch(self, events: List[Dict[str, Any]],
+                            calendar_id: str = 'primary') -> List[Optional[Dict[str, Any]]]:
+        """
+        Create many events using Google batch requests (50 inserts per HTTP call).
+        
+        Args:
+            events: Dicts with create_event's arguments (summary, start_time,
+                end_time, optional description and location)
+            calendar_id: Calendar to insert into
+            
+        Returns:
+            Created events in input order; None where an insert failed
+        """
+        if not self.service:
+            self.authenticate()
+            
+        created: List[Optional[Dict[str, Any]]] = [None] * len(events)
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error creating event %s: %s", request_id, exception)
+            else:
+                created[int(request_id)] = response
+        
+        for offset in range(0, len(events), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            requests = []
+            for index, event in enumerate(events[offset:offset + BATCH_LIMIT], start=offset):
+                request = self.service.events().insert(calendarId=calendar_id, body=self._event_body(**event))
+                batch.add(request, request_id=str(index))
+                requests.append(request)
+            # Bulk imports queue behind interactive calls for quota
+            get_pool().execute_batch(batch, requests, priority=PRIORITY_BACKGROUND)
+            
+        logger.info("Created %d of %d events in batches",
+                    sum(1 for e in created if e is not None), len(events))
+        return created
+        
+    @timed("calendar")
+    def free_busy(self, start: datetime.datetime, end: datetime.datetime,
+                  calendars: List[str]) -> Dict[str, List[Tuple[datetime.datetime, datetime.datetime]]]:
+        """
+        Get busy periods for many calendars with the FreeBusy endpoint.
+        
+        One request covers up to 50 calendars; larger lists are split.
+        Calendars the API reports errors for (e.g. not shared with the
+        account) are logged and left out of the result.
+        
+        Args:
+            start: Range start (naive times are local)
+            end: Range end
+            calendars: Calendar IDs (e.g. staff email addresses)
+            
+        Returns:
+            Busy (start, end) periods per calendar, as naive local datetimes
+        """
+        if not self.service:
+            self.authenticate()
+            
+        busy = {}
+        for offset in range(0, len(calendars), FREEBUSY_LIMIT):
+            chunk = calendars[offset:offset + FREEBUSY_LIMIT]
+            result = get_pool().execute(self.service.freebusy().query(body={
+                'timeMin': start.astimezone().isoformat(),
+                'timeMax': end.astimezone().isoformat(),
+                'items': [{'id': calendar_id} for calendar_id in chunk]
+            }))
+            
+            for calendar_id, info in result.get('calendars', {}).items():
+                if info.get('errors'):
+                    logger.warning("FreeBusy errors for calendar %s: %s", calendar_id, info['errors'])
+                    continue
+                busy[calendar_id] = [
+                    (from_minutes(parse_rfc3339(period['start'])), from_minutes(parse_rfc3339(period['end'])))
+                    for period in info.get('busy', [])
+                ]
+                
+        return busy
+        
+    def slot_filter(self, calendars: List[str], min_free: int = 1) -> Callable[[SlotSet], SlotSet]:
+        """
+        Build a slot filter that removes times when too few calendars are free.
+        
+        The filter makes one FreeBusy call covering all the slots; pass it to
+        NailSalonAPI.add_slot_filter to overlay staff calendars on availability.
+        
+        It fails open, since the calendars only narrow the salon's own
+        availability: a calendar FreeBusy reports errors for counts as free,
+        and if the FreeBusy call itself fails the error is logged and the
+        slots are returned unfiltered, rather than every slot disappearing.
+        
+        Args:
+            calendars: Calendar IDs to check
+            min_free: Calendars that must be free for a slot to stay available
+            
+        Returns:
+            Callable taking and returning a SlotSet
+        """
+        def apply(slots: SlotSet) -> SlotSet:
+            if not slots:
+                return slots
+            start = from_minutes(min(slots.starts))
+            end = from_minutes(max(s + d for s, d in zip(slots.starts, slots.durations)))
+            try:
+                busy = self.free_busy(start, end, calendars)
+            except Exception as e:
+                logger.error("FreeBusy lookup failed, showing slots without staff calendars: %s", e)
+                return slots
+            # Calendars missing from the result had errors; they count as free
+            intervals = {calendar_id: [] for calendar_id in calendars}
+            for calendar_id, periods in busy.items():
+                intervals[calendar_id] = [(to_minutes(s), to_minutes(e)) for s, e in periods]
+            return filter_busy_slots(slots, intervals, min_free)
+        return apply
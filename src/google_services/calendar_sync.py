@@ -0,0 +1,306 @@
+"""
+Incremental Google Calendar sync into a local, range-queryable event mirror,
+plus the busy-interval checks used to overlay calendars on slot availability.
+"""
+import bisect
+import datetime
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from googleapiclient.errors import HttpError
+
+from src.google_services.pool import get_pool
+from src.slots import SlotSet, to_minutes
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rfc3339(value: str) -> int:
+    """Convert an API timestamp to epoch minutes in local wall-clock time."""
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return to_minutes(parsed)
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sort and merge overlapping [start, end) intervals.
+
+    Returns:
+        (starts, ends) arrays of disjoint intervals in order
+    """
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    if not merged:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    bounds = np.array(merged, dtype=np.int64)
+    return bounds[:, 0], bounds[:, 1]
+
+
+def busy_slot_mask(slots: SlotSet, intervals: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """
+    Flag the slots that overlap any busy interval.
+
+    Args:
+        slots: Candidate slots
+        intervals: Busy [start, end) intervals in epoch minutes
+
+    Returns:
+        Boolean array, True where the slot is busy
+    """
+    busy_starts, busy_ends = merge_intervals(intervals)
+    slot_starts = np.frombuffer(slots.starts, dtype=np.int32).astype(np.int64)
+    slot_ends = slot_starts + np.frombuffer(slots.durations, dtype=np.uint16)
+    # First busy interval ending after each slot starts; the slot is busy if it starts before the slot ends
+    i = np.searchsorted(busy_ends, slot_starts, side="right")
+    hit = i < len(busy_starts)
+    busy = np.zeros(len(slot_starts), dtype=bool)
+    busy[hit] = busy_starts[i[hit]] < slot_ends[hit]
+    return busy
+
+
+def filter_busy_slots(slots: SlotSet, busy: Dict[str, Iterable[Tuple[int, int]]], min_free: int = 1) -> SlotSet:
+    """
+    Keep slots where enough calendars are free.
+
+    Args:
+        slots: Candidate slots
+        busy: Busy intervals (epoch minutes) per calendar
+        min_free: Calendars that must be free for a slot to stay available
+            (1 for "any staff member", len(busy) for "everyone")
+
+    Returns:
+        The available slots
+    """
+    if not slots:
+        return slots
+    free = np.zeros(len(slots), dtype=np.int64)
+    for intervals in busy.values():
+        free += ~busy_slot_mask(slots, intervals)
+    starts = np.frombuffer(slots.starts, dtype=np.int32)
+    return slots.without(starts[free < min_free].tolist())
+
+
+def event_span(event: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """
+    Get an event's start and end as epoch minutes in local wall-clock time.
+
+    Timed events are converted to the local timezone; all-day events span
+    midnight to midnight.
+
+    Returns:
+        (start, end), or None if the event has no usable times
+    """
+    bounds = []
+    for key in ("start", "end"):
+        when = event.get(key) or {}
+        if when.get("dateTime"):
+            bounds.append(parse_rfc3339(when["dateTime"]))
+        elif when.get("date"):
+            bounds.append(to_minutes(datetime.datetime.fromisoformat(when["date"])))
+        else:
+            return None
+    return bounds[0], bounds[1]
+
+
+def _as_minutes(value: datetime.datetime) -> int:
+    """Convert a query bound to local epoch minutes."""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return to_minutes(value)
+
+
+class CalendarMirror:
+    """
+    Local copy of one calendar kept current with Google's sync tokens.
+
+    The first sync pages through every event; later syncs send the stored
+    ``syncToken`` and receive only what changed (cancelled events are
+    removed). If Google expires the token (HTTP 410) the mirror is cleared
+    and fully re-synced. Range queries are answered from a sorted index
+    after refreshing at most once per ``max_age`` seconds.
+    """
+
+    def __init__(self, calendar: Any, calendar_id: str = "primary", page_size: int = 250,
+                 max_age: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the mirror.
+
+        Args:
+            calendar: GoogleCalendar client (authenticated on first sync)
+            calendar_id: Calendar to mirror
+            page_size: Events requested per page
+            max_age: Seconds before a query triggers an incremental sync
+            clock: Monotonic clock
+        """
+        self.calendar = calendar
+        self.calendar_id = calendar_id
+        self.page_size = page_size
+        self.max_age = max_age
+        self.clock = clock
+
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.sync_token: Optional[str] = None
+        self.synced_at: Optional[float] = None
+
+        # Sorted (start, end, event_id) for busy events; rebuilt after changes
+        self._index: List[Tuple[int, int, str]] = []
+        self._starts: List[int] = []
+        self._longest = 0
+        self._dirty = True
+        self._lock = threading.RLock()
+        self._stats = {"full_syncs": 0, "incremental_syncs": 0, "pages": 0, "changes": 0}
+
+    def _service(self):
+        """Get the Calendar API service, authenticating if needed."""
+        if not self.calendar.service:
+            self.calendar.authenticate()
+        return self.calendar.service
+
+    def sync(self) -> int:
+        """
+        Pull changes since the last sync (everything on the first call).
+
+        Returns:
+            Number of events added, updated or removed
+        """
+        with self._lock:
+            full = self.sync_token is None
+            try:
+                changes = self._pull(full)
+            except HttpError as e:
+                if full or getattr(e.resp, "status", None) != 410:
+                    raise
+                logger.info("Sync token for calendar %s expired, running a full sync", self.calendar_id)
+                self.sync_token = None
+                full = True
+                changes = self._pull(full)
+
+            self._stats["full_syncs" if full else "incremental_syncs"] += 1
+            self._stats["changes"] += changes
+            self.synced_at = self.clock()
+            if changes:
+                logger.info("Calendar %s sync applied %s changes", self.calendar_id, changes)
+            return changes
+
+    def _pull(self, full: bool) -> int:
+        """Page through events.list and apply the results."""
+        service = self._service()
+        params = {"calendarId": self.calendar_id, "singleEvents": True, "maxResults": self.page_size}
+        if full:
+            received: Dict[str, Dict[str, Any]] = {}
+        else:
+            params["syncToken"] = self.sync_token
+
+        changes = 0
+        page_token = None
+        while True:
+            if page_token:
+                params["pageToken"] = page_token
+            response = get_pool().execute(service.events().list(**params))
+            self._stats["pages"] += 1
+            for event in response.get("items", []):
+                changes += 1
+                if full:
+                    if event.get("status") != "cancelled":
+                        received[event["id"]] = event
+                elif event.get("status") == "cancelled":
+                    self.events.pop(event["id"], None)
+                else:
+                    self.events[event["id"]] = event
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        # Only the last page carries the token for the next incremental sync
+        self.sync_token = response.get("nextSyncToken")
+        if full:
+            self.events = received
+        self._dirty = True
+        return changes
+
+    def refresh(self) -> None:
+        """Sync if the mirror is older than max_age."""
+        if self.synced_at is None or self.clock() - self.synced_at >= self.max_age:
+            self.sync()
+
+    def _ensure_index(self) -> None:
+        """Rebuild the sorted busy-time index if events changed."""
+        if not self._dirty:
+            return
+        index = []
+        for event_id, event in self.events.items():
+            if event.get("transparency") == "transparent":
+                continue
+            span = event_span(event)
+            if span is not None and span[1] > span[0]:
+                index.append((span[0], span[1], event_id))
+        index.sort()
+        self._index = index
+        self._starts = [start for start, _, _ in index]
+        self._longest = max((end - start for start, end, _ in index), default=0)
+        self._dirty = False
+
+    def _overlapping(self, start: int, end: int) -> List[Tuple[int, int, str]]:
+        """Busy index entries overlapping [start, end) (lock held, index current)."""
+        lo = bisect.bisect_left(self._starts, start - self._longest)
+        hi = bisect.bisect_left(self._starts, end)
+        return [entry for entry in self._index[lo:hi] if entry[1] > start]
+
+    def events_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict[str, Any]]:
+        """
+        Get events overlapping [start, end), ordered by start time.
+
+        Args:
+            start: Range start
+            end: Range end
+
+        Returns:
+            Calendar events (free/transparent events excluded)
+        """
+        self.refresh()
+        with self._lock:
+            self._ensure_index()
+            return [self.events[event_id] for _, _, event_id in self._overlapping(_as_minutes(start), _as_minutes(end))]
+
+    def is_free(self, start: datetime.datetime, end: datetime.datetime) -> bool:
+        """Check whether no busy event overlaps [start, end)."""
+        self.refresh()
+        with self._lock:
+            self._ensure_index()
+            return not self._overlapping(_as_minutes(start), _as_minutes(end))
+
+    def filter_slots(self, slots: SlotSet) -> SlotSet:
+        """
+        Drop slots that overlap a busy event.
+
+        Args:
+            slots: Candidate slots
+
+        Returns:
+            The slots that are free on this calendar
+        """
+        if not slots:
+            return slots
+        self.refresh()
+        with self._lock:
+            self._ensure_index()
+            intervals = [(start, end) for start, end, _ in self._index]
+        return filter_busy_slots(slots, {self.calendar_id: intervals})
+
+    def stats(self) -> Dict[str, int]:
+        """Get sync counters."""
+        stats = dict(self._stats)
+        stats["events"] = len(self.events)
+        return stats
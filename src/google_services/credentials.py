@@ -0,0 +1,210 @@
+"""
+Shared OAuth credentials with proactive, cross-process-safe refresh.
+"""
+import datetime
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Sequence
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialManager:
+    """
+    Own the OAuth credentials stored in one token file.
+
+    Every client in the process gets the same ``Credentials`` object, and
+    refreshes update it in place, so a new token reaches all of them at once.
+    A background thread refreshes ``refresh_margin`` seconds before expiry,
+    keeping the refresh round trip off the request path. Refreshes take an
+    exclusive ``flock`` on ``<token_path>.lock`` and re-read the token file
+    first: if another process has already refreshed, its token is adopted
+    instead of refreshing again.
+    """
+
+    def __init__(self, token_path: str, scopes: Sequence[str], credentials_path: Optional[str] = None,
+                 refresh_margin: float = 300.0, retry_delay: float = 30.0):
+        """
+        Initialize the manager (nothing is read until credentials() is called).
+
+        Args:
+            token_path: Path to the OAuth token JSON file
+            scopes: Scopes to request if the token file doesn't record any
+            credentials_path: OAuth client secrets file for the consent flow
+            refresh_margin: Seconds before expiry to refresh; google-auth already treats
+                tokens as invalid about four minutes early, so keep this above that
+            retry_delay: Seconds between background attempts after a failed refresh
+        """
+        self.token_path = token_path
+        self.lock_path = f"{token_path}.lock"
+        self.scopes = list(scopes)
+        self.credentials_path = credentials_path
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+
+        self._credentials: Optional[Credentials] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"refreshes": 0, "adopted": 0, "failures": 0}
+
+    def credentials(self) -> Credentials:
+        """
+        Get the shared credentials, loading or refreshing them only if they aren't valid.
+
+        Returns:
+            Valid credentials
+        """
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self._load_token()
+            creds = self._credentials
+            if creds is not None and creds.valid:
+                return creds
+        return self.refresh()
+
+    def refresh(self, interactive: bool = True) -> Credentials:
+        """
+        Refresh the credentials, or adopt a token another process just wrote.
+
+        Args:
+            interactive: Run the browser consent flow if there is no refresh token
+
+        Returns:
+            The refreshed credentials (the same object clients already hold)
+        """
+        with self._lock, self._file_lock():
+            stored = self._load_token()
+            creds = self._credentials
+            if stored is not None and stored.valid and not self._expiring(stored) and \
+                    (creds is None or creds.token != stored.token):
+                if creds is None:
+                    self._credentials = stored
+                else:
+                    creds.token = stored.token
+                    creds.expiry = stored.expiry
+                self._stats["adopted"] += 1
+                logger.info("Using Google token refreshed by another process (%s)", self.token_path)
+                return self._credentials
+
+            if creds is None:
+                creds = stored
+            if creds is not None and creds.refresh_token:
+                creds.refresh(Request())
+                self._stats["refreshes"] += 1
+                logger.info("Refreshed Google credentials from %s", self.token_path)
+            elif interactive:
+                creds = self._run_flow()
+            else:
+                raise RuntimeError(f"No refresh token in {self.token_path}")
+
+            self._save_token(creds)
+            self._credentials = creds
+            return creds
+
+    def _expiring(self, creds: Credentials) -> bool:
+        """Check whether credentials expire within the refresh margin."""
+        if creds.expiry is None:
+            return False
+        remaining = (creds.expiry - datetime.datetime.utcnow()).total_seconds()
+        return remaining < self.refresh_margin
+
+    def _seconds_until_refresh(self) -> float:
+        """Seconds the background thread should sleep before the next refresh."""
+        creds = self._credentials
+        if creds is None or creds.expiry is None:
+            return self.refresh_margin
+        remaining = (creds.expiry - datetime.datetime.utcnow()).total_seconds()
+        return max(0.0, remaining - self.refresh_margin)
+
+    def start(self) -> None:
+        """Start refreshing in the background (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="google-credentials", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Background loop: sleep until shortly before expiry, then refresh."""
+        while not self._stop.wait(self._seconds_until_refresh()):
+            try:
+                if self._credentials is None or self._expiring(self._credentials):
+                    self.refresh(interactive=False)
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.error("Background refresh of %s failed: %s", self.token_path, e)
+                if self._stop.wait(self.retry_delay):
+                    break
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock shared by every process using this token file."""
+        import fcntl
+
+        lock_dir = os.path.dirname(self.lock_path)
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _load_token(self) -> Optional[Credentials]:
+        """Read credentials from the token file, or None if it is missing or unreadable."""
+        if not os.path.exists(self.token_path):
+            return None
+        try:
+            with open(self.token_path, 'r') as token_file:
+                token_data = json.load(token_file)
+            # Prefer the scopes the token was granted, so clients asking for
+            # different scopes can share one refresh
+            creds = Credentials.from_authorized_user_info(
+                info=token_data,
+                scopes=token_data.get("scopes") or self.scopes
+            )
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.warning("Token file is invalid, will re-authenticate: %s", e)
+            return None
+        if not creds.has_scopes(self.scopes):
+            logger.warning("Token at %s was not granted all of %s", self.token_path, self.scopes)
+        return creds
+
+    def _save_token(self, creds: Credentials) -> None:
+        """Atomically replace the token file."""
+        token_dir = os.path.dirname(self.token_path)
+        if token_dir:
+            os.makedirs(token_dir, exist_ok=True)
+        temp_path = f"{self.token_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(temp_path, self.token_path)
+
+    def _run_flow(self) -> Credentials:
+        """Run the installed-app consent flow (opens a browser)."""
+        if not self.credentials_path or not os.path.exists(self.credentials_path):
+            raise FileNotFoundError(f"OAuth credentials not found at {self.credentials_path}")
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, self.scopes)
+        return flow.run_local_server(port=0)
+
+    def stats(self) -> Dict[str, int]:
+        """Get refresh, adoption and failure counters."""
+        return dict(self._stats)
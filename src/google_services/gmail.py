@@ -4,18 +4,17 @@ Gmail API integration for email handling.
 import base64
 import logging
 import os
-import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Any, Optional, Tuple
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from src.config import Config
+from src.google_services.pool import AsyncResource, get_pool
+from src.google_services.quota import PRIORITY_BACKGROUND
+from src.google_services.registry import get_registry
+from src.utils.metrics import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
@@ -49,39 +48,13 @@ class GmailService:
             raise FileNotFoundError(f"OAuth credentials not found at {self.credentials_path}")
             
         try:
-            # Check if token.json exists with valid credentials
-            if os.path.exists(self.token_path):
-                with open(self.token_path, 'r') as token_file:
-                    token_data = json.load(token_file)
-                self.credentials = Credentials.from_authorized_user_info(
-                    info=token_data,
-                    scopes=self.SCOPES
-                )
-            
-            # If credentials don't exist or are invalid, authenticate
-            if not self.credentials or not self.credentials.valid:
-                if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    self.credentials.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_path, self.SCOPES
-                    )
-                    self.credentials = flow.run_local_server(port=0)
-                
-                # Save the credentials for future use
-                token_dir = os.path.dirname(self.token_path)
-                if not os.path.exists(token_dir):
-                    os.makedirs(token_dir, exist_ok=True)
-                    
-                with open(self.token_path, 'w') as token:
-                    token.write(json.dumps(json.loads(self.credentials.to_json())))
-            
-            # Build the service
-            self.service = build('gmail', 'v1', credentials=self.credentials)
+            registry = get_registry()
+            self.credentials = registry.credentials(self.token_path, self.SCOPES, self.credentials_path)
+            self.service = registry.service('gmail', 'v1', credentials=self.credentials)
             logger.info("Successfully authenticated with Gmail API")
             
         except Exception as e:
-            logger.error(f"Authentication error: {str(e)}")
+            logger.error("Authentication error: %s", e)
             raise
     
     def _get_service(self):
@@ -90,6 +63,11 @@ class GmailService:
             self.authenticate()
         return self.service
     
+    def async_service(self) -> AsyncResource:
+        """Get an async facade over the Gmail service (``await ....get(...)``)."""
+        return get_pool().wrap(self._get_service())
+    
+    @timed("gmail")
     def send_email(self, to: str, subject: str, body: str, 
                   html_body: Optional[str] = None, cc: Optional[List[str]] = None) -> Dict[str, Any]:
         """
@@ -125,18 +103,19 @@ class GmailService:
         encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
         
         try:
-            send_message = service.users().messages().send(
+            send_message = get_pool().execute(service.users().messages().send(
                 userId="me", 
                 body={'raw': encoded_message}
-            ).execute()
+            ))
             
-            logger.info(f"Email sent to {to}, message ID: {send_message['id']}")
+            logger.info("Email sent to %s, message ID: %s", to, send_message['id'])
             return send_message
             
         except HttpError as error:
-            logger.error(f"Error sending email: {error}")
+            logger.error("Error sending email: %s", error)
             raise
     
+    @timed("gmail")
     def get_unread_emails(self, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         Get unread emails.
@@ -151,11 +130,11 @@ class GmailService:
         
         try:
             # Search for unread emails
-            response = service.users().messages().list(
+            response = get_pool().execute(service.users().messages().list(
                 userId="me",
                 q="is:unread",
                 maxResults=max_results
-            ).execute()
+            ))
             
             messages = response.get('messages', [])
             
@@ -163,23 +142,25 @@ class GmailService:
                 logger.info("No unread emails found")
                 return []
             
-            # Get full message details for each message ID
-            detailed_messages = []
-            for message in messages:
-                msg = service.users().messages().get(
+            # Get full message details concurrently; queued behind interactive calls for quota
+            detailed_messages = get_pool().execute_all([
+                service.users().messages().get(
                     userId="me", 
                     id=message['id'],
                     format='full'
-                ).execute()
-                detailed_messages.append(msg)
+                )
+                for message in messages
+            ], priority=PRIORITY_BACKGROUND)
                 
-            logger.info(f"Retrieved {len(detailed_messages)} unread emails")
+            logger.info("Retrieved %d unread emails", len(detailed_messages))
             return detailed_messages
             
         except HttpError as error:
-            logger.error(f"Error retrieving emails: {error}")
+            logger.error("Error retrieving emails: %s", error)
+            mark_failed()
             return []
     
+    @timed("gmail")
     def reply_to_email(self, message_id: str, reply_body: str, 
                       html_reply_body: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -197,7 +178,7 @@ class GmailService:
         
         try:
             # Get the original message to extract headers
-            original = service.users().messages().get(userId="me", id=message_id).execute()
+            original = get_pool().execute(service.users().messages().get(userId="me", id=message_id))
             
             # Extract headers from original message
             headers = {}
@@ -222,18 +203,19 @@ class GmailService:
             encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
             
             # Send the reply
-            send_message = service.users().messages().send(
+            send_message = get_pool().execute(service.users().messages().send(
                 userId="me", 
                 body={'raw': encoded_message, 'threadId': original['threadId']}
-            ).execute()
+            ))
             
-            logger.info(f"Email reply sent, message ID: {send_message['id']}")
+            logger.info("Email reply sent, message ID: %s", send_message['id'])
             return send_message
             
         except HttpError as error:
-            logger.error(f"Error replying to email: {error}")
+            logger.error("Error replying to email: %s", error)
             raise
     
+    @timed("gmail")
     def mark_as_read(self, message_id: str) -> Dict[str, Any]:
         """
         Mark an email as read.
@@ -247,14 +229,14 @@ class GmailService:
         service = self._get_service()
         
         try:
-            return service.users().messages().modify(
+            return get_pool().execute(service.users().messages().modify(
                 userId="me",
                 id=message_id,
                 body={'removeLabelIds': ['UNREAD']}
-            ).execute()
+            ))
             
         except HttpError as error:
-            logger.error(f"Error marking email as read: {error}")
+            logger.error("Error marking email as read: %s", error)
             raise
     
     def get_email_content(self, message: Dict[str, Any]) -> Tuple[str, str]:
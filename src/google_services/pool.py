@@ -0,0 +1,254 @@
+"""
+Thread-safe execution of Google API requests.
+
+Service objects from googleapiclient share one httplib2 connection, which
+is not safe to use from several threads at once. ``ClientPool`` executes
+each request on a connection owned by the calling thread, wrapped around
+the service's (shared) credentials, so the same Gmail, Calendar or Sheets
+service can be used from worker threads, ``run_in_executor`` and asyncio
+code concurrently. With a ``QuotaScheduler`` attached, every request also
+waits for quota first and quota rejections pause the queue and are retried.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import google_auth_httplib2
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
+
+from src.google_services.quota import PRIORITY_INTERACTIVE, QuotaScheduler
+from src.google_services.sheets_writer import is_rate_limited, retry_delay
+
+logger = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """
+    Execute Google API requests on per-thread HTTP connections.
+
+    Connections are created lazily, one per (thread, credentials) pair, and
+    reused for every later request from that thread. Credentials are not
+    copied, so a token refreshed on one thread is used by all of them.
+    """
+
+    def __init__(self, max_workers: int = 8, scheduler: Optional[QuotaScheduler] = None,
+                 max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 60.0):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Worker threads for submit() and the async facade
+            scheduler: Quota scheduler every request waits on (None sends immediately)
+            max_retries: Retries for requests rejected for quota (with a scheduler)
+            backoff: Initial pause after a quota rejection without Retry-After
+            max_backoff: Maximum pause in seconds
+        """
+        self.max_workers = max_workers
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "in_flight": 0, "connections": 0, "quota_retries": 0}
+
+    def http_for(self, shared_http: Any) -> Any:
+        """
+        Get the calling thread's connection equivalent to a service's shared one.
+
+        Args:
+            shared_http: The ``http`` a request was built with
+
+        Returns:
+            An AuthorizedHttp over the same credentials, or a plain Http for
+            API-key services
+        """
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        # Plain httplib2.Http also has a ``credentials`` attribute (basic auth), so check the type
+        credentials = shared_http.credentials if isinstance(shared_http, google_auth_httplib2.AuthorizedHttp) else None
+        key = id(credentials)
+        entry = connections.get(key)
+        # Keep the credentials in the entry so the id can't be reused while cached
+        if entry is None or entry[0] is not credentials:
+            http = build_http()
+            if credentials is not None:
+                http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+            entry = connections[key] = (credentials, http)
+            with self._lock:
+                self._stats["connections"] += 1
+        return entry[1]
+
+    def execute(self, request: Any, num_retries: int = 0, priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """
+        Execute a request on the calling thread's connection.
+
+        Objects that aren't ``HttpRequest`` (test doubles) are executed as
+        they are, without quota scheduling; batches go through execute_batch.
+
+        Args:
+            request: Request returned by a service method
+            num_retries: Retries for transient errors
+            priority: Queue position when waiting for quota (lower first)
+
+        Returns:
+            The decoded response
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+        try:
+            if not isinstance(request, HttpRequest):
+                return request.execute()
+            if self.scheduler is None:
+                return request.execute(http=self.http_for(request.http), num_retries=num_retries)
+            return self._execute_scheduled(request, num_retries, priority)
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+
+    def _execute_scheduled(self, request: HttpRequest, num_retries: int, priority: int) -> Any:
+        """Wait for quota, send, and pause the scheduler on quota rejections."""
+        attempt = 0
+        while True:
+            with self.scheduler.reserve(request.methodId, priority=priority):
+                try:
+                    return request.execute(http=self.http_for(request.http), num_retries=num_retries)
+                except HttpError as e:
+                    if attempt >= self.max_retries or not is_rate_limited(e):
+                        raise
+                    delay = retry_delay(e, attempt, self.backoff, self.max_backoff)
+            # Paused outside the permit so the pause holds every queued call, this one included
+            self.scheduler.honor_retry_after(delay)
+            attempt += 1
+            with self._lock:
+                self._stats["quota_retries"] += 1
+
+    def execute_batch(self, batch: Any, requests: List[Any], priority: int = PRIORITY_INTERACTIVE) -> None:
+        """
+        Execute a batch request on the calling thread's connection.
+
+        With a scheduler the batch first waits for quota for every request
+        in it, since Google charges each one. Responses and errors go to the
+        batch's callbacks; a batch built from test doubles is executed as it is.
+
+        Args:
+            batch: BatchHttpRequest from ``service.new_batch_http_request``
+            requests: The requests added to the batch
+            priority: Queue position when waiting for quota (lower first)
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+        try:
+            if not requests or not isinstance(requests[0], HttpRequest):
+                batch.execute()
+                return
+            http = self.http_for(requests[0].http)
+            if self.scheduler is None:
+                batch.execute(http=http)
+                return
+            with self.scheduler.reserve_all([request.methodId for request in requests], priority=priority):
+                batch.execute(http=http)
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+
+    def submit(self, request: Any, num_retries: int = 0, priority: int = PRIORITY_INTERACTIVE) -> Future:
+        """Execute a request on a worker thread."""
+        call = functools.partial(contextvars.copy_context().run, self.execute, request, num_retries, priority)
+        return self.executor.submit(call)
+
+    def execute_all(self, requests: List[Any], return_exceptions: bool = False,
+                    priority: int = PRIORITY_INTERACTIVE) -> List[Any]:
+        """
+        Execute requests concurrently.
+
+        Args:
+            requests: Requests returned by service methods
+            return_exceptions: Put errors in the results instead of raising the first one
+            priority: Queue position when waiting for quota (lower first)
+
+        Returns:
+            Responses in request order
+        """
+        futures = [self.submit(request, priority=priority) for request in requests]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    async def run(self, request: Any, num_retries: int = 0, priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """Execute a request without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(request, num_retries, priority))
+
+    def wrap(self, service: Any) -> "AsyncResource":
+        """Get an async facade over a service object."""
+        return AsyncResource(service, self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get call, in-flight and connection counters, plus quota state if scheduled."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        if self.scheduler is not None:
+            stats["quota"] = self.scheduler.stats()
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads."""
+        self.executor.shutdown(wait=wait)
+
+
+class AsyncResource:
+    """
+    Async view of a googleapiclient resource.
+
+    Resource navigation works as usual; calling an API method returns an
+    awaitable that executes on the pool::
+
+        gmail = pool.wrap(service)
+        message = await gmail.users().messages().get(userId="me", id=message_id)
+    """
+
+    def __init__(self, resource: Any, pool: ClientPool):
+        self._resource = resource
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._resource, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            result = attribute(*args, **kwargs)
+            if hasattr(result, "execute"):
+                return self._pool.run(result)
+            return AsyncResource(result, self._pool)
+
+        return call
+
+
+_default_pool: Optional[ClientPool] = None
+_default_lock = threading.Lock()
+
+
+def get_pool() -> ClientPool:
+    """Get the process-wide Google client pool (quota-scheduled)."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = ClientPool(scheduler=QuotaScheduler())
+        return _default_pool
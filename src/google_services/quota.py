@@ -0,0 +1,157 @@
+"""
+Quota-aware scheduling of Google API calls.
+
+Google meters Gmail in quota units per user per second and Sheets and
+Calendar in requests per user per minute. ``QuotaScheduler`` charges each
+call its documented cost against token buckets sized to those quotas and
+queues calls in priority order when a bucket is empty, so bursts (e.g. an
+inbox backfill) are spread out instead of failing with 429 or
+``rateLimitExceeded``.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.chat.governor import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from src.utils.rate_limit import PriorityLimiter, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Per-user quotas as (bucket capacity, refill per second), from Google's published defaults
+DEFAULT_QUOTAS: Dict[str, Tuple[float, float]] = {
+    "gmail": (250, 250.0),           # 250 quota units per user per second
+    "sheets_read": (60, 1.0),        # 60 read requests per user per minute
+    "sheets_write": (60, 1.0),       # 60 write requests per user per minute
+    "calendar": (600, 10.0),         # 600 queries per user per minute
+}
+
+# Charges for the methods we call, by discovery method ID
+METHOD_COSTS: Dict[str, Dict[str, float]] = {
+    "gmail.users.messages.get": {"gmail": 5},
+    "gmail.users.messages.list": {"gmail": 5},
+    "gmail.users.messages.modify": {"gmail": 5},
+    "gmail.users.messages.send": {"gmail": 100},
+    "gmail.users.messages.batchModify": {"gmail": 50},
+    "gmail.users.threads.get": {"gmail": 10},
+    "gmail.users.history.list": {"gmail": 2},
+    "sheets.spreadsheets.values.get": {"sheets_read": 1},
+    "sheets.spreadsheets.values.batchGet": {"sheets_read": 1},
+    "sheets.spreadsheets.values.update": {"sheets_write": 1},
+    "sheets.spreadsheets.values.append": {"sheets_write": 1},
+    "sheets.spreadsheets.values.batchUpdate": {"sheets_write": 1},
+    "calendar.events.list": {"calendar": 1},
+    "calendar.events.insert": {"calendar": 1},
+    "calendar.freebusy.query": {"calendar": 1},
+}
+
+# Fallback charges for other methods, by API name
+DEFAULT_COSTS: Dict[str, Dict[str, float]] = {
+    "gmail": {"gmail": 5},
+    "sheets": {"sheets_write": 1},
+    "calendar": {"calendar": 1},
+}
+
+
+class QuotaScheduler:
+    """
+    Admit Google API calls against per-quota token buckets.
+
+    Calls wait in priority order (interactive before background) until every
+    bucket they draw from has enough units. When Google rejects a call for
+    quota anyway, ``honor_retry_after`` holds all queued calls until the
+    window passes.
+    """
+
+    def __init__(self, quotas: Optional[Dict[str, Tuple[float, float]]] = None,
+                 costs: Optional[Dict[str, Dict[str, float]]] = None,
+                 max_concurrent: Optional[int] = 16):
+        """
+        Initialize the scheduler.
+
+        Args:
+            quotas: Bucket capacity and refill rate per quota (defaults to DEFAULT_QUOTAS)
+            costs: Charges per method ID, merged over METHOD_COSTS
+            max_concurrent: Maximum in-flight calls (None for unlimited)
+        """
+        quotas = quotas or DEFAULT_QUOTAS
+        self.costs = {**METHOD_COSTS, **(costs or {})}
+        self.limiter = PriorityLimiter(
+            buckets={name: TokenBucket(capacity, refill) for name, (capacity, refill) in quotas.items()},
+            max_concurrent=max_concurrent
+        )
+        self._calls: Dict[str, int] = {}
+
+    def costs_for(self, method_id: Optional[str]) -> Dict[str, float]:
+        """
+        Get the quota charges for a method.
+
+        Args:
+            method_id: Discovery method ID, e.g. "gmail.users.messages.send"
+
+        Returns:
+            Units to draw from each known quota (empty if the API isn't metered)
+        """
+        if not method_id:
+            return {}
+        costs = self.costs.get(method_id)
+        if costs is None:
+            costs = DEFAULT_COSTS.get(method_id.split(".", 1)[0], {})
+        return {name: units for name, units in costs.items() if name in self.limiter.buckets}
+
+    @contextmanager
+    def reserve(self, method_id: Optional[str], priority: int = PRIORITY_INTERACTIVE,
+                timeout: Optional[float] = None):
+        """
+        Wait for quota for one call.
+
+        Args:
+            method_id: Discovery method ID of the call
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout: Maximum seconds to queue
+
+        Yields:
+            Permit for the call
+        """
+        with self.reserve_all([method_id], priority=priority, timeout=timeout) as permit:
+            yield permit
+
+    @contextmanager
+    def reserve_all(self, method_ids: List[Optional[str]], priority: int = PRIORITY_INTERACTIVE,
+                    timeout: Optional[float] = None):
+        """
+        Wait for quota for calls sent together in one batch request.
+
+        Google charges every request inside a batch, so the batch waits
+        until all of their charges fit.
+
+        Args:
+            method_ids: Discovery method ID of each call in the batch
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout: Maximum seconds to queue
+
+        Yields:
+            Permit for the batch
+        """
+        costs: Dict[str, float] = {}
+        for method_id in method_ids:
+            for name, units in self.costs_for(method_id).items():
+                costs[name] = costs.get(name, 0) + units
+        with self.limiter.limit(costs, priority=priority, timeout=timeout) as permit:
+            if permit.waited > 0.5:
+                logger.debug("%s queued %.2fs for quota",
+                             ", ".join(sorted({m or "unknown" for m in method_ids})), permit.waited)
+            for method_id in method_ids:
+                self._calls[method_id or "unknown"] = self._calls.get(method_id or "unknown", 0) + 1
+            yield permit
+
+    def honor_retry_after(self, seconds: float) -> None:
+        """Hold all queued calls after Google reports a quota error."""
+        logger.warning("Google API quota exceeded, pausing calls for %.2fs", seconds)
+        self.limiter.pause(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter counters, bucket levels and calls per method."""
+        stats: Dict[str, Any] = self.limiter.stats()
+        stats["buckets"] = {name: bucket.tokens for name, bucket in self.limiter.buckets.items()}
+        stats["calls"] = dict(self._calls)
+        return stats
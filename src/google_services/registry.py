@@ -0,0 +1,156 @@
+"""
+Process-wide registry of Google API discovery documents, credentials and
+built service objects.
+
+Discovery documents are read from the copies bundled with
+google-api-python-client, so building a service never fetches
+``$discovery/rest`` over the network. Each (api, version, auth) service is
+built once and shared by every client in the process, and OAuth
+credentials are managed once per token file (see credentials.py) so a
+refresh is seen by all of them.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+
+from src.google_services.credentials import CredentialManager
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Cache of discovery documents, OAuth credentials and built services."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize an empty registry.
+
+        Args:
+            clock: Timer used to measure build times
+        """
+        self.clock = clock
+        self._documents: Dict[Tuple[str, str], Optional[str]] = {}
+        # token path -> manager owning the shared Credentials
+        self._managers: Dict[str, CredentialManager] = {}
+        # (api, version, auth key) -> (service, credentials kept alive for the key)
+        self._services: Dict[Tuple[str, str, Any], Tuple[Any, Any]] = {}
+        self._builds: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+
+    def document(self, api: str, version: str) -> Optional[str]:
+        """
+        Get the bundled discovery document for an API.
+
+        Args:
+            api: API name, e.g. "calendar"
+            version: API version, e.g. "v3"
+
+        Returns:
+            The discovery document JSON, or None if it isn't bundled
+        """
+        key = (api, version)
+        with self._lock:
+            if key not in self._documents:
+                self._documents[key] = discovery_cache.get_static_doc(api, version)
+                if self._documents[key] is None:
+                    logger.warning("No bundled discovery document for %s %s", api, version)
+            return self._documents[key]
+
+    def credentials(self, token_path: str, scopes: Sequence[str],
+                    credentials_path: Optional[str] = None) -> Credentials:
+        """
+        Get the shared OAuth credentials stored in a token file.
+
+        Each token file has one CredentialManager, which refreshes the
+        credentials in place in the background before they expire, so every
+        service built on them picks up the new token. When there is no
+        usable token the installed-app flow runs (this opens a browser) and
+        the result is saved to ``token_path``.
+
+        Args:
+            token_path: Path to the OAuth token JSON file
+            scopes: Scopes to request if the token file doesn't record any
+            credentials_path: OAuth client secrets file for the consent flow
+
+        Returns:
+            Valid credentials
+        """
+        key = os.path.abspath(token_path)
+        with self._lock:
+            manager = self._managers.get(key)
+            if manager is None:
+                manager = self._managers[key] = CredentialManager(token_path, scopes, credentials_path)
+        creds = manager.credentials()
+        manager.start()
+        return creds
+
+    def service(self, api: str, version: str, credentials: Any = None,
+                developer_key: Optional[str] = None) -> Any:
+        """
+        Get a service object, building it on first use.
+
+        Args:
+            api: API name, e.g. "sheets"
+            version: API version, e.g. "v4"
+            credentials: OAuth credentials (takes precedence over developer_key)
+            developer_key: API key for key-only access
+
+        Returns:
+            The shared service object
+        """
+        auth = ("credentials", id(credentials)) if credentials is not None else ("key", developer_key)
+        key = (api, version, auth)
+        with self._lock:
+            cached = self._services.get(key)
+            if cached is not None:
+                return cached[0]
+
+            document = self.document(api, version)
+            started = self.clock()
+            if document is not None:
+                service = build_from_document(document, credentials=credentials, developerKey=developer_key)
+            else:
+                service = build(api, version, credentials=credentials, developerKey=developer_key,
+                                cache_discovery=False, static_discovery=False)
+            seconds = self.clock() - started
+
+            self._services[key] = (service, credentials)
+            source = "static" if document is not None else "network"
+            self._builds.append({"api": api, "version": version, "auth": auth[0],
+                                 "discovery": source, "seconds": seconds})
+            logger.info("Built %s %s service in %.1f ms (%s discovery)", api, version, seconds * 1000, source)
+            return service
+
+    def clear(self) -> None:
+        """Drop every cached service and credential (documents are kept)."""
+        with self._lock:
+            self._services.clear()
+            managers = list(self._managers.values())
+            self._managers.clear()
+        for manager in managers:
+            manager.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache sizes, credential refreshes and per-service build times."""
+        with self._lock:
+            return {
+                "documents": sum(1 for doc in self._documents.values() if doc is not None),
+                "services": len(self._services),
+                "credentials": len(self._managers),
+                "refreshes": sum(manager.stats()["refreshes"] for manager in self._managers.values()),
+                "builds": [dict(entry) for entry in self._builds],
+            }
+
+
+_registry = ServiceRegistry()
+
+
+def get_registry() -> ServiceRegistry:
+    """Get the process-wide service registry."""
+    return _registry
@@ -0,0 +1,207 @@
+"""
+Cached reads and cell-level diff writes for Google Sheets ranges.
+"""
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Grid = List[List[Any]]
+
+_CELL = re.compile(r"^\$?([A-Za-z]*)\$?(\d*)$")
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based index (A -> 1, AA -> 27)."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def column_letters(index: int) -> str:
+    """Convert a 1-based column index to letters (1 -> A, 27 -> AA)."""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def range_origin(range_name: str) -> Tuple[str, int, int]:
+    """
+    Find the sheet and top-left cell of an A1 range.
+
+    Args:
+        range_name: A1 notation, e.g. "Prices!B2:E", "'Staff list'!A:D" or "A1:C10"
+
+    Returns:
+        Tuple of (sheet prefix including "!" or "", first row, first column), 1-based
+
+    Raises:
+        ValueError: If the range cannot be parsed
+    """
+    sheet, bang, cells = range_name.rpartition("!")
+    prefix = f"{sheet}!" if bang else ""
+    match = _CELL.match(cells.split(":", 1)[0])
+    if match is None:
+        raise ValueError(f"Unsupported A1 range: {range_name!r}")
+    letters, digits = match.groups()
+    return prefix, int(digits) if digits else 1, column_index(letters) if letters else 1
+
+
+def _cell_text(value: Any) -> str:
+    """Render a cell value the way it compares: blanks as "", whole floats without ".0"."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def diff_cells(old: Grid, new: Grid) -> List[Tuple[int, int, List[Any]]]:
+    """
+    Find runs of changed cells between two grids.
+
+    Cells missing from a ragged row compare as "" (the API trims trailing
+    empty cells). Cells present only in ``old`` are left alone, matching
+    values.update semantics. Values compare by their text, because the
+    cache is read unformatted: a sheet number 10 equals a desired "10".
+
+    Returns:
+        List of (row offset, column offset, values) runs of adjacent changed cells
+    """
+    runs = []
+    for r, row in enumerate(new):
+        old_row = old[r] if r < len(old) else []
+        run_start = None
+        for c, value in enumerate(row):
+            previous = old_row[c] if c < len(old_row) else ""
+            changed = _cell_text(value) != _cell_text(previous)
+            if changed and run_start is None:
+                run_start = c
+            elif not changed and run_start is not None:
+                runs.append((r, run_start, list(row[run_start:c])))
+                run_start = None
+        if run_start is not None:
+            runs.append((r, run_start, list(row[run_start:])))
+    return runs
+
+
+def _merge(old: Grid, new: Grid) -> Grid:
+    """Overlay new values on a cached grid the way values.update would."""
+    merged = [list(row) for row in old]
+    for r, row in enumerate(new):
+        if r >= len(merged):
+            merged.append([])
+        target = merged[r]
+        if len(target) < len(row):
+            target.extend([""] * (len(row) - len(target)))
+        target[:len(row)] = row
+    return merged
+
+
+class SheetMirror:
+    """
+    Keep a local copy of sheet ranges and write back only what changed.
+
+    ``read`` serves a range from the cache for ``ttl`` seconds after it was
+    fetched. ``sync`` diffs the desired grid against the cached one and
+    sends only the changed cells, coalesced into row runs, in a single
+    ``values.batchUpdate`` call.
+    """
+
+    def __init__(self, sheets: Any, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the mirror.
+
+        Args:
+            sheets: GoogleSheets client (read_range and batch_update_values)
+            ttl: Seconds a read stays fresh
+            clock: Monotonic clock
+        """
+        self.sheets = sheets
+        self.ttl = ttl
+        self.clock = clock
+        self._grids: Dict[str, Tuple[float, Grid]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"reads": 0, "hits": 0, "syncs": 0, "cells_sent": 0, "cells_compared": 0}
+
+    def read(self, range_name: str, use_oauth: bool = False, force: bool = False) -> Grid:
+        """
+        Read a range, from the cache when it is fresh.
+
+        Args:
+            range_name: The A1 notation of the range to read
+            use_oauth: Whether to use OAuth instead of API key
+            force: Bypass the cache
+
+        Returns:
+            A copy of the range's values
+        """
+        with self._lock:
+            cached = self._grids.get(range_name)
+        if not force and cached is not None and self.clock() - cached[0] < self.ttl:
+            self._stats["hits"] += 1
+            return [list(row) for row in cached[1]]
+
+        fetched_at = self.clock()
+        grid = self.sheets.read_range(range_name, use_oauth=use_oauth, value_render_option="UNFORMATTED_VALUE")
+        self._stats["reads"] += 1
+        with self._lock:
+            self._grids[range_name] = (fetched_at, [list(row) for row in grid])
+        return [list(row) for row in grid]
+
+    def sync(self, range_name: str, values: Grid) -> int:
+        """
+        Make a range hold the given values, sending only changed cells.
+
+        Args:
+            range_name: The A1 notation of the range
+            values: Desired values, starting at the range's top-left cell
+
+        Returns:
+            Number of cells sent
+        """
+        current = self.read(range_name, use_oauth=True)
+        runs = diff_cells(current, values)
+        self._stats["cells_compared"] += sum(len(row) for row in values)
+        if not runs:
+            return 0
+
+        prefix, first_row, first_column = range_origin(range_name)
+        data = []
+        for r, c, run in runs:
+            row = first_row + r
+            start = column_letters(first_column + c)
+            end = column_letters(first_column + c + len(run) - 1)
+            data.append({"range": f"{prefix}{start}{row}:{end}{row}", "values": [run]})
+
+        self.sheets.batch_update_values(data)
+        sent = sum(len(run) for _, _, run in runs)
+        self._stats["syncs"] += 1
+        self._stats["cells_sent"] += sent
+        logger.info("Synced %s: %s changed cells in %d runs", range_name, sent, len(runs))
+
+        with self._lock:
+            cached = self._grids.get(range_name)
+            if cached is not None:
+                self._grids[range_name] = (cached[0], _merge(cached[1], values))
+        return sent
+
+    def invalidate(self, range_name: Optional[str] = None) -> None:
+        """Forget one cached range, or all of them."""
+        with self._lock:
+            if range_name is None:
+                self._grids.clear()
+            else:
+                self._grids.pop(range_name, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get read, cache-hit and cell counters."""
+        stats = dict(self._stats)
+        stats["ranges"] = len(self._grids)
+        return stats
@@ -2,17 +2,21 @@
 Google Sheets API integration for DelaneNails.
 """
 import logging
-import os
 from typing import List, Dict, Any, Optional
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from src.config import Config
+from src.google_services.pool import AsyncResource, get_pool
+from src.google_services.registry import get_registry
+from src.google_services.sheet_mirror import SheetMirror
+from src.google_services.sheets_writer import SheetsBatchWriter
+from src.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
 class GoogleSheets:
     """Client for interacting with Google Sheets API."""
     
@@ -28,6 +32,8 @@ class GoogleSheets:
         self.credentials_path = credentials_path
         self.api_key = Config.get_google_api_key()
         self.service = None
+        # Built services by auth mode (True = OAuth); an API-key read must not serve a later write
+        self._services: Dict[bool, Any] = {}
         
         # Get Google credentials paths
         google_creds = Config.get_google_credentials()
@@ -37,52 +43,24 @@ class GoogleSheets:
     def build_service_with_api_key(self):
         """Build the service using API key (limited read-only access)."""
         try:
-            self.service = build('sheets', 'v4', developerKey=self.api_key)
+            self.service = get_registry().service('sheets', 'v4', developer_key=self.api_key)
             logger.info("Successfully built Sheets service with API key")
             return self.service
         except Exception as e:
-            logger.error(f"Error building Sheets service with API key: {e}")
+            logger.error("Error building Sheets service with API key: %s", e)
             raise
 
     def build_service_with_oauth(self):
         """Build the service using OAuth2 credentials (full access)."""
-        from google_auth_oauthlib.flow import InstalledAppFlow
-        from google.auth.transport.requests import Request
-        import json
-        
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-        
         try:
-            creds = None
-            # Check if token file exists
-            if os.path.exists(self.token_path):
-                with open(self.token_path, 'r') as token:
-                    creds = Credentials.from_authorized_user_info(
-                        info=json.load(token),
-                        scopes=SCOPES
-                    )
-            
-            # If no valid credentials, authenticate
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_path, SCOPES
-                    )
-                    creds = flow.run_local_server(port=0)
-                
-                # Save credentials for next run
-                with open(self.token_path, 'w') as token:
-                    token.write(json.dumps(json.loads(creds.to_json())))
-            
-            # Build service
-            self.service = build('sheets', 'v4', credentials=creds)
+            registry = get_registry()
+            creds = registry.credentials(self.token_path, SCOPES, self.credentials_path)
+            self.service = registry.service('sheets', 'v4', credentials=creds)
             logger.info("Successfully built Sheets service with OAuth")
             return self.service
             
         except Exception as e:
-            logger.error(f"Error building Sheets service with OAuth: {e}")
+            logger.error("Error building Sheets service with OAuth: %s", e)
             raise
 
     def get_service(self, use_oauth: bool = True):
@@ -95,21 +73,39 @@ class GoogleSheets:
         Returns:
             The Sheets service
         """
-        if self.service:
-            return self.service
+        service = self._services.get(use_oauth)
+        if service is not None:
+            return service
             
         if use_oauth:
-            return self.build_service_with_oauth()
+            service = self.build_service_with_oauth()
         else:
-            return self.build_service_with_api_key()
+            service = self.build_service_with_api_key()
+        self._services[use_oauth] = service
+        return service
+
+    def async_service(self, use_oauth: bool = True) -> AsyncResource:
+        """
+        Get an async facade over the Sheets service.
+        
+        Args:
+            use_oauth: Whether to use OAuth (True) or API key (False)
+        
+        Returns:
+            The service, with API methods returning awaitables
+        """
+        return get_pool().wrap(self.get_service(use_oauth=use_oauth))
 
-    def read_range(self, range_name: str, use_oauth: bool = False) -> List[List[Any]]:
+    @timed("sheets")
+    def read_range(self, range_name: str, use_oauth: bool = False,
+                   value_render_option: str = 'FORMATTED_VALUE') -> List[List[Any]]:
         """
         Read data from a range in a spreadsheet.
         
         Args:
             range_name: The A1 notation of the range to read
             use_oauth: Whether to use OAuth instead of API key
+            value_render_option: FORMATTED_VALUE, UNFORMATTED_VALUE or FORMULA
             
         Returns:
             The values from the range
@@ -120,26 +116,30 @@ class GoogleSheets:
         service = self.get_service(use_oauth=use_oauth)
         
         try:
-            result = service.spreadsheets().values().get(
+            result = get_pool().execute(service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
-                range=range_name
-            ).execute()
+                range=range_name,
+                valueRenderOption=value_render_option
+            ))
             
             values = result.get('values', [])
-            logger.info(f"Read {len(values)} rows from sheet")
+            logger.info("Read %d rows from sheet", len(values))
             return values
             
         except HttpError as e:
-            logger.error(f"HTTP error reading from sheet: {e}")
+            logger.error("HTTP error reading from sheet: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error reading from sheet: {e}")
+            logger.error("Error reading from sheet: %s", e)
             raise
 
+    @timed("sheets")
     def write_range(self, range_name: str, values: List[List[Any]]) -> int:
         """
         Write data to a range in a spreadsheet.
         
+        This sends every cell; use mirror().sync() to send only cells that changed.
+        
         Args:
             range_name: The A1 notation of the range to write
             values: The data to write
@@ -157,32 +157,86 @@ class GoogleSheets:
             body = {
                 'values': values
             }
-            result = service.spreadsheets().values().update(
+            result = get_pool().execute(service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
                 range=range_name,
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ))
             
             updated_cells = result.get('updatedCells', 0)
-            logger.info(f"Updated {updated_cells} cells in sheet")
+            logger.info("Updated %s cells in sheet", updated_cells)
             return updated_cells
             
         except HttpError as e:
-            logger.error(f"HTTP error writing to sheet: {e}")
+            logger.error("HTTP error writing to sheet: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error writing to sheet: {e}")
+            logger.error("Error writing to sheet: %s", e)
+            raise
+
+    @timed("sheets")
+    def batch_update_values(self, data: List[Dict[str, Any]]) -> int:
+        """
+        Write several ranges in one API call.
+        
+        Args:
+            data: List of {"range": A1 range, "values": rows} entries
+            
+        Returns:
+            Number of cells updated
+        """
+        if not self.spreadsheet_id:
+            raise ValueError("spreadsheet_id is required")
+            
+        # Write operations require OAuth
+        service = self.get_service(use_oauth=True)
+        
+        try:
+            result = get_pool().execute(service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={
+                    'valueInputOption': 'RAW',
+                    'data': data
+                }
+            ))
+            
+            updated_cells = result.get('totalUpdatedCells', 0)
+            logger.info("Updated %s cells in %d ranges", updated_cells, len(data))
+            return updated_cells
+            
+        except HttpError as e:
+            logger.error("HTTP error batch writing to sheet: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error batch writing to sheet: %s", e)
             raise
 
     def append_row(self, sheet_range: str, values: List[Any]) -> int:
         """
         Append a row to a spreadsheet.
         
+        For frequent appends (e.g. logging every booking), use batch_writer()
+        so rows are sent in batches instead of one API call each.
+        
         Args:
             sheet_range: The A1 notation of the range to append to
             values: The row data to append
             
+        Returns:
+            Number of cells updated
+        """
+        return self.append_rows(sheet_range, [values])
+
+    @timed("sheets")
+    def append_rows(self, sheet_range: str, rows: List[List[Any]]) -> int:
+        """
+        Append several rows to a spreadsheet in one API call.
+        
+        Args:
+            sheet_range: The A1 notation of the range to append to
+            rows: The rows to append
+            
         Returns:
             Number of cells updated
         """
@@ -194,23 +248,47 @@ class GoogleSheets:
         
         try:
             body = {
-                'values': [values]  # Wrap in list for single row
+                'values': rows
             }
-            result = service.spreadsheets().values().append(
+            result = get_pool().execute(service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id,
                 range=sheet_range,
                 valueInputOption='RAW',
                 insertDataOption='INSERT_ROWS',
                 body=body
-            ).execute()
+            ))
             
             updated_cells = result.get('updates', {}).get('updatedCells', 0)
-            logger.info(f"Appended row with {updated_cells} cells to sheet")
+            logger.info("Appended %d rows with %s cells to sheet", len(rows), updated_cells)
             return updated_cells
             
         except HttpError as e:
-            logger.error(f"HTTP error appending to sheet: {e}")
+            logger.error("HTTP error appending to sheet: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error appending to sheet: {e}")
+            logger.error("Error appending to sheet: %s", e)
             raise
+
+    def mirror(self, ttl: float = 60.0) -> SheetMirror:
+        """
+        Create a cached mirror that reads ranges once per TTL and writes only changed cells.
+        
+        Args:
+            ttl: Seconds a read stays fresh
+            
+        Returns:
+            The mirror
+        """
+        return SheetMirror(self, ttl=ttl)
+
+    def batch_writer(self, **kwargs) -> SheetsBatchWriter:
+        """
+        Create a buffered writer that batches appends to this spreadsheet.
+        
+        Args:
+            **kwargs: SheetsBatchWriter options (max_rows, max_delay, ...)
+            
+        Returns:
+            The writer; close it (or let interpreter exit) to flush remaining rows
+        """
+        return SheetsBatchWriter(self, **kwargs)
@@ -0,0 +1,234 @@
+"""
+Buffered, batched row appends for Google Sheets.
+"""
+import atexit
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+
+from src.chat.governor import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: quota/rate limits and transient server errors
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+# 403 is also used for quota errors, distinguished by reason
+QUOTA_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Check whether a Google API error is a quota or rate-limit rejection."""
+    if not isinstance(error, HttpError):
+        return False
+    status = getattr(error.resp, "status", None)
+    if status == 429:
+        return True
+    if status == 403:
+        content = error.content.decode("utf-8", "replace") if isinstance(error.content, bytes) else str(error.content)
+        return any(reason in content for reason in QUOTA_REASONS)
+    return False
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether a Google API error is a quota or transient failure."""
+    if not isinstance(error, HttpError):
+        return False
+    return getattr(error.resp, "status", None) in RETRYABLE_STATUSES or is_rate_limited(error)
+
+
+def retry_delay(error: Exception, attempt: int, backoff: float, max_backoff: float) -> float:
+    """Seconds to wait before retrying: the server's Retry-After, else jittered exponential backoff."""
+    retry_after = parse_retry_after(getattr(error, "resp", None))
+    if retry_after is not None:
+        return retry_after
+    return min(max_backoff, backoff * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+
+class SheetsBatchWriter:
+    """
+    Accumulate appended rows and send them in as few API calls as possible.
+
+    Rows are buffered per range and flushed with one ``values.append`` per
+    range once ``max_rows`` rows are waiting or ``max_delay`` seconds have
+    passed since the oldest one. A background thread does the flushing, so
+    ``append`` never waits on the network. Quota and transient errors are
+    retried with backoff; rows from a batch that still fails go back to the
+    front of the buffer for the next flush. Pending rows are flushed on
+    ``close`` and at interpreter exit.
+    """
+
+    def __init__(self, sheets: Any, max_rows: int = 500, max_delay: float = 5.0,
+                 max_buffered: int = 10000, max_retries: int = 5, backoff: float = 1.0,
+                 max_backoff: float = 60.0, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the writer.
+
+        Args:
+            sheets: GoogleSheets client (anything with append_rows(range, rows))
+            max_rows: Pending rows that trigger a flush
+            max_delay: Seconds a row may wait before it is flushed
+            max_buffered: Rows kept while the API is failing; the oldest are dropped beyond this
+            max_retries: Retries per batch for quota and transient errors
+            backoff: Initial retry delay in seconds
+            max_backoff: Maximum retry delay in seconds
+            sleep: Sleep function used between retries
+            clock: Monotonic clock
+        """
+        self.sheets = sheets
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.max_buffered = max_buffered
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.clock = clock
+
+        self._pending: Dict[str, List[List[Any]]] = {}
+        self._count = 0
+        self._first_at: Optional[float] = None
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"rows": 0, "calls": 0, "retries": 0, "failed": 0, "dropped": 0}
+        atexit.register(self.close)
+
+    def append(self, sheet_range: str, values: List[Any]) -> None:
+        """
+        Queue a row to be appended to a range.
+
+        Args:
+            sheet_range: The A1 notation of the range to append to
+            values: The row data to append
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SheetsBatchWriter is closed")
+            self._pending.setdefault(sheet_range, []).append(list(values))
+            self._count += 1
+            if self._first_at is None:
+                self._first_at = self.clock()
+            self._trim()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sheets-batch-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _trim(self) -> None:
+        """Drop the oldest rows once the buffer exceeds its bound (lock held)."""
+        while self._count > self.max_buffered:
+            sheet_range = next(iter(self._pending))
+            rows = self._pending[sheet_range]
+            rows.pop(0)
+            if not rows:
+                del self._pending[sheet_range]
+            self._count -= 1
+            self._stats["dropped"] += 1
+
+    def _take(self) -> Dict[str, List[List[Any]]]:
+        """Remove and return everything pending (lock held)."""
+        batch, self._pending = self._pending, {}
+        self._count = 0
+        self._first_at = None
+        return batch
+
+    def _run(self) -> None:
+        """Flush whenever the size or time threshold is reached."""
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._count >= self.max_rows:
+                        break
+                    if self._first_at is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._first_at + self.max_delay - self.clock()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Send all pending rows now.
+
+        Returns:
+            Number of rows appended
+        """
+        with self._send_lock:
+            with self._cond:
+                batch = self._take()
+            sent = 0
+            for sheet_range, rows in batch.items():
+                try:
+                    self._send(sheet_range, rows)
+                    sent += len(rows)
+                except Exception as e:
+                    logger.error("Failed to append %d rows to %s: %s", len(rows), sheet_range, e)
+                    self._stats["failed"] += 1
+                    self._requeue(sheet_range, rows)
+            return sent
+
+    def _send(self, sheet_range: str, rows: List[List[Any]]) -> None:
+        """Append one range's rows in a single call, retrying quota errors."""
+        attempt = 0
+        while True:
+            try:
+                self._stats["calls"] += 1
+                self.sheets.append_rows(sheet_range, rows)
+                self._stats["rows"] += len(rows)
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_delay(e, attempt, self.backoff, self.max_backoff)
+                logger.warning("Sheets append throttled (%s), retrying in %.1fs", e.resp.status, delay)
+                self._stats["retries"] += 1
+                attempt += 1
+                self.sleep(delay)
+
+    def _requeue(self, sheet_range: str, rows: List[List[Any]]) -> None:
+        """Put a failed batch back ahead of rows queued since."""
+        with self._cond:
+            self._pending[sheet_range] = rows + self._pending.get(sheet_range, [])
+            self._count += len(rows)
+            if self._first_at is None:
+                self._first_at = self.clock()
+            self._trim()
+
+    def pending(self) -> int:
+        """Number of rows waiting to be sent."""
+        with self._cond:
+            return self._count
+
+    def close(self) -> None:
+        """Stop the background thread and flush pending rows."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "SheetsBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Get row, call and retry counters."""
+        stats = dict(self._stats)
+        stats["pending"] = self.pending()
+        return stats
@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
 from src.config import Config
+from src.utils.metrics import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class BooksyAPI:
         if not self.business_id:
             raise ValueError("Booksy Business ID is required")
             
-        logger.info(f"Initialized Booksy API client for business ID: {self.business_id}")
+        logger.info("Initialized Booksy API client for business ID: %s", self.business_id)
         
     def _get_headers(self) -> Dict[str, str]:
         """Return headers for API requests."""
@@ -41,6 +42,7 @@ class BooksyAPI:
             "Content-Type": "application/json"
         }
         
+    @timed("booksy")
     def get_available_slots(self, service_id: str, start_date: datetime, 
                             end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
@@ -74,17 +76,22 @@ class BooksyAPI:
             response.raise_for_status()
             
             data = response.json()
-            logger.info(f"Retrieved {len(data.get('slots', []))} available slots")
+            logger.info("Retrieved %d available slots", len(data.get('slots', [])))
             return data.get("slots", [])
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching available slots: {str(e)}")
+            logger.error("Error fetching available slots: %s", e)
+            mark_failed()
             return []
     
-    def get_services(self) -> List[Dict[str, Any]]:
+    @timed("booksy")
+    def get_services(self, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get list of available services.
         
+        Args:
+            raise_errors: Re-raise request errors instead of returning an empty list
+            
         Returns:
             List of services with details
         """
@@ -95,13 +102,17 @@ class BooksyAPI:
             response.raise_for_status()
             
             data = response.json()
-            logger.info(f"Retrieved {len(data.get('services', []))} services")
+            logger.info("Retrieved %d services", len(data.get('services', [])))
             return data.get("services", [])
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching services: {str(e)}")
+            logger.error("Error fetching services: %s", e)
+            mark_failed()
+            if raise_errors:
+                raise
             return []
             
+    @timed("booksy")
     def create_appointment(self, service_id: str, staff_id: str, 
                           start_time: datetime, customer_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -134,7 +145,7 @@ class BooksyAPI:
             response.raise_for_status()
             
             result = response.json()
-            logger.info(f"Created appointment ID: {result.get('id')}")
+            logger.info("Created appointment ID: %s", result.get('id'))
             
             # Send notification about new appointment
             from src.services.notification import NotificationService
@@ -148,9 +159,10 @@ class BooksyAPI:
             return result
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error creating appointment: {str(e)}")
+            logger.error("Error creating appointment: %s", e)
             raise
             
+    @timed("booksy")
     def update_appointment(self, appointment_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an existing appointment.
@@ -173,7 +185,7 @@ class BooksyAPI:
             response.raise_for_status()
             
             result = response.json()
-            logger.info(f"Updated appointment ID: {appointment_id}")
+            logger.info("Updated appointment ID: %s", appointment_id)
             
             # Send notification about updated appointment
             from src.services.notification import NotificationService
@@ -186,17 +198,21 @@ class BooksyAPI:
             return result
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error updating appointment: {str(e)}")
+            logger.error("Error updating appointment: %s", e)
             raise
             
+    @timed("booksy")
     def get_appointments(self, start_date: datetime, 
-                        end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                        end_date: Optional[datetime] = None,
+                        raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get appointments in a date range.
         
         Args:
             start_date: Start date for appointment search
             end_date: End date for appointment search (defaults to same day as start)
+            raise_errors: Re-raise request errors instead of returning an empty
+                list (callers that cache results can't tell an outage from a quiet day)
             
         Returns:
             List of appointments
@@ -220,9 +236,12 @@ class BooksyAPI:
             response.raise_for_status()
             
             data = response.json()
-            logger.info(f"Retrieved {len(data.get('appointments', []))} appointments")
+            logger.info("Retrieved %d appointments", len(data.get('appointments', [])))
             return data.get("appointments", [])
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching appointments: {str(e)}")
+            logger.error("Error fetching appointments: %s", e)
+            mark_failed()
+            if raise_errors:
+                raise
             return []
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
 from src.config import config
+from src.utils.metrics import mark_failed, timed
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -19,11 +20,11 @@ class NotificationService:
     
     def __init__(self):
         """Initialize the notification service."""
-        self.smtp_host = config.get("smtp_host")
+        self.smtp_host = config.get("smtp_host", "smtp.example.com")
         self.smtp_port = config.get("smtp_port")
         self.smtp_username = config.get("smtp_username")
         self.smtp_password = config.get("smtp_password")
-        self.from_email = config.get("from_email")
+        self.from_email = config.get("from_email", "appointments@delanenails.com")
         
         # SMS settings
         self.sms_provider = config.get("sms_provider")
@@ -168,6 +169,7 @@ class NotificationService:
         success = await self._send_email(staff_email, subject, body)
         return success
     
+    @timed("smtp", "send_email")
     async def _send_email(self, to_email: str, subject: str, body: str) -> bool:
         """
         Send an email.
@@ -201,12 +203,14 @@ class NotificationService:
                 server.login(self.smtp_username, self.smtp_password)
                 server.sendmail(self.from_email, to_email, message.as_string())
                 
-            logger.info(f"Email sent to {to_email}: {subject}")
+            logger.info("Email sent to %s: %s", to_email, subject)
             return True
         except Exception as e:
-            logger.error(f"Error sending email: {str(e)}")
+            logger.error("Error sending email: %s", e)
+            mark_failed()
             return False
     
+    @timed("sms", "send_sms")
     async def _send_sms(self, to_phone: str, message: str) -> bool:
         """
         Send an SMS message.
@@ -235,11 +239,12 @@ class NotificationService:
                     from_=self.twilio_phone_number,
                     to=to_phone
                 )
-                logger.info(f"SMS sent to {to_phone}: {sms.sid}")
+                logger.info("SMS sent to %s: %s", to_phone, sms.sid)
                 return True
             else:
-                logger.warning(f"SMS provider {self.sms_provider} not supported")
+                logger.warning("SMS provider %s not supported", self.sms_provider)
                 return False
         except Exception as e:
-            logger.error(f"Error sending SMS: {str(e)}")
+            logger.error("Error sending SMS: %s", e)
+            mark_failed()
             return False
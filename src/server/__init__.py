@@ -0,0 +1,9 @@
+"""
+Unified ASGI application for the DelaneNails web front-ends.
+
+Run with:
+    python -m src.server.app --workers 4
+"""
+from src.server.app import create_app
+
+__all__ = ["create_app"]
@@ -0,0 +1,119 @@
+"""
+Unified ASGI application: pages, JSON API, WebSocket chat and voice.
+
+Replaces the separate Flask/SocketIO servers with one event loop per worker
+process; real-time chat is a native WebSocket at /ws/{session_id}. Run one
+worker per core with:
+    python -m src.server.app --workers 4
+"""
+import argparse
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+
+from src.chat.bus import BUS_SOCKET_ENV
+from src.config import config
+from src.server.legacy import mount_legacy
+from src.server.routers import api, chat, pages, voice
+from src.server.state import HEALTH, AppState
+from src.utils.logger import setup_logger
+from src.utils.metrics import CONTENT_TYPE, get_registry
+from src.utils.tracing import TraceMiddleware
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
+
+
+def create_app(state: Optional[AppState] = None, legacy: bool = True) -> FastAPI:
+    """
+    Build the application.
+
+    Args:
+        state: Shared state (defaults to a new AppState)
+        legacy: Mount the legacy Flask routes if a2wsgi is available
+
+    Returns:
+        The FastAPI application
+    """
+    state = state or AppState()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await state.start()
+        try:
+            yield
+        finally:
+            await state.close()
+
+    app = FastAPI(
+        title="DelaneNails API",
+        description="API for DelaneNails salon services and virtual assistant",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    app.state.shared = state
+
+    app.add_middleware(TraceMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, specify actual origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(pages.router)
+    app.include_router(api.router)
+    app.include_router(chat.router)
+    app.include_router(voice.router)
+
+    @app.get("/health")
+    async def health():
+        """Health check endpoint."""
+        return HEALTH
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics for this worker process."""
+        return Response(get_registry().render(), media_type=CONTENT_TYPE)
+
+    if STATIC_DIR.is_dir():
+        app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    if legacy:
+        mount_legacy(app, state)
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+    """Run the application with one worker process per core."""
+    parser = argparse.ArgumentParser(description="DelaneNails web server")
+    parser.add_argument("--host", default=config.get("api_host", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=config.get("api_port", 8000))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Workers must share a bus so messages reach sockets held by other processes
+    if args.workers > 1 and not os.getenv(BUS_SOCKET_ENV):
+        os.environ[BUS_SOCKET_ENV] = os.path.join(tempfile.gettempdir(), "delanenails-bus.sock")
+
+    import uvicorn
+
+    # This process owns logging; replace what imported modules may have set up
+    setup_logger(force=True)
+    uvicorn.run("src.server.app:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
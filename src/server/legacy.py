@@ -0,0 +1,51 @@
+"""
+Compatibility shim serving the legacy Flask sites inside the ASGI app.
+"""
+import logging
+from typing import Any
+
+from src.server.state import AppState
+
+logger = logging.getLogger(__name__)
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    WSGIMiddleware = None
+
+# Mount point for the legacy Flask routes; src.web_simple is served below it
+LEGACY_PREFIX = "/legacy"
+SIMPLE_PREFIX = "/simple"
+
+
+def mount_legacy(app: Any, state: AppState, prefix: str = LEGACY_PREFIX) -> bool:
+    """
+    Mount the legacy Flask apps under a prefix.
+
+    src.web (booking form, flash messages) is served at the prefix and
+    src.web_simple below it at ``SIMPLE_PREFIX``. Both modules' agent and
+    reservations are replaced with the shared ones so legacy and native
+    routes see the same bookings and holds. Requires the a2wsgi package.
+
+    Args:
+        app: The FastAPI application
+        state: Shared application state
+        prefix: URL prefix for the legacy routes
+
+    Returns:
+        True if the legacy routes were mounted
+    """
+    if WSGIMiddleware is None:
+        logger.info("a2wsgi not installed; legacy Flask routes are disabled")
+        return False
+
+    from src import web, web_simple
+
+    for module in (web, web_simple):
+        module.agent = state.agent
+        module.reservations = state.reservations
+    # The longer prefix goes first; mounts match in order
+    app.mount(prefix + SIMPLE_PREFIX, WSGIMiddleware(web_simple.app))
+    app.mount(prefix, WSGIMiddleware(web.app))
+    logger.info("Legacy Flask routes mounted at %s", prefix)
+    return True
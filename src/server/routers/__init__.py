@@ -0,0 +1 @@
+"""Routers mounted by the unified ASGI application."""
@@ -0,0 +1,215 @@
+"""
+JSON API routes.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from pydantic import BaseModel
+
+from src.server.state import AppState, get_state
+from src.slots import encode_slot_id, to_minutes
+from src.storage.reservations import (
+    SlotUnavailableError, assign_claim, claim_slot, filter_available, rollback_claim
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api")
+
+
+class TextRequestModel(BaseModel):
+    message: str
+    customer_info: Optional[Dict[str, Any]] = None
+    reference_id: Optional[str] = None
+    channel: str = "web"
+    # Keeps a multi-message booking together; omit for one-off questions
+    session_id: Optional[str] = None
+
+
+class AppointmentRequestModel(BaseModel):
+    service_id: str
+    preferred_date: Optional[datetime] = None
+    preferred_time: Optional[str] = None
+    customer_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    notes: Optional[str] = None
+    hold_token: Optional[str] = None
+
+
+class SimpleBookingModel(BaseModel):
+    service_id: Optional[str] = None
+    slot_id: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_phone: Optional[str] = None
+    hold_token: Optional[str] = None
+
+
+class HoldRequestModel(BaseModel):
+    slot_id: str
+    hold_token: Optional[str] = None
+
+
+class CallbackRequestModel(BaseModel):
+    name: str
+    phone: str
+    email: Optional[str] = None
+    issue_summary: str
+    urgency: str = "normal"
+
+
+def slot_id_for(date: datetime, time_str: str) -> str:
+    """
+    Build a slot ID from a date and an "HH:MM" time.
+
+    Args:
+        date: Appointment date
+        time_str: Appointment time, e.g. "14:30"
+
+    Returns:
+        Slot ID in the API's slot_YYYYMMDDHHMM format
+
+    Raises:
+        ValueError: If the time is not a valid "HH:MM" time
+    """
+    time_parts = time_str.split(":")
+    hour = int(time_parts[0])
+    minute = int(time_parts[1]) if len(time_parts) > 1 else 0
+    return encode_slot_id(to_minutes(date.replace(hour=hour, minute=minute, second=0, microsecond=0)))
+
+
+@router.post("/chat")
+@router.post("/simple-chat")
+async def chat(request: TextRequestModel, state: AppState = Depends(get_state)):
+    """Process a text-based chat request."""
+    try:
+        conversation = state.conversation(request.session_id)
+        return {"response": await state.agent.process_message_async(request.message, conversation)}
+    except Exception as e:
+        logger.error("Error processing chat request: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/slots")
+async def slots(service_id: Optional[str] = None, date: Optional[str] = None,
+                state: AppState = Depends(get_state)) -> List[Dict[str, Any]]:
+    """Get available time slots for a service on a date."""
+    if not service_id or not date:
+        return []
+    try:
+        start_date = datetime.strptime(date, "%Y-%m-%d")
+        slots = await state.agent.api.get_available_slots_async(service_id=service_id, start_date=start_date)
+        return filter_available(state.reservations, slots).to_dicts()
+    except Exception as e:
+        logger.error("Error getting slots: %s", e)
+        return []
+
+
+@router.post("/slots/hold")
+async def hold_slot(request: HoldRequestModel, state: AppState = Depends(get_state)):
+    """Hold a slot while the customer enters their details (or extend their hold)."""
+    hold = state.reservations.hold(request.slot_id, token=request.hold_token)
+    if hold is None:
+        raise HTTPException(status_code=409, detail="Sorry, that time was just taken. Please choose another time.")
+    return hold.to_dict()
+
+
+@router.post("/slots/release")
+async def release_slot(request: HoldRequestModel, state: AppState = Depends(get_state)):
+    """Release a hold the customer no longer needs."""
+    released = bool(request.hold_token) and state.reservations.release(request.slot_id, request.hold_token)
+    return {"released": released}
+
+
+@router.post("/appointments")
+async def create_appointment(request: AppointmentRequestModel, state: AppState = Depends(get_state)):
+    """Book a new appointment from a preferred date and time."""
+    if not (request.preferred_date and request.preferred_time):
+        return {"error": "Missing date or time information"}
+
+    try:
+        slot_id = slot_id_for(request.preferred_date, request.preferred_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        token = claim_slot(state.reservations, slot_id, request.hold_token)
+    except SlotUnavailableError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    try:
+        appointment = await state.agent.api.book_appointment_async(
+            service_id=request.service_id,
+            slot_id=slot_id,
+            customer_details={
+                "name": request.customer_name,
+                "phone": request.phone,
+                "email": request.email
+            }
+        )
+    except Exception as e:
+        rollback_claim(state.reservations, slot_id, token)
+        logger.error("Error creating appointment: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    assign_claim(state.reservations, slot_id, token, appointment["appointment_id"])
+    return appointment
+
+
+@router.post("/simple-booking")
+async def simple_booking(request: SimpleBookingModel, state: AppState = Depends(get_state)):
+    """Book an appointment for a slot chosen on the booking form."""
+    if not request.service_id or not request.slot_id:
+        return {"error": "Missing service or slot information"}
+
+    try:
+        token = claim_slot(state.reservations, request.slot_id, request.hold_token)
+    except SlotUnavailableError as e:
+        return {"error": str(e)}
+
+    try:
+        appointment = await state.agent.api.book_appointment_async(
+            service_id=request.service_id,
+            slot_id=request.slot_id,
+            customer_details={
+                "name": request.customer_name,
+                "email": request.customer_email,
+                "phone": request.customer_phone
+            }
+        )
+    except Exception as e:
+        rollback_claim(state.reservations, request.slot_id, token)
+        logger.error("Error booking appointment: %s", e)
+        return {"error": str(e)}
+    assign_claim(state.reservations, request.slot_id, token, appointment["appointment_id"])
+    return appointment
+
+
+@router.post("/callback")
+async def request_callback(request: CallbackRequestModel, background_tasks: BackgroundTasks,
+                           state: AppState = Depends(get_state)):
+    """Request a callback from staff."""
+    customer_info = {
+        "name": request.name,
+        "phone": request.phone,
+        "email": request.email
+    }
+    background_tasks.add_task(
+        state.notification_service.schedule_callback,
+        customer_info=customer_info,
+        issue_summary=request.issue_summary
+    )
+    return {
+        "success": True,
+        "message": "Callback request received. Our staff will contact you shortly."
+    }
+
+
+@router.post("/send-reminders")
+async def send_reminders():
+    """Trigger sending of appointment reminders."""
+    return {
+        "success": True,
+        "message": "Reminder functionality is available in the full version."
+    }
@@ -0,0 +1,53 @@
+"""
+WebSocket chat route.
+"""
+import json
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from src.server.state import get_state
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.websocket("/ws/{session_id}")
+async def websocket_endpoint(websocket: WebSocket, session_id: str):
+    """Chat with the booking agent over a WebSocket."""
+    state = get_state(websocket)
+    manager = state.manager
+    connection = await manager.connect(websocket, session_id)
+
+    try:
+        while True:
+            data = await websocket.receive_text()
+            manager.touch(websocket)
+            try:
+                request = json.loads(data)
+            except ValueError:
+                logger.warning("Ignoring invalid WebSocket frame for session %s", session_id)
+                continue
+
+            # Heartbeat replies only refresh the connection
+            if request.get("type") == "pong":
+                continue
+
+            message = request.get("message", "")
+            customer_info = request.get("customer_info") or {}
+            if any(customer_info.values()):
+                manager.memory.set_customer_info(session_id, customer_info)
+            manager.memory.add_turn(session_id, "user", message)
+
+            try:
+                reply = await state.agent.process_message_async(message, state.conversation(session_id))
+            except Exception as e:
+                logger.error("Error processing WebSocket message: %s", e)
+                reply = "Sorry, something went wrong. Please try again."
+
+            manager.memory.add_turn(session_id, "assistant", reply)
+            await manager.send_response(connection, {"message": reply})
+
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
@@ -0,0 +1,76 @@
+"""
+HTML pages served from the shared page cache.
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+
+from src import web_pages
+from src.server.state import HEALTH, AppState, get_state
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Pages that call the salon API when (re)rendered go through the bounded
+# blocking pool; static pages are served straight from the cache.
+
+
+@router.get("/", response_class=HTMLResponse)
+async def home(request: Request, state: AppState = Depends(get_state)):
+    """Landing page for browsers; other clients get the health JSON / used to return."""
+    if "text/html" not in request.headers.get("accept", ""):
+        return JSONResponse(HEALTH, headers={"Vary": "Accept"})
+    response = state.page_cache.starlette_response(request, "home", web_pages.home_page)
+    # Shared caches must not hand the page to API clients
+    response.headers["Vary"] = "Accept, Accept-Encoding"
+    return response
+
+
+@router.get("/services", response_class=HTMLResponse)
+async def services(request: Request, state: AppState = Depends(get_state)):
+    """Services page."""
+    return await state.blocking.run(
+        "pages", state.page_cache.starlette_response,
+        request, "services", lambda: web_pages.services_page(state.agent.api.get_services())
+    )
+
+
+@router.get("/simple-chat", response_class=HTMLResponse)
+async def simple_chat(request: Request, state: AppState = Depends(get_state)):
+    """Simple chat page using the JSON API."""
+    return state.page_cache.starlette_response(request, "simple_chat", web_pages.chat_page)
+
+
+@router.get("/chat", response_class=HTMLResponse)
+async def assistant(request: Request, state: AppState = Depends(get_state)):
+    """NailAide chat page using the WebSocket and voice routes."""
+    return state.page_cache.starlette_response(request, "assistant", web_pages.assistant_page)
+
+
+@router.get("/simple-booking", response_class=HTMLResponse)
+async def simple_booking(request: Request, state: AppState = Depends(get_state)):
+    """Booking form; keyed by date because it embeds today's date."""
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    return await state.blocking.run(
+        "pages", state.page_cache.starlette_response,
+        request,
+        ("simple_booking", current_date),
+        lambda: web_pages.booking_page(state.agent.api.get_services(), current_date)
+    )
+
+
+@router.get("/simple-confirmation", response_class=HTMLResponse)
+async def simple_confirmation(id: Optional[str] = None, state: AppState = Depends(get_state)):
+    """Booking confirmation page."""
+    if not id:
+        return RedirectResponse("/")
+    try:
+        appointment = await state.agent.api.get_appointment_async(id)
+        return HTMLResponse(web_pages.confirmation_page(appointment))
+    except Exception as e:
+        logger.error("Error retrieving appointment: %s", e)
+        return RedirectResponse("/")
@@ -0,0 +1,46 @@
+"""
+Voice message route.
+"""
+import logging
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+
+from src.server.state import AppState, get_state
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/voice")
+@router.post("/api/voice")
+async def process_voice(audio: UploadFile = File(...), session_id: str = Form(""),
+                        state: AppState = Depends(get_state)):
+    """
+    Transcribe a voice message, answer it, and push the reply to the session's sockets.
+    """
+    try:
+        voice_service = state.voice_service
+    except ImportError:
+        raise HTTPException(status_code=503, detail="Voice processing is not available")
+
+    try:
+        audio_content = await audio.read()
+        transcription = await voice_service.speech_to_text(audio_content)
+        text = transcription.get("text", "")
+        if not text:
+            return {"success": False, "message": "Sorry, I couldn't hear that. Please try again."}
+
+        reply = await state.agent.process_message_async(text, state.conversation(session_id))
+        result = {"success": True, "transcription": text, "message": reply}
+
+        if session_id:
+            state.memory.add_turn(session_id, "user", text)
+            state.memory.add_turn(session_id, "assistant", reply)
+            # Reaches every socket for the session, in any worker
+            await state.manager.publish(session_id, result)
+
+        return result
+    except Exception as e:
+        logger.error("Error processing voice input: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,167 @@
+"""
+Objects shared by every router in a worker process.
+"""
+import logging
+import threading
+from typing import Any, Optional
+
+from starlette.requests import HTTPConnection
+
+from src.agent import BookingAgent, Conversation
+from src.chat.bus import MessageBus, create_bus
+from src.chat.connections import ConnectionManager
+from src.chat.memory import ConversationMemory
+from src.config import SettingsWatcher, settings
+from src.storage.appointment_store import AppointmentStore
+from src.storage.reservations import InMemoryReservations, SQLiteReservations
+from src.utils.blocking import BlockingPool
+from src.utils.page_cache import PageCache
+
+logger = logging.getLogger(__name__)
+
+# Reported by /health (and by / to clients that don't ask for HTML)
+HEALTH = {"status": "online", "version": "1.0.0"}
+
+# Concurrent blocking calls allowed per route; the rest queue on the event loop
+ROUTE_LIMITS = {
+    "pages": 4,
+    "salon_api": 8,
+    "slot_filters": 4,
+}
+
+
+def build_agent() -> BookingAgent:
+    """
+    Build a booking agent from the current settings.
+
+    Books against the local store when configured; reservations then live in
+    SQLite alongside it, so holds are shared by all workers and legacy apps.
+    """
+    current = settings()
+    store = None
+    if current.db_type == "sqlite" and current.use_local_store:
+        store = AppointmentStore(current.db_path)
+    reservations = SQLiteReservations(store.db_path) if store is not None else InMemoryReservations()
+    return BookingAgent(use_mock_api=current.use_mock_api, store=store, reservations=reservations)
+
+
+class LazyAgent:
+    """
+    Build a booking agent on first use.
+
+    Lets the legacy Flask modules be imported (e.g. to be mounted with the
+    shared agent) without opening a store and reservations of their own.
+    """
+
+    def __init__(self):
+        self._agent: Optional[BookingAgent] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> BookingAgent:
+        with self._lock:
+            if self._agent is None:
+                self._agent = build_agent()
+            return self._agent
+
+
+class AppState:
+    """
+    One booking agent, page cache, connection manager and message bus per worker.
+
+    The agent's API client keeps a pooled HTTP session, so every router
+    reuses the same keep-alive connections to the salon API. Work that can
+    still block runs in one bounded thread pool with per-route caps.
+    """
+
+    def __init__(self, agent: Optional[BookingAgent] = None, bus: Optional[MessageBus] = None,
+                 memory: Optional[ConversationMemory] = None, reservations: Optional[Any] = None):
+        """
+        Initialize shared state.
+
+        Args:
+            agent: Booking agent (defaults to build_agent())
+            bus: Message bus (defaults to create_bus())
+            memory: Conversation memory for chat sessions
+            reservations: Slot reservations (defaults to SQLite alongside the
+                local store, so holds are shared by all workers, else in-memory)
+        """
+        current = settings()
+        self.agent = agent or build_agent()
+        self.blocking = BlockingPool(
+            max_workers=current.blocking_max_workers,
+            route_limits=ROUTE_LIMITS
+        )
+        self.agent.api.blocking_pool = self.blocking
+        if reservations is None:
+            reservations = self.agent.reservations
+        if reservations is None:
+            store = self.agent.api.store
+            reservations = SQLiteReservations(store.db_path) if store is not None else InMemoryReservations()
+        # Chat bookings and cancellations go through the same reservations as the REST routes
+        self.reservations = self.agent.reservations = self.agent.api.reservations = reservations
+        self.page_cache = PageCache(ttl=300)
+        self.bus = bus or create_bus()
+        self.manager = ConnectionManager(memory=memory, bus=self.bus)
+
+        self.settings_watcher = SettingsWatcher()
+
+        self._notification_service = None
+        self._voice_service = None
+
+    @property
+    def memory(self) -> ConversationMemory:
+        """Conversation memory shared by the WebSocket and voice routes."""
+        return self.manager.memory
+
+    def conversation(self, session_id: Optional[str]) -> Conversation:
+        """
+        Get a chat session's conversation with the shared agent.
+
+        Every customer needs their own: one agent serves them all, and their
+        flows interleave. Without a session ID the conversation lasts one message.
+        """
+        if not session_id:
+            return Conversation()
+        return self.memory.conversation(session_id, Conversation)
+
+    @property
+    def notification_service(self) -> Any:
+        """Notification service, created on first use."""
+        if self._notification_service is None:
+            from src.notification import NotificationService
+            self._notification_service = NotificationService()
+        return self._notification_service
+
+    @property
+    def voice_service(self) -> Any:
+        """
+        Voice service, created on first use.
+
+        Raises:
+            ImportError: If the Google Cloud speech libraries are not installed
+        """
+        if self._voice_service is None:
+            from src.services.voice_service import VoiceService
+            self._voice_service = VoiceService()
+        return self._voice_service
+
+    async def start(self) -> None:
+        """Start background resources."""
+        await self.bus.start()
+        self.settings_watcher.start()
+
+    async def close(self) -> None:
+        """Release background resources and pooled connections."""
+        self.settings_watcher.stop()
+        await self.bus.close()
+        await self.agent.api.aclose()
+        if self.agent.api.store is not None:
+            self.agent.api.store.close()
+        if isinstance(self.reservations, SQLiteReservations):
+            self.reservations.close()
+        self.blocking.shutdown(wait=False)
+
+
+def get_state(connection: HTTPConnection) -> AppState:
+    """FastAPI dependency returning the shared state for a request or WebSocket."""
+    return connection.app.state.shared
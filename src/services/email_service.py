@@ -8,31 +8,61 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List, Any, Optional, Union
 
-from src.config import Config
+from src.config import Settings, settings
+from src.utils.metrics import mark_failed, timed
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SMTP_SERVER = "smtp.gmail.com"
+
 class EmailService:
-    """Service for sending emails."""
+    """
+    Service for sending emails.
+    
+    SMTP settings are read from the current settings snapshot on use, so a
+    hot-reloaded config file takes effect without restarting.
+    """
     
     def __init__(self):
         """Initialize email service with necessary configuration."""
-        self.config = Config()
-        
-        # Email server settings
-        self.smtp_server = self.config.get("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(self.config.get("SMTP_PORT", 587))
-        self.smtp_username = self.config.get("SMTP_USERNAME", "")
-        self.smtp_password = self.config.get("SMTP_PASSWORD", "")
-        self.sender_email = self.config.get("SENDER_EMAIL", self.smtp_username)
-        self.sender_name = self.config.get("SENDER_NAME", "Delane Nails")
-        
         # Verify credentials
         if not self.smtp_username or not self.smtp_password:
             logger.warning("SMTP credentials not properly configured")
         
         logger.info("Email service initialized")
     
+    @property
+    def config(self) -> Settings:
+        """Current settings snapshot."""
+        return settings()
+    
+    @property
+    def smtp_server(self) -> str:
+        return self.config.get("smtp_host", DEFAULT_SMTP_SERVER)
+    
+    @property
+    def smtp_port(self) -> int:
+        return self.config.smtp_port
+    
+    @property
+    def smtp_username(self) -> str:
+        return self.config.smtp_username
+    
+    @property
+    def smtp_password(self) -> str:
+        return self.config.smtp_password
+    
+    @property
+    def sender_email(self) -> str:
+        """Configured sender, else the SMTP account itself."""
+        current = self.config
+        return current.get("from_email", current.smtp_username or None)
+    
+    @property
+    def sender_name(self) -> str:
+        return self.config.sender_name
+    
+    @timed("smtp")
     async def send_email(self, to_email: str, subject: str, 
                        html_content: str, cc: Optional[List[str]] = None,
                        bcc: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -49,7 +79,7 @@ class EmailService:
         Returns:
             Dict with email sending status
         """
-        logger.info(f"Sending email to {to_email}, subject: {subject}")
+        logger.info("Sending email to %s, subject: %s", to_email, subject)
         
         if not self.smtp_username or not self.smtp_password:
             logger.error("Cannot send email: SMTP credentials not configured")
@@ -88,7 +118,7 @@ class EmailService:
                 
                 server.sendmail(self.sender_email, recipients, message.as_string())
             
-            logger.info(f"Email sent successfully to {to_email}")
+            logger.info("Email sent successfully to %s", to_email)
             return {
                 "success": True,
                 "to": to_email,
@@ -98,7 +128,8 @@ class EmailService:
             }
             
         except Exception as e:
-            logger.error(f"Error sending email to {to_email}: {str(e)}")
+            logger.error("Error sending email to %s: %s", to_email, e)
+            mark_failed()
             return {
                 "success": False,
                 "error": str(e),
@@ -124,7 +155,7 @@ class EmailService:
         Returns:
             Dict with email sending status
         """
-        logger.info(f"Sending template email '{template_name}' to {to_email}")
+        logger.info("Sending template email '%s' to %s", template_name, to_email)
         
         # In a real system, this would load an HTML template from files or a database
         # and populate it with the provided data.
@@ -137,7 +168,7 @@ class EmailService:
         elif template_name == "welcome":
             html_content = self._render_welcome(template_data)
         else:
-            logger.error(f"Unknown email template: {template_name}")
+            logger.error("Unknown email template: %s", template_name)
             return {
                 "success": False,
                 "error": f"Unknown email template: {template_name}"
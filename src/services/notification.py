@@ -10,39 +10,59 @@ from datetime import datetime, timedelta
 import twilio.rest
 from twilio.base.exceptions import TwilioRestException
 
-from src.config import Config
+from src.config import Settings, settings
 from src.services.email_service import EmailService
+from src.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
 class NotificationService:
-    """Service for sending notifications via email, SMS, etc."""
+    """
+    Service for sending notifications via email, SMS, etc.
+    
+    Twilio credentials and staff contacts are read from the current settings
+    snapshot on use; the Twilio client is rebuilt when its credentials change.
+    """
     
     def __init__(self):
         """Initialize notification service."""
-        self.config = Config()
-        
-        # Initialize Twilio for SMS
-        twilio_account_sid = self.config.get("TWILIO_ACCOUNT_SID")
-        twilio_auth_token = self.config.get("TWILIO_AUTH_TOKEN")
-        
-        if twilio_account_sid and twilio_auth_token:
-            self.twilio_client = twilio.rest.Client(twilio_account_sid, twilio_auth_token)
-            self.twilio_phone = self.config.get("TWILIO_PHONE_NUMBER")
-        else:
-            self.twilio_client = None
-            self.twilio_phone = None
+        self._twilio_credentials = None
+        self._twilio_client = None
+        if self.twilio_client is None:
             logger.warning("Twilio credentials not found, SMS notifications disabled")
         
         # Initialize email service
         self.email_service = EmailService()
         
-        # Staff notification settings
-        self.staff_emails = self.config.get("STAFF_EMAILS", ["maecity@aol.com"])
-        self.owner_phone = self.config.get("OWNER_PHONE")
-        
         logger.info("Notification service initialized")
     
+    @property
+    def config(self) -> Settings:
+        """Current settings snapshot."""
+        return settings()
+    
+    @property
+    def twilio_client(self) -> Optional[twilio.rest.Client]:
+        """Twilio client for the configured credentials, or None if not configured."""
+        current = self.config
+        credentials = (current.twilio_account_sid, current.twilio_auth_token)
+        if credentials != self._twilio_credentials:
+            self._twilio_client = twilio.rest.Client(*credentials) if all(credentials) else None
+            self._twilio_credentials = credentials
+        return self._twilio_client
+    
+    @property
+    def twilio_phone(self) -> Optional[str]:
+        return self.config.twilio_phone_number or None
+    
+    @property
+    def staff_emails(self) -> List[str]:
+        return list(self.config.staff_emails)
+    
+    @property
+    def owner_phone(self) -> Optional[str]:
+        return self.config.owner_phone
+    
     async def send_appointment_confirmation(self, email: str, appointment_details: Dict[str, Any],
                                           admin_email: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -56,7 +76,7 @@ class NotificationService:
         Returns:
             Dict with notification status
         """
-        logger.info(f"Sending appointment confirmation to {email}")
+        logger.info("Sending appointment confirmation to %s", email)
         
         # Format appointment date/time
         start_time = appointment_details.get("start_time", "")
@@ -156,7 +176,7 @@ class NotificationService:
         Returns:
             Dict with notification status
         """
-        logger.info(f"Sending appointment reminder to {email}")
+        logger.info("Sending appointment reminder to %s", email)
         results = {}
         
         # Format appointment date/time
@@ -194,20 +214,16 @@ class NotificationService:
             try:
                 sms_message = f"Reminder: Your appointment at Delane Nails is tomorrow, {formatted_date} at {formatted_time}. Call (404) 555-1234 if you need to reschedule."
                 
-                message = self.twilio_client.messages.create(
-                    body=sms_message,
-                    from_=self.twilio_phone,
-                    to=phone
-                )
+                message = self._send_sms(phone, sms_message)
                 
                 results["sms"] = {
                     "success": True,
                     "message_id": message.sid
                 }
-                logger.info(f"SMS reminder sent to {phone}")
+                logger.info("SMS reminder sent to %s", phone)
                 
             except TwilioRestException as e:
-                logger.error(f"Error sending SMS reminder: {str(e)}")
+                logger.error("Error sending SMS reminder: %s", e)
                 results["sms"] = {
                     "success": False,
                     "error": str(e)
@@ -228,7 +244,7 @@ class NotificationService:
         Returns:
             Dict with notification status
         """
-        logger.info(f"Sending staff alert: {subject}")
+        logger.info("Sending staff alert: %s", subject)
         results = {}
         
         # Send email to all staff
@@ -262,20 +278,16 @@ class NotificationService:
             try:
                 sms_message = f"URGENT: {subject}"
                 
-                message = self.twilio_client.messages.create(
-                    body=sms_message,
-                    from_=self.twilio_phone,
-                    to=self.owner_phone
-                )
+                message = self._send_sms(self.owner_phone, sms_message)
                 
                 results["sms"] = {
                     "success": True,
                     "message_id": message.sid
                 }
-                logger.info(f"Urgent SMS alert sent to owner")
+                logger.info("Urgent SMS alert sent to owner")
                 
             except TwilioRestException as e:
-                logger.error(f"Error sending SMS alert: {str(e)}")
+                logger.error("Error sending SMS alert: %s", e)
                 results["sms"] = {
                     "success": False,
                     "error": str(e)
@@ -283,6 +295,23 @@ class NotificationService:
         
         return results
     
+    @timed("sms", "send_sms")
+    def _send_sms(self, to_phone: str, body: str) -> Any:
+        """
+        Send an SMS through Twilio.
+        
+        Returns:
+            The Twilio message
+            
+        Raises:
+            TwilioRestException: If Twilio rejects the message
+        """
+        return self.twilio_client.messages.create(
+            body=body,
+            from_=self.twilio_phone,
+            to=to_phone
+        )
+    
     async def schedule_callback(self, customer_info: Dict[str, Any], 
                               issue_summary: str) -> Dict[str, Any]:
         """
@@ -295,7 +324,7 @@ class NotificationService:
         Returns:
             Dict with scheduling status
         """
-        logger.info(f"Scheduling callback for customer {customer_info.get('name', 'Unknown')}")
+        logger.info("Scheduling callback for customer %s", customer_info.get('name', 'Unknown'))
         
         # Send staff notification
         subject = f"Customer Callback Request"
@@ -12,7 +12,8 @@ import google.cloud.speech as speech
 import google.cloud.texttospeech as tts
 from google.oauth2 import service_account
 
-from src.config import Config
+from src.config import Settings, settings
+from src.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +22,44 @@ class VoiceService:
     
     def __init__(self):
         """Initialize voice service with necessary credentials."""
-        self.config = Config()
-        
-        # Setup Google Cloud credentials
-        credentials_json = self.config.get("GOOGLE_CREDENTIALS_JSON")
-        if credentials_json:
-            self.credentials = service_account.Credentials.from_service_account_info(credentials_json)
-        else:
-            self.credentials = None
+        self._credentials_json = None
+        self._clients = None
+        self._clients_for_current()
+        if self.credentials is None:
             logger.warning("Google Cloud credentials not found, using application default credentials")
         
-        # Initialize clients
-        self.speech_client = speech.SpeechClient(credentials=self.credentials)
-        self.tts_client = tts.TextToSpeechClient(credentials=self.credentials)
-        
         logger.info("Voice service initialized")
     
+    @property
+    def config(self) -> Settings:
+        """Current settings snapshot."""
+        return settings()
+    
+    def _clients_for_current(self) -> Tuple[Any, Any, Any]:
+        """(credentials, speech client, TTS client), rebuilt when the configured credentials change."""
+        credentials_json = self.config.google_credentials_json
+        if self._clients is None or credentials_json != self._credentials_json:
+            credentials = None
+            if credentials_json:
+                credentials = service_account.Credentials.from_service_account_info(dict(credentials_json))
+            self._clients = (credentials, speech.SpeechClient(credentials=credentials),
+                             tts.TextToSpeechClient(credentials=credentials))
+            self._credentials_json = credentials_json
+        return self._clients
+    
+    @property
+    def credentials(self) -> Any:
+        return self._clients_for_current()[0]
+    
+    @property
+    def speech_client(self) -> speech.SpeechClient:
+        return self._clients_for_current()[1]
+    
+    @property
+    def tts_client(self) -> tts.TextToSpeechClient:
+        return self._clients_for_current()[2]
+    
+    @timed("speech")
     async def speech_to_text(self, audio_content: bytes, 
                            language_code: str = "en-US") -> Dict[str, Any]:
         """
@@ -49,7 +72,7 @@ class VoiceService:
         Returns:
             Dict with transcription results
         """
-        logger.info(f"Processing speech to text, content size: {len(audio_content)} bytes")
+        logger.info("Processing speech to text, content size: %d bytes", len(audio_content))
         
         # Run in a separate thread to prevent blocking
         loop = asyncio.get_event_loop()
@@ -98,7 +121,7 @@ class VoiceService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error in speech recognition: {str(e)}")
+            logger.error("Error in speech recognition: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -107,6 +130,7 @@ class VoiceService:
                 "confidence": 0.0
             }
     
+    @timed("tts")
     async def text_to_speech(self, text: str, voice_name: str = "en-US-Wavenet-F",
                            voice_gender: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -120,7 +144,7 @@ class VoiceService:
         Returns:
             Dict with audio content and metadata
         """
-        logger.info(f"Converting text to speech: '{text[:50]}...' using voice {voice_name}")
+        logger.info("Converting text to speech: '%s...' using voice %s", text[:50], voice_name)
         
         # Run in a separate thread to prevent blocking
         loop = asyncio.get_event_loop()
@@ -183,7 +207,7 @@ class VoiceService:
             }
             
         except Exception as e:
-            logger.error(f"Error in speech synthesis: {str(e)}")
+            logger.error("Error in speech synthesis: %s", e)
             return {
                 "success": False,
                 "error": str(e),
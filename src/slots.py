@@ -0,0 +1,344 @@
+"""
+Compact value types for appointment slots and bookings.
+
+Times are stored as integer minutes since 1970-01-01 in salon wall-clock
+time. Slot IDs (``slot_YYYYMMDDHHMM``) are encoded and decoded only here;
+the ISO-string dictionaries the HTTP API speaks are produced only by the
+``to_dict``/``to_dicts`` methods at the edge.
+"""
+import re
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+DEFAULT_DURATION = 60
+
+_ISO = "%Y-%m-%dT%H:%M:%S"
+_SLOT_ID = re.compile(r"slot_(\d{12})")
+
+
+def to_minutes(dt: datetime) -> int:
+    """Convert a datetime to epoch minutes, keeping its wall-clock time."""
+    return (dt.replace(tzinfo=None) - EPOCH) // MINUTE
+
+
+def from_minutes(minutes: int) -> datetime:
+    """Convert epoch minutes back to a naive datetime."""
+    return EPOCH + timedelta(minutes=minutes)
+
+
+def parse_time(value: str) -> int:
+    """Convert an ISO timestamp from the API to epoch minutes."""
+    return to_minutes(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def format_time(minutes: int) -> str:
+    """Format epoch minutes as the API's ISO timestamp."""
+    return from_minutes(minutes).strftime(_ISO)
+
+
+def encode_slot_id(minutes: int) -> str:
+    """Build the slot ID for a start time given in epoch minutes."""
+    return f"slot_{from_minutes(minutes).strftime('%Y%m%d%H%M')}"
+
+
+def decode_slot_id(slot_id: str) -> int:
+    """
+    Get the start time encoded in a slot ID.
+
+    Args:
+        slot_id: Slot ID in slot_YYYYMMDDHHMM format
+
+    Returns:
+        Start time in epoch minutes
+
+    Raises:
+        ValueError: If the slot ID is malformed
+    """
+    match = _SLOT_ID.fullmatch(slot_id or "")
+    if match is None:
+        raise ValueError(f"Invalid slot ID: {slot_id!r}")
+    return to_minutes(datetime.strptime(match.group(1), "%Y%m%d%H%M"))
+
+
+class Slot:
+    """
+    A bookable time slot.
+
+    Item access (``slot["start_time"]``) reads the slot's JSON form, for
+    callers written against the dictionaries the API returns.
+    """
+
+    __slots__ = ("start", "duration", "service_id")
+
+    _KEYS = ("id", "start_time", "end_time", "available", "service_id")
+
+    def __init__(self, start: int, duration: int = DEFAULT_DURATION, service_id: str = "default-service"):
+        self.start = start
+        self.duration = duration
+        self.service_id = service_id
+
+    @property
+    def id(self) -> str:
+        return encode_slot_id(self.start)
+
+    @property
+    def end(self) -> int:
+        return self.start + self.duration
+
+    @property
+    def starts_at(self) -> datetime:
+        return from_minutes(self.start)
+
+    @property
+    def ends_at(self) -> datetime:
+        return from_minutes(self.end)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return self.to_dict()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Slot):
+            return NotImplemented
+        return (self.start, self.duration, self.service_id) == (other.start, other.duration, other.service_id)
+
+    def __repr__(self) -> str:
+        return f"Slot({self.id!r}, duration={self.duration}, service_id={self.service_id!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the API's slot dictionary."""
+        return {
+            "id": self.id,
+            "start_time": format_time(self.start),
+            "end_time": format_time(self.end),
+            "available": True,
+            "service_id": self.service_id,
+        }
+
+
+class SlotSet:
+    """
+    An ordered collection of slots for one service, backed by typed arrays.
+
+    Each slot costs six bytes (a 32-bit start and a 16-bit duration), so a
+    month of availability fits in a couple of kilobytes. Slot objects are
+    only created when items are accessed.
+    """
+
+    __slots__ = ("starts", "durations", "service_id")
+
+    def __init__(self, starts: Iterable[int] = (), durations: Optional[Iterable[int]] = None,
+                 service_id: str = "default-service"):
+        """
+        Initialize the collection.
+
+        Args:
+            starts: Slot start times in epoch minutes
+            durations: Slot lengths in minutes (defaults to an hour each)
+            service_id: Service the slots are for
+        """
+        self.starts = array("i", starts)
+        if durations is None:
+            self.durations = array("H", [DEFAULT_DURATION]) * len(self.starts)
+        else:
+            self.durations = array("H", durations)
+        if len(self.durations) != len(self.starts):
+            raise ValueError("starts and durations must be the same length")
+        self.service_id = service_id
+
+    @classmethod
+    def from_dicts(cls, slots: Iterable[Dict[str, Any]], service_id: Optional[str] = None) -> "SlotSet":
+        """
+        Decode slot dictionaries returned by the HTTP API.
+
+        Args:
+            slots: Dictionaries with start_time and (optionally) end_time
+            service_id: Service the slots are for (defaults to the first slot's)
+
+        Returns:
+            The decoded collection
+        """
+        starts = array("i")
+        durations = array("H")
+        for slot in slots:
+            start = parse_time(slot["start_time"])
+            end = parse_time(slot["end_time"]) if slot.get("end_time") else start + DEFAULT_DURATION
+            starts.append(start)
+            durations.append(end - start)
+            if service_id is None:
+                service_id = slot.get("service_id")
+        return cls(starts, durations, service_id or "default-service")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __iter__(self) -> Iterator[Slot]:
+        for start, duration in zip(self.starts, self.durations):
+            yield Slot(start, duration, self.service_id)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Slot, "SlotSet"]:
+        if isinstance(index, slice):
+            return SlotSet(self.starts[index], self.durations[index], self.service_id)
+        return Slot(self.starts[index], self.durations[index], self.service_id)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, Slot):
+            return item.service_id == self.service_id and item.start in self.starts
+        if isinstance(item, str):
+            try:
+                return decode_slot_id(item) in self.starts
+            except ValueError:
+                return False
+        return item in self.starts
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the slot arrays."""
+        return len(self.starts) * self.starts.itemsize + len(self.durations) * self.durations.itemsize
+
+    def ids(self) -> List[str]:
+        """Get the slot IDs in order."""
+        return [encode_slot_id(start) for start in self.starts]
+
+    def without(self, starts: Iterable[int]) -> "SlotSet":
+        """
+        Drop slots starting at any of the given times.
+
+        Args:
+            starts: Start times in epoch minutes
+
+        Returns:
+            A new collection (this one if nothing was dropped)
+        """
+        excluded = set(starts)
+        if not excluded:
+            return self
+        keep = [i for i, start in enumerate(self.starts) if start not in excluded]
+        if len(keep) == len(self.starts):
+            return self
+        return SlotSet((self.starts[i] for i in keep), (self.durations[i] for i in keep), self.service_id)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to the API's list of slot dictionaries."""
+        return [slot.to_dict() for slot in self]
+
+
+def generate_slots(service_id: Optional[str] = None, start_date: Optional[datetime] = None,
+                   days: int = 7, open_hour: int = 9, close_hour: int = 17,
+                   duration: int = DEFAULT_DURATION, now: Optional[datetime] = None) -> SlotSet:
+    """
+    Generate the salon's standard slots, skipping any already in the past.
+
+    Args:
+        service_id: Service the slots are for
+        start_date: First day to generate (defaults to today)
+        days: Number of days to generate
+        open_hour: Hour the first slot of each day starts
+        close_hour: Hour the last slot of each day must start before
+        duration: Slot length in minutes
+        now: Current time (defaults to datetime.now())
+
+    Returns:
+        The generated slots in start order
+    """
+    now = now or datetime.now()
+    start_date = start_date or now
+    first_day = to_minutes(start_date.replace(hour=0, minute=0, second=0, microsecond=0))
+    now_minutes = (now.replace(tzinfo=None) - EPOCH) / MINUTE
+
+    starts = array("i")
+    for day in range(days):
+        day_start = first_day + day * 1440
+        for minute in range(open_hour * 60, close_hour * 60, duration):
+            start = day_start + minute
+            if start >= now_minutes:
+                starts.append(start)
+    return SlotSet(starts, array("H", [duration]) * len(starts), service_id or "default-service")
+
+
+class Appointment:
+    """A booked appointment."""
+
+    __slots__ = ("appointment_id", "service_id", "start", "duration", "status",
+                 "customer_name", "customer_email", "customer_phone", "service_name")
+
+    def __init__(self, appointment_id: str, service_id: str, start: int,
+                 duration: int = DEFAULT_DURATION, status: str = "confirmed",
+                 customer_name: str = "", customer_email: str = "", customer_phone: str = "",
+                 service_name: Optional[str] = None):
+        self.appointment_id = appointment_id
+        self.service_id = service_id
+        self.start = start
+        self.duration = duration
+        self.status = status
+        self.customer_name = customer_name
+        self.customer_email = customer_email
+        self.customer_phone = customer_phone
+        self.service_name = service_name
+
+    @classmethod
+    def for_slot(cls, service_id: str, slot_id: str, customer_details: Dict[str, str],
+                 service_name: Optional[str] = None) -> "Appointment":
+        """
+        Create a confirmed appointment for a slot.
+
+        The ID carries the slot ID plus a random suffix, so a slot that is
+        cancelled and booked again gets a new appointment ID.
+
+        Args:
+            service_id: ID of the booked service
+            slot_id: ID of the booked slot
+            customer_details: Customer name, email and phone
+            service_name: Display name of the service
+
+        Returns:
+            The appointment
+
+        Raises:
+            ValueError: If the slot ID is malformed
+        """
+        return cls(
+            appointment_id=f"appt-{slot_id}-{uuid.uuid4().hex[:8]}",
+            service_id=service_id,
+            start=decode_slot_id(slot_id),
+            customer_name=customer_details.get("name") or "",
+            customer_email=customer_details.get("email") or "",
+            customer_phone=customer_details.get("phone") or "",
+            service_name=service_name,
+        )
+
+    @property
+    def slot_id(self) -> str:
+        return encode_slot_id(self.start)
+
+    @property
+    def starts_at(self) -> datetime:
+        return from_minutes(self.start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the API's appointment dictionary."""
+        appointment = {
+            "appointment_id": self.appointment_id,
+            "slot_id": self.slot_id,
+            "service_id": self.service_id,
+            "status": self.status,
+            "start_time": format_time(self.start),
+            "end_time": format_time(self.start + self.duration),
+            "customer_name": self.customer_name,
+            "customer_email": self.customer_email,
+            "customer_phone": self.customer_phone,
+        }
+        if self.service_name is not None:
+            appointment["service_name"] = self.service_name
+        return appointment
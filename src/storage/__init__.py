@@ -0,0 +1,11 @@
+"""Local persistence for appointments and slot holds."""
+from src.storage.appointment_store import AppointmentStore
+from src.storage.reservations import (
+    InMemoryReservations, SQLiteReservations, SlotUnavailableError, assign_claim, claim_slot, filter_available,
+    rollback_claim
+)
+
+__all__ = [
+    "AppointmentStore", "InMemoryReservations", "SQLiteReservations",
+    "SlotUnavailableError", "assign_claim", "claim_slot", "filter_available", "rollback_claim",
+]
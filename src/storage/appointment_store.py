@@ -0,0 +1,275 @@
+"""
+SQLite repository for appointments.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+# Stored fields, in column order
+FIELDS = (
+    "appointment_id", "slot_id", "service_id", "service_name", "status",
+    "start_time", "end_time", "customer_name", "customer_email", "customer_phone",
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS appointments ("
+    " appointment_id TEXT PRIMARY KEY,"
+    " slot_id TEXT,"
+    " service_id TEXT,"
+    " service_name TEXT,"
+    " status TEXT NOT NULL DEFAULT 'confirmed',"
+    " start_time TEXT NOT NULL,"
+    " end_time TEXT,"
+    " customer_name TEXT,"
+    " customer_email TEXT,"
+    " customer_phone TEXT,"
+    " email_key TEXT,"
+    " phone_key TEXT,"
+    " created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_appointments_start ON appointments (start_time)",
+    # At most one confirmed appointment per start time; canceled ones don't count
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_appointments_confirmed_start"
+    " ON appointments (start_time) WHERE status = 'confirmed'",
+    "CREATE INDEX IF NOT EXISTS idx_appointments_phone ON appointments (phone_key)",
+    "CREATE INDEX IF NOT EXISTS idx_appointments_email ON appointments (email_key)",
+)
+
+# Statements are module constants so sqlite3's statement cache reuses them
+_INSERT = (
+    f"INSERT INTO appointments ({', '.join(FIELDS)}, email_key, phone_key, created_at)"
+    f" VALUES ({', '.join('?' * (len(FIELDS) + 3))})"
+)
+_SELECT = f"SELECT {', '.join(FIELDS)} FROM appointments"
+_BY_ID = f"{_SELECT} WHERE appointment_id = ?"
+_BY_PHONE = f"{_SELECT} WHERE phone_key = ? ORDER BY start_time"
+_BY_EMAIL = f"{_SELECT} WHERE email_key = ? ORDER BY start_time"
+_BETWEEN = f"{_SELECT} WHERE start_time >= ? AND start_time < ? ORDER BY start_time"
+_BETWEEN_STATUS = f"{_SELECT} WHERE start_time >= ? AND start_time < ? AND status = ? ORDER BY start_time"
+_SET_STATUS = "UPDATE appointments SET status = ? WHERE appointment_id = ?"
+_SET_STATUS_FROM = f"{_SET_STATUS} AND status = ?"
+# Times as epoch minutes; created_at is converted from UTC to wall-clock time like start_time
+_ANALYTICS_ROWS = (
+    "SELECT CAST(strftime('%s', start_time) AS INTEGER) / 60,"
+    " COALESCE(CAST(strftime('%s', end_time) AS INTEGER) / 60, CAST(strftime('%s', start_time) AS INTEGER) / 60 + 60),"
+    " service_id, status,"
+    " CAST(strftime('%s', created_at, 'unixepoch', 'localtime') AS INTEGER) / 60"
+    " FROM appointments WHERE start_time >= ? AND start_time < ?"
+)
+
+_NON_DIGITS = re.compile(r"\D")
+
+TimeValue = Union[datetime, str]
+
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    """Normalize a phone number for lookups (digits only)."""
+    digits = _NON_DIGITS.sub("", phone or "")
+    return digits or None
+
+
+def email_key(email: Optional[str]) -> Optional[str]:
+    """Normalize an email address for lookups."""
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def _time_str(value: TimeValue) -> str:
+    """Format a datetime the way start_time is stored (ISO, seconds precision)."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%S")
+    return value
+
+
+class AppointmentStore:
+    """
+    Appointments persisted in SQLite (WAL mode).
+
+    Appointments are indexed by ID, start time, customer phone and customer
+    email, so lookups and a day's range scan touch only matching rows.
+    Start times are stored as ISO strings, which sort chronologically.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database (defaults to config "db_path";
+                ":memory:" for a private in-memory store)
+        """
+        self.db_path = db_path or config.get("db_path", "delane_nails.db")
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     isolation_level=None, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        logger.info("Appointment store initialized at %s", self.db_path)
+
+    @staticmethod
+    def _row(appointment: Dict[str, Any], now: float) -> tuple:
+        """Build the insert parameters for one appointment."""
+        values = [appointment.get(field) for field in FIELDS]
+        values[FIELDS.index("start_time")] = _time_str(appointment["start_time"])
+        if appointment.get("end_time") is not None:
+            values[FIELDS.index("end_time")] = _time_str(appointment["end_time"])
+        if not values[FIELDS.index("status")]:
+            values[FIELDS.index("status")] = "confirmed"
+        return (*values, email_key(appointment.get("customer_email")),
+                phone_key(appointment.get("customer_phone")), now)
+
+    @staticmethod
+    def _to_dict(row: tuple) -> Dict[str, Any]:
+        """Convert a selected row to an appointment dictionary."""
+        return dict(zip(FIELDS, row))
+
+    def add(self, appointment: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert one appointment.
+
+        Args:
+            appointment: Appointment with at least appointment_id and start_time
+
+        Returns:
+            The stored appointment
+
+        Raises:
+            ValueError: If an appointment with the same ID exists, or a
+                confirmed appointment already starts at the same time
+        """
+        try:
+            with self._lock:
+                self._conn.execute(_INSERT, self._row(appointment, time.time()))
+        except sqlite3.IntegrityError as e:
+            if "start_time" in str(e):
+                raise ValueError(f"An appointment is already booked at {_time_str(appointment['start_time'])}")
+            raise ValueError(f"Appointment {appointment['appointment_id']} already exists")
+        return self.get(appointment["appointment_id"])
+
+    def add_many(self, appointments: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert appointments in a single transaction.
+
+        Args:
+            appointments: Appointments to insert
+
+        Returns:
+            Number of appointments inserted
+        """
+        now = time.time()
+        rows = [self._row(appointment, now) for appointment in appointments]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_INSERT, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def get(self, appointment_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an appointment by ID.
+
+        Returns:
+            The appointment, or None if it does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(_BY_ID, (appointment_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def find_by_phone(self, phone: str) -> List[Dict[str, Any]]:
+        """Get a customer's appointments by phone number (any formatting)."""
+        with self._lock:
+            rows = self._conn.execute(_BY_PHONE, (phone_key(phone),)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def find_by_email(self, email: str) -> List[Dict[str, Any]]:
+        """Get a customer's appointments by email address (case-insensitive)."""
+        with self._lock:
+            rows = self._conn.execute(_BY_EMAIL, (email_key(email),)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def between(self, start: TimeValue, end: TimeValue,
+                status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get appointments starting in [start, end), ordered by start time.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            status: Only return appointments with this status
+
+        Returns:
+            List of appointments
+        """
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute(_BETWEEN, (_time_str(start), _time_str(end))).fetchall()
+            else:
+                rows = self._conn.execute(
+                    _BETWEEN_STATUS, (_time_str(start), _time_str(end), status)
+                ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def on_day(self, day: datetime, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the appointments starting on a calendar day."""
+        start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.between(start, start + timedelta(days=1), status)
+
+    def set_status(self, appointment_id: str, status: str,
+                   expected: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Change an appointment's status (e.g. to "canceled").
+
+        Args:
+            appointment_id: ID of the appointment
+            status: New status
+            expected: Only change the appointment if it currently has this status
+
+        Returns:
+            The updated appointment, or None if it does not exist (or its
+            status was not expected)
+        """
+        with self._lock:
+            if expected is None:
+                updated = self._conn.execute(_SET_STATUS, (status, appointment_id)).rowcount
+            else:
+                updated = self._conn.execute(_SET_STATUS_FROM, (status, appointment_id, expected)).rowcount
+        return self.get(appointment_id) if updated else None
+
+    def analytics_rows(self, start: TimeValue, end: TimeValue) -> List[tuple]:
+        """
+        Get compact rows for appointments starting in [start, end).
+
+        Returns:
+            List of (start_minute, end_minute, service_id, status, created_minute)
+            tuples, with times in epoch minutes
+        """
+        with self._lock:
+            return self._conn.execute(_ANALYTICS_ROWS, (_time_str(start), _time_str(end))).fetchall()
+
+    def count(self) -> int:
+        """Get the number of stored appointments."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM appointments").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,423 @@
+"""
+Slot reservations: short holds while a customer types, then an atomic confirm.
+
+A slot is free, held (with a token and an expiry) or confirmed. ``hold``
+only succeeds on a free slot, an expired hold, or the caller's own hold
+(which extends it). ``confirm`` is a compare-and-swap from the caller's
+unexpired hold to confirmed, so of any number of racing customers exactly
+one gets the slot. Once the appointment is booked, ``assign`` hands the
+confirmation from the claim token to the appointment ID, so cancelling that
+appointment frees its own slot and never one rebooked by someone else.
+Lapsed holds are purged by ``hold`` every ``PURGE_INTERVAL`` seconds, so
+they don't accumulate.
+"""
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from src.slots import SlotSet, decode_slot_id
+
+logger = logging.getLogger(__name__)
+
+# Seconds a slot stays held while the customer fills in their details
+DEFAULT_HOLD_TTL = 300
+
+# Lapsed holds are purged by hold() at most this often (seconds)
+PURGE_INTERVAL = 60
+
+HELD = "held"
+CONFIRMED = "confirmed"
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a slot is held or booked by someone else."""
+
+
+class Hold:
+    """A granted hold on a slot."""
+
+    __slots__ = ("slot_id", "token", "expires_at")
+
+    def __init__(self, slot_id: str, token: str, expires_at: float):
+        self.slot_id = slot_id
+        self.token = token
+        self.expires_at = expires_at
+
+    def to_dict(self, now: Optional[float] = None) -> Dict[str, object]:
+        """Convert to the JSON returned to booking forms."""
+        now = time.time() if now is None else now
+        return {
+            "slot_id": self.slot_id,
+            "hold_token": self.token,
+            "expires_in": max(0, int(self.expires_at - now))
+        }
+
+
+class InMemoryReservations:
+    """Reservations for a single process."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Initialize the reservations.
+
+        Args:
+            clock: Time source (seconds since the epoch)
+        """
+        self.clock = clock
+        self._lock = threading.Lock()
+        # slot_id -> [state, token, expires_at]
+        self._slots: Dict[str, list] = {}
+        # appointment_id -> slot_id, for assigned confirmations
+        self._owned: Dict[str, str] = {}
+        self._next_purge = clock() + PURGE_INTERVAL
+
+    def hold(self, slot_id: str, ttl: float = DEFAULT_HOLD_TTL,
+             token: Optional[str] = None) -> Optional[Hold]:
+        """
+        Hold a slot, or extend the caller's own hold.
+
+        Args:
+            slot_id: Slot to hold
+            ttl: Seconds until the hold lapses
+            token: Token of a hold the caller already has on this slot
+
+        Returns:
+            The hold, or None if someone else holds or booked the slot
+        """
+        now = self.clock()
+        if now >= self._next_purge:
+            self.purge_expired()
+        with self._lock:
+            entry = self._slots.get(slot_id)
+            if entry is not None:
+                state, current_token, expires_at = entry
+                mine = token is not None and token == current_token
+                if state == CONFIRMED or (expires_at > now and not mine):
+                    return None
+            hold = Hold(slot_id, token or uuid.uuid4().hex, now + ttl)
+            self._slots[slot_id] = [HELD, hold.token, hold.expires_at]
+        return hold
+
+    def confirm(self, slot_id: str, token: str) -> bool:
+        """
+        Turn the caller's unexpired hold into a confirmed booking.
+
+        Returns:
+            True if this caller now owns the slot
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._slots.get(slot_id)
+            if entry is None or entry[0] != HELD or entry[1] != token or entry[2] <= now:
+                return False
+            entry[0] = CONFIRMED
+            return True
+
+    def release(self, slot_id: str, token: str) -> bool:
+        """
+        Give up a hold the customer no longer needs (confirmed bookings stay).
+
+        Returns:
+            True if the caller's hold was removed
+        """
+        with self._lock:
+            entry = self._slots.get(slot_id)
+            if entry is None or entry[0] != HELD or entry[1] != token:
+                return False
+            del self._slots[slot_id]
+            return True
+
+    def rollback(self, slot_id: str, token: str) -> bool:
+        """
+        Remove the caller's hold or confirmation after its booking failed.
+
+        Unlike ``release`` this also removes a confirmed reservation, so only
+        pass a token ``claim_slot`` just returned, never one from a client.
+
+        Returns:
+            True if the reservation was removed
+        """
+        with self._lock:
+            entry = self._slots.get(slot_id)
+            if entry is None or entry[1] != token:
+                return False
+            del self._slots[slot_id]
+            self._owned.pop(token, None)
+            return True
+
+    def assign(self, slot_id: str, token: str, appointment_id: str) -> bool:
+        """
+        Hand the caller's confirmed slot to the appointment booked on it.
+
+        Returns:
+            True if the confirmation now belongs to appointment_id
+        """
+        with self._lock:
+            entry = self._slots.get(slot_id)
+            if entry is None or entry[0] != CONFIRMED or entry[1] != token:
+                return False
+            entry[1] = appointment_id
+            self._owned[appointment_id] = slot_id
+            return True
+
+    def cancel(self, appointment_id: str) -> bool:
+        """
+        Free the slot held by a cancelled appointment.
+
+        Returns:
+            True if the appointment's reservation was removed
+        """
+        with self._lock:
+            slot_id = self._owned.pop(appointment_id, None)
+            entry = self._slots.get(slot_id) if slot_id else None
+            if entry is None or entry[0] != CONFIRMED or entry[1] != appointment_id:
+                return False
+            del self._slots[slot_id]
+            return True
+
+    def unavailable(self, slot_ids: Iterable[str]) -> Set[str]:
+        """Get the slots among slot_ids that are confirmed or held."""
+        now = self.clock()
+        with self._lock:
+            taken = set()
+            for slot_id in slot_ids:
+                entry = self._slots.get(slot_id)
+                if entry is not None and (entry[0] == CONFIRMED or entry[2] > now):
+                    taken.add(slot_id)
+            return taken
+
+    def purge_expired(self) -> int:
+        """Forget lapsed holds; returns how many were removed."""
+        now = self.clock()
+        with self._lock:
+            self._next_purge = now + PURGE_INTERVAL
+            expired = [slot_id for slot_id, (state, _, expires_at) in self._slots.items()
+                       if state == HELD and expires_at <= now]
+            for slot_id in expired:
+                del self._slots[slot_id]
+        return len(expired)
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS slot_reservations ("
+    " slot_id TEXT PRIMARY KEY,"
+    " token TEXT NOT NULL,"
+    " state TEXT NOT NULL,"
+    " expires_at REAL)"
+)
+# Cancellation looks reservations up by the appointment that owns them
+_TOKEN_INDEX = "CREATE INDEX IF NOT EXISTS slot_reservations_token ON slot_reservations (token)"
+
+# One statement per operation, so each is atomic across threads and processes
+_HOLD = (
+    "INSERT INTO slot_reservations (slot_id, token, state, expires_at) VALUES (?, ?, 'held', ?)"
+    " ON CONFLICT (slot_id) DO UPDATE SET"
+    " token = excluded.token, state = 'held', expires_at = excluded.expires_at"
+    " WHERE slot_reservations.state = 'held'"
+    " AND (slot_reservations.expires_at <= ? OR slot_reservations.token = excluded.token)"
+)
+_CONFIRM = (
+    "UPDATE slot_reservations SET state = 'confirmed', expires_at = NULL"
+    " WHERE slot_id = ? AND token = ? AND state = 'held' AND expires_at > ?"
+)
+_RELEASE = "DELETE FROM slot_reservations WHERE slot_id = ? AND token = ? AND state = 'held'"
+_ROLLBACK = "DELETE FROM slot_reservations WHERE slot_id = ? AND token = ?"
+_ASSIGN = "UPDATE slot_reservations SET token = ? WHERE slot_id = ? AND token = ? AND state = 'confirmed'"
+_CANCEL = "DELETE FROM slot_reservations WHERE token = ? AND state = 'confirmed'"
+_PURGE = "DELETE FROM slot_reservations WHERE state = 'held' AND expires_at <= ?"
+
+# Stay well under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+
+class SQLiteReservations:
+    """
+    Reservations in SQLite, shared by every worker using the same database.
+    """
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time,
+                 busy_timeout_ms: int = 5000):
+        """
+        Initialize the reservations.
+
+        Args:
+            db_path: Path to the SQLite database (may be the appointment store's)
+            clock: Time source (seconds since the epoch)
+            busy_timeout_ms: How long to wait for another process's write lock
+        """
+        self.db_path = db_path
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_TOKEN_INDEX)
+        self._next_purge = clock() + PURGE_INTERVAL
+
+    def hold(self, slot_id: str, ttl: float = DEFAULT_HOLD_TTL,
+             token: Optional[str] = None) -> Optional[Hold]:
+        """
+        Hold a slot, or extend the caller's own hold.
+
+        Args:
+            slot_id: Slot to hold
+            ttl: Seconds until the hold lapses
+            token: Token of a hold the caller already has on this slot
+
+        Returns:
+            The hold, or None if someone else holds or booked the slot
+        """
+        now = self.clock()
+        if now >= self._next_purge:
+            self.purge_expired()
+        hold = Hold(slot_id, token or uuid.uuid4().hex, now + ttl)
+        with self._lock:
+            changed = self._conn.execute(_HOLD, (slot_id, hold.token, hold.expires_at, now)).rowcount
+        return hold if changed else None
+
+    def confirm(self, slot_id: str, token: str) -> bool:
+        """
+        Turn the caller's unexpired hold into a confirmed booking.
+
+        Returns:
+            True if this caller now owns the slot
+        """
+        with self._lock:
+            return self._conn.execute(_CONFIRM, (slot_id, token, self.clock())).rowcount == 1
+
+    def release(self, slot_id: str, token: str) -> bool:
+        """
+        Give up a hold the customer no longer needs (confirmed bookings stay).
+
+        Returns:
+            True if the caller's hold was removed
+        """
+        with self._lock:
+            return self._conn.execute(_RELEASE, (slot_id, token)).rowcount == 1
+
+    def rollback(self, slot_id: str, token: str) -> bool:
+        """
+        Remove the caller's hold or confirmation after its booking failed.
+
+        Unlike ``release`` this also removes a confirmed reservation, so only
+        pass a token ``claim_slot`` just returned, never one from a client.
+
+        Returns:
+            True if the reservation was removed
+        """
+        with self._lock:
+            return self._conn.execute(_ROLLBACK, (slot_id, token)).rowcount == 1
+
+    def assign(self, slot_id: str, token: str, appointment_id: str) -> bool:
+        """
+        Hand the caller's confirmed slot to the appointment booked on it.
+
+        Returns:
+            True if the confirmation now belongs to appointment_id
+        """
+        with self._lock:
+            return self._conn.execute(_ASSIGN, (appointment_id, slot_id, token)).rowcount == 1
+
+    def cancel(self, appointment_id: str) -> bool:
+        """
+        Free the slot held by a cancelled appointment.
+
+        Returns:
+            True if the appointment's reservation was removed
+        """
+        with self._lock:
+            return self._conn.execute(_CANCEL, (appointment_id,)).rowcount == 1
+
+    def unavailable(self, slot_ids: Iterable[str]) -> Set[str]:
+        """Get the slots among slot_ids that are confirmed or held."""
+        slot_ids = list(slot_ids)
+        now = self.clock()
+        taken = set()
+        with self._lock:
+            for i in range(0, len(slot_ids), _IN_CHUNK):
+                chunk = slot_ids[i:i + _IN_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT slot_id FROM slot_reservations WHERE slot_id IN ({', '.join('?' * len(chunk))})"
+                    " AND (state = 'confirmed' OR expires_at > ?)",
+                    (*chunk, now)
+                ).fetchall()
+                taken.update(row[0] for row in rows)
+        return taken
+
+    def purge_expired(self) -> int:
+        """Forget lapsed holds; returns how many were removed."""
+        now = self.clock()
+        with self._lock:
+            self._next_purge = now + PURGE_INTERVAL
+            return self._conn.execute(_PURGE, (now,)).rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def claim_slot(reservations, slot_id: str, hold_token: Optional[str] = None,
+               ttl: float = DEFAULT_HOLD_TTL) -> str:
+    """
+    Confirm a slot for booking, holding it first if the client's hold is missing or lapsed.
+
+    On success the caller books the appointment, then calls
+    ``assign_claim`` with its ID, or ``rollback_claim`` if the booking fails.
+
+    Args:
+        reservations: InMemoryReservations or SQLiteReservations
+        slot_id: Slot being booked
+        hold_token: Token from an earlier hold, if the client took one
+        ttl: Hold TTL used when no hold exists yet
+
+    Returns:
+        The reservation token
+
+    Raises:
+        SlotUnavailableError: If another customer holds or booked the slot
+    """
+    # Takes a free or lapsed slot, or refreshes the caller's own hold
+    hold = reservations.hold(slot_id, ttl, token=hold_token)
+    if hold is None or not reservations.confirm(slot_id, hold.token):
+        raise SlotUnavailableError("Sorry, that time was just taken. Please choose another time.")
+    return hold.token
+
+
+def assign_claim(reservations, slot_id: str, token: str, appointment_id: str) -> bool:
+    """
+    Hand a claimed slot to the appointment just booked on it.
+
+    Cancelling that appointment (``reservations.cancel(appointment_id)``)
+    then frees this slot and nothing else.
+
+    Returns:
+        True if the claim was assigned
+    """
+    return reservations.assign(slot_id, token, appointment_id)
+
+
+def rollback_claim(reservations, slot_id: str, token: str) -> bool:
+    """
+    Undo claim_slot after the booking itself failed.
+
+    Returns:
+        True if the reservation was removed
+    """
+    return reservations.rollback(slot_id, token)
+
+
+def filter_available(reservations, slots: SlotSet) -> SlotSet:
+    """Drop slots that are confirmed or currently held."""
+    taken = reservations.unavailable(slots.ids())
+    return slots.without(decode_slot_id(slot_id) for slot_id in taken)
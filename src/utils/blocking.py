@@ -0,0 +1,107 @@
+"""
+Bounded thread pool for running blocking calls from async handlers.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BlockingPool:
+    """
+    Run blocking functions off the event loop with per-route concurrency caps.
+
+    All routes share one bounded executor, so slow upstream calls can never
+    spawn unbounded threads. Each route also has its own cap, so a burst on
+    one route (e.g. booking) queues behind that cap instead of taking every
+    worker thread away from the others.
+    """
+
+    def __init__(self, max_workers: int = 16, route_limits: Optional[Dict[str, int]] = None,
+                 default_limit: Optional[int] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Threads shared by all routes
+            route_limits: Maximum concurrent calls per route name
+            default_limit: Cap for routes not listed (defaults to max_workers)
+        """
+        self.max_workers = max_workers
+        self.route_limits = dict(route_limits or {})
+        self.default_limit = default_limit or max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _route(self, route: str) -> asyncio.Semaphore:
+        """Get (or create) a route's semaphore and counters."""
+        semaphore = self._semaphores.get(route)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.route_limits.get(route, self.default_limit))
+            self._semaphores[route] = semaphore
+            self._stats[route] = {"calls": 0, "waiting": 0, "in_flight": 0}
+        return semaphore
+
+    async def run(self, route: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function in the pool.
+
+        Context variables are copied into the worker thread.
+
+        Args:
+            route: Route name used for the concurrency cap
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's return value
+        """
+        semaphore = self._route(route)
+        stats = self._stats[route]
+
+        stats["waiting"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["waiting"] -= 1
+
+        stats["in_flight"] += 1
+        stats["calls"] += 1
+        try:
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            stats["in_flight"] -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get per-route call, waiting and in-flight counters."""
+        return {route: dict(counters) for route, counters in self._stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads."""
+        self.executor.shutdown(wait=wait)
+
+
+_default_pool: Optional[BlockingPool] = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> BlockingPool:
+    """Get the process-wide pool used when no pool is passed explicitly."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = BlockingPool()
+        return _default_pool
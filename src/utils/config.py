@@ -1,9 +1,11 @@
 """
 Configuration management for the application.
 """
+import atexit
 import os
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -12,19 +14,25 @@ logger = logging.getLogger(__name__)
 class Config:
     """Configuration manager for the application."""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, save_delay: float = 0.5):
         """
         Initialize configuration.
         
         Args:
             config_path: Path to the configuration file (JSON)
+            save_delay: Seconds to wait after set() before writing, so a burst
+                of changes is saved once
         """
         self.config_path = config_path or os.environ.get(
             "CONFIG_PATH",
             str(Path(__file__).parent.parent.parent / "config" / "config.json")
         )
+        self.save_delay = save_delay
         self.config = {}
+        self._lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self.load_config()
+        atexit.register(self.flush)
         
     def load_config(self) -> None:
         """Load configuration from file."""
@@ -32,14 +40,14 @@ class Config:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r') as config_file:
                     self.config = json.load(config_file)
-                logger.info(f"Configuration loaded from {self.config_path}")
+                logger.info("Configuration loaded from %s", self.config_path)
             else:
-                logger.warning(f"No configuration file found at {self.config_path}")
+                logger.warning("No configuration file found at %s", self.config_path)
                 # Create default config directory if it doesn't exist
                 os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
                 self._create_default_config()
         except Exception as e:
-            logger.error(f"Error loading configuration: {str(e)}")
+            logger.error("Error loading configuration: %s", e)
             self._create_default_config()
             
     def _create_default_config(self) -> None:
@@ -59,9 +67,9 @@ class Config:
             with open(self.config_path, 'w') as config_file:
                 json.dump(default_config, config_file, indent=2)
             self.config = default_config
-            logger.info(f"Default configuration created at {self.config_path}")
+            logger.info("Default configuration created at %s", self.config_path)
         except Exception as e:
-            logger.error(f"Error creating default configuration: {str(e)}")
+            logger.error("Error creating default configuration: %s", e)
             
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -83,7 +91,7 @@ class Config:
                     return default
             return value
         except Exception as e:
-            logger.error(f"Error getting config value '{key}': {str(e)}")
+            logger.error("Error getting config value '%s': %s", key, e)
             return default
             
     def set(self, key: str, value: Any) -> None:
@@ -96,21 +104,41 @@ class Config:
         """
         try:
             keys = key.split('.')
-            config = self.config
-            for k in keys[:-1]:
-                if k not in config:
-                    config[k] = {}
-                config = config[k]
-            config[keys[-1]] = value
-            self._save_config()
+            with self._lock:
+                config = self.config
+                for k in keys[:-1]:
+                    if k not in config:
+                        config[k] = {}
+                    config = config[k]
+                config[keys[-1]] = value
+                self._schedule_save()
         except Exception as e:
-            logger.error(f"Error setting config value '{key}': {str(e)}")
+            logger.error("Error setting config value '%s': %s", key, e)
             
-    def _save_config(self) -> None:
-        """Save configuration to file."""
+    def _schedule_save(self) -> None:
+        """Start the save timer unless one is already pending (lock held)."""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            # Written under the lock so an older snapshot can't land after a newer one
+            self._save_config(json.dumps(self.config, indent=2))
+            
+    def _save_config(self, data: str) -> None:
+        """Atomically replace the configuration file."""
+        temp_path = f"{self.config_path}.{os.getpid()}.tmp"
         try:
-            with open(self.config_path, 'w') as config_file:
-                json.dump(self.config, config_file, indent=2)
-            logger.debug(f"Configuration saved to {self.config_path}")
+            with open(temp_path, 'w') as config_file:
+                config_file.write(data)
+            os.replace(temp_path, self.config_path)
+            logger.debug("Configuration saved to %s", self.config_path)
         except Exception as e:
-            logger.error(f"Error saving configuration: {str(e)}")
+            logger.error("Error saving configuration: %s", e)
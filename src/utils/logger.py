@@ -1,45 +1,234 @@
 """
 Logging configuration for the application.
+
+Records are put on an in-memory queue by the calling thread and written by
+a ``QueueListener`` thread, so request handlers never wait on file or
+console I/O. Messages are formatted on the listener thread too: log with
+%-style arguments (``logger.info("Retrieved %d slots", n)``) and the
+string is only built if the record is actually written. Arguments the
+caller could still change (lists, dicts, other objects) are formatted when
+the record is queued, so the message shows them as they were.
 """
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+from src.utils.rate_limit import TokenBucket
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Argument types that can't change between logging and formatting
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, type(None), date, time, timedelta, Decimal, uuid.UUID)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Cap the rate of INFO and lower records per logger.
+
+    ``rates`` maps logger names to records per second; a name also covers
+    its children ("src.integrations" covers "src.integrations.booksy").
+    Warnings and errors always pass. The number of records dropped since the
+    last one that passed is attached to it as ``sampled_out``.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        """
+        Initialize the filter.
+
+        Args:
+            rates: Records per second allowed for each logger name
+        """
+        super().__init__()
+        self.rates = dict(rates)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rule(self, name: str) -> Optional[str]:
+        """Find the most specific configured logger name covering ``name``."""
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rule = self._rule(record.name)
+        if rule is None:
+            return True
+        with self._lock:
+            bucket = self._buckets.get(rule)
+            if bucket is None:
+                rate = self.rates[rule]
+                bucket = self._buckets[rule] = TokenBucket(max(rate, 1.0), rate)
+            if bucket.time_until(1) > 0:
+                self._dropped[rule] = self._dropped.get(rule, 0) + 1
+                return False
+            bucket.consume(1)
+            dropped = self._dropped.pop(rule, 0)
+        if dropped:
+            record.sampled_out = dropped
+        return True
+
+
+def _is_immutable(value: object) -> bool:
+    """Check whether a log argument (or tuple of them) can't change after logging."""
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
 
-def setup_logger(log_level: Optional[str] = None, 
-                log_file: Optional[str] = None) -> None:
+    The stock handler formats every record before queueing it, so the
+    caller pays for message interpolation even though the queue stays in
+    this process. Only the exception text is rendered up front, while the
+    traceback is still current, and so are messages whose arguments are
+    mutable, while they still hold the logged values.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        if not isinstance(record.msg, str) or (record.args and not _is_immutable(record.args)):
+            try:
+                record.msg, record.args = record.getMessage(), None
+            except Exception:
+                # Leave a bad format string for the listener's handler to report
+                pass
+        return record
+
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, float]:
+    """Parse "logger=rate,logger=rate" (e.g. from $LOG_SAMPLE_RATES)."""
+    rates = {}
+    for item in (value or "").split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def setup_logger(log_level: Optional[str] = None,
+                log_file: Optional[str] = None,
+                json_format: Optional[bool] = None,
+                sample_rates: Optional[Dict[str, float]] = None,
+                force: bool = False) -> Optional[logging.handlers.QueueListener]:
     """
     Configure application logging.
-    
+
+    Routes the root logger through a single queue handler; a listener
+    thread writes to the log file and stdout. If logging is already set up,
+    by an earlier call or by whatever hosts the app (a test runner, an
+    embedding server), it is left alone unless ``force`` is set.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file
+        json_format: Write JSON lines instead of text (defaults to $LOG_FORMAT == "json")
+        sample_rates: Records per second allowed per logger name (defaults to $LOG_SAMPLE_RATES)
+        force: Replace the root logger's handlers and stop the previous
+            listener, closing the handlers it wrote to
+
+    Returns:
+        The running listener, or None if logging was configured elsewhere
     """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return _listener
+
     log_level = log_level or os.environ.get("LOG_LEVEL", "INFO")
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
-    
+    if json_format is None:
+        json_format = os.environ.get("LOG_FORMAT", "").lower() == "json"
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES"))
+
     # Create logs directory if not exists and log_file is not provided
     if not log_file:
         log_dir = Path(__file__).parent.parent.parent / "logs"
         log_dir.mkdir(exist_ok=True)
         log_file = str(log_dir / "app.log")
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=numeric_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    shutdown_logging()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    queue_handler = LazyQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        # Handlers installed by others (e.g. a test runner's) are theirs to close
+        if isinstance(handler, LazyQueueHandler):
+            handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(numeric_level)
+
     # Set logging level for external libraries
     logging.getLogger("openai").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("googleapiclient").setLevel(logging.WARNING)
-    
+
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured with level {log_level}")
-    logger.info(f"Log file: {log_file}")
+    logger.info("Logging configured with level %s", log_level)
+    logger.info("Log file: %s", log_file)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and close its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
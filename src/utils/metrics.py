@@ -0,0 +1,358 @@
+"""
+In-process metrics: counters, gauges and latency histograms.
+
+Integration clients time their upstream calls with the ``timed`` decorator;
+the web apps expose everything in Prometheus text format at ``/metrics``.
+Each worker process keeps its own registry, so scrape every worker.
+"""
+import asyncio
+import contextvars
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.tracing import span
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket bounds (seconds) reported to Prometheus; the histograms themselves
+# keep finer log-linear buckets, so these can change without losing data
+EXPORT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    """A monotonically increasing count."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """A value that can go up and down."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class Histogram:
+    """
+    Latency histogram with HDR-style log-linear buckets.
+
+    Observations are kept as whole microseconds. Values below
+    ``2 ** precision_bits`` get a bucket each; above that every power of two
+    is split into ``2 ** (precision_bits - 1)`` buckets, so quantiles are
+    within ``2 ** -(precision_bits - 1)`` (1.6% by default) of the true
+    value while recording stays a couple of integer operations.
+    """
+
+    def __init__(self, precision_bits: int = 7, max_value_bits: int = 32):
+        """
+        Initialize the histogram.
+
+        Args:
+            precision_bits: Significant bits kept per observation
+            max_value_bits: Observations of 2 ** max_value_bits microseconds
+                (71 minutes by default) or more land in the last bucket
+        """
+        self.precision_bits = precision_bits
+        self.counts = [0] * ((max_value_bits - precision_bits + 2) << (precision_bits - 1))
+        self.sum = 0.0
+        self._half_bits = precision_bits - 1
+        self._max_micros = (1 << max_value_bits) - 1
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return sum(self.counts)
+
+    def _index(self, micros: int) -> int:
+        """Bucket index for a value in microseconds."""
+        micros = min(micros, self._max_micros)
+        shift = micros.bit_length() - self.precision_bits
+        if shift <= 0:
+            return micros
+        return (shift << self._half_bits) + (micros >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """Largest value (microseconds) recorded in a bucket."""
+        if index < 1 << self.precision_bits:
+            return index
+        shift = (index >> self._half_bits) - 1
+        return ((index - (shift << self._half_bits) + 1) << shift) - 1
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration in seconds (inlines _index; this is the hot path)."""
+        micros = int(seconds * 1e6)
+        if micros > self._max_micros:
+            micros = self._max_micros
+        shift = micros.bit_length() - self.precision_bits
+        if shift > 0:
+            micros = (shift << self._half_bits) + (micros >> shift)
+        lock = self._lock
+        lock.acquire()
+        self.counts[micros] += 1
+        self.sum += seconds
+        lock.release()
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0-1) in seconds, or NaN if nothing was recorded."""
+        with self._lock:
+            counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return math.nan
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self._upper_bound(index) / 1e6
+        return self._upper_bound(len(counts) - 1) / 1e6
+
+    def cumulative(self, bounds: Sequence[float]) -> List[int]:
+        """Observations at or below each bound (seconds), to bucket precision."""
+        with self._lock:
+            counts = list(self.counts)
+        result = []
+        for bound in bounds:
+            result.append(sum(counts[:self._index(int(bound * 1e6)) + 1]))
+        return result
+
+
+class MetricFamily:
+    """A named metric with one child per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, kind: str, factory: Callable[[], Any],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        """
+        Get the child metric for these label values, creating it if needed.
+
+        Look children up once and keep them, so recording skips this lookup.
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help_text: str, kind: str, factory: Callable[[], Any],
+                labelnames: Sequence[str]) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help_text, kind, factory, labelnames)
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {family.kind} "
+                                 f"with labels {family.labelnames}")
+            return family
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        """Get or register a counter family."""
+        return self._family(name, help_text, "counter", Counter, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        """Get or register a gauge family."""
+        return self._family(name, help_text, "gauge", Gauge, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        """Get or register a latency histogram family (observations in seconds)."""
+        return self._family(name, help_text, "histogram", Histogram, labelnames)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in sorted(family.children(), key=lambda item: item[0]):
+                labels = _format_labels(family.labelnames, values)
+                if family.kind != "histogram":
+                    lines.append(f"{family.name}{labels} {_format_value(child.value)}")
+                    continue
+                names = family.labelnames + ("le",)
+                for bound, count in zip(EXPORT_BUCKETS, child.cumulative(EXPORT_BUCKETS)):
+                    bucket_labels = _format_labels(names, values + (_format_value(bound),))
+                    lines.append(f"{family.name}_bucket{bucket_labels} {count}")
+                lines.append(f"{family.name}_bucket{_format_labels(names, values + ('+Inf',))} {child.count}")
+                lines.append(f"{family.name}_sum{labels} {_format_value(child.sum)}")
+                lines.append(f"{family.name}_count{labels} {child.count}")
+        return "\n".join(lines) + "\n"
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current values, with p50/p90/p99 (seconds) for histograms."""
+        result: Dict[str, Any] = {}
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            for values, child in family.children():
+                key = family.name + _format_labels(family.labelnames, values)
+                if family.kind == "histogram":
+                    result[key] = {"count": child.count, "sum": child.sum,
+                                   "p50": child.quantile(0.5), "p90": child.quantile(0.9),
+                                   "p99": child.quantile(0.99)}
+                else:
+                    result[key] = child.value
+        return result
+
+
+_registry = MetricsRegistry()
+
+# Failure flag of the innermost timed call in progress (see mark_failed)
+_call_failed: contextvars.ContextVar[Optional[List[bool]]] = contextvars.ContextVar(
+    "integration_call_failed", default=None
+)
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+def mark_failed() -> None:
+    """
+    Count the timed call in progress as an error without raising.
+
+    For integration methods that catch upstream errors and return a fallback
+    ([], False, an error dict); call it from the except block.
+    """
+    failed = _call_failed.get()
+    if failed is not None:
+        failed[0] = True
+
+
+def timed(client: str, method: Optional[str] = None,
+          registry: Optional[MetricsRegistry] = None) -> Callable[[Callable], Callable]:
+    """
+    Time calls to an integration method.
+
+    Records ``integration_call_seconds{client,method}``, counts exceptions
+    and calls flagged with ``mark_failed`` in ``integration_errors_total``,
+    tracks ``integration_in_flight{client}`` and opens a "client.method" trace
+    span. Works on both regular and ``async`` methods.
+
+    Args:
+        client: Integration name, e.g. "booksy" or "gmail"
+        method: Metric label for the method (defaults to the function name)
+        registry: Registry to record into (defaults to the process-wide one)
+
+    Returns:
+        Decorator
+    """
+    registry = registry or _registry
+
+    def decorator(func: Callable) -> Callable:
+        name = method or func.__name__
+        span_name = f"{client}.{name}"
+        latency = registry.histogram(
+            "integration_call_seconds", "Latency of calls to external services", ("client", "method")
+        ).labels(client, name)
+        errors = registry.counter(
+            "integration_errors_total", "Calls to external services that raised", ("client", "method")
+        ).labels(client, name)
+        in_flight = registry.gauge(
+            "integration_in_flight", "Calls to external services in progress", ("client",)
+        ).labels(client)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                in_flight.inc()
+                failed = [False]
+                token = _call_failed.set(failed)
+                start = time.perf_counter()
+                try:
+                    with span(span_name):
+                        return await func(*args, **kwargs)
+                except BaseException:
+                    failed[0] = True
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - start)
+                    _call_failed.reset(token)
+                    if failed[0]:
+                        errors.inc()
+                    in_flight.dec()
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            in_flight.inc()
+            failed = [False]
+            token = _call_failed.set(failed)
+            start = time.perf_counter()
+            try:
+                with span(span_name):
+                    return func(*args, **kwargs)
+            except BaseException:
+                failed[0] = True
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+                _call_failed.reset(token)
+                if failed[0]:
+                    errors.inc()
+                in_flight.dec()
+        return wrapper
+
+    return decorator
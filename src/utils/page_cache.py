@@ -0,0 +1,222 @@
+"""
+Render-once page cache with precompressed variants and strong ETags.
+"""
+import functools
+import gzip
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Any, Union
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+class CachedPage:
+    """A rendered page with its compressed variants."""
+
+    __slots__ = ("variants", "etag", "content_type", "created_at")
+
+    def __init__(self, body: bytes, content_type: str):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.content_type = content_type
+        self.created_at = time.monotonic()
+        self.etag = f'"{digest}"'
+
+        # encoding -> (body, etag); each coding gets its own strong validator
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, self.etag)}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"')
+            if brotli is not None:
+                self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against any variant of this page."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(etag in tags for _, etag in self.variants.values())
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[str, bytes, str]:
+        """
+        Pick the best variant for an Accept-Encoding header.
+
+        Returns:
+            Tuple of (encoding, body, etag)
+        """
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted.get(encoding, 0) > 0:
+                body, etag = self.variants[encoding]
+                return encoding, body, etag
+        body, etag = self.variants["identity"]
+        return "identity", body, etag
+
+
+def _parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for item in (header or "").split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+class PageCache:
+    """
+    Cache fully rendered pages by key.
+
+    Each page is rendered once, stored alongside gzip and (if the brotli
+    package is installed) brotli variants, and served with a strong ETag so
+    repeat visitors get a 304 instead of the body.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_age: int = 300):
+        """
+        Initialize the page cache.
+
+        Args:
+            ttl: Seconds before a page is re-rendered (None caches until invalidated)
+            max_age: Cache-Control max-age sent to browsers
+        """
+        self.ttl = ttl
+        self.max_age = max_age
+        self._pages: Dict[Any, CachedPage] = {}
+        self._lock = threading.Lock()
+        self._stats = {"renders": 0, "hits": 0, "not_modified": 0}
+
+    def get(self, key: Any, render: Callable[[], Union[str, bytes]],
+            content_type: str = "text/html; charset=utf-8") -> CachedPage:
+        """
+        Get a cached page, rendering it on first use or after the TTL.
+
+        Args:
+            key: Cache key (e.g. route name, or a tuple including the date)
+            render: Callable returning the page body
+            content_type: Content-Type header for the page
+
+        Returns:
+            The cached page
+        """
+        page = self._pages.get(key)
+        if page is not None and (self.ttl is None or time.monotonic() - page.created_at < self.ttl):
+            self._stats["hits"] += 1
+            return page
+
+        body = render()
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        page = CachedPage(body, content_type)
+        with self._lock:
+            self._pages[key] = page
+            self._stats["renders"] += 1
+        return page
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop one cached page, or all of them when no key is given."""
+        with self._lock:
+            if key is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(key, None)
+
+    def respond(self, page: CachedPage, if_none_match: Optional[str],
+                accept_encoding: Optional[str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Build a framework-neutral response for a cached page.
+
+        Args:
+            page: The cached page
+            if_none_match: Request If-None-Match header
+            accept_encoding: Request Accept-Encoding header
+
+        Returns:
+            Tuple of (status_code, headers, body)
+        """
+        encoding, body, etag = page.select(accept_encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if page.matches(if_none_match):
+            self._stats["not_modified"] += 1
+            return 304, headers, b""
+
+        headers["Content-Type"] = page.content_type
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return 200, headers, body
+
+    def flask_page(self, key: Optional[Union[str, Callable[[], Any]]] = None):
+        """
+        Decorator caching a Flask view that returns an HTML string.
+
+        Args:
+            key: Cache key, or a callable computing one per request
+                (defaults to the view's name)
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                from flask import Response, request
+
+                cache_key = key() if callable(key) else (key or view.__name__)
+                page = self.get(cache_key, lambda: view(*args, **kwargs))
+                status, headers, body = self.respond(
+                    page,
+                    request.headers.get("If-None-Match"),
+                    request.headers.get("Accept-Encoding")
+                )
+                return Response(body, status=status, headers=headers)
+            return wrapper
+        return decorator
+
+    def starlette_response(self, request: Any, key: Any, render: Callable[[], Union[str, bytes]]):
+        """
+        Serve a cached page from a FastAPI/Starlette handler.
+
+        Args:
+            request: The incoming Request
+            key: Cache key
+            render: Callable returning the page body
+
+        Returns:
+            A Starlette Response
+        """
+        from starlette.responses import Response
+
+        page = self.get(key, render)
+        status, headers, body = self.respond(
+            page,
+            request.headers.get("if-none-match"),
+            request.headers.get("accept-encoding")
+        )
+        return Response(content=body, status_code=status, headers=headers)
+
+    def stats(self) -> Dict[str, int]:
+        """Get render/hit counters."""
+        stats = dict(self._stats)
+        stats["pages"] = len(self._pages)
+        return stats
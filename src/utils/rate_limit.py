@@ -0,0 +1,199 @@
+"""
+Token buckets and a priority-ordered limiter for client-side rate limiting.
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class TokenBucket:
+    """Continuously refilling token bucket."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            capacity: Maximum number of tokens the bucket can hold
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update."""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def time_until(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        Get the number of seconds until ``amount`` tokens are available.
+
+        Requests larger than the bucket are clamped to its capacity so they
+        can eventually proceed instead of waiting forever.
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float, now: Optional[float] = None) -> None:
+        """Remove tokens from the bucket (may go negative when reconciling)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class Permit:
+    """Grant returned by PriorityLimiter.acquire."""
+
+    __slots__ = ("costs", "priority", "waited")
+
+    def __init__(self, costs: Dict[str, float], priority: int, waited: float):
+        self.costs = costs
+        self.priority = priority
+        self.waited = waited
+
+
+class PriorityLimiter:
+    """
+    Admit work against a set of token buckets and a concurrency cap.
+
+    Waiters are served strictly in priority order (lower number first, FIFO
+    within a priority), so background work never jumps ahead of interactive
+    requests that are already queued.
+    """
+
+    def __init__(self, buckets: Dict[str, TokenBucket], max_concurrent: Optional[int] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            buckets: Named token buckets that each request draws from
+            max_concurrent: Maximum number of in-flight requests (None for unlimited)
+        """
+        self.buckets = buckets
+        self.max_concurrent = max_concurrent
+
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._stats = {"granted": 0, "timeouts": 0, "pauses": 0, "wait_seconds": 0.0}
+
+    def _wait_time(self, costs: Dict[str, float], now: float) -> Optional[float]:
+        """Seconds until a request with these costs may start, or None if blocked on concurrency."""
+        if self.max_concurrent is not None and self._active >= self.max_concurrent:
+            return None
+        wait = max(0.0, self._paused_until - now)
+        for name, amount in costs.items():
+            wait = max(wait, self.buckets[name].time_until(amount, now))
+        return wait
+
+    def acquire(self, costs: Dict[str, float], priority: int = 0,
+                timeout: Optional[float] = None) -> Permit:
+        """
+        Block until the request may proceed.
+
+        Args:
+            costs: Amount to draw from each named bucket
+            priority: Lower values are served first
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Permit that must be passed to release()
+
+        Raises:
+            TimeoutError: If the request could not be admitted in time
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        entry = (priority, next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] == entry:
+                        wait = self._wait_time(costs, now)
+                        if wait == 0:
+                            heapq.heappop(self._waiters)
+                            for name, amount in costs.items():
+                                self.buckets[name].consume(amount, now)
+                            self._active += 1
+                            waited = now - started
+                            self._stats["granted"] += 1
+                            self._stats["wait_seconds"] += waited
+                            # Let the next waiter re-check now that the head moved
+                            self._cond.notify_all()
+                            return Permit(costs, priority, waited)
+
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._stats["timeouts"] += 1
+                            raise TimeoutError("Timed out waiting for rate limiter")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self, permit: Permit) -> None:
+        """Return a concurrency slot taken by acquire()."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def limit(self, costs: Dict[str, float], priority: int = 0, timeout: Optional[float] = None):
+        """Context manager wrapping acquire() and release()."""
+        permit = self.acquire(costs, priority=priority, timeout=timeout)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def adjust(self, name: str, delta: float) -> None:
+        """Reconcile a bucket once the actual cost of a request is known."""
+        with self._cond:
+            self.buckets[name].adjust(delta)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Stop admitting new work for ``seconds`` (e.g. after a Retry-After)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._stats["pauses"] += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """Get limiter counters and current queue state."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["active"] = self._active
+            stats["queued"] = len(self._waiters)
+            stats["paused_for"] = max(0.0, self._paused_until - time.monotonic())
+        return stats
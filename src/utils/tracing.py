@@ -0,0 +1,352 @@
+"""
+Lightweight request tracing.
+
+Spans nest through a context variable, so a span opened in a web handler
+is the parent of spans opened by the agent and the API clients it calls,
+including code run in the blocking and Google client pools (both copy the
+caller's context). Whole traces are written as JSON lines (one span per
+line) by a background thread. Sampling is decided once per trace: an
+unsampled trace costs a context-variable lookup per span.
+
+Print the slowest recorded traces with:
+    python -m src.utils.tracing --top 10
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+
+
+def _reset(token: contextvars.Token) -> None:
+    """Restore the enclosing span, unless the span is exiting in another context."""
+    try:
+        _current.reset(token)
+    except ValueError:
+        # E.g. a generator holding the span was finalized by the garbage
+        # collector; the context that entered it is gone, nothing to restore
+        pass
+
+
+class Span:
+    """A timed operation within a trace; use as a context manager."""
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent", "name", "attributes",
+                 "start", "end", "error", "_spans", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        # Finished spans of the trace, shared by every span in it
+        self._spans: List["Span"] = parent._spans if parent is not None else []
+        self.start = self.end = 0.0
+        self.error: Optional[str] = None
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (0 until the span ends)."""
+        return self.end - self.start
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.time()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _reset(self._token)
+        self._spans.append(self)
+        if self.parent is None:
+            self.tracer.finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent is not None else None,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _UnsampledSpan:
+    """Stand-in for spans of traces that are not recorded."""
+
+    __slots__ = ("_token",)
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_UnsampledSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class _UnsampledRoot(_UnsampledSpan):
+    """Root of an unsampled trace: marks the context so child spans skip sampling."""
+
+    def __enter__(self) -> "_UnsampledRoot":
+        self._token = _current.set(UNSAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _reset(self._token)
+
+
+UNSAMPLED = _UnsampledSpan()
+
+
+class JsonlExporter:
+    """Append finished traces to a JSON lines file from a background thread."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to append spans to (parent directories are created)
+        """
+        self.path = path
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        """Queue a finished trace for writing."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put([span.to_dict() for span in spans])
+
+    def flush(self) -> None:
+        """Wait until every queued trace has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        while True:
+            records = self._queue.get()
+            try:
+                with open(self.path, "a") as trace_file:
+                    for record in records:
+                        trace_file.write(json.dumps(record, default=str) + "\n")
+            except OSError as e:
+                logger.error("Could not write trace to %s: %s", self.path, e)
+            finally:
+                self._queue.task_done()
+
+
+class Tracer:
+    """Create spans and export sampled traces."""
+
+    def __init__(self, sample_rate: float = 1.0, exporter: Optional[JsonlExporter] = None,
+                 min_duration: float = 0.0):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of traces to record (0 disables tracing)
+            exporter: Where finished traces go (None keeps only the counters)
+            min_duration: Only export traces whose root span took at least this many seconds
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.min_duration = min_duration
+        self._stats = {"sampled": 0, "exported": 0}
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """
+        Open a span as a child of the current one, or start a new trace.
+
+        Args:
+            name: Operation name, e.g. "agent.intent" or "booksy.get_services"
+            **attributes: Attributes to record on the span
+
+        Returns:
+            A context manager yielding the span
+        """
+        parent = _current.get()
+        if parent is None:
+            if self.sample_rate <= 0:
+                return UNSAMPLED
+            if self.sample_rate < 1 and random.random() >= self.sample_rate:
+                return _UnsampledRoot()
+            self._stats["sampled"] += 1
+        elif parent is UNSAMPLED:
+            return UNSAMPLED
+        return Span(self, name, parent, attributes)
+
+    def finish(self, root: Span) -> None:
+        """Export a trace once its root span has ended."""
+        if self.exporter is None or root.duration < self.min_duration:
+            return
+        self._stats["exported"] += 1
+        self.exporter.export(root._spans)
+
+    def stats(self) -> Dict[str, int]:
+        """Get sampled and exported trace counts."""
+        return dict(self._stats)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, configured from settings on first use."""
+    global _tracer
+    if _tracer is None:
+        from src.config import settings
+
+        with _tracer_lock:
+            if _tracer is None:
+                current = settings()
+                exporter = JsonlExporter(current.trace_file) if current.trace_sample_rate > 0 else None
+                _tracer = Tracer(current.trace_sample_rate, exporter, current.trace_min_duration_ms / 1000)
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the process-wide tracer (None reconfigures from settings on next use)."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Open a span on the process-wide tracer (see Tracer.span)."""
+    return get_tracer().span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost open span, or None outside a sampled trace."""
+    current = _current.get()
+    return current if isinstance(current, Span) else None
+
+
+class TraceMiddleware:
+    """ASGI middleware opening a root span for every HTTP request."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with span(f"{scope['method']} {scope['path']}") as request_span:
+            async def send_with_status(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    request_span.set("status", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+
+def load_traces(path: str) -> List[List[Dict[str, Any]]]:
+    """Read exported spans grouped by trace, root span first."""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path) as trace_file:
+        for line in trace_file:
+            if line.strip():
+                record = json.loads(line)
+                traces[record["trace_id"]].append(record)
+    return [sorted(spans, key=lambda record: (record["parent_id"] is not None, record["start"]))
+            for spans in traces.values()]
+
+
+def format_trace(spans: List[Dict[str, Any]], width: int = 40) -> str:
+    """
+    Render a trace as an indented tree with a flame-style timeline bar per span.
+
+    Args:
+        spans: Spans of one trace, root first
+        width: Characters in the timeline bar
+
+    Returns:
+        The rendered tree
+    """
+    root = spans[0]
+    total = max(root["duration_ms"], 1e-9)
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    for record in spans[1:]:
+        children[record["parent_id"]].append(record)
+
+    lines = [f"trace {root['trace_id']}  {root['duration_ms']:.1f} ms"]
+
+    def walk(record: Dict[str, Any], depth: int) -> None:
+        offset = int((record["start"] - root["start"]) * 1000 / total * width)
+        length = max(1, round(record["duration_ms"] / total * width))
+        offset = min(offset, width - 1)
+        bar = " " * offset + "█" * min(length, width - offset)
+        attributes = " ".join(f"{key}={value}" for key, value in record["attributes"].items())
+        error = f" !{record['error']}" if record["error"] else ""
+        lines.append(f"  {bar:<{width}} {record['duration_ms']:9.1f} ms  {'  ' * depth}{record['name']}"
+                     f"{' ' + attributes if attributes else ''}{error}")
+        for child in sorted(children[record["span_id"]], key=lambda item: item["start"]):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return "\n".join(lines)
+
+
+def slowest(traces: Iterable[List[Dict[str, Any]]], top: int = 10) -> List[List[Dict[str, Any]]]:
+    """Pick the traces with the longest root spans."""
+    return sorted(traces, key=lambda spans: spans[0]["duration_ms"], reverse=True)[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the slowest recorded traces."""
+    parser = argparse.ArgumentParser(description="Show the slowest recorded request traces")
+    parser.add_argument("--file", help="Trace file (defaults to the trace_file setting)")
+    parser.add_argument("--top", type=int, default=10, help="Number of traces to show")
+    parser.add_argument("--name", help="Only traces whose root span has this name, e.g. 'POST /api/chat'")
+    args = parser.parse_args(argv)
+
+    if args.file is None:
+        from src.config import settings
+        args.file = settings().trace_file
+
+    traces = load_traces(args.file)
+    if args.name:
+        traces = [spans for spans in traces if spans[0]["name"] == args.name]
+    for spans in slowest(traces, args.top):
+        print(format_trace(spans))
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,15 @@ from datetime import datetime
 import os
 from typing import Dict, Any
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify, session
+from werkzeug.local import LocalProxy
 
-from src.agent import BookingAgent
 from src.config import config
+from src.server.state import LazyAgent
+from src.storage.reservations import (
+    SlotUnavailableError, assign_claim, claim_slot, filter_available, rollback_claim
+)
+from src.utils.metrics import CONTENT_TYPE, get_registry
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
@@ -22,8 +27,12 @@ app = Flask(__name__,
 
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "delane-nails-secret-key")
 
-# Initialize booking agent
-agent = BookingAgent(use_mock_api=config.get("use_mock_api", True))
+# Booking agent, built on first request (replaced with the shared one when mounted in the ASGI app)
+_standalone_agent = LazyAgent()
+agent = LocalProxy(_standalone_agent)
+
+# Slot reservations shared with the other booking paths
+reservations = LocalProxy(lambda: _standalone_agent().reservations)
 
 @app.route('/')
 def home():
@@ -57,6 +66,12 @@ def booking():
             flash("Please fill out all required fields", "error")
             return redirect(url_for('booking'))
             
+        try:
+            token = claim_slot(reservations, slot_id)
+        except SlotUnavailableError as e:
+            flash(str(e), "error")
+            return redirect(url_for('booking'))
+            
         try:
             # Book appointment
             customer_details = {
@@ -70,6 +85,7 @@ def booking():
                 slot_id=slot_id,
                 customer_details=customer_details
             )
+            assign_claim(reservations, slot_id, token, appointment['appointment_id'])
             
             # Store appointment ID in session
             session['last_appointment_id'] = appointment['appointment_id']
@@ -77,7 +93,8 @@ def booking():
             flash("Your appointment has been booked successfully!", "success")
             return redirect(url_for('confirmation'))
         except Exception as e:
-            logger.error(f"Error booking appointment: {str(e)}")
+            rollback_claim(reservations, slot_id, token)
+            logger.error("Error booking appointment: %s", e)
             flash(f"Error booking appointment: {str(e)}", "error")
             return redirect(url_for('booking'))
     
@@ -100,10 +117,10 @@ def booking():
     # Get available slots if service is selected
     available_slots = []
     if selected_service_id:
-        available_slots = agent.api.get_available_slots(
+        available_slots = filter_available(reservations, agent.api.get_available_slots(
             service_id=selected_service_id,
             start_date=selected_date
-        )
+        ))
     
     return render_template('booking.html',
                           services=services_list,
@@ -128,7 +145,7 @@ def confirmation():
                               business_address=config.get("business_address"),
                               business_phone=config.get("business_phone"))
     except Exception as e:
-        logger.error(f"Error getting appointment: {str(e)}")
+        logger.error("Error getting appointment: %s", e)
         flash(f"Error retrieving appointment: {str(e)}", "error")
         return redirect(url_for('home'))
 
@@ -151,7 +168,7 @@ def api_chat():
         response = agent.process_message(message)
         return jsonify({'response': response})
     except Exception as e:
-        logger.error(f"Error processing message: {str(e)}")
+        logger.error("Error processing message: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/slots', methods=['GET'])
@@ -166,11 +183,16 @@ def api_slots():
     try:
         date = datetime.strptime(date_str, "%Y-%m-%d")
         slots = agent.api.get_available_slots(service_id=service_id, start_date=date)
-        return jsonify(slots)
+        return jsonify(filter_available(reservations, slots).to_dicts())
     except Exception as e:
-        logger.error(f"Error getting slots: {str(e)}")
+        logger.error("Error getting slots: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics for this process."""
+    return Response(get_registry().render(), mimetype=CONTENT_TYPE)
+
 def start_web_server():
     """Start the web server."""
     host = config.get("web_host", "0.0.0.0")
@@ -0,0 +1,848 @@
+"""
+HTML pages shared by the web front-ends.
+
+Each function returns a complete page; callers decide how it is cached and
+served (Flask views, the ASGI app in src.server, or web_interface.py).
+"""
+from typing import Any, Dict, List
+
+
+def home_page() -> str:
+    """Simple home page."""
+    return """
+    <html>
+        <head>
+            <title>Delane Nails</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+                h1 { color: #9c27b0; }
+                .container { max-width: 800px; margin: 0 auto; }
+                .btn { display: inline-block; background: #9c27b0; color: white; padding: 10px 20px; 
+                      text-decoration: none; border-radius: 4px; margin-right: 10px; }
+                footer { margin-top: 50px; text-align: center; color: #666; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <h1>Welcome to Delane Nails</h1>
+                <p>Professional nail services at your fingertips.</p>
+                
+                <h2>Quick Links</h2>
+                <a href="/services" class="btn">View Services</a>
+                <a href="/simple-chat" class="btn">Chat With Us</a>
+                <a href="/simple-booking" class="btn">Book Appointment</a>
+                
+                <h2>About Us</h2>
+                <p>At Delane Nails, we provide high-quality nail services in a relaxing environment. 
+                Our team of professionals is dedicated to giving you the perfect look.</p>
+                
+                <h2>Business Hours</h2>
+                <ul>
+                    <li>Monday - Friday: 9:00 AM - 7:00 PM</li>
+                    <li>Saturday: 9:00 AM - 5:00 PM</li>
+                    <li>Sunday: Closed</li>
+                </ul>
+                
+                <footer>
+                    &copy; 2023 Delane Nails - All Rights Reserved
+                </footer>
+            </div>
+        </body>
+    </html>
+    """
+
+
+def services_page(services: List[Dict[str, Any]]) -> str:
+    """Display services page."""
+    # Build HTML for services
+    services_html = ""
+    for service in services:
+        services_html += f"""
+        <div class="service">
+            <h3>{service['name']} - ${service['price']}</h3>
+            <p><strong>Duration:</strong> {service['duration']} minutes</p>
+            <p>{service['description']}</p>
+            <a href="/simple-booking?service_id={service['id']}" class="btn">Book This Service</a>
+        </div>
+        <hr>
+        """
+    
+    return f"""
+    <html>
+        <head>
+            <title>Our Services - Delane Nails</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+                h1, h2 {{ color: #9c27b0; }}
+                .container {{ max-width: 800px; margin: 0 auto; }}
+                .service {{ margin-bottom: 20px; }}
+                .btn {{ display: inline-block; background: #9c27b0; color: white; padding: 8px 16px; 
+                      text-decoration: none; border-radius: 4px; }}
+                hr {{ border: 0; height: 1px; background: #eee; margin: 20px 0; }}
+                nav {{ margin-bottom: 30px; }}
+                nav a {{ margin-right: 15px; color: #9c27b0; text-decoration: none; }}
+                nav a:hover {{ text-decoration: underline; }}
+                footer {{ margin-top: 50px; text-align: center; color: #666; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <nav>
+                    <a href="/">Home</a>
+                    <a href="/services">Services</a>
+                    <a href="/simple-chat">Chat</a>
+                    <a href="/simple-booking">Book Appointment</a>
+                </nav>
+                
+                <h1>Our Services</h1>
+                <p>Browse our selection of professional nail services.</p>
+                
+                {services_html}
+                
+                <footer>
+                    &copy; 2023 Delane Nails - All Rights Reserved
+                </footer>
+            </div>
+        </body>
+    </html>
+    """
+
+
+def chat_page() -> str:
+    """Simple chat interface."""
+    return """
+    <html>
+        <head>
+            <title>Chat - Delane Nails</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+                h1, h2 { color: #9c27b0; }
+                .container { max-width: 800px; margin: 0 auto; }
+                #chatbox { border: 1px solid #ccc; padding: 10px; height: 300px; overflow-y: auto; margin-bottom: 10px; }
+                #messageForm { display: flex; }
+                #message { flex-grow: 1; padding: 8px; border: 1px solid #ccc; border-radius: 4px; }
+                button { background: #9c27b0; color: white; border: none; padding: 8px 15px; cursor: pointer; border-radius: 4px; margin-left: 10px; }
+                .message { margin-bottom: 10px; padding: 8px; border-radius: 4px; }
+                .agent { background-color: #f0f0f0; }
+                .user { background-color: #e0f0ff; text-align: right; }
+                nav { margin-bottom: 30px; }
+                nav a { margin-right: 15px; color: #9c27b0; text-decoration: none; }
+                nav a:hover { text-decoration: underline; }
+                footer { margin-top: 50px; text-align: center; color: #666; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <nav>
+                    <a href="/">Home</a>
+                    <a href="/services">Services</a>
+                    <a href="/simple-chat">Chat</a>
+                    <a href="/simple-booking">Book Appointment</a>
+                </nav>
+                
+                <h1>Chat with Delane Nails</h1>
+                <div id="chatbox">
+                    <div class="message agent">Hello! How can I help you today?</div>
+                </div>
+                <form id="messageForm">
+                    <input type="text" id="message" placeholder="Type your message..." autofocus>
+                    <button type="submit">Send</button>
+                </form>
+                
+                <footer>
+                    &copy; 2023 Delane Nails - All Rights Reserved
+                </footer>
+            </div>
+            
+            <script>
+                // Keeps this page's messages in one conversation on the server
+                const sessionId = 'chat-' + Date.now().toString(36) + Math.random().toString(36).slice(2);
+
+                document.getElementById('messageForm').addEventListener('submit', function(e) {
+                    e.preventDefault();
+                    const message = document.getElementById('message').value.trim();
+                    if (!message) return;
+                    
+                    // Add user message
+                    const chatbox = document.getElementById('chatbox');
+                    chatbox.innerHTML += '<div class="message user">' + message + '</div>';
+                    document.getElementById('message').value = '';
+                    
+                    // Send to server
+                    fetch('/api/simple-chat', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ message: message, session_id: sessionId })
+                    })
+                    .then(response => response.json())
+                    .then(data => {
+                        chatbox.innerHTML += '<div class="message agent">' + data.response + '</div>';
+                        chatbox.scrollTop = chatbox.scrollHeight;
+                    })
+                    .catch(error => {
+                        console.error('Error:', error);
+                        chatbox.innerHTML += '<div class="message error">Error communicating with server</div>';
+                        chatbox.scrollTop = chatbox.scrollHeight;
+                    });
+                    
+                    chatbox.scrollTop = chatbox.scrollHeight;
+                });
+            </script>
+        </body>
+    </html>
+    """
+
+
+def booking_page(services: List[Dict[str, Any]], current_date: str) -> str:
+    """Simple booking form."""
+    # Build services options
+    service_options = ""
+    for service in services:
+        service_options += f'<option value="{service["id"]}">{service["name"]} - ${service["price"]} ({service["duration"]} min)</option>'
+    
+    return f"""
+    <html>
+        <head>
+            <title>Book Appointment - Delane Nails</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+                h1, h2 {{ color: #9c27b0; }}
+                .container {{ max-width: 800px; margin: 0 auto; }}
+                form {{ background: #f9f9f9; padding: 20px; border-radius: 8px; }}
+                .form-group {{ margin-bottom: 15px; }}
+                label {{ display: block; margin-bottom: 5px; font-weight: bold; }}
+                input, select, textarea {{ width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; box-sizing: border-box; }}
+                button {{ background: #9c27b0; color: white; border: none; padding: 10px 20px; cursor: pointer; border-radius: 4px; }}
+                nav {{ margin-bottom: 30px; }}
+                nav a {{ margin-right: 15px; color: #9c27b0; text-decoration: none; }}
+                nav a:hover {{ text-decoration: underline; }}
+                footer {{ margin-top: 50px; text-align: center; color: #666; }}
+                #availableSlots {{ display: none; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <nav>
+                    <a href="/">Home</a>
+                    <a href="/services">Services</a>
+                    <a href="/simple-chat">Chat</a>
+                    <a href="/simple-booking">Book Appointment</a>
+                </nav>
+                
+                <h1>Book Your Appointment</h1>
+                <p>Please fill out the form below to book your appointment.</p>
+                
+                <form id="bookingForm">
+                    <div class="form-group">
+                        <label for="service">Select Service</label>
+                        <select id="service" name="service_id" required>
+                            <option value="">Choose a service...</option>
+                            {service_options}
+                        </select>
+                    </div>
+                    
+                    <div class="form-group">
+                        <label for="date">Select Date</label>
+                        <input type="date" id="date" name="date" required min="{current_date}">
+                    </div>
+                    
+                    <div class="form-group" id="availableSlots">
+                        <label for="slot">Select Time</label>
+                        <select id="slot" name="slot_id" required>
+                            <option value="">Select date and service first</option>
+                        </select>
+                    </div>
+                    
+                    <div class="form-group">
+                        <label for="name">Your Name</label>
+                        <input type="text" id="name" name="name" required>
+                    </div>
+                    
+                    <div class="form-group">
+                        <label for="phone">Phone Number</label>
+                        <input type="tel" id="phone" name="phone" required>
+                    </div>
+                    
+                    <div class="form-group">
+                        <label for="email">Email Address</label>
+                        <input type="email" id="email" name="email">
+                    </div>
+                    
+                    <div class="form-group">
+                        <label for="notes">Special Requests (Optional)</label>
+                        <textarea id="notes" name="notes" rows="3"></textarea>
+                    </div>
+                    
+                    <button type="submit">Book Appointment</button>
+                </form>
+                
+                <footer>
+                    &copy; 2023 Delane Nails - All Rights Reserved
+                </footer>
+            </div>
+            
+            <script>
+                document.addEventListener('DOMContentLoaded', function() {{
+                    const serviceSelect = document.getElementById('service');
+                    const dateInput = document.getElementById('date');
+                    const slotSelect = document.getElementById('slot');
+                    const slotsDiv = document.getElementById('availableSlots');
+                    const bookingForm = document.getElementById('bookingForm');
+                    
+                    // Hold on the selected slot while the customer types their details
+                    let holdToken = null;
+                    let heldSlot = null;
+                    
+                    function releaseHold() {{
+                        if (!holdToken) {{
+                            return;
+                        }}
+                        fetch('/api/slots/release', {{
+                            method: 'POST',
+                            headers: {{ 'Content-Type': 'application/json' }},
+                            body: JSON.stringify({{ slot_id: heldSlot, hold_token: holdToken }})
+                        }});
+                        holdToken = null;
+                        heldSlot = null;
+                    }}
+                    
+                    function holdSlot() {{
+                        releaseHold();
+                        const slotId = slotSelect.value;
+                        if (!slotId) {{
+                            return;
+                        }}
+                        fetch('/api/slots/hold', {{
+                            method: 'POST',
+                            headers: {{ 'Content-Type': 'application/json' }},
+                            body: JSON.stringify({{ slot_id: slotId }})
+                        }})
+                        .then(response => response.json().then(data => ({{ ok: response.ok, data: data }})))
+                        .then(result => {{
+                            if (result.ok) {{
+                                holdToken = result.data.hold_token;
+                                heldSlot = slotId;
+                            }} else {{
+                                alert(result.data.error || result.data.detail);
+                                updateSlots();
+                            }}
+                        }});
+                    }}
+                    
+                    function updateSlots() {{
+                        releaseHold();
+                        const serviceId = serviceSelect.value;
+                        const date = dateInput.value;
+                        
+                        if (!serviceId || !date) {{
+                            slotsDiv.style.display = 'none';
+                            return;
+                        }}
+                        
+                        // Show loading state
+                        slotsDiv.style.display = 'block';
+                        slotSelect.innerHTML = '<option value="">Loading available times...</option>';
+                        
+                        // Fetch available slots
+                        fetch('/api/slots?service_id=' + serviceId + '&date=' + date)
+                            .then(response => response.json())
+                            .then(slots => {{
+                                slotSelect.innerHTML = '';
+                                
+                                if (slots.length === 0) {{
+                                    slotSelect.innerHTML = '<option value="">No available slots for this date</option>';
+                                    return;
+                                }}
+                                
+                                slotSelect.innerHTML = '<option value="">Choose a time...</option>';
+                                
+                                slots.forEach(function(slot) {{
+                                    const option = document.createElement('option');
+                                    option.value = slot.id;
+                                    const startTime = slot.start_time.substring(11, 16);
+                                    // Fix: Parse only the hour part of the time
+                                    const hour = parseInt(startTime.split(':')[0], 10);
+                                    option.textContent = startTime + ' (' + (hour >= 12 ? 'PM' : 'AM') + ')';
+                                    slotSelect.appendChild(option);
+                                }});
+                            }})
+                            .catch(error => {{
+                                console.error('Error:', error);
+                                slotSelect.innerHTML = '<option value="">Error loading times</option>';
+                            }});
+                    }}
+                    
+                    serviceSelect.addEventListener('change', updateSlots);
+                    dateInput.addEventListener('change', updateSlots);
+                    slotSelect.addEventListener('change', holdSlot);
+                    
+                    bookingForm.addEventListener('submit', function(e) {{
+                        e.preventDefault();
+                        
+                        const formData = {{
+                            service_id: serviceSelect.value,
+                            slot_id: slotSelect.value,
+                            customer_name: document.getElementById('name').value,
+                            customer_email: document.getElementById('email').value,
+                            customer_phone: document.getElementById('phone').value,
+                            notes: document.getElementById('notes').value,
+                            hold_token: slotSelect.value === heldSlot ? holdToken : null
+                        }};
+                        
+                        if (!formData.service_id || !formData.slot_id || !formData.customer_name || !formData.customer_phone) {{
+                            alert('Please fill all required fields');
+                            return;
+                        }}
+                        
+                        // Submit booking
+                        fetch('/api/simple-booking', {{
+                            method: 'POST',
+                            headers: {{ 'Content-Type': 'application/json' }},
+                            body: JSON.stringify(formData)
+                        }})
+                        .then(response => response.json())
+                        .then(data => {{
+                            if (data.appointment_id) {{
+                                window.location.href = '/simple-confirmation?id=' + data.appointment_id;
+                            }} else if (data.error) {{
+                                alert('Error: ' + data.error);
+                            }}
+                        }})
+                        .catch(error => {{
+                            console.error('Error:', error);
+                            alert('There was an error booking your appointment. Please try again.');
+                        }});
+                    }});
+                }});
+            </script>
+        </body>
+    </html>
+    """
+
+
+def confirmation_page(appointment: Dict[str, Any]) -> str:
+    """Simple confirmation page."""
+    return f"""
+    <html>
+        <head>
+            <title>Booking Confirmed - Delane Nails</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+                h1, h2 {{ color: #9c27b0; }}
+                .container {{ max-width: 800px; margin: 0 auto; }}
+                .confirmation {{ background: #f0fff0; padding: 20px; border-radius: 8px; border-left: 5px solid #4CAF50; }}
+                .details {{ background: #f9f9f9; padding: 15px; border-radius: 8px; margin: 20px 0; }}
+                .btn {{ display: inline-block; background: #9c27b0; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px; }}
+                nav {{ margin-bottom: 30px; }}
+                nav a {{ margin-right: 15px; color: #9c27b0; text-decoration: none; }}
+                nav a:hover {{ text-decoration: underline; }}
+                footer {{ margin-top: 50px; text-align: center; color: #666; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <nav>
+                    <a href="/">Home</a>
+                    <a href="/services">Services</a>
+                    <a href="/simple-chat">Chat</a>
+                    <a href="/simple-booking">Book Appointment</a>
+                </nav>
+                
+                <div class="confirmation">
+                    <h1>Booking Confirmed!</h1>
+                    <p>Thank you for booking with Delane Nails. Your appointment has been confirmed.</p>
+                </div>
+                
+                <div class="details">
+                    <h2>Appointment Details</h2>
+                    <p><strong>Service:</strong> {appointment.get('service_name', 'N/A')}</p>
+                    <p><strong>Date & Time:</strong> {appointment.get('start_time', 'N/A').replace('T', ' ').replace('Z', '')}</p>
+                    <p><strong>Customer:</strong> {appointment.get('customer_name', 'N/A')}</p>
+                    <p><strong>Confirmation ID:</strong> {appointment.get('appointment_id', 'N/A')}</p>
+                    <p><strong>Status:</strong> {appointment.get('status', 'N/A')}</p>
+                </div>
+                
+                <p>A confirmation has been sent to your email address. If you need to cancel or reschedule, please contact us.</p>
+                
+                <p>
+                    <a href="/" class="btn">Return to Home</a>
+                </p>
+                
+                <footer>
+                    &copy; 2023 Delane Nails - All Rights Reserved
+                </footer>
+            </div>
+        </body>
+    </html>
+    """
+
+
+def assistant_page() -> str:
+    """NailAide chat page talking to /ws/{session_id} and /voice."""
+    return """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>NailAide Chat</title>
+        <style>
+            body {
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                margin: 0;
+                padding: 0;
+                background-color: #f5f5f5;
+                color: #333;
+            }
+            .container {
+                max-width: 800px;
+                margin: 0 auto;
+                padding: 20px;
+            }
+            .chat-container {
+                display: flex;
+                flex-direction: column;
+                height: 70vh;
+                border: 1px solid #ddd;
+                border-radius: 8px;
+                background-color: white;
+                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            }
+            .chat-header {
+                background-color: #d14d72;
+                color: white;
+                padding: 15px;
+                border-radius: 8px 8px 0 0;
+            }
+            .chat-messages {
+                flex: 1;
+                overflow-y: auto;
+                padding: 15px;
+            }
+            .message {
+                margin-bottom: 15px;
+                padding: 10px 15px;
+                border-radius: 18px;
+                max-width: 75%;
+                word-wrap: break-word;
+            }
+            .user-message {
+                align-self: flex-end;
+                background-color: #007bff;
+                color: white;
+                margin-left: auto;
+            }
+            .assistant-message {
+                background-color: #e9e9eb;
+                color: #333;
+                margin-right: auto;
+            }
+            .chat-input {
+                display: flex;
+                padding: 15px;
+                border-top: 1px solid #ddd;
+            }
+            #messageInput {
+                flex: 1;
+                padding: 10px 15px;
+                border: 1px solid #ddd;
+                border-radius: 20px;
+                margin-right: 10px;
+            }
+            button {
+                background-color: #d14d72;
+                color: white;
+                border: none;
+                border-radius: 20px;
+                padding: 10px 15px;
+                cursor: pointer;
+            }
+            button:hover {
+                background-color: #b83e61;
+            }
+            .voice-button {
+                background-color: #28a745;
+            }
+            .voice-button:hover {
+                background-color: #218838;
+            }
+            .voice-button.recording {
+                background-color: #dc3545;
+            }
+            .slot-list {
+                margin-top: 10px;
+                background-color: #f8f9fa;
+                padding: 10px;
+                border-radius: 10px;
+            }
+            .slot {
+                padding: 8px;
+                border-bottom: 1px solid #eee;
+            }
+            .customer-info {
+                margin-top: 20px;
+                background-color: white;
+                padding: 15px;
+                border-radius: 8px;
+                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            }
+            .customer-info h3 {
+                margin-top: 0;
+                color: #d14d72;
+            }
+            .form-group {
+                margin-bottom: 15px;
+            }
+            .form-group label {
+                display: block;
+                margin-bottom: 5px;
+            }
+            .form-group input {
+                width: 100%;
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 4px;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>Chat with NailAide</h1>
+            
+            <div class="chat-container">
+                <div class="chat-header">
+                    <h2>Delane Nails Virtual Assistant</h2>
+                </div>
+                <div class="chat-messages" id="chatMessages">
+                    <div class="message assistant-message">
+                        <p>Hello! I'm NailAide, your virtual assistant for Delane Nails. How can I help you today?</p>
+                    </div>
+                </div>
+                <div class="chat-input">
+                    <input type="text" id="messageInput" placeholder="Type your message here..." />
+                    <button id="sendButton">Send</button>
+                    <button id="voiceButton" class="voice-button">🎤</button>
+                </div>
+            </div>
+            
+            <div class="customer-info">
+                <h3>Your Information</h3>
+                <div class="form-group">
+                    <label for="nameInput">Name:</label>
+                    <input type="text" id="nameInput" placeholder="Your name" />
+                </div>
+                <div class="form-group">
+                    <label for="emailInput">Email:</label>
+                    <input type="email" id="emailInput" placeholder="Your email" />
+                </div>
+                <div class="form-group">
+                    <label for="phoneInput">Phone:</label>
+                    <input type="tel" id="phoneInput" placeholder="Your phone number" />
+                </div>
+                <button id="updateInfoButton">Update Information</button>
+            </div>
+        </div>
+        
+        <script>
+            let sessionId = localStorage.getItem('sessionId');
+            if (!sessionId) {
+                sessionId = generateUUID();
+                localStorage.setItem('sessionId', sessionId);
+            }
+            
+            // Load customer info from local storage if available
+            const loadCustomerInfo = () => {
+                const info = JSON.parse(localStorage.getItem('customerInfo') || '{}');
+                if (info.name) document.getElementById('nameInput').value = info.name;
+                if (info.email) document.getElementById('emailInput').value = info.email;
+                if (info.phone) document.getElementById('phoneInput').value = info.phone;
+                return info;
+            };
+            
+            let customerInfo = loadCustomerInfo();
+            
+            // WebSocket connection
+            const ws = new WebSocket(`ws://${window.location.host}/ws/${sessionId}`);
+            
+            ws.onmessage = function(event) {
+                const data = JSON.parse(event.data);
+                
+                // Answer server heartbeats so the connection is kept alive
+                if (data.type === 'ping') {
+                    ws.send(JSON.stringify({ type: 'pong' }));
+                    return;
+                }
+                
+                displayMessage(data.message, 'assistant');
+                
+                // Handle special responses
+                if (data.action === 'display_slots' && data.data && data.data.available_slots) {
+                    displaySlots(data.data.available_slots);
+                }
+            };
+            
+            ws.onclose = function() {
+                displayMessage('Connection closed. Please refresh the page.', 'system');
+            };
+            
+            // Display a message in the chat
+            function displayMessage(message, sender) {
+                const chatMessages = document.getElementById('chatMessages');
+                const messageDiv = document.createElement('div');
+                messageDiv.className = `message ${sender}-message`;
+                
+                const paragraph = document.createElement('p');
+                paragraph.textContent = message;
+                messageDiv.appendChild(paragraph);
+                
+                chatMessages.appendChild(messageDiv);
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+            
+            // Display available slots
+            function displaySlots(slots) {
+                const chatMessages = document.getElementById('chatMessages');
+                const slotsDiv = document.createElement('div');
+                slotsDiv.className = 'slot-list';
+                
+                const header = document.createElement('h4');
+                header.textContent = 'Available Appointment Slots:';
+                slotsDiv.appendChild(header);
+                
+                slots.forEach((slot, index) => {
+                    const slotDiv = document.createElement('div');
+                    slotDiv.className = 'slot';
+                    slotDiv.textContent = `${index + 1}. ${slot.formatted_time} with ${slot.staff_name}`;
+                    slotDiv.onclick = () => {
+                        document.getElementById('messageInput').value = `I'd like to book slot ${index + 1}`;
+                    };
+                    slotsDiv.appendChild(slotDiv);
+                });
+                
+                chatMessages.appendChild(slotsDiv);
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+            
+            // Send message when button is clicked
+            document.getElementById('sendButton').addEventListener('click', function() {
+                sendMessage();
+            });
+            
+            // Send message when Enter key is pressed
+            document.getElementById('messageInput').addEventListener('keypress', function(event) {
+                if (event.key === 'Enter') {
+                    sendMessage();
+                }
+            });
+            
+            // Update customer info
+            document.getElementById('updateInfoButton').addEventListener('click', function() {
+                customerInfo = {
+                    name: document.getElementById('nameInput').value,
+                    email: document.getElementById('emailInput').value,
+                    phone: document.getElementById('phoneInput').value
+                };
+                
+                localStorage.setItem('customerInfo', JSON.stringify(customerInfo));
+                alert('Your information has been updated!');
+            });
+            
+            // Send message function
+            function sendMessage() {
+                const messageInput = document.getElementById('messageInput');
+                const message = messageInput.value.trim();
+                
+                if (message) {
+                    // Display user message
+                    displayMessage(message, 'user');
+                    
+                    // Send to server
+                    ws.send(JSON.stringify({
+                        message: message,
+                        customer_info: customerInfo
+                    }));
+                    
+                    // Clear input
+                    messageInput.value = '';
+                }
+            }
+            
+            // Voice button functionality
+            let mediaRecorder;
+            let audioChunks = [];
+            let isRecording = false;
+            
+            document.getElementById('voiceButton').addEventListener('click', function() {
+                const voiceButton = document.getElementById('voiceButton');
+                
+                if (!isRecording) {
+                    // Start recording
+                    navigator.mediaDevices.getUserMedia({ audio: true })
+                        .then(stream => {
+                            isRecording = true;
+                            voiceButton.classList.add('recording');
+                            voiceButton.textContent = '⏹️';
+                            
+                            mediaRecorder = new MediaRecorder(stream);
+                            mediaRecorder.start();
+                            
+                            mediaRecorder.ondataavailable = function(event) {
+                                audioChunks.push(event.data);
+                            };
+                            
+                            mediaRecorder.onstop = function() {
+                                const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
+                                sendVoiceMessage(audioBlob);
+                                audioChunks = [];
+                                stream.getTracks().forEach(track => track.stop());
+                            };
+                        })
+                        .catch(err => {
+                            console.error('Error accessing microphone:', err);
+                            alert('Could not access microphone. Please check permissions.');
+                        });
+                } else {
+                    // Stop recording
+                    isRecording = false;
+                    voiceButton.classList.remove('recording');
+                    voiceButton.textContent = '🎤';
+                    mediaRecorder.stop();
+                }
+            });
+            
+            // Send voice message
+            function sendVoiceMessage(audioBlob) {
+                displayMessage('Processing voice message...', 'system');
+                
+                const formData = new FormData();
+                formData.append('audio', audioBlob);
+                formData.append('session_id', sessionId);
+                
+                fetch('/voice', {
+                    method: 'POST',
+                    body: formData
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.transcription) {
+                        displayMessage(data.transcription, 'user');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error sending voice message:', error);
+                    displayMessage('Error processing voice message. Please try again.', 'system');
+                });
+            }
+            
+            // Generate UUID function
+            function generateUUID() {
+                return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) {
+                    const r = Math.random() * 16 | 0,
+                          v = c == 'x' ? r : (r & 0x3 | 0x8);
+                    return v.toString(16);
+                });
+            }
+        </script>
+    </body>
+    </html>
+    """
@@ -7,6 +7,9 @@ from flask import Flask, jsonify, request, redirect
 
 from src.agent import BookingAgent
 from src.config import config
+from src.storage.reservations import (
+    InMemoryReservations, SlotUnavailableError, assign_claim, claim_slot, filter_available, rollback_claim
+)
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
@@ -16,8 +19,9 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = "delane-nails-secret-key"
 
-# Initialize booking agent
-agent = BookingAgent(use_mock_api=True)
+# Initialize booking agent; chat and form bookings claim slots in the same reservations
+agent = BookingAgent(use_mock_api=True, reservations=InMemoryReservations())
+reservations = agent.reservations
 
 # Home page route
 @app.route('/')
@@ -84,15 +88,21 @@ def api_slots():
     try:
         date = datetime.strptime(date_str, "%Y-%m-%d")
         slots = agent.api.get_available_slots(service_id=service_id, start_date=date)
-        return jsonify(slots)
+        return jsonify(filter_available(reservations, slots).to_dicts())
     except Exception as e:
-        logger.error(f"Error getting slots: {str(e)}")
+        logger.error("Error getting slots: %s", e)
         return jsonify([])
 
 # Process booking form submission API endpoint
 @app.route('/api/simple-booking', methods=['POST'])
 def process_booking():
     data = request.json
+    slot_id = data.get('slot_id')
+    
+    try:
+        token = claim_slot(reservations, slot_id, data.get('hold_token'))
+    except SlotUnavailableError as e:
+        return jsonify({'error': str(e)})
     
     try:
         customer_details = {
@@ -103,13 +113,15 @@ def process_booking():
         
         appointment = agent.api.book_appointment(
             service_id=data.get('service_id'),
-            slot_id=data.get('slot_id'),
+            slot_id=slot_id,
             customer_details=customer_details
         )
+        assign_claim(reservations, slot_id, token, appointment['appointment_id'])
         
         return jsonify(appointment)
     except Exception as e:
-        logger.error(f"Error booking appointment: {str(e)}")
+        rollback_claim(reservations, slot_id, token)
+        logger.error("Error booking appointment: %s", e)
         return jsonify({'error': str(e)})
 
 # Services page route
@@ -503,7 +515,7 @@ def simple_confirmation():
         </html>
         """
     except Exception as e:
-        logger.error(f"Error retrieving appointment: {str(e)}")
+        logger.error("Error retrieving appointment: %s", e)
         return redirect('/')
 
 def start_simple_web_server():
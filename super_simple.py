@@ -2,9 +2,16 @@
 Super simple standalone version of the Delane Nails application.
 """
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from flask import Flask, jsonify, request, redirect
 
+from src.storage.appointment_store import AppointmentStore
+from src.slots import Appointment, generate_slots
+from src.storage.reservations import (
+    SQLiteReservations, SlotUnavailableError, claim_slot, filter_available, rollback_claim
+)
+from src.utils.page_cache import PageCache
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -40,40 +47,18 @@ SERVICES = [
     }
 ]
 
-# Store appointments in memory
-APPOINTMENTS = {}
+# Appointments persist in SQLite (config "db_path") across restarts
+APPOINTMENTS = AppointmentStore()
 
-def generate_slots(service_id=None, start_date=None):
-    """Generate available appointment slots."""
-    if start_date is None:
-        start_date = datetime.now()
-    
-    # Generate slots for the next 7 days
-    slots = []
-    for day_offset in range(7):
-        current_date = start_date + timedelta(days=day_offset)
-        
-        # Generate 8 slots per day (9am to 5pm)
-        for hour in range(9, 17):
-            slot_time = current_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            
-            # Skip slots in the past
-            if slot_time < datetime.now():
-                continue
-                
-            slot = {
-                "id": f"slot_{slot_time.strftime('%Y%m%d%H%M')}",
-                "start_time": slot_time.strftime("%Y-%m-%dT%H:%M:%S"),
-                "end_time": (slot_time + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S"),
-                "available": True,
-                "service_id": service_id or "default-service"
-            }
-            slots.append(slot)
-    
-    return slots
+# Slot holds live in the same database so they survive restarts too
+RESERVATIONS = SQLiteReservations(APPOINTMENTS.db_path)
+
+# Rendered pages with gzip/brotli variants
+page_cache = PageCache()
 
 # Home page route
 @app.route('/')
+@page_cache.flask_page()
 def home():
     return """
     <html>
@@ -119,6 +104,7 @@ def home():
 
 # Services page route
 @app.route('/services')
+@page_cache.flask_page()
 def services():
     services_html = ""
     for service in SERVICES:
@@ -174,6 +160,7 @@ def services():
 
 # Simple chat interface route
 @app.route('/simple-chat')
+@page_cache.flask_page()
 def simple_chat():
     return """
     <html>
@@ -256,6 +243,7 @@ def simple_chat():
 
 # Simple booking form route
 @app.route('/simple-booking')
+@page_cache.flask_page(key=lambda: ('simple_booking', datetime.now().strftime('%Y-%m-%d')))
 def simple_booking():
     service_options = ""
     for service in SERVICES:
@@ -352,7 +340,50 @@ def simple_booking():
                     var slotsDiv = document.getElementById('availableSlots');
                     var bookingForm = document.getElementById('bookingForm');
                     
+                    // Hold on the selected slot while the customer types their details
+                    var holdToken = null;
+                    var heldSlot = null;
+                    
+                    function releaseHold() {{
+                        if (!holdToken) {{
+                            return;
+                        }}
+                        fetch('/api/slots/release', {{
+                            method: 'POST',
+                            headers: {{ 'Content-Type': 'application/json' }},
+                            body: JSON.stringify({{ slot_id: heldSlot, hold_token: holdToken }})
+                        }});
+                        holdToken = null;
+                        heldSlot = null;
+                    }}
+                    
+                    function holdSlot() {{
+                        releaseHold();
+                        var slotId = slotSelect.value;
+                        if (!slotId) {{
+                            return;
+                        }}
+                        fetch('/api/slots/hold', {{
+                            method: 'POST',
+                            headers: {{ 'Content-Type': 'application/json' }},
+                            body: JSON.stringify({{ slot_id: slotId }})
+                        }})
+                        .then(function(response) {{
+                            return response.json().then(function(data) {{ return {{ ok: response.ok, data: data }}; }});
+                        }})
+                        .then(function(result) {{
+                            if (result.ok) {{
+                                holdToken = result.data.hold_token;
+                                heldSlot = slotId;
+                            }} else {{
+                                alert(result.data.error);
+                                updateSlots();
+                            }}
+                        }});
+                    }}
+                    
                     function updateSlots() {{
+                        releaseHold();
                         var serviceId = serviceSelect.value;
                         var date = dateInput.value;
                         
@@ -397,6 +428,7 @@ def simple_booking():
                     
                     serviceSelect.addEventListener('change', updateSlots);
                     dateInput.addEventListener('change', updateSlots);
+                    slotSelect.addEventListener('change', holdSlot);
                     
                     bookingForm.addEventListener('submit', function(e) {{
                         e.preventDefault();
@@ -407,7 +439,8 @@ def simple_booking():
                             customer_name: document.getElementById('name').value,
                             customer_email: document.getElementById('email').value,
                             customer_phone: document.getElementById('phone').value,
-                            notes: document.getElementById('notes').value
+                            notes: document.getElementById('notes').value,
+                            hold_token: slotSelect.value === heldSlot ? holdToken : null
                         }};
                         
                         if (!formData.service_id || !formData.slot_id || !formData.customer_name || !formData.customer_phone) {{
@@ -467,14 +500,40 @@ def api_slots():
     try:
         date = datetime.strptime(date_str, "%Y-%m-%d")
         slots = generate_slots(service_id=service_id, start_date=date)
-        return jsonify(slots)
+        return jsonify(filter_available(RESERVATIONS, slots).to_dicts())
     except Exception as e:
         print(f"Error getting slots: {str(e)}")
         return jsonify([])
 
+@app.route('/api/slots/hold', methods=['POST'])
+def hold_slot():
+    data = request.json
+    if not data.get('slot_id'):
+        return jsonify({'error': 'Missing slot information'}), 400
+    hold = RESERVATIONS.hold(data.get('slot_id'), token=data.get('hold_token'))
+    if hold is None:
+        return jsonify({'error': 'Sorry, that time was just taken. Please choose another time.'}), 409
+    return jsonify(hold.to_dict())
+
+@app.route('/api/slots/release', methods=['POST'])
+def release_slot():
+    data = request.json
+    released = bool(data.get('hold_token')) and RESERVATIONS.release(data.get('slot_id'), data.get('hold_token'))
+    return jsonify({'released': released})
+
 @app.route('/api/simple-booking', methods=['POST'])
 def process_booking():
     data = request.json
+    service_id = data.get('service_id')
+    slot_id = data.get('slot_id')
+    
+    if not service_id or not slot_id:
+        return jsonify({'error': 'Missing service or slot information'})
+    
+    try:
+        token = claim_slot(RESERVATIONS, slot_id, data.get('hold_token'))
+    except SlotUnavailableError as e:
+        return jsonify({'error': str(e)})
     
     try:
         customer_details = {
@@ -483,57 +542,25 @@ def process_booking():
             "phone": data.get('customer_phone', '')
         }
         
-        service_id = data.get('service_id')
-        slot_id = data.get('slot_id')
-        
-        if not service_id or not slot_id:
-            return jsonify({'error': 'Missing service or slot information'})
-        
-        # Extract date and time from slot ID
-        date_time_str = slot_id.replace("slot_", "")
-        year = int(date_time_str[0:4])
-        month = int(date_time_str[4:6])
-        day = int(date_time_str[6:8])
-        hour = int(date_time_str[8:10])
-        minute = int(date_time_str[10:12])
-        
-        appointment_time = datetime(year, month, day, hour, minute)
-        
-        # Generate an appointment ID
-        appointment_id = f"appt-{slot_id}"
-        
         # Find service name
         service_name = next((s["name"] for s in SERVICES if s["id"] == service_id), "Unknown Service")
         
-        # Create appointment
-        appointment = {
-            "appointment_id": appointment_id,
-            "service_id": service_id,
-            "service_name": service_name,
-            "status": "confirmed",
-            "start_time": appointment_time.strftime("%Y-%m-%dT%H:%M:%S"),
-            "end_time": (appointment_time + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S"),
-            "customer_name": customer_details.get("name", ""),
-            "customer_email": customer_details.get("email", ""),
-            "customer_phone": customer_details.get("phone", "")
-        }
-        
-        # Store appointment in memory
-        APPOINTMENTS[appointment_id] = appointment
+        appointment = Appointment.for_slot(service_id, slot_id, customer_details, service_name).to_dict()
+        APPOINTMENTS.add(appointment)
         
         return jsonify(appointment)
     except Exception as e:
+        rollback_claim(RESERVATIONS, slot_id, token)
         print(f"Error booking appointment: {str(e)}")
         return jsonify({'error': str(e)})
 
 @app.route('/simple-confirmation')
 def simple_confirmation():
     appointment_id = request.args.get('id')
-    if not appointment_id or appointment_id not in APPOINTMENTS:
+    appointment = APPOINTMENTS.get(appointment_id) if appointment_id else None
+    if appointment is None:
         return redirect('/')
     
-    appointment = APPOINTMENTS[appointment_id]
-    
     return f"""
     <html>
         <head>
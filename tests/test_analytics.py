@@ -0,0 +1,97 @@
+"""
+Tests for the columnar appointment analytics.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.analytics import AppointmentAnalytics, format_report, rows_from_dicts
+from src.mocks import MockResponses
+from src.storage.appointment_store import AppointmentStore
+
+
+def appointment(n, start, service_id="service-001", minutes=60, status="confirmed"):
+    return {
+        "appointment_id": f"appt-{n}",
+        "service_id": service_id,
+        "status": status,
+        "start_time": start,
+        "end_time": start + timedelta(minutes=minutes),
+    }
+
+
+@pytest.fixture
+def store():
+    store = AppointmentStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_report_aggregates(store):
+    """Revenue, bookings, cancellations and hourly utilization come out of the rollups."""
+    day = datetime(2030, 5, 6)
+    store.add_many([
+        appointment(1, day.replace(hour=9), "service-001"),
+        appointment(2, day.replace(hour=10, minute=30), "service-003", minutes=75),
+        appointment(3, day.replace(hour=14), "service-002", status="canceled"),
+        appointment(4, day.replace(hour=15), "service-unknown"),
+    ])
+    analytics = AppointmentAnalytics.for_store(store, MockResponses.services(),
+                                               clock=lambda: datetime(2030, 6, 1))
+
+    report = analytics.report(day, day + timedelta(days=1))
+
+    assert report["appointments"] == 3
+    assert report["cancellations"] == 1
+    assert report["cancellation_rate"] == 0.25
+    assert report["revenue"] == 90.0
+    assert report["revenue_by_service"] == {"Manicure": 35.0, "Gel Nails": 55.0}
+    assert report["bookings_by_service"]["Other"] == 1
+    assert report["revenue_by_category"] == {"Hands": 35.0, "Enhancements": 55.0}
+    # The 75-minute appointment fills 10:30-11:45
+    assert report["utilization_by_hour"][10] == 0.5
+    assert report["utilization_by_hour"][11] == 0.75
+    assert report["utilization_by_hour"][14] == 0.0
+    assert "Revenue: $90.00" in format_report(report)
+
+
+def test_finished_days_are_not_rescanned():
+    """Past days are loaded once; today is reloaded on every report."""
+    calls = []
+    rows = rows_from_dicts([
+        {"start_time": "2030-05-01T09:00:00", "service_id": "service-002", "status": "confirmed",
+         "created_at": "2030-04-29T09:00:00"},
+        {"start_time": "2030-05-03T09:00:00", "service_id": "service-002", "status": "confirmed"},
+    ])
+
+    def loader(start, end):
+        calls.append((start.date(), end.date()))
+        return rows
+
+    analytics = AppointmentAnalytics(loader, MockResponses.services(), clock=lambda: datetime(2030, 5, 3, 12))
+
+    first = analytics.month_to_date()
+    second = analytics.month_to_date()
+
+    assert first == second
+    assert first["appointments"] == 2 and first["revenue"] == 80.0
+    assert first["lead_time_hours"] == {"mean": 48.0, "buckets": {"<1d": 0, "1-3d": 1, "3-7d": 0, "7-14d": 0, "14d+": 0}}
+    assert calls == [(date(2030, 5, 1), date(2030, 5, 4)), (date(2030, 5, 3), date(2030, 5, 4))]
+
+
+def test_failed_loads_are_not_cached():
+    """A loader error fails the report without caching the days it was loading."""
+    rows = rows_from_dicts([{"start_time": "2030-05-01T09:00:00", "service_id": "service-002"}])
+    outage = [True]
+
+    def loader(start, end):
+        if outage[0]:
+            raise ConnectionError("upstream down")
+        return rows
+
+    analytics = AppointmentAnalytics(loader, MockResponses.services(), clock=lambda: datetime(2030, 5, 3, 12))
+
+    with pytest.raises(ConnectionError):
+        analytics.month_to_date()
+    outage[0] = False
+    assert analytics.month_to_date()["appointments"] == 1
@@ -0,0 +1,126 @@
+"""
+Tests for the SQLite appointment store.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api_client import NailSalonAPI
+from src.storage.appointment_store import AppointmentStore
+from src.storage.reservations import InMemoryReservations, assign_claim, claim_slot
+
+
+def make_appointment(n, start):
+    return {
+        "appointment_id": f"appt-{n}",
+        "service_id": "service-001",
+        "service_name": "Manicure",
+        "start_time": start,
+        "end_time": start + timedelta(hours=1),
+        "customer_name": f"Customer {n}",
+        "customer_email": f"Customer{n}@Example.com",
+        "customer_phone": f"(555) 010-{n:04d}",
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AppointmentStore(str(tmp_path / "appointments.db"))
+    yield store
+    store.close()
+
+
+def test_lookups_by_id_phone_and_email(store):
+    """Appointments are found by ID, normalized phone and case-insensitive email."""
+    start = datetime(2030, 5, 1, 9)
+    store.add(make_appointment(1, start))
+
+    assert store.get("appt-1")["start_time"] == "2030-05-01T09:00:00"
+    assert store.get("appt-1")["status"] == "confirmed"
+    assert store.get("missing") is None
+    assert [a["appointment_id"] for a in store.find_by_phone("555-010-0001")] == ["appt-1"]
+    assert [a["appointment_id"] for a in store.find_by_email("customer1@example.com")] == ["appt-1"]
+
+    with pytest.raises(ValueError, match="appt-1 already exists"):
+        store.add(make_appointment(1, datetime(2030, 5, 2, 9)))
+
+
+def test_one_confirmed_appointment_per_start_time(store):
+    """A start time can be booked again only after its appointment is canceled."""
+    start = datetime(2030, 5, 1, 9)
+    store.add(make_appointment(1, start))
+
+    with pytest.raises(ValueError, match="already booked"):
+        store.add(make_appointment(2, start))
+    store.set_status("appt-1", "canceled")
+    store.add(make_appointment(2, start))
+    assert sorted(a["appointment_id"] for a in store.on_day(start)) == ["appt-1", "appt-2"]
+
+
+def test_batch_insert_and_day_range(store):
+    """Batched inserts are range-scannable by day and status."""
+    start = datetime(2030, 5, 1, 9)
+    store.add_many(make_appointment(n, start + timedelta(hours=n)) for n in range(48))
+    store.set_status("appt-2", "canceled")
+
+    day = store.on_day(datetime(2030, 5, 1))
+    assert store.count() == 48
+    assert [a["appointment_id"] for a in day] == [f"appt-{n}" for n in range(15)]
+    assert len(store.on_day(datetime(2030, 5, 1), status="confirmed")) == 14
+
+
+def test_persists_across_reopen(tmp_path):
+    """Bookings survive closing and reopening the database."""
+    path = str(tmp_path / "appointments.db")
+    store = AppointmentStore(path)
+    store.add(make_appointment(7, datetime(2030, 5, 1, 9)))
+    store.close()
+
+    reopened = AppointmentStore(path)
+    assert reopened.get("appt-7")["customer_name"] == "Customer 7"
+    reopened.close()
+
+
+def test_api_uses_store_as_local_backend(store):
+    """NailSalonAPI books, looks up, cancels and hides booked slots via the store."""
+    api = NailSalonAPI(store=store)
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slot = api.get_available_slots("service-002", day)[0]
+
+    appointment = api.book_appointment("service-002", slot["id"], {"name": "Ada", "phone": "555-0100"})
+    assert appointment["service_name"] == "Pedicure"
+    assert api.get_appointment(appointment["appointment_id"])["customer_name"] == "Ada"
+    assert slot["id"] not in [s["id"] for s in api.get_available_slots("service-002", day)]
+
+    assert api.cancel_appointment(appointment["appointment_id"])["status"] == "canceled"
+    assert slot["id"] in [s["id"] for s in api.get_available_slots("service-002", day)]
+    rebooked = api.book_appointment("service-002", slot["id"], {"name": "Bo"})
+    assert rebooked["appointment_id"] != appointment["appointment_id"]
+    assert api.get_appointment(appointment["appointment_id"])["status"] == "canceled"
+    with pytest.raises(KeyError):
+        api.get_appointment("appt-missing")
+
+
+@pytest.mark.parametrize("backend", ["store", "mock"])
+def test_repeated_cancel_keeps_a_rebooked_slot(store, backend):
+    """Cancelling an old appointment again doesn't reopen the slot a new customer booked."""
+    reservations = InMemoryReservations()
+    if backend == "store":
+        api = NailSalonAPI(store=store, reservations=reservations)
+    else:
+        api = NailSalonAPI(use_mock=True, reservations=reservations)
+    slot_id = "slot_203005041400"
+
+    def book(name):
+        token = claim_slot(reservations, slot_id)
+        appointment = api.book_appointment("service-001", slot_id, {"name": name})
+        assign_claim(reservations, slot_id, token, appointment["appointment_id"])
+        return appointment["appointment_id"]
+
+    first = book("Ada")
+    assert api.cancel_appointment(first)["status"] == "canceled"
+    assert reservations.unavailable([slot_id]) == set()
+
+    book("Bo")
+    api.cancel_appointment(first)
+    assert reservations.unavailable([slot_id]) == {slot_id}
@@ -0,0 +1,25 @@
+"""
+Tests for the hot-path benchmark runner and the regression comparison.
+"""
+from benchmarks import agent as agent_benchmarks
+from benchmarks.compare import compare
+
+
+def test_run_and_compare_flags_only_real_regressions():
+    """Saved results compare per benchmark; slowdowns within threshold or noise pass."""
+    baseline = agent_benchmarks.run(repeat=2, min_time=0.001, only=["agent.determine_intent"])
+    result = baseline["results"]["agent.determine_intent"]
+    assert list(baseline["results"]) == ["agent.determine_intent"] and result["median_us"] > 0
+
+    def with_results(**results):
+        return {"results": results}
+
+    before = with_results(fast={"median_us": 10.0, "stdev_us": 0.1}, noisy={"median_us": 10.0, "stdev_us": 4.0},
+                          gone={"median_us": 1.0}, optional={"skipped": "No module named 'twilio'"})
+    after = with_results(fast={"median_us": 12.0, "stdev_us": 0.1}, noisy={"median_us": 13.0, "stdev_us": 4.0},
+                         optional={"median_us": 3.0}, added={"median_us": 5.0})
+
+    statuses = {row["name"]: row["status"] for row in compare(before, after, threshold=0.10)}
+    assert statuses == {"fast": "regression", "noisy": "unchanged", "gone": "missing",
+                        "optional": "skipped", "added": "new"}
+    assert compare(after, before)[0]["status"] == "improvement"
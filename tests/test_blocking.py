@@ -0,0 +1,108 @@
+"""
+Tests for the bounded blocking pool and the async agent path.
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.agent import BookingAgent
+from src.api_client import NailSalonAPI
+from src.utils.blocking import BlockingPool
+from src.utils.metrics import get_registry
+
+
+@pytest.mark.asyncio
+async def test_route_cap_limits_concurrency():
+    """A route never runs more calls at once than its cap."""
+    pool = BlockingPool(max_workers=8, route_limits={"booking": 2})
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    await asyncio.gather(*(pool.run("booking", work) for _ in range(6)))
+    pool.shutdown()
+
+    assert max(peak) == 2
+    assert pool.stats()["booking"] == {"calls": 6, "waiting": 0, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_capped_route_does_not_starve_others():
+    """Calls on another route proceed while a capped route is saturated."""
+    pool = BlockingPool(max_workers=4, route_limits={"slow": 1})
+    release = threading.Event()
+
+    slow = [asyncio.ensure_future(pool.run("slow", release.wait)) for _ in range(3)]
+    assert await asyncio.wait_for(pool.run("pages", lambda: "ok"), timeout=1) == "ok"
+
+    release.set()
+    await asyncio.gather(*slow)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_agent_matches_sync_agent():
+    """process_message_async walks the same booking flow as process_message."""
+    script = ["hello", "book an appointment", "1", "tomorrow", "1", "Ada", "555-0100", "ada@example.com"]
+    sync_agent = BookingAgent(use_mock_api=True)
+    async_agent = BookingAgent(use_mock_api=True)
+
+    for message in script:
+        expected = sync_agent.process_message(message)
+        actual = await async_agent.process_message_async(message)
+        if "appointment ID" in expected:
+            # Mock appointment IDs are random
+            expected, actual = expected.split("ID is")[0], actual.split("ID is")[0]
+        assert actual == expected
+
+    assert "is confirmed" in actual
+
+
+@pytest.mark.asyncio
+async def test_async_agent_awaits_upstream_api():
+    """With a real API the async path goes through the async HTTP client."""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request.url.path)
+        return httpx.Response(200, json=[
+            {"id": "svc_1", "name": "Manicure", "price": 25, "duration": 30, "description": "Classic"}
+        ])
+
+    agent = BookingAgent(use_mock_api=False)
+    agent.api = NailSalonAPI(api_base_url="http://salon.test")
+    agent.api._async_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://salon.test"
+    )
+
+    reply = await agent.process_message_async("what services do you offer")
+    await agent.api.aclose()
+
+    assert requests_seen == ["/services"]
+    assert "Manicure - $25" in reply
+
+
+@pytest.mark.asyncio
+async def test_in_process_async_calls_are_timed_once():
+    """Async calls answered locally record their own latency and not the sync method's too."""
+    def count(method):
+        key = f'integration_call_seconds{{client="salon_api",method="{method}"}}'
+        return get_registry().stats().get(key, {"count": 0})["count"]
+
+    api = NailSalonAPI(use_mock=True)
+    before = {method: count(method) for method in ("get_services", "get_services_async")}
+    await api.get_services_async()
+
+    assert count("get_services_async") == before["get_services_async"] + 1
+    assert count("get_services") == before["get_services"]
@@ -0,0 +1,53 @@
+"""
+Tests for the cross-worker chat message bus.
+"""
+import asyncio
+
+import pytest
+
+from src.chat.bus import MessageBus, UnixSocketBackend
+
+
+@pytest.mark.asyncio
+async def test_in_process_publish():
+    """Local subscribers receive published messages."""
+    bus = MessageBus()
+    await bus.start()
+    received = []
+
+    async def handler(message):
+        received.append(message)
+
+    bus.subscribe("s1", handler)
+    await bus.publish("s1", {"message": "hello"})
+    await bus.publish("s2", {"message": "nobody"})
+    bus.unsubscribe("s1")
+    await bus.publish("s1", {"message": "gone"})
+
+    assert received == [{"message": "hello"}]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_forwards_between_workers(tmp_path):
+    """A message published in one worker reaches the worker holding the socket."""
+    path = str(tmp_path / "bus.sock")
+    worker_a = MessageBus(UnixSocketBackend(path))
+    worker_b = MessageBus(UnixSocketBackend(path))
+    await worker_a.start()
+    await worker_b.start()
+
+    received = asyncio.Queue()
+
+    async def handler(message):
+        await received.put(message)
+
+    worker_b.subscribe("s1", handler)
+    await asyncio.sleep(0.05)
+    await worker_a.publish("s1", {"transcription": "book a manicure"})
+
+    message = await asyncio.wait_for(received.get(), timeout=1)
+    assert message == {"transcription": "book a manicure"}
+
+    await worker_b.close()
+    await worker_a.close()
@@ -0,0 +1,150 @@
+"""
+Tests for FreeBusy availability overlays and batched event creation.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api_client import NailSalonAPI
+from src.google_services.calendar import GoogleCalendar
+from src.google_services.calendar_sync import filter_busy_slots
+from src.slots import generate_slots, to_minutes
+
+DAY = datetime(2030, 5, 1)
+
+
+def minutes(hour, minute=0):
+    return to_minutes(DAY.replace(hour=hour, minute=minute))
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            if request.result["summary"] == "bad":
+                self.callback(request_id, None, ValueError("rejected"))
+            else:
+                self.callback(request_id, dict(request.result, id=f"evt-{request_id}"), None)
+
+
+class FakeService:
+    """Calendar service covering freebusy().query, events().insert and batches."""
+
+    def __init__(self, busy):
+        self.busy = busy
+        self.queries = []
+        self.batches = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.queries.append([item["id"] for item in body["items"]])
+        calendars = {}
+        for item in body["items"]:
+            if item["id"] in self.busy:
+                calendars[item["id"]] = {"busy": self.busy[item["id"]]}
+            else:
+                calendars[item["id"]] = {"errors": [{"reason": "notFound"}]}
+        return FakeRequest({"calendars": calendars})
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body):
+        return FakeRequest(body)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture
+def calendar():
+    # Skip __init__: it reads OAuth credential paths from the environment
+    calendar = GoogleCalendar.__new__(GoogleCalendar)
+    calendar.service = FakeService({
+        "ana@salon.test": [{"start": "2030-05-01T09:00:00", "end": "2030-05-01T11:00:00"}],
+        "bo@salon.test": [{"start": "2030-05-01T10:30:00", "end": "2030-05-01T12:00:00"}],
+    })
+    return calendar
+
+
+def test_filter_busy_slots_counts_free_calendars():
+    """min_free=1 keeps a slot if anyone is free; min_free=2 needs both."""
+    slots = generate_slots("service-001", DAY, days=1, now=datetime(2030, 1, 1))
+    busy = {
+        "ana": [(minutes(9), minutes(11))],
+        "bo": [(minutes(10, 30), minutes(11, 15)), (minutes(11), minutes(12))],
+    }
+    assert "slot_203005011000" not in filter_busy_slots(slots, busy, min_free=1)
+    assert "slot_203005010900" in filter_busy_slots(slots, busy, min_free=1)
+    assert filter_busy_slots(slots, busy, min_free=2).ids()[:2] == ["slot_203005011200", "slot_203005011300"]
+
+
+def test_free_busy_chunks_and_skips_errors(calendar):
+    """One query per 50 calendars; calendars with errors are left out."""
+    staff = ["ana@salon.test", "bo@salon.test"] + [f"temp{n}@salon.test" for n in range(60)]
+    busy = calendar.free_busy(DAY.replace(hour=9), DAY.replace(hour=17), staff)
+
+    assert [len(q) for q in calendar.service.queries] == [50, 12]
+    assert busy == {
+        "ana@salon.test": [(DAY.replace(hour=9), DAY.replace(hour=11))],
+        "bo@salon.test": [(DAY.replace(hour=10, minute=30), DAY.replace(hour=12))],
+    }
+
+
+def test_slot_filter_overlays_api_availability(calendar):
+    """A calendar slot filter narrows NailSalonAPI slots with a single FreeBusy call."""
+    api = NailSalonAPI(use_mock=True)
+    api.add_slot_filter(calendar.slot_filter(["ana@salon.test", "bo@salon.test"], min_free=2))
+
+    slots = api.get_available_slots("service-001", datetime(2030, 5, 1))
+    assert len(calendar.service.queries) == 1
+    assert not {"slot_203005010900", "slot_203005011000", "slot_203005011100"} & set(slots.ids())
+    assert "slot_203005011200" in slots
+
+
+def test_slot_filter_fails_open(calendar):
+    """Unreadable calendars count as free, and a failed FreeBusy call leaves slots unfiltered."""
+    api = NailSalonAPI(use_mock=True)
+    unfiltered = api.get_available_slots("service-001", datetime(2030, 5, 1))
+    api.add_slot_filter(calendar.slot_filter(["ana@salon.test", "gone@salon.test"], min_free=2))
+
+    slots = api.get_available_slots("service-001", datetime(2030, 5, 1))
+    assert "slot_203005010900" not in slots and "slot_203005011100" in slots
+
+    def broken(body):
+        raise ConnectionError("FreeBusy unreachable")
+
+    calendar.service.query = broken
+    assert api.get_available_slots("service-001", datetime(2030, 5, 1)).ids() == unfiltered.ids()
+
+
+def test_create_events_batch(calendar):
+    """Inserts go out 50 per batch; failures come back as None in place."""
+    start = DAY.replace(hour=9)
+    events = [
+        {"summary": "bad" if n == 3 else f"Import {n}", "start_time": start, "end_time": start + timedelta(hours=1)}
+        for n in range(120)
+    ]
+    created = calendar.create_events_batch(events)
+
+    assert calendar.service.batches == [50, 50, 20]
+    assert created[3] is None
+    assert created[119]["id"] == "evt-119" and created[119]["summary"] == "Import 119"
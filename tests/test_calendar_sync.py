@@ -0,0 +1,90 @@
+"""
+Tests for the incremental Google Calendar mirror.
+"""
+from datetime import datetime
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from src.google_services.calendar_sync import CalendarMirror
+from src.slots import generate_slots
+
+
+def event(event_id, start, end, **extra):
+    return {"id": event_id, "start": {"dateTime": start}, "end": {"dateTime": end}, **extra}
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class FakeEvents:
+    """events() resource serving queued pages; records request parameters."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def list(self, **params):
+        self.requests.append(params)
+        return FakeRequest(self.responses.pop(0))
+
+
+class FakeCalendar:
+    def __init__(self, responses):
+        self.events_resource = FakeEvents(responses)
+        self.service = self
+
+    def events(self):
+        return self.events_resource
+
+
+def test_full_sync_pages_then_incremental_changes():
+    """Every page is read; later syncs apply only changes, including cancellations."""
+    calendar = FakeCalendar([
+        {"items": [event("a", "2030-05-01T10:00:00", "2030-05-01T11:00:00")], "nextPageToken": "p2"},
+        {"items": [event("b", "2030-05-01T13:00:00", "2030-05-01T14:30:00")], "nextSyncToken": "s1"},
+        {"items": [{"id": "a", "status": "cancelled"},
+                   event("c", "2030-05-01T15:00:00", "2030-05-01T16:00:00", transparency="transparent")],
+         "nextSyncToken": "s2"},
+    ])
+    mirror = CalendarMirror(calendar, max_age=3600)
+
+    assert [e["id"] for e in mirror.events_between(datetime(2030, 5, 1), datetime(2030, 5, 2))] == ["a", "b"]
+    assert mirror.sync_token == "s1"
+    assert calendar.events_resource.requests[1]["pageToken"] == "p2"
+
+    assert mirror.sync() == 2
+    assert calendar.events_resource.requests[2]["syncToken"] == "s1"
+    assert sorted(mirror.events) == ["b", "c"]
+    # Transparent events don't block time
+    assert mirror.is_free(datetime(2030, 5, 1, 15), datetime(2030, 5, 1, 16))
+    assert not mirror.is_free(datetime(2030, 5, 1, 14), datetime(2030, 5, 1, 15))
+
+    slots = generate_slots("service-001", datetime(2030, 5, 1), days=1, now=datetime(2030, 1, 1))
+    assert "slot_203005011400" not in mirror.filter_slots(slots)
+    assert len(mirror.filter_slots(slots)) == 6
+
+
+def test_expired_sync_token_triggers_full_resync():
+    """HTTP 410 clears the mirror and pages through everything again."""
+    gone = HttpError(httplib2.Response({"status": "410"}), b"")
+    calendar = FakeCalendar([
+        {"items": [event("a", "2030-05-01T10:00:00", "2030-05-01T11:00:00")], "nextSyncToken": "s1"},
+        gone,
+        {"items": [event("z", "2030-05-02T10:00:00", "2030-05-02T11:00:00")], "nextSyncToken": "s9"},
+    ])
+    mirror = CalendarMirror(calendar)
+    mirror.sync()
+    mirror.sync()
+
+    assert list(mirror.events) == ["z"]
+    assert mirror.sync_token == "s9"
+    assert "syncToken" not in calendar.events_resource.requests[2]
+    assert mirror.stats()["full_syncs"] == 2
@@ -0,0 +1,102 @@
+"""
+Tests for the settings snapshot, hot reload and debounced config writes.
+"""
+import dataclasses
+import json
+import os
+
+import pytest
+
+import src.config
+from src.config import Config, Settings, SettingsWatcher, load_settings, settings
+from src.utils.config import Config as FileConfig
+
+
+@pytest.fixture(autouse=True)
+def restore_snapshot(monkeypatch):
+    """Let tests publish snapshots without leaking them into other tests."""
+    monkeypatch.setattr(src.config, "_settings", src.config._settings)
+
+
+def test_load_merges_file_and_environment_with_types(tmp_path):
+    """Environment beats file beats defaults; values are converted and frozen."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"api_port": 9000, "db_path": "file.db", "openai": {"model": "gpt-4"}}))
+
+    loaded = Settings.load(path, environ={"API_PORT": "9100", "USE_LOCAL_STORE": "yes",
+                                          "STAFF_EMAILS": "a@salon.test, b@salon.test"})
+
+    assert loaded.api_port == 9100 and loaded.db_path == "file.db" and loaded.use_local_store is True
+    assert loaded.staff_emails == ("a@salon.test", "b@salon.test")
+    assert loaded.get("openai.model") == "gpt-4" and loaded.get("NOTIFICATION_EMAIL") == "maecity@aol.com"
+    assert loaded.get("openai.missing", "default") == "default"
+    assert loaded.get("BUSINESS_PHONE", "+18001234567") == "+18001234567" and loaded.business_phone == ""
+    assert loaded.get("API_PORT", 1) == 9100 and loaded["owner_phone"] is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        loaded.api_port = 1
+    with pytest.raises(TypeError):
+        loaded.business_hours["sunday"] = "10:00-14:00"
+    with pytest.raises(ValueError, match="api_port"):
+        Settings.load(path, environ={"API_PORT": "eighty"})
+
+    blank = Settings.load(path, environ={"API_PORT": "", "SMTP_PORT": "", "SMTP_HOST": "", "SMTP_SERVER": "mail.test"})
+    assert blank.api_port == 9000 and blank.smtp_port == 587 and blank.smtp_host == "mail.test"
+
+
+def test_config_facade_reads_current_snapshot(tmp_path):
+    """Config works on the class and sees snapshots published later."""
+    load_settings(tmp_path / "missing.json", environ={"GOOGLE_TOKEN_PATH": "/tmp/token.json", "GOOGLE_API_KEY": "key"})
+
+    assert Config.get_google_credentials()["token_path"] == "/tmp/token.json"
+    assert Config.get_google_api_key() == "key"
+    assert Config.get("BOOKSY_API_KEY") == "" and src.config.config["db_type"] == "sqlite"
+
+    load_settings(tmp_path / "missing.json", environ={"GOOGLE_API_KEY": "rotated"})
+    assert Config.get_google_api_key() == "rotated"
+
+
+def test_watcher_swaps_snapshot_on_change(tmp_path):
+    """A changed file publishes a new snapshot; an invalid one keeps the old."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"business_name": "Delane Nails"}))
+    load_settings(path, environ={})
+    watcher = SettingsWatcher(path)
+    before = settings()
+
+    assert not watcher.check()
+    path.write_text(json.dumps({"business_name": "Delane Nails & Spa"}))
+    os.utime(path, (1, 1))
+    assert watcher.check()
+    assert settings().business_name == "Delane Nails & Spa" and before.business_name == "Delane Nails"
+
+    path.write_text(json.dumps({"api_port": "not a port"}))
+    os.utime(path, (2, 2))
+    assert not watcher.check()
+    assert settings().business_name == "Delane Nails & Spa"
+
+
+def test_file_config_writes_are_debounced_and_atomic(tmp_path):
+    """A burst of set() calls is written once, with no temp file left behind."""
+    path = tmp_path / "config.json"
+    file_config = FileConfig(str(path), save_delay=60)
+    written = os.stat(path).st_mtime_ns
+
+    for temperature in (0.1, 0.2, 0.3):
+        file_config.set("openai.temperature", temperature)
+    assert os.stat(path).st_mtime_ns == written
+
+    file_config.flush()
+    assert json.loads(path.read_text())["openai"]["temperature"] == 0.3
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+def test_email_service_follows_reloaded_settings(tmp_path):
+    """Services read the current snapshot on use and keep their own defaults."""
+    from src.services.email_service import EmailService
+
+    load_settings(tmp_path / "missing.json", environ={"SMTP_USERNAME": "salon@gmail.com"})
+    service = EmailService()
+    assert service.smtp_server == "smtp.gmail.com" and service.sender_email == "salon@gmail.com"
+
+    load_settings(tmp_path / "missing.json", environ={"SMTP_HOST": "mail.salon.test", "FROM_EMAIL": "hi@salon.test"})
+    assert service.smtp_server == "mail.salon.test" and service.sender_email == "hi@salon.test"
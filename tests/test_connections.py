@@ -0,0 +1,86 @@
+"""
+Tests for the WebSocket ConnectionManager.
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.chat.connections import ConnectionManager
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, delay: float = 0.0):
+        self.sent = []
+        self.closed_with = None
+        self.delay = delay
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_multiple_sockets_per_session():
+    """Messages for a session reach every socket of that session only."""
+    manager = ConnectionManager()
+    tab1, tab2, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.connect(tab1, "s1")
+    await manager.connect(tab2, "s1")
+    await manager.connect(other, "s2")
+
+    assert await manager.send_to_session("s1", {"message": "hi"}) == 2
+    await asyncio.sleep(0)
+    assert tab1.sent == tab2.sent == [{"message": "hi"}]
+    assert other.sent == []
+
+    manager.disconnect(tab1)
+    manager.disconnect(tab2)
+    assert "s1" not in manager.sessions
+    assert len(manager.active_connections) == 1
+    manager.disconnect(other)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_broadcast():
+    """A client with a full queue is dropped while others still receive."""
+    manager = ConnectionManager(queue_size=2)
+    slow, fast = FakeWebSocket(delay=10), FakeWebSocket()
+    await manager.connect(slow, "slow")
+    await manager.connect(fast, "fast")
+
+    for i in range(4):
+        await manager.broadcast({"n": i})
+        await asyncio.sleep(0)
+
+    assert slow.closed_with == 1013
+    assert slow not in manager.connections
+    assert [m["n"] for m in fast.sent] == [0, 1, 2, 3]
+    manager.disconnect(fast)
+
+
+@pytest.mark.asyncio
+async def test_reap_idle_connections():
+    """Quiet sockets are pinged and dead sockets are closed."""
+    manager = ConnectionManager(heartbeat_interval=10, idle_timeout=30)
+    quiet, dead = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(quiet, "quiet")
+    await manager.connect(dead, "dead")
+    now = time.monotonic()
+    manager.connections[quiet].last_seen = now - 15
+    manager.connections[dead].last_seen = now - 60
+
+    assert await manager.reap(now) == 1
+    await asyncio.sleep(0)
+    assert dead.closed_with == 1001
+    assert quiet.sent == [{"type": "ping"}]
+    manager.disconnect(quiet)
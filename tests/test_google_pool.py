@@ -0,0 +1,165 @@
+"""
+Tests for thread-safe, quota-scheduled Google API request execution.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+
+import google_auth_httplib2
+import httplib2
+import pytest
+from google.oauth2.credentials import Credentials
+
+from src.google_services import pool as pool_module
+from src.google_services.pool import ClientPool
+from src.google_services.quota import QuotaScheduler
+from src.google_services.registry import ServiceRegistry
+
+
+class FakeHttp:
+    """httplib2.Http stand-in that records which threads use it."""
+
+    created = []
+
+    def __init__(self):
+        self.threads = set()
+        FakeHttp.created.append(self)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return httplib2.Response({"status": "200"}), json.dumps({"uri": uri}).encode()
+
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    FakeHttp.created = []
+    monkeypatch.setattr(pool_module, "build_http", FakeHttp)
+    return FakeHttp
+
+
+@pytest.fixture
+def sheets():
+    return ServiceRegistry().service("sheets", "v4", developer_key="key")
+
+
+def test_requests_run_on_per_thread_connections(fake_http, sheets):
+    """Concurrent requests never share a connection, and results keep request order."""
+    pool = ClientPool(max_workers=4)
+    requests = [sheets.spreadsheets().values().get(spreadsheetId=f"sheet-{n}", range="A1") for n in range(12)]
+
+    results = pool.execute_all(requests)
+
+    assert [f"sheet-{n}/" in result["uri"] for n, result in enumerate(results)] == [True] * 12
+    assert 1 < len(fake_http.created) <= 4
+    assert all(len(http.threads) == 1 for http in fake_http.created)
+    assert pool.stats()["calls"] == 12
+    pool.shutdown()
+
+
+def test_async_facade(fake_http, sheets):
+    """Calling an API method through the facade returns an awaitable response."""
+    pool = ClientPool(max_workers=2)
+    facade = pool.wrap(sheets)
+
+    async def read_both():
+        return await asyncio.gather(
+            facade.spreadsheets().values().get(spreadsheetId="a", range="A1"),
+            facade.spreadsheets().values().get(spreadsheetId="b", range="A1"),
+        )
+
+    first, second = asyncio.run(read_both())
+    assert "/spreadsheets/a/" in first["uri"] and "/spreadsheets/b/" in second["uri"]
+    pool.shutdown()
+
+
+def test_thread_connections_share_credentials(fake_http):
+    """Each thread gets its own AuthorizedHttp over the same credentials object."""
+    creds = Credentials(token="token")
+    shared = google_auth_httplib2.AuthorizedHttp(creds)
+    pool = ClientPool(max_workers=2)
+
+    here = pool.http_for(shared)
+    there = pool.executor.submit(pool.http_for, shared).result()
+
+    assert here is pool.http_for(shared)
+    assert here is not there
+    assert here.credentials is creds and there.credentials is creds
+    pool.shutdown()
+
+
+def test_quota_costs_by_method():
+    """Known methods use their documented cost; other metered methods fall back per API."""
+    scheduler = QuotaScheduler()
+    assert scheduler.costs_for("gmail.users.messages.send") == {"gmail": 100}
+    assert scheduler.costs_for("gmail.users.labels.list") == {"gmail": 5}
+    assert scheduler.costs_for("sheets.spreadsheets.values.get") == {"sheets_read": 1}
+    assert scheduler.costs_for("storage.objects.list") == {}
+
+
+def test_scheduler_holds_calls_over_quota():
+    """Once a quota's units are spent, further calls queue instead of being sent."""
+    scheduler = QuotaScheduler(quotas={"gmail": (250, 0.001)})
+    for _ in range(2):
+        with scheduler.reserve("gmail.users.messages.send"):
+            pass
+    with pytest.raises(TimeoutError):
+        with scheduler.reserve("gmail.users.messages.send", timeout=0.05):
+            pass
+    assert scheduler.stats()["calls"] == {"gmail.users.messages.send": 2}
+
+
+def test_quota_rejection_pauses_and_retries(monkeypatch, sheets):
+    """A 429 pauses the scheduler for Retry-After and the call is sent again."""
+    class RateLimitedOnce(FakeHttp):
+        def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+            if not getattr(self, "rejected", False):
+                self.rejected = True
+                return httplib2.Response({"status": "429", "retry-after": "0"}), b"{}"
+            return super().request(uri, method, body, headers, **kwargs)
+
+    monkeypatch.setattr(pool_module, "build_http", RateLimitedOnce)
+    pool = ClientPool(max_workers=1, scheduler=QuotaScheduler())
+
+    result = pool.execute(sheets.spreadsheets().values().get(spreadsheetId="a", range="A1"))
+
+    stats = pool.stats()
+    assert "/spreadsheets/a/" in result["uri"]
+    assert stats["quota_retries"] == 1 and stats["quota"]["pauses"] == 1
+    assert stats["quota"]["calls"] == {"sheets.spreadsheets.values.get": 2}
+    pool.shutdown()
+
+
+def test_batches_use_the_thread_connection_and_charge_each_request(fake_http, monkeypatch):
+    """A batch goes out on the pool's connection and draws quota for every request in it."""
+    class BatchHttp(FakeHttp):
+        def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+            self.threads.add(threading.get_ident())
+            parts = []
+            for content_id in re.findall(r"Content-ID: <([^>]+)>", body):
+                parts.append(
+                    "--reply\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id}>\r\n\r\n"
+                    'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{"id": "evt"}\r\n'
+                )
+            content = "".join(parts) + "--reply--"
+            return httplib2.Response({"status": "200", "content-type": "multipart/mixed; boundary=reply"}), \
+                content.encode()
+
+    monkeypatch.setattr(pool_module, "build_http", BatchHttp)
+    calendar = ServiceRegistry().service("calendar", "v3", developer_key="key")
+    pool = ClientPool(max_workers=1, scheduler=QuotaScheduler())
+    responses = []
+    batch = calendar.new_batch_http_request(callback=lambda request_id, response, error: responses.append(response))
+    requests = [calendar.events().insert(calendarId="primary", body={"summary": str(n)}) for n in range(3)]
+    for request in requests:
+        batch.add(request)
+
+    pool.execute_batch(batch, requests)
+
+    assert responses == [{"id": "evt"}] * 3
+    assert len(BatchHttp.created) == 1
+    assert pool.stats()["quota"]["calls"] == {"calendar.events.insert": 3}
+    pool.shutdown()
@@ -0,0 +1,119 @@
+"""
+Tests for the shared Google discovery/service registry and credential manager.
+"""
+import datetime
+import json
+import threading
+import time
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from src.google_services.credentials import CredentialManager
+from src.google_services.registry import ServiceRegistry
+
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+
+def test_services_built_once_from_static_discovery():
+    """Each (api, version, auth) is built once, without a discovery fetch."""
+    registry = ServiceRegistry()
+    sheets = registry.service("sheets", "v4", developer_key="key-1")
+
+    assert registry.service("sheets", "v4", developer_key="key-1") is sheets
+    assert registry.service("sheets", "v4", developer_key="key-2") is not sheets
+    assert hasattr(sheets.spreadsheets().values(), "batchUpdate")
+
+    stats = registry.stats()
+    assert stats["documents"] == 1 and stats["services"] == 2
+    assert [build["discovery"] for build in stats["builds"]] == ["static", "static"]
+    assert all(build["seconds"] >= 0 for build in stats["builds"])
+
+
+def test_credentials_shared_and_refreshed_once(tmp_path, monkeypatch):
+    """Clients on one token file get the same credentials; a refresh is saved and seen by all."""
+    token_path = tmp_path / "token.json"
+    token_path.write_text(json.dumps({
+        "token": "old", "refresh_token": "refresh", "client_id": "id", "client_secret": "secret",
+        "expiry": "2020-01-01T00:00:00Z", "scopes": SCOPES,
+    }))
+    refreshes = []
+
+    def refresh(self, request):
+        refreshes.append(self)
+        self.token = "new"
+        self.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", refresh)
+    registry = ServiceRegistry()
+
+    calendar_creds = registry.credentials(str(token_path), SCOPES)
+    gmail_creds = registry.credentials(str(token_path), ["https://www.googleapis.com/auth/gmail.modify"])
+
+    assert calendar_creds is gmail_creds and calendar_creds.token == "new"
+    assert len(refreshes) == 1
+    assert json.loads(token_path.read_text())["token"] == "new"
+
+    calendar = registry.service("calendar", "v3", credentials=calendar_creds)
+    assert registry.service("calendar", "v3", credentials=gmail_creds) is calendar
+    assert registry.stats()["refreshes"] == 1
+    registry.clear()
+
+
+def write_token(path, token, expires_in):
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
+    path.write_text(json.dumps({
+        "token": token, "refresh_token": "refresh", "client_id": "id", "client_secret": "secret",
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"), "scopes": SCOPES,
+    }))
+
+
+@pytest.fixture
+def counted_refresh(monkeypatch):
+    """Replace the token endpoint with a slow counter that issues numbered tokens."""
+    issued = []
+
+    def refresh(self, request):
+        time.sleep(0.05)
+        issued.append(self)
+        self.token = f"new-{len(issued)}"
+        self.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", refresh)
+    return issued
+
+
+def test_concurrent_refresh_is_serialized_across_managers(tmp_path, counted_refresh):
+    """Managers sharing a token file (as separate processes would) refresh once; the rest adopt it."""
+    token_path = tmp_path / "token.json"
+    write_token(token_path, "old", expires_in=-60)
+    managers = [CredentialManager(str(token_path), SCOPES) for _ in range(4)]
+
+    threads = [threading.Thread(target=manager.credentials) for manager in managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(counted_refresh) == 1
+    assert {manager.credentials().token for manager in managers} == {"new-1"}
+    assert sum(manager.stats()["adopted"] for manager in managers) == 3
+    assert json.loads(token_path.read_text())["token"] == "new-1"
+
+
+def test_background_refresh_updates_shared_credentials(tmp_path, counted_refresh):
+    """Credentials inside the refresh margin are renewed in place before any request needs them."""
+    token_path = tmp_path / "token.json"
+    write_token(token_path, "old", expires_in=600)
+    manager = CredentialManager(str(token_path), SCOPES, refresh_margin=599.9)
+
+    creds = manager.credentials()
+    assert creds.token == "old" and not counted_refresh
+    manager.start()
+    deadline = time.monotonic() + 5
+    while creds.token == "old" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.stop()
+
+    assert creds.token == "new-1" and manager.credentials() is creds
+    assert manager.stats()["refreshes"] == 1
@@ -0,0 +1,99 @@
+"""
+Tests for queue-based logging, JSON output and per-logger sampling.
+"""
+import json
+import logging
+import threading
+
+import pytest
+
+from src.utils import logger as logger_module
+from src.utils.logger import SamplingFilter, parse_sample_rates, setup_logger, shutdown_logging
+
+
+@pytest.fixture
+def root_logging():
+    """Restore the root logger's handlers and level after the test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_records_are_written_as_json_by_listener_thread(tmp_path, root_logging):
+    """Callers only enqueue; the listener formats and writes JSON lines."""
+    log_file = tmp_path / "app.log"
+    setup_logger("INFO", str(log_file), json_format=True, sample_rates={}, force=True)
+    writers = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            writers.append(threading.current_thread())
+
+    logger_module._listener.handlers += (Recorder(),)
+    log = logging.getLogger("tests.logger")
+    log.info("Retrieved %d slots", 3, extra={"request_id": "r-1"})
+    log.debug("Not written %s", "at INFO")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Failed")
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    ours = [entry for entry in entries if entry["logger"] == "tests.logger"]
+    assert ours[0]["message"] == "Retrieved 3 slots" and ours[0]["request_id"] == "r-1"
+    assert ours[1]["level"] == "ERROR" and "ValueError: boom" in ours[1]["exception"]
+    assert len(ours) == 2
+    assert writers and threading.current_thread() not in writers
+
+
+def test_existing_logging_is_left_alone_unless_forced(tmp_path, root_logging):
+    """A host's handlers survive setup_logger; forcing it again closes the previous listener's files."""
+    host = logging.NullHandler()
+    root_logging.addHandler(host)
+    assert setup_logger("INFO", str(tmp_path / "skipped.log")) is None
+    assert host in root_logging.handlers and not (tmp_path / "skipped.log").exists()
+
+    first = setup_logger("INFO", str(tmp_path / "first.log"), force=True)
+    first_file = next(h for h in first.handlers if isinstance(h, logging.FileHandler))
+    assert setup_logger("INFO", str(tmp_path / "other.log")) is first
+    setup_logger("INFO", str(tmp_path / "second.log"), force=True)
+
+    assert first_file.stream is None
+    assert len(root_logging.handlers) == 1
+
+
+def test_sampling_caps_chatty_loggers_only():
+    """INFO records beyond the rate are dropped and counted; warnings and other loggers pass."""
+    sampler = SamplingFilter(parse_sample_rates("src.integrations=1, other=5"))
+
+    def record(name, level=logging.INFO):
+        return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+    passed = [sampler.filter(record("src.integrations.booksy")) for _ in range(10)]
+    assert passed.count(True) == 1
+    assert sampler.filter(record("src.integrations.booksy", logging.WARNING))
+    assert all(sampler.filter(record("src.google_services.gmail")) for _ in range(10))
+
+    sampler._buckets["src.integrations"].adjust(-1)
+    summary = record("src.integrations.booksy")
+    assert sampler.filter(summary) and summary.sampled_out == 9
+
+
+def test_mutable_arguments_are_formatted_when_logged():
+    """A list or dict changed after logging still shows its logged value; plain values stay lazy."""
+    handler = logger_module.LazyQueueHandler(None)
+    items = ["a"]
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "Items %s (%d)", (items, 1), None)
+    lazy = logging.LogRecord("tests", logging.INFO, __file__, 1, "Retrieved %d slots", (3,), None)
+
+    assert handler.prepare(record) is record
+    items.append("b")
+    assert record.getMessage() == "Items ['a'] (1)" and record.args is None
+    assert handler.prepare(lazy).args == (3,)
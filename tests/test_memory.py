@@ -0,0 +1,49 @@
+"""
+Tests for bounded conversation memory.
+"""
+import time
+
+from src.chat.memory import ConversationMemory
+
+
+def test_ring_buffer_keeps_recent_turns_and_summarizes():
+    """Turns beyond max_turns are folded into the summary."""
+    memory = ConversationMemory(max_turns=4, token_budget=10000)
+    for i in range(10):
+        memory.add_turn("s1", "user", f"Message number {i}. Extra detail here.")
+
+    history = memory.history("s1")
+    assert [turn["content"].split(".")[0] for turn in history] == [
+        "Message number 6", "Message number 7", "Message number 8", "Message number 9"
+    ]
+
+    messages = memory.messages("s1")
+    assert messages[0]["role"] == "system"
+    assert "user: Message number 0." in messages[0]["content"]
+    assert "Extra detail" not in messages[0]["content"]
+
+
+def test_token_budget_compaction():
+    """A session never keeps more verbatim tokens than its budget."""
+    memory = ConversationMemory(max_turns=100, token_budget=50, summary_token_budget=20)
+    for _ in range(20):
+        memory.add_turn("s1", "assistant", "x" * 80)
+
+    session = memory.get_session("s1")
+    assert session.tokens <= 50
+    assert len(session.summary) <= 20 * 4
+
+
+def test_idle_sessions_are_evicted():
+    """Sessions idle past the TTL are dropped on the next access."""
+    memory = ConversationMemory(idle_ttl=60)
+    memory.add_turn("old", "user", "hello")
+    memory.add_turn("new", "user", "hello")
+    memory.get_session("old").last_active = time.time() - 120
+    # Restore activity ordering as it would be after real idle time
+    memory._sessions.move_to_end("new")
+
+    assert memory.evict_idle() == 1
+    assert "old" not in memory
+    assert "new" in memory
+    assert memory.stats()["evicted"] == 1
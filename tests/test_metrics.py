@@ -0,0 +1,90 @@
+"""
+Tests for the metrics registry, latency histograms and the timing decorator.
+"""
+import asyncio
+import random
+
+import pytest
+
+from src.utils.metrics import Histogram, MetricsRegistry, mark_failed, timed
+
+
+def test_histogram_quantiles_within_precision():
+    """Quantiles land within the bucket precision of the exact values."""
+    rng = random.Random(7)
+    values = sorted(rng.expovariate(50) for _ in range(20000))
+    histogram = Histogram()
+    for value in values:
+        histogram.observe(value)
+
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(sum(values))
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.02, abs=2e-6)
+
+    histogram.observe(1e9)
+    assert histogram.quantile(1.0) == pytest.approx(2 ** 32 / 1e6, rel=0.02)
+
+
+def test_timed_records_sync_and_async_calls():
+    """Latency, errors and in-flight calls are recorded and rendered for Prometheus."""
+    registry = MetricsRegistry()
+
+    class Client:
+        @timed("booksy", registry=registry)
+        def get_services(self, fail=False):
+            if fail:
+                raise RuntimeError("upstream down")
+            return ["manicure"]
+
+        @timed("booksy", "slots", registry=registry)
+        async def get_slots_async(self):
+            await asyncio.sleep(0)
+            return []
+
+    client = Client()
+    assert client.get_services() == ["manicure"]
+    with pytest.raises(RuntimeError):
+        client.get_services(fail=True)
+    asyncio.run(client.get_slots_async())
+
+    stats = registry.stats()
+    assert stats['integration_call_seconds{client="booksy",method="get_services"}']["count"] == 2
+    assert stats['integration_call_seconds{client="booksy",method="slots"}']["count"] == 1
+    assert stats['integration_errors_total{client="booksy",method="get_services"}'] == 1
+    assert stats['integration_in_flight{client="booksy"}'] == 0
+
+    text = registry.render()
+    assert "# TYPE integration_call_seconds histogram" in text
+    assert 'integration_call_seconds_bucket{client="booksy",method="get_services",le="+Inf"} 2' in text
+    assert 'integration_call_seconds_count{client="booksy",method="slots"} 1' in text
+    with pytest.raises(ValueError):
+        registry.counter("integration_call_seconds", "clash")
+
+
+def test_handled_failures_are_counted_as_errors():
+    """Methods that swallow upstream errors flag them with mark_failed, counted once per call."""
+    registry = MetricsRegistry()
+
+    @timed("booksy", "get_services", registry=registry)
+    def get_services(fail=False, reraise=False):
+        try:
+            if fail:
+                raise ConnectionError("upstream down")
+            return ["manicure"]
+        except ConnectionError:
+            mark_failed()
+            if reraise:
+                raise
+            return []
+
+    assert get_services() == ["manicure"]
+    assert get_services(fail=True) == []
+    with pytest.raises(ConnectionError):
+        get_services(fail=True, reraise=True)
+    mark_failed()
+
+    stats = registry.stats()
+    assert stats['integration_call_seconds{client="booksy",method="get_services"}']["count"] == 3
+    assert stats['integration_errors_total{client="booksy",method="get_services"}'] == 2
@@ -0,0 +1,63 @@
+"""
+Tests for the precompressed page cache.
+"""
+import gzip
+
+from src.utils.page_cache import PageCache
+
+PAGE = "<html><body>" + "Welcome to Delane Nails! " * 100 + "</body></html>"
+
+
+def test_page_rendered_once_with_compressed_variant():
+    """The page is rendered once and gzip is served when accepted."""
+    cache = PageCache()
+    calls = []
+
+    def render():
+        calls.append(1)
+        return PAGE
+
+    for _ in range(3):
+        page = cache.get("home", render)
+    status, headers, body = cache.respond(page, None, "gzip;q=1.0, identity;q=0.5")
+
+    assert len(calls) == 1
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == PAGE
+    assert headers["Vary"] == "Accept-Encoding"
+
+
+def test_conditional_get_returns_304():
+    """A matching If-None-Match yields an empty 304."""
+    cache = PageCache()
+    page = cache.get("home", lambda: PAGE)
+    _, headers, _ = cache.respond(page, None, None)
+
+    status, headers_304, body = cache.respond(page, headers["ETag"], None)
+    assert status == 304
+    assert body == b""
+    assert headers_304["ETag"] == headers["ETag"]
+    assert cache.respond(page, '"stale"', None)[0] == 200
+
+
+def test_flask_view_is_cached():
+    """The Flask decorator serves cached bytes with caching headers."""
+    from flask import Flask
+
+    app = Flask(__name__)
+    cache = PageCache()
+
+    @app.route("/")
+    @cache.flask_page()
+    def home():
+        return PAGE
+
+    client = app.test_client()
+    first = client.get("/")
+    second = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.data.decode() == PAGE
+    assert second.status_code == 304
+    assert cache.stats()["renders"] == 1
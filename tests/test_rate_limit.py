@@ -0,0 +1,82 @@
+"""
+Tests for the rate limiter and OpenAI rate governor.
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from src.chat.governor import RateGovernor, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, parse_retry_after
+from src.chat.openai_client import OpenAIClient
+from src.utils.rate_limit import PriorityLimiter, TokenBucket
+
+
+def test_token_bucket_refill():
+    """A drained bucket reports the time until enough tokens refill."""
+    bucket = TokenBucket(capacity=10, refill_per_second=10)
+    bucket.consume(10)
+    assert 0.4 < bucket.time_until(5) <= 0.5
+    assert bucket.time_until(1000) <= 1.0  # clamped to capacity
+
+
+def test_interactive_requests_outrank_background():
+    """Queued interactive work is admitted before earlier background work."""
+    limiter = PriorityLimiter({}, max_concurrent=1)
+    order = []
+    blocker = limiter.acquire({})
+
+    def worker(name, priority):
+        with limiter.limit({}, priority=priority):
+            order.append(name)
+
+    background = threading.Thread(target=worker, args=("email", PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("chat", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+
+    limiter.release(blocker)
+    background.join(1)
+    interactive.join(1)
+    assert order == ["chat", "email"]
+
+
+def test_pause_and_timeout():
+    """A pause holds new requests and a timeout surfaces as TimeoutError."""
+    limiter = PriorityLimiter({"requests": TokenBucket(5, 5)})
+    limiter.pause(0.5)
+    with pytest.raises(TimeoutError):
+        limiter.acquire({"requests": 1}, timeout=0.05)
+    assert limiter.stats()["queued"] == 0
+
+
+def test_parse_retry_after():
+    """Retry-After is read from seconds and millisecond headers."""
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({}) is None
+
+
+def test_client_retries_after_rate_limit():
+    """The client pauses for Retry-After and retries a 429 through the governor."""
+    governor = RateGovernor(requests_per_minute=600, tokens_per_minute=100000, max_concurrent=2)
+    client = OpenAIClient(api_key="test", governor=governor)
+    client.client = MagicMock()
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    rate_limited = RateLimitError(
+        "rate limited",
+        response=httpx.Response(429, headers={"retry-after-ms": "10"}, request=request),
+        body=None
+    )
+    ok = MagicMock()
+    ok.usage.total_tokens = 42
+    client.client.chat.completions.create.side_effect = [rate_limited, ok]
+
+    assert client.chat_completion([{"role": "user", "content": "hi"}]) is ok
+    assert client.client.chat.completions.create.call_count == 2
+    assert governor.stats()["pauses"] == 1
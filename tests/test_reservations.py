@@ -0,0 +1,163 @@
+"""
+Tests for slot reservations.
+"""
+import threading
+
+import pytest
+
+from src.slots import SlotSet, decode_slot_id
+from src.storage.reservations import (
+    PURGE_INTERVAL, InMemoryReservations, SQLiteReservations, SlotUnavailableError, assign_claim, claim_slot,
+    filter_available, rollback_claim
+)
+
+SLOT = "slot_203005041400"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_reservations(request, tmp_path):
+    """Factory for each backend; SQLite instances share one database file."""
+    created = []
+
+    def make(clock=None):
+        kwargs = {"clock": clock} if clock else {}
+        if request.param == "memory":
+            if created:
+                return created[0]
+            reservations = InMemoryReservations(**kwargs)
+        else:
+            reservations = SQLiteReservations(str(tmp_path / "reservations.db"), **kwargs)
+        created.append(reservations)
+        return reservations
+
+    yield make
+    for reservations in created:
+        if isinstance(reservations, SQLiteReservations):
+            reservations.close()
+
+
+def test_hold_is_exclusive_until_it_expires(make_reservations):
+    """A held slot can't be taken by others until the hold lapses."""
+    clock = FakeClock()
+    reservations = make_reservations(clock)
+
+    first = reservations.hold(SLOT, ttl=300)
+    assert first is not None
+    assert reservations.hold(SLOT, ttl=300) is None
+    assert reservations.hold(SLOT, ttl=600, token=first.token).expires_at == clock.now + 600
+    assert reservations.unavailable([SLOT, "slot_other"]) == {SLOT}
+
+    clock.now += 601
+    assert not reservations.confirm(SLOT, first.token)
+    second = reservations.hold(SLOT)
+    assert second is not None and second.token != first.token
+
+
+def test_confirm_is_compare_and_swap(make_reservations):
+    """Only the hold owner can confirm, once; a confirmed slot stays booked."""
+    reservations = make_reservations()
+    hold = reservations.hold(SLOT)
+
+    assert not reservations.confirm(SLOT, "someone-else")
+    assert reservations.confirm(SLOT, hold.token)
+    assert not reservations.confirm(SLOT, hold.token)
+    assert reservations.hold(SLOT) is None
+    slots = SlotSet([decode_slot_id(SLOT)])
+    assert len(filter_available(reservations, slots)) == 0
+
+    # A client's hold token can't release a confirmed booking; only a failed booking rolls it back
+    assert not reservations.release(SLOT, hold.token)
+    assert len(filter_available(reservations, slots)) == 0
+    assert not rollback_claim(reservations, SLOT, "someone-else")
+    assert rollback_claim(reservations, SLOT, hold.token)
+    assert filter_available(reservations, slots).ids() == [SLOT]
+
+
+def test_release_gives_up_only_the_callers_hold(make_reservations):
+    """Releasing a hold frees the slot for other customers."""
+    reservations = make_reservations()
+    hold = reservations.hold(SLOT)
+
+    assert not reservations.release(SLOT, "someone-else")
+    assert reservations.release(SLOT, hold.token)
+    assert reservations.hold(SLOT) is not None
+
+
+def test_cancel_frees_only_the_appointments_own_slot(make_reservations):
+    """Cancelling reopens the slot its appointment was assigned, and never a later booking's."""
+    reservations = make_reservations()
+    token = claim_slot(reservations, SLOT)
+    assert not assign_claim(reservations, SLOT, "someone-else", "appt-1")
+    assert assign_claim(reservations, SLOT, token, "appt-1")
+    assert not rollback_claim(reservations, SLOT, token)
+
+    assert reservations.cancel("appt-1")
+    assert reservations.hold(SLOT) is not None
+    assert not reservations.cancel("appt-1")
+
+    token = claim_slot(reservations, "slot_other")
+    assert not reservations.cancel("appt-1")
+    assert assign_claim(reservations, "slot_other", token, "appt-2")
+    assert not reservations.cancel("appt-1")
+    assert reservations.unavailable(["slot_other"]) == {"slot_other"}
+
+
+def test_hold_purges_lapsed_holds_periodically(make_reservations):
+    """Lapsed holds are cleaned up by later holds without a separate timer."""
+    clock = FakeClock()
+    reservations = make_reservations(clock)
+    reservations.hold(SLOT, ttl=1)
+
+    clock.now += PURGE_INTERVAL
+    reservations.hold("slot_other")
+    assert reservations.purge_expired() == 0
+
+    # Holds in between don't purge again until the interval has passed
+    reservations.hold(SLOT, ttl=1)
+    clock.now += 2
+    reservations.hold("slot_third")
+    assert reservations.purge_expired() == 1
+
+
+def test_burst_on_one_slot_books_exactly_once(make_reservations):
+    """Hundreds of concurrent bookings for the same slot produce one winner."""
+    # Two handles model two workers when the backend is SQLite
+    handles = [make_reservations(), make_reservations()]
+    winners = []
+    losers = []
+    start = threading.Barrier(200)
+
+    def book(n):
+        start.wait()
+        try:
+            winners.append(claim_slot(handles[n % 2], SLOT))
+        except SlotUnavailableError:
+            losers.append(n)
+
+    threads = [threading.Thread(target=book, args=(n,)) for n in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(winners) == 1
+    assert len(losers) == 199
+
+
+def test_claim_refreshes_a_lapsed_hold_nobody_took(make_reservations):
+    """A customer whose hold lapsed can still book if the slot is free."""
+    clock = FakeClock()
+    reservations = make_reservations(clock)
+    hold = reservations.hold(SLOT, ttl=60)
+
+    clock.now += 120
+    assert claim_slot(reservations, SLOT, hold.token) == hold.token
+    assert reservations.purge_expired() == 0
@@ -0,0 +1,92 @@
+"""
+Tests for the OpenAI response cache.
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from src.chat.openai_client import OpenAIClient
+from src.chat.response_cache import ResponseCache, make_cache_key
+
+
+def _completion(text):
+    """Build a minimal chat completion response."""
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": text}
+        }]
+    })
+
+
+@pytest.fixture
+def client():
+    """Create an OpenAI client with a mocked transport and in-memory cache."""
+    openai_client = OpenAIClient(api_key="test", cache=ResponseCache(db_path=":memory:"))
+    openai_client.client = MagicMock()
+    openai_client.client.chat.completions.create.return_value = _completion("We open at 9 AM.")
+    return openai_client
+
+
+def test_cache_key_normalization():
+    """Whitespace and case differences map to the same key."""
+    a = make_cache_key("gpt-4", 0.0, [{"role": "user", "content": "What are your hours?"}])
+    b = make_cache_key("gpt-4", 0.0, [{"role": "User", "content": "  what are   your HOURS? "}])
+    c = make_cache_key("gpt-4", 0.2, [{"role": "user", "content": "What are your hours?"}])
+    assert a == b
+    assert a != c
+
+
+def test_repeated_question_served_from_cache(client):
+    """A repeated low-temperature question only hits the API once."""
+    messages = [{"role": "user", "content": "What are your hours?"}]
+
+    first = client.chat_completion(messages, temperature=0)
+    second = client.chat_completion(messages, temperature=0)
+
+    assert client.client.chat.completions.create.call_count == 1
+    assert client.get_response_text(second) == client.get_response_text(first)
+    stats = client.cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_high_temperature_and_bypass_skip_cache(client):
+    """Non-deterministic or explicitly bypassed calls always go to the API."""
+    messages = [{"role": "user", "content": "Tell me a joke"}]
+
+    client.chat_completion(messages, temperature=0.9)
+    client.chat_completion(messages, temperature=0.9)
+    client.chat_completion(messages, temperature=0, bypass_cache=True)
+
+    assert client.client.chat.completions.create.call_count == 3
+    assert client.cache.stats()["bypassed"] == 3
+
+
+def test_lru_eviction_and_ttl():
+    """The least recently used entry is evicted and stale entries expire."""
+    cache = ResponseCache(db_path=":memory:", max_entries=2, ttl_seconds=60)
+    cache.put("a", {"v": 1})
+    time.sleep(0.01)
+    cache.put("b", {"v": 2})
+    time.sleep(0.01)
+    assert cache.get("a") == {"v": 1}
+    time.sleep(0.01)
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get("c") is None
+    assert cache.stats()["expired"] == 1
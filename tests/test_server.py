@@ -0,0 +1,196 @@
+"""
+Tests for the unified ASGI application.
+"""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agent import BookingAgent
+from src.server.app import create_app
+from src.server.state import AppState
+from src.storage.appointment_store import AppointmentStore
+
+
+@pytest.fixture
+def client():
+    """A client for an app with a mock-backed agent and no legacy routes."""
+    state = AppState(agent=BookingAgent(use_mock_api=True))
+    with TestClient(create_app(state, legacy=False)) as test_client:
+        yield test_client
+
+
+def test_pages_are_cached_and_revalidated(client):
+    """Pages carry an ETag and a repeat request gets a 304."""
+    browser = {"Accept": "text/html,application/xhtml+xml,*/*;q=0.8"}
+    for path in ("/", "/services", "/simple-chat", "/simple-booking", "/chat"):
+        response = client.get(path, headers=browser)
+        assert response.status_code == 200, path
+        assert "text/html" in response.headers["content-type"]
+
+        repeat = client.get(path, headers={**browser, "If-None-Match": response.headers["etag"]})
+        assert repeat.status_code == 304, path
+
+
+def test_root_still_answers_api_clients_with_health(client):
+    """Clients that don't ask for HTML get the health JSON the API used to serve at /."""
+    assert client.get("/").json() == {"status": "online", "version": "1.0.0"}
+    assert client.get("/", headers={"Accept": "application/json"}).json()["status"] == "online"
+
+
+def test_slots_and_booking_share_the_agent(client):
+    """Slots come from the shared agent and can be booked and confirmed."""
+    slots = client.get("/api/slots", params={"service_id": "svc_001", "date": "2030-05-01"}).json()
+    assert slots
+    assert client.get("/api/slots").json() == []
+
+    appointment = client.post("/api/simple-booking", json={
+        "service_id": "svc_001",
+        "slot_id": slots[0]["id"],
+        "customer_name": "Ada",
+        "customer_phone": "555-0100"
+    }).json()
+    assert appointment["appointment_id"]
+
+    confirmation = client.get("/simple-confirmation", params={"id": appointment["appointment_id"]})
+    assert confirmation.status_code == 200
+    assert "Booking Confirmed" in confirmation.text
+
+
+def test_appointment_from_preferred_time(client):
+    """A preferred date and time is turned into a slot booking."""
+    response = client.post("/api/appointments", json={
+        "service_id": "svc_001",
+        "preferred_date": "2030-05-01T00:00:00",
+        "preferred_time": "9:30",
+        "customer_name": "Ada"
+    })
+    assert response.status_code == 200
+    assert response.json()["start_time"].startswith("2030-05-01T09:30")
+
+
+def test_chat_over_http_and_websocket(client):
+    """The JSON and WebSocket chat routes answer with the same agent."""
+    response = client.post("/api/chat", json={"message": "hello"})
+    assert "Welcome to Delane Nails" in response.json()["response"]
+
+    with client.websocket_connect("/ws/session-1") as websocket:
+        websocket.send_json({"type": "pong"})
+        websocket.send_json({"message": "hello", "customer_info": {"name": "Ada"}})
+        reply = websocket.receive_json()
+
+    assert "Welcome to Delane Nails" in reply["message"]
+    state = client.app.state.shared
+    assert [turn["role"] for turn in state.memory.history("session-1")] == ["user", "assistant"]
+    assert state.memory.get_session("session-1").customer_info == {"name": "Ada"}
+
+
+def test_chat_sessions_keep_their_own_booking_flow(client):
+    """Customers chatting at the same time with the shared agent don't step into each other's flows."""
+    def chat(session_id, message):
+        return client.post("/api/chat", json={"message": message, "session_id": session_id}).json()["response"]
+
+    assert "Which service" in chat("ada", "I'd like to book an appointment")
+    assert "What day" not in chat("bo", "1")
+    assert "What day" in chat("ada", "1")
+    assert "What day" not in chat(None, "1")
+
+    with client.websocket_connect("/ws/cy") as websocket:
+        websocket.send_json({"message": "2"})
+        assert "What day" not in websocket.receive_json()["message"]
+
+
+def test_legacy_flask_routes_are_mounted():
+    """Both Flask sites are served under /legacy with the shared agent and reservations."""
+    pytest.importorskip("a2wsgi")
+    from src import web, web_simple
+
+    state = AppState(agent=BookingAgent(use_mock_api=True))
+    with TestClient(create_app(state)) as test_client:
+        assert test_client.get("/legacy/chat").status_code == 200
+        params = {"service_id": "service-001", "date": "2030-05-06"}
+        slot_id = test_client.get("/api/slots", params=params).json()[0]["id"]
+        hold = test_client.post("/legacy/simple/api/slots/hold", json={"slot_id": slot_id})
+
+        assert hold.status_code == 200
+        assert test_client.post("/api/slots/hold", json={"slot_id": slot_id}).status_code == 409
+
+    assert web.agent is web_simple.agent is state.agent
+    assert web.reservations is web_simple.reservations is state.reservations
+    # Importing the modules built no agents of their own
+    assert web._standalone_agent._agent is None and web_simple._standalone_agent._agent is None
+
+
+def test_slot_cannot_be_double_booked(client):
+    """A held slot is hidden from others and only its holder can book it."""
+    params = {"service_id": "service-001", "date": "2030-05-04"}
+    slot_id = client.get("/api/slots", params=params).json()[0]["id"]
+
+    hold = client.post("/api/slots/hold", json={"slot_id": slot_id}).json()
+    assert client.post("/api/slots/hold", json={"slot_id": slot_id}).status_code == 409
+    assert slot_id not in [slot["id"] for slot in client.get("/api/slots", params=params).json()]
+
+    booking = {"service_id": "service-001", "slot_id": slot_id, "customer_name": "Ada"}
+    assert "error" in client.post("/api/simple-booking", json=booking).json()
+    booked = client.post("/api/simple-booking", json={**booking, "hold_token": hold["hold_token"]}).json()
+    assert booked["appointment_id"]
+    assert "error" in client.post("/api/simple-booking", json=booking).json()
+
+
+def test_metrics_endpoint_reports_integration_latency(client):
+    """Upstream calls made while serving requests show up at /metrics."""
+    client.get("/api/slots", params={"service_id": "svc_001", "date": "2030-05-01"})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    assert 'integration_call_seconds_count{client="salon_api",method="get_available_slots_async"}' in response.text
+
+
+def test_release_cannot_free_a_confirmed_booking(client):
+    """The hold token returned to a client can't be used to reopen its booked slot."""
+    params = {"service_id": "service-001", "date": "2030-05-05"}
+    slot_id = client.get("/api/slots", params=params).json()[0]["id"]
+    hold = client.post("/api/slots/hold", json={"slot_id": slot_id}).json()
+    booking = {"service_id": "service-001", "slot_id": slot_id, "customer_name": "Ada",
+               "hold_token": hold["hold_token"]}
+    assert client.post("/api/simple-booking", json=booking).json()["appointment_id"]
+
+    released = client.post("/api/slots/release", json={"slot_id": slot_id, "hold_token": hold["hold_token"]})
+    assert released.json() == {"released": False}
+    assert slot_id not in [slot["id"] for slot in client.get("/api/slots", params=params).json()]
+    assert "error" in client.post("/api/simple-booking", json={**booking, "hold_token": None}).json()
+
+
+def test_chat_bookings_claim_the_slot_and_cancelling_frees_it(tmp_path):
+    """The chat agent books through the shared reservations; a cancellation reopens the slot."""
+    state = AppState(agent=BookingAgent(use_mock_api=False, store=AppointmentStore(str(tmp_path / "salon.db"))))
+    agent = state.agent
+    with TestClient(create_app(state, legacy=False)):
+        for message in ("I'd like to book an appointment", "1", "tomorrow"):
+            agent.process_message(message)
+        slot = agent.current_context["slots"][0]
+        agent.process_message("1")
+        assert state.reservations.hold(slot.id) is None
+
+        for message in ("Ada", "555-0100", "ada@example.com"):
+            reply = agent.process_message(message)
+        appointment_id = re.search(r"ID is (\S+)\. ", reply).group(1)
+        assert state.reservations.unavailable([slot.id]) == {slot.id}
+
+        agent.api.cancel_appointment(appointment_id)
+        assert state.reservations.hold(slot.id) is not None
+
+
+def test_fixed_flask_app_lists_and_books_slots():
+    """The standalone fixed front-end serves slots as JSON and hides booked ones."""
+    from src import web_simple_fixed
+
+    client = web_simple_fixed.app.test_client()
+    params = {"service_id": "service-001", "date": "2030-05-07"}
+    slots = client.get("/api/slots", query_string=params).get_json()
+    assert slots and {"id", "start_time"} <= set(slots[0])
+
+    booking = {"service_id": "service-001", "slot_id": slots[0]["id"], "customer_name": "Ada"}
+    assert client.post("/api/simple-booking", json=booking).get_json()["appointment_id"]
+    assert "error" in client.post("/api/simple-booking", json=booking).get_json()
+    assert slots[0]["id"] not in [slot["id"] for slot in client.get("/api/slots", query_string=params).get_json()]
@@ -0,0 +1,74 @@
+"""
+Tests for the diff-based Google Sheets mirror.
+"""
+import pytest
+
+from src.google_services.sheet_mirror import SheetMirror, column_index, column_letters, diff_cells, range_origin
+
+
+class FakeSheets:
+    """A single in-memory grid served through the GoogleSheets methods the mirror uses."""
+
+    def __init__(self, grid):
+        self.grid = [list(row) for row in grid]
+        self.reads = 0
+        self.batches = []
+
+    def read_range(self, range_name, use_oauth=False, value_render_option="FORMATTED_VALUE"):
+        self.reads += 1
+        return [list(row) for row in self.grid]
+
+    def batch_update_values(self, data):
+        self.batches.append(data)
+        return sum(len(entry["values"][0]) for entry in data)
+
+
+def test_a1_helpers():
+    """Column letters round-trip and range origins parse sheet names and open ranges."""
+    assert [column_letters(i) for i in (1, 26, 27, 702, 703)] == ["A", "Z", "AA", "ZZ", "AAA"]
+    assert all(column_index(column_letters(i)) == i for i in range(1, 1000))
+    assert range_origin("Prices!B2:E") == ("Prices!", 2, 2)
+    assert range_origin("'Staff list'!A:D") == ("'Staff list'!", 1, 1)
+    assert range_origin("C10") == ("", 10, 3)
+    with pytest.raises(ValueError):
+        range_origin("Prices!named-range")
+
+
+def test_diff_treats_missing_cells_as_blank():
+    """Trailing cells trimmed by the API don't count as changes; adjacent changes form one run."""
+    old = [["Manicure", 35], ["Pedicure", 40, "note"]]
+    new = [["Manicure", 35, ""], ["Pedicure", 45, "sale"], ["Gel", 55]]
+    assert diff_cells(old, new) == [(1, 1, [45, "sale"]), (2, 0, ["Gel", 55])]
+
+
+def test_diff_compares_numbers_by_their_text():
+    """Unformatted reads return numbers, so a number and its string form are not a change."""
+    old = [[10, 2.5, 40.0, None]]
+    assert diff_cells(old, [["10", "2.5", 40, ""]]) == []
+    assert diff_cells(old, [["11", 2.5, "40", ""]]) == [(0, 0, ["11"])]
+
+
+def test_sync_sends_only_changed_cells():
+    """Syncing a 2,000-row sheet with two edits sends two cells, and reads hit the cache."""
+    now = [0.0]
+    grid = [[f"service-{n}", f"Service {n}", 10 + n] for n in range(2000)]
+    sheets = FakeSheets(grid)
+    mirror = SheetMirror(sheets, ttl=60, clock=lambda: now[0])
+
+    desired = [list(row) for row in grid]
+    desired[5][2] = 99
+    desired[1500][1] = "Renamed"
+    assert mirror.sync("Prices!A2:C", desired) == 2
+    assert sheets.batches == [[
+        {"range": "Prices!C7:C7", "values": [[99]]},
+        {"range": "Prices!B1502:B1502", "values": [["Renamed"]]},
+    ]]
+
+    # The cache reflects the write, so syncing again sends nothing and doesn't re-read
+    assert mirror.sync("Prices!A2:C", desired) == 0
+    assert mirror.read("Prices!A2:C")[5][2] == 99
+    assert sheets.reads == 1
+
+    now[0] = 61
+    mirror.read("Prices!A2:C")
+    assert sheets.reads == 2
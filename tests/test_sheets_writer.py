@@ -0,0 +1,80 @@
+"""
+Tests for the buffered Google Sheets batch writer.
+"""
+import time
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.google_services.sheets_writer import SheetsBatchWriter, is_retryable
+
+
+class FakeSheets:
+    """Records append_rows calls; fails with queued errors first."""
+
+    def __init__(self, errors=()):
+        self.calls = []
+        self.errors = list(errors)
+
+    def append_rows(self, sheet_range, rows):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.calls.append((sheet_range, [list(row) for row in rows]))
+        return sum(len(row) for row in rows)
+
+
+def http_error(status, content=b"", **headers):
+    return HttpError(httplib2.Response({"status": str(status), **headers}), content)
+
+
+def test_rows_are_batched_per_range():
+    """Hundreds of appends become one call per range, flushed on close."""
+    sheets = FakeSheets()
+    with SheetsBatchWriter(sheets, max_rows=10000, max_delay=3600) as writer:
+        for n in range(300):
+            writer.append("Bookings!A:C", [n, "Manicure", "confirmed"])
+        writer.append("Leads!A:B", ["Ada", "555-1234"])
+        assert writer.pending() == 301
+        assert sheets.calls == []
+
+    assert [(r, len(rows)) for r, rows in sheets.calls] == [("Bookings!A:C", 300), ("Leads!A:B", 1)]
+    assert writer.stats()["calls"] == 2
+
+
+def test_size_threshold_flushes_in_background():
+    """Reaching max_rows flushes without waiting for the delay."""
+    sheets = FakeSheets()
+    writer = SheetsBatchWriter(sheets, max_rows=50, max_delay=3600)
+    for n in range(50):
+        writer.append("Bookings!A:A", [n])
+
+    deadline = time.monotonic() + 2
+    while not sheets.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(sheets.calls) == 1 and len(sheets.calls[0][1]) == 50
+    writer.close()
+
+
+def test_quota_errors_are_retried_with_retry_after():
+    """429s and quota 403s are retried, honoring Retry-After; other errors requeue the rows."""
+    delays = []
+    sheets = FakeSheets(errors=[
+        http_error(429, **{"retry-after": "2"}),
+        http_error(403, b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'),
+    ])
+    writer = SheetsBatchWriter(sheets, max_delay=3600, sleep=delays.append)
+    writer.append("Bookings!A:A", ["first"])
+    assert writer.flush() == 1
+    assert delays[0] == 2.0 and len(delays) == 2
+
+    sheets.errors = [http_error(400)]
+    writer.append("Bookings!A:A", ["second"])
+    assert writer.flush() == 0
+    assert writer.pending() == 1
+    writer.close()
+    assert sheets.calls[-1] == ("Bookings!A:A", [["second"]])
+
+    assert not is_retryable(http_error(403, b"forbidden"))
+    with pytest.raises(RuntimeError):
+        writer.append("Bookings!A:A", ["late"])
@@ -0,0 +1,69 @@
+"""
+Tests for the compact slot and appointment value types.
+"""
+from datetime import datetime
+
+import pytest
+
+from src.slots import (
+    Appointment, Slot, SlotSet, decode_slot_id, encode_slot_id, generate_slots, to_minutes
+)
+
+
+def test_slot_id_round_trip():
+    """Slot IDs encode and decode through epoch minutes; malformed IDs are rejected."""
+    start = to_minutes(datetime(2030, 5, 4, 14, 30))
+    assert encode_slot_id(start) == "slot_203005041430"
+    assert decode_slot_id("slot_203005041430") == start
+
+    for bad in ("slot_2030050414", "appt-slot_203005041430", "slot_203013041430", None):
+        with pytest.raises(ValueError):
+            decode_slot_id(bad)
+
+
+def test_generated_slots_are_compact_and_skip_the_past():
+    """A month of slots fits in a few KB and serializes to the API's dicts only on request."""
+    now = datetime(2030, 5, 1, 12, 15)
+    month = generate_slots("service-001", datetime(2030, 5, 1), days=30, now=now)
+
+    assert len(month) == 30 * 8 - 4
+    assert month.nbytes < 2048
+    assert month[0] == Slot(to_minutes(datetime(2030, 5, 1, 13)), 60, "service-001")
+    assert month[0]["start_time"] == "2030-05-01T13:00:00"
+    assert "id" in month[0]
+    assert month.to_dicts()[0] == {
+        "id": "slot_203005011300",
+        "start_time": "2030-05-01T13:00:00",
+        "end_time": "2030-05-01T14:00:00",
+        "available": True,
+        "service_id": "service-001",
+    }
+    assert "slot_203005011300" in month and "slot_203005011200" not in month
+    assert isinstance(month[:8], SlotSet) and len(month[:8]) == 8
+
+
+def test_slot_set_decodes_api_dicts_and_filters():
+    """Dicts from the HTTP API decode to the same collection; without() drops start times."""
+    slots = generate_slots("service-002", datetime(2030, 5, 1), days=1, now=datetime(2030, 1, 1))
+    decoded = SlotSet.from_dicts(slots.to_dicts())
+
+    assert decoded.service_id == "service-002"
+    assert list(decoded) == list(slots)
+    remaining = decoded.without([decode_slot_id("slot_203005010900")])
+    assert remaining.ids()[0] == "slot_203005011000"
+    assert decoded.without([]) is decoded
+
+
+def test_appointment_for_slot():
+    """Appointments take their times from the slot ID."""
+    appointment = Appointment.for_slot(
+        "service-001", "slot_203005041430", {"name": "Ada", "email": "ada@example.com"}, "Manicure"
+    ).to_dict()
+    rebooked = Appointment.for_slot("service-001", "slot_203005041430", {"name": "Bo"})
+
+    assert appointment["appointment_id"].startswith("appt-slot_203005041430-")
+    assert rebooked.appointment_id != appointment["appointment_id"]
+    assert appointment["start_time"] == "2030-05-04T14:30:00"
+    assert appointment["end_time"] == "2030-05-04T15:30:00"
+    assert appointment["service_name"] == "Manicure"
+    assert appointment["customer_phone"] == ""
@@ -0,0 +1,142 @@
+"""
+Tests for request tracing: span nesting, sampling, export and the trace viewer.
+"""
+import asyncio
+import contextvars
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import api_client
+from src.agent import BookingAgent
+from src.server.app import create_app
+from src.server.state import AppState
+from src.utils import tracing
+from src.utils.tracing import JsonlExporter, Tracer, format_trace, load_traces, slowest
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """Record every trace to a temporary file."""
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonlExporter(str(path))
+    monkeypatch.setattr(tracing, "_tracer", Tracer(sample_rate=1.0, exporter=exporter))
+    yield path
+    exporter.flush()
+
+
+def test_chat_request_traced_from_handler_to_api_client(trace_file):
+    """A chat turn produces one trace: handler -> agent intent -> API client calls."""
+    state = AppState(agent=BookingAgent(use_mock_api=True))
+    with TestClient(create_app(state, legacy=False)) as client:
+        assert client.post("/api/chat", json={"message": "What services do you offer?"}).status_code == 200
+    tracing.get_tracer().exporter.flush()
+
+    [spans] = [spans for spans in load_traces(str(trace_file)) if spans[0]["name"] == "POST /api/chat"]
+    by_id = {record["span_id"]: record for record in spans}
+    root = spans[0]
+    intent = next(record for record in spans if record["name"] == "agent.intent")
+    client_call = next(record for record in spans if record["name"] == "salon_api.get_services_async")
+
+    assert root["parent_id"] is None and root["attributes"]["status"] == 200
+    assert intent["attributes"]["intent"] == "list_services" and intent["parent_id"] == root["span_id"]
+    assert by_id[client_call["parent_id"]] is intent
+    assert all(record["duration_ms"] <= root["duration_ms"] for record in spans)
+
+    rendered = format_trace(spans)
+    assert "POST /api/chat" in rendered and "    salon_api.get_services_async" in rendered
+
+
+def test_http_span_records_status(trace_file):
+    """Requests made by the API client get an HTTP span under the client call."""
+    class Response:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"id": "svc_001", "name": "Manicure"}]
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            return Response()
+
+    api = api_client.NailSalonAPI(api_base_url="https://salon.test", session=Session())
+    with tracing.span("job"):
+        api.get_services()
+    tracing.get_tracer().exporter.flush()
+
+    [spans] = load_traces(str(trace_file))
+    assert [record["name"] for record in spans] == ["job", "salon_api.get_services", "HTTP GET"]
+    assert spans[2]["attributes"] == {"path": "/services", "status": 200}
+
+
+def test_sampling_and_slow_trace_filter(tmp_path):
+    """Sampling is decided per trace and short traces can be left out of the export."""
+    random.seed(3)
+    tracer = Tracer(sample_rate=0.25)
+    kinds = []
+    for _ in range(400):
+        with tracer.span("request") as root:
+            with tracer.span("child") as child:
+                kinds.append((type(root), type(child)))
+    sampled = sum(kind == (tracing.Span, tracing.Span) for kind in kinds)
+    assert 60 < sampled < 140
+    assert all((root is tracing.Span) == (child is tracing.Span) for root, child in kinds)
+    assert tracing.current_span() is None
+
+    assert Tracer(sample_rate=0).span("request") is tracing.UNSAMPLED
+
+    exporter = JsonlExporter(str(tmp_path / "slow.jsonl"))
+    tracer = Tracer(exporter=exporter, min_duration=0.05)
+    with tracer.span("fast"):
+        pass
+    with pytest.raises(ValueError), tracer.span("slow") as slow:
+        slow.start -= 1
+        raise ValueError("boom")
+    exporter.flush()
+
+    [spans] = slowest(load_traces(exporter.path))
+    assert spans[0]["name"] == "slow" and spans[0]["error"] == "ValueError: boom"
+    assert tracer.stats() == {"sampled": 2, "exported": 1}
+
+
+def test_span_left_open_in_another_context_exits_cleanly():
+    """A generator holding a span can be closed outside the context that entered it."""
+    tracer = Tracer(sample_rate=1.0)
+
+    def flow():
+        with tracer.span("held"):
+            yield
+
+    held = flow()
+    contextvars.copy_context().run(next, held)
+    held.close()
+    assert tracing.current_span() is None
+
+
+def test_cancelled_chat_turn_closes_its_spans(trace_file):
+    """Cancelling a chat turn mid-call ends its spans in the task that opened them."""
+    agent = BookingAgent(use_mock_api=True)
+
+    async def stalled():
+        await asyncio.sleep(3600)
+
+    agent.api.get_services_async = stalled
+
+    async def main():
+        with tracing.span("request"):
+            turn = asyncio.ensure_future(agent.process_message_async("What services do you offer?"))
+            await asyncio.sleep(0)
+            turn.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await turn
+
+    asyncio.run(main())
+    tracing.get_tracer().exporter.flush()
+
+    [spans] = load_traces(str(trace_file))
+    intent = next(record for record in spans if record["name"] == "agent.intent")
+    assert intent["error"].startswith("GeneratorExit")